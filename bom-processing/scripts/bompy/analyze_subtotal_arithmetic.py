@@ -7,19 +7,97 @@ The sum of weekly subtotals for a geographic area for a year
 should approximately match the general bill subtotal for that area.
 """
 
+import argparse
+import sys
 import pandas as pd
 from pathlib import Path
 
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+SUBTOTAL_COLUMNS = [
+    "subtotal_category",
+    "count_type",
+    "count",
+    "year",
+    "joinid",
+    "bill_type",
+]
+
+
+def load_parquet_subtotals(dataset_path, years=None):
+    """
+    Load subtotals from the partitioned Parquet output.
+
+    Only the columns used by the analysis are read. When a year range is
+    given, partitions outside its decades are pruned and row groups are
+    skipped using their year statistics.
+    """
+    from bom.writers import read_parquet_table
+
+    filters = None
+    if years:
+        start, end = years
+        filters = [
+            ("decade", ">=", start // 10 * 10),
+            ("decade", "<=", end // 10 * 10),
+            ("year", ">=", start),
+            ("year", "<=", end),
+        ]
+
+    return read_parquet_table(
+        dataset_path,
+        columns=SUBTOTAL_COLUMNS,
+        filters=filters,
+        categorical=False,
+        nullable=False,
+    )
+
+
+def load_cached_subtotals(cache_dir, years=None):
+    """
+    Load subtotals from the bills stage's Arrow intermediates.
+
+    These are written by ``process_all_data.py --cache --cache-format arrow``
+    (without ``--stream``). The file is memory-mapped and only the columns
+    used by the analysis are read.
+    """
+    from bom.pipeline import read_intermediate
 
-def main():
+    df = read_intermediate(
+        cache_dir, "bills", "subtotal_records", SUBTOTAL_COLUMNS, categorical=False
+    )
+    if years:
+        df = df[df["year"].between(*years)]
+    return df
+
+
+def main(input_format="csv", years=None):
     # Load subtotals
-    data_path = Path(__file__).parent / "data" / "subtotals.csv"
+    data_dir = Path(__file__).parent / "data"
+    if input_format == "cache":
+        data_path = Path(__file__).parent / ".cache" / "pipeline"
+    elif input_format == "parquet":
+        data_path = data_dir / "parquet" / "subtotals"
+    else:
+        data_path = data_dir / "subtotals.csv"
 
     if not data_path.exists():
         print(f"Error: {data_path} not found. Run process_all_data.py first.")
         return
 
-    df = pd.read_csv(data_path)
+    if input_format == "cache":
+        try:
+            df = load_cached_subtotals(data_path, years)
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            return
+    elif input_format == "parquet":
+        df = load_parquet_subtotals(data_path, years)
+    else:
+        df = pd.read_csv(data_path)
+        if years:
+            df = df[df["year"].between(*years)]
 
     print("=" * 60)
     print("BILLS OF MORTALITY - SUBTOTAL ARITHMETIC VALIDATION")
@@ -249,4 +327,21 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--format",
+        dest="input_format",
+        choices=["csv", "parquet", "cache"],
+        default="csv",
+        help="Read subtotals.csv, the partitioned Parquet dataset or the "
+        "Arrow stage cache written with --cache-format arrow",
+    )
+    parser.add_argument(
+        "--years",
+        nargs=2,
+        type=int,
+        metavar=("START", "END"),
+        help="Only analyze subtotals within this year range (inclusive)",
+    )
+    args = parser.parse_args()
+    main(input_format=args.input_format, years=args.years)
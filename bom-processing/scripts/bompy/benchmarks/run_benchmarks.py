@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark the loader, extractors and processors on synthetic corpora.
+
+Runs the suite in ``bom.benchmarks`` (also available as ``bompy bench``),
+writes the results and prints them against the stored baseline.
+
+    python benchmarks/run_benchmarks.py --scale 1 --scale 10
+    python benchmarks/run_benchmarks.py --scale 0.1 --scale 1 --save-baseline
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+ROOT = Path(__file__).parent.parent
+
+# Add src to path
+sys.path.insert(0, str(ROOT / "src"))
+
+from bom.benchmarks import (
+    BENCHMARKS,
+    DEFAULT_THRESHOLD,
+    compare_reports,
+    run_benchmarks,
+)
+
+DEFAULT_DATA_DIR = ROOT / ".cache" / "benchmarks"
+DEFAULT_OUTPUT = ROOT / "logs" / "benchmarks.json"
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        action="append",
+        help="Corpus size relative to the real one (repeatable, default 1)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=BENCHMARKS,
+        help="Run only these benchmarks (repeatable)",
+    )
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write the results to the baseline file instead of comparing",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="Also record Python allocation peaks (slower)",
+    )
+    parser.add_argument(
+        "--skip-outputs",
+        action="store_true",
+        help="Don't run the pipeline to hash its output tables",
+    )
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    report = run_benchmarks(
+        args.data_dir,
+        scales=args.scale or [1.0],
+        seed=args.seed,
+        only=args.only,
+        trace=args.tracemalloc,
+        outputs=not args.skip_outputs,
+    )
+    output = args.baseline if args.save_baseline else args.output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Wrote {output}")
+
+    if not args.save_baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        print(compare_reports(report, baseline, DEFAULT_THRESHOLD).format())
+
+
+if __name__ == "__main__":
+    main()
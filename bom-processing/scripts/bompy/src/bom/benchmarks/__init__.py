@@ -0,0 +1,29 @@
+"""Component benchmarks on synthetic corpora, the regression gate and shadow runs."""
+
+from .compare import (
+    DEFAULT_THRESHOLD,
+    BaselineError,
+    Change,
+    Comparison,
+    compare_reports,
+)
+from .shadow import ShadowReport, TableDiff, diff_tables, shadow_run
+from .suite import BENCHMARKS, run_benchmarks, run_scale
+from .synthetic import GENERATOR_VERSION, generate_corpus
+
+__all__ = [
+    "BENCHMARKS",
+    "DEFAULT_THRESHOLD",
+    "GENERATOR_VERSION",
+    "BaselineError",
+    "Change",
+    "Comparison",
+    "ShadowReport",
+    "TableDiff",
+    "compare_reports",
+    "diff_tables",
+    "generate_corpus",
+    "run_benchmarks",
+    "run_scale",
+    "shadow_run",
+]
@@ -0,0 +1,185 @@
+"""Compare a benchmark report with a stored baseline.
+
+Each benchmark's wall time, peak RSS growth and records per second are
+compared with the baseline's at the same scale. A metric regresses when it
+is worse by more than the threshold (a fraction, 0.25 = 25%) and by more
+than a small absolute amount, so the fastest components don't fail on
+noise. Differing record counts and output tables whose SHA-256 differs
+from the baseline's are reported as output differences.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+DEFAULT_THRESHOLD = 0.25
+
+# Smaller absolute differences are noise, whatever the ratio
+MIN_SECONDS = 0.25
+MIN_RSS_MB = 5.0
+
+# Metric, whether higher is better, and its absolute noise floor
+METRICS = [
+    ("seconds", False, MIN_SECONDS),
+    ("rss_peak_mb", False, MIN_RSS_MB),
+    ("records_per_sec", True, None),
+]
+
+
+class BaselineError(ValueError):
+    """Raised when a baseline can't be compared with a run."""
+
+
+@dataclass
+class Change:
+    """One metric of one benchmark, in the baseline and now."""
+
+    benchmark: str
+    scale: float
+    metric: str
+    baseline: Optional[float]
+    current: Optional[float]
+    regressed: bool = False
+
+    @property
+    def change(self) -> Optional[float]:
+        if not self.baseline or self.current is None:
+            return None
+        return self.current / self.baseline - 1
+
+
+@dataclass
+class Comparison:
+    """The result of comparing a report with its baseline."""
+
+    threshold: float
+    changes: List[Change] = field(default_factory=list)
+    output_diffs: List[str] = field(default_factory=list)
+    outputs_checked: int = 0
+
+    @property
+    def regressions(self) -> List[Change]:
+        return [change for change in self.changes if change.regressed]
+
+    @property
+    def passed(self) -> bool:
+        return not self.regressions and not self.output_diffs
+
+    def format(self) -> str:
+        """A readable table of every metric, then the output check."""
+        lines = [
+            f"{'benchmark':<22}{'scale':>6}  {'metric':<16}"
+            f"{'baseline':>12}{'current':>12}{'change':>9}"
+        ]
+        for c in self.changes:
+            change = "-" if c.change is None else f"{c.change:+.1%}"
+            lines.append(
+                f"{c.benchmark:<22}{c.scale:>6g}  {c.metric:<16}"
+                f"{_number(c.baseline):>12}{_number(c.current):>12}{change:>9}"
+                + ("  ✗ regression" if c.regressed else "")
+            )
+
+        if self.output_diffs:
+            lines.append("\nOutputs differ from the baseline:")
+            lines.extend(f"  ✗ {diff}" for diff in self.output_diffs)
+        elif self.outputs_checked:
+            lines.append(
+                f"\nOutputs: {self.outputs_checked} tables identical to the baseline"
+            )
+
+        if self.passed:
+            lines.append(f"\nPASS (threshold {self.threshold:.0%})")
+        else:
+            lines.append(
+                f"\nFAIL: {len(self.regressions)} regressions past "
+                f"{self.threshold:.0%}, {len(self.output_diffs)} output differences"
+            )
+        return "\n".join(lines)
+
+
+def compare_reports(
+    current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD
+) -> Comparison:
+    """
+    Compare a benchmark report with a baseline report.
+
+    Args:
+        current: Report from ``run_benchmarks``
+        baseline: Stored report to compare against
+        threshold: Fraction by which a metric may get worse
+
+    Returns:
+        The Comparison; ``passed`` is False on any regression or output
+        difference
+    """
+    if current.get("generator_version") != baseline.get("generator_version"):
+        raise BaselineError(
+            f"The baseline was recorded on synthetic corpus version "
+            f"{baseline.get('generator_version')}, this run used "
+            f"{current.get('generator_version')}; record a new baseline"
+        )
+    comparison = Comparison(threshold)
+
+    previous = {(r["benchmark"], r["scale"]): r for r in baseline["results"]}
+    for result in current["results"]:
+        key = (result["benchmark"], result["scale"])
+        base = previous.get(key)
+        if base is None:
+            continue
+        if result["records"] != base["records"]:
+            comparison.output_diffs.append(
+                f"{key[0]} at scale {key[1]:g}: {result['records']:,} records, "
+                f"baseline {base['records']:,}"
+            )
+        for metric, higher_is_better, floor in METRICS:
+            comparison.changes.append(
+                _change(result, base, metric, higher_is_better, floor, threshold)
+            )
+
+    scales = {r["scale"] for r in current["results"]}
+    old_tables = {
+        (o["scale"], o["table"]): o
+        for o in baseline.get("outputs", [])
+        if o["scale"] in scales
+    }
+    new_tables = {(o["scale"], o["table"]): o for o in current.get("outputs", [])}
+    if new_tables:
+        for key in sorted(old_tables.keys() | new_tables.keys()):
+            old, new = old_tables.get(key), new_tables.get(key)
+            name = f"{key[1]} at scale {key[0]:g}"
+            if old is None:
+                comparison.output_diffs.append(f"{name}: not in the baseline")
+            elif new is None:
+                comparison.output_diffs.append(f"{name}: not written")
+            elif old["sha256"] != new["sha256"]:
+                comparison.output_diffs.append(
+                    f"{name}: {new['bytes']:,} bytes, baseline {old['bytes']:,} "
+                    f"(sha256 {new['sha256'][:12]}, baseline {old['sha256'][:12]})"
+                )
+        comparison.outputs_checked = len(new_tables)
+    return comparison
+
+
+def _change(result, base, metric, higher_is_better, floor, threshold) -> Change:
+    change = Change(
+        benchmark=result["benchmark"],
+        scale=result["scale"],
+        metric=metric,
+        baseline=base.get(metric),
+        current=result.get(metric),
+    )
+    if change.change is None:
+        return change
+    worse = -change.change if higher_is_better else change.change
+    if metric == "records_per_sec":
+        # Rates of very fast components are noise too: use the time's floor
+        noticeable = result["seconds"] - base["seconds"] > MIN_SECONDS
+    else:
+        noticeable = change.current - change.baseline > floor
+    change.regressed = worse > threshold and noticeable
+    return change
+
+
+def _number(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    return f"{value:,.3f}" if abs(value) < 100 else f"{value:,.0f}"
@@ -0,0 +1,359 @@
+"""Shadow runs: a candidate engine next to the legacy one, on the same inputs.
+
+For one processor path (see ``bom.processors.engines``), every source the
+path handles is processed twice, once by the legacy engine and once by the
+candidate. Each engine's time is measured. The records are built into
+their output tables and compared without regard to row order:
+
+- rows only the legacy engine produced are ``missing``
+- rows only the candidate produced are ``extra``
+- a missing and an extra row with the same key are one ``changed`` row,
+  reported with the columns that differ
+
+Bills and causes are also compared after source-aware deduplication. Its
+tie-break keeps the first record among equals, so a candidate that emits
+records in a different order can change which duplicate survives.
+"""
+
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from ..contracts import TABLE_CONTRACTS, build_table
+from ..loaders import REGISTRY
+from ..processors import (
+    BillsProcessor,
+    ChristeningsGenderProcessor,
+    ChristeningsParishProcessor,
+    ChristeningsProcessor,
+    engines,
+)
+from ..processors.dedup import BILL_DEDUP_RULE, CAUSE_DEDUP_RULE, deduplicate
+from ..processors.general_bills import GeneralBillsProcessor
+from ..utils.diagnostics import DiagnosticsCollector
+from ..utils.sections import section
+from .suite import Suite
+
+# Row keys of tables without a uniqueness key in their contract
+DIFF_KEYS = {
+    "christenings": ("christening", "year", "week_number", "unique_identifier"),
+    "christenings_by_gender": (
+        "christening",
+        "year",
+        "week_number",
+        "unique_identifier",
+    ),
+    "christenings_by_parish": ("parish_name", "count_type", "year", "joinid", "source"),
+}
+
+DEDUP_RULES = {"all_bills": BILL_DEDUP_RULE, "causes_of_death": CAUSE_DEDUP_RULE}
+
+# Rows of each kind of difference shown per table
+MAX_SAMPLES = 5
+
+NA = "<NA>"
+
+
+@dataclass
+class TableDiff:
+    """Order-insensitive differences between two versions of a table."""
+
+    table: str
+    key: Tuple[str, ...]
+    legacy_rows: int
+    candidate_rows: int
+    columns: Optional[str] = None
+    missing: int = 0
+    extra: int = 0
+    changed: int = 0
+    samples: List[str] = field(default_factory=list)
+
+    @property
+    def equal(self) -> bool:
+        return self.columns is None and not (self.missing or self.extra or self.changed)
+
+    def format(self) -> str:
+        if self.equal:
+            return f"  ✓ {self.table}: {self.legacy_rows:,} rows identical"
+        lines = [
+            f"  ✗ {self.table}: {self.legacy_rows:,} legacy rows, "
+            f"{self.candidate_rows:,} candidate rows; {self.missing:,} missing, "
+            f"{self.extra:,} extra, {self.changed:,} changed"
+        ]
+        if self.columns:
+            lines.append(f"      {self.columns}")
+        lines.extend(f"      {sample}" for sample in self.samples)
+        return "\n".join(lines)
+
+
+@dataclass
+class ShadowReport:
+    """A candidate engine's shadow run against the legacy engine."""
+
+    path: str
+    engine: str
+    sources: int
+    legacy_seconds: float
+    engine_seconds: float
+    tables: List[TableDiff]
+
+    @property
+    def speedup(self) -> Optional[float]:
+        if not self.engine_seconds:
+            return None
+        return self.legacy_seconds / self.engine_seconds
+
+    @property
+    def equivalent(self) -> bool:
+        return all(diff.equal for diff in self.tables)
+
+    def format(self) -> str:
+        speedup = "-" if self.speedup is None else f"{self.speedup:.2f}×"
+        lines = [
+            f"{self.path}: {self.engine} vs {engines.LEGACY} on {self.sources} "
+            f"sources: {self.engine_seconds:.3f}s vs {self.legacy_seconds:.3f}s "
+            f"({speedup} speedup)"
+        ]
+        lines.extend(diff.format() for diff in self.tables)
+        lines.append("EQUIVALENT" if self.equivalent else "DIFFERENT")
+        return "\n".join(lines)
+
+
+def diff_tables(
+    table: str,
+    legacy: Sequence,
+    candidate: Sequence,
+    key: Optional[Tuple[str, ...]] = None,
+    max_samples: int = MAX_SAMPLES,
+) -> TableDiff:
+    """
+    Compare two record lists as tables, ignoring row order.
+
+    Args:
+        table: Output table name, for column types and the default key
+        legacy: Records from the legacy engine
+        candidate: Records from the candidate engine
+        key: Columns identifying a row (default: the contract's first
+            uniqueness key, or ``DIFF_KEYS``)
+        max_samples: Differences of each kind to describe
+
+    Returns:
+        The TableDiff
+    """
+    key = key or _table_key(table)
+    left, right = build_table(table, legacy), build_table(table, candidate)
+    diff = TableDiff(table, key, len(left), len(right))
+    if list(left.columns) != list(right.columns) and len(left) and len(right):
+        diff.columns = (
+            f"columns differ: legacy {list(left.columns)}, "
+            f"candidate {list(right.columns)}"
+        )
+        return diff
+
+    columns = list(left.columns) or list(right.columns)
+    # Multisets of rows: equal rows cancel out, whatever their order
+    left_rows = Counter(_rows(left))
+    right_rows = Counter(_rows(right))
+    missing = left_rows - right_rows
+    extra = right_rows - left_rows
+
+    positions = [columns.index(name) for name in key if name in columns]
+    by_key: Dict[Tuple, List[Tuple]] = defaultdict(list)
+    for row, count in extra.items():
+        by_key[tuple(row[i] for i in positions)].extend([row] * count)
+
+    changed: List[Tuple[Tuple, Tuple]] = []
+    missing_rows: List[Tuple] = []
+    for row, count in missing.items():
+        matches = by_key.get(tuple(row[i] for i in positions), [])
+        for _ in range(count):
+            if matches:
+                changed.append((row, matches.pop()))
+            else:
+                missing_rows.append(row)
+    extra_rows = [row for rows in by_key.values() for row in rows]
+
+    diff.changed, diff.missing, diff.extra = (
+        len(changed),
+        len(missing_rows),
+        len(extra_rows),
+    )
+    for old, new in changed[:max_samples]:
+        differing = ", ".join(
+            f"{name}: {old[i]} → {new[i]}"
+            for i, name in enumerate(columns)
+            if old[i] != new[i]
+        )
+        diff.samples.append(f"changed {_describe(old, columns, key)}: {differing}")
+    for label, rows in (("missing", missing_rows), ("extra", extra_rows)):
+        diff.samples.extend(
+            f"{label} {_describe(row, columns, key)}" for row in rows[:max_samples]
+        )
+    return diff
+
+
+def _table_key(table: str) -> Tuple[str, ...]:
+    contract = TABLE_CONTRACTS.get(table)
+    if contract is not None and contract.unique:
+        return contract.unique[0]
+    return DIFF_KEYS.get(table, ())
+
+
+def _rows(df: pd.DataFrame) -> List[Tuple]:
+    # Strings compare the same however each column happens to be typed
+    return list(df.astype("string").fillna(NA).itertuples(index=False, name=None))
+
+
+def _describe(row: Tuple, columns: List[str], key: Tuple[str, ...]) -> str:
+    return "(" + ", ".join(f"{name}={row[columns.index(name)]}" for name in key) + ")"
+
+
+# --- Paths --------------------------------------------------------------------
+
+
+def _bill_sources(state, causes: bool) -> List[Tuple[pd.DataFrame, str]]:
+    """The bills stage's causes sources, or its weekly parish sources.
+
+    General Bills go through their own processor rather than an engine, so
+    they are left out, picked the way ``iter_parish_dataframes`` picks them.
+    """
+    general_bills = GeneralBillsProcessor()
+    return [
+        (df, name)
+        for df, name in REGISTRY.select(state["datasets"], "bills")
+        if (REGISTRY.kind(REGISTRY.get_dataset_type(name)) == "causes") == causes
+        and (causes or not general_bills.is_general_bill_dataset(name))
+    ]
+
+
+def _routed(state, processor: str) -> List[Tuple[pd.DataFrame, str]]:
+    return REGISTRY.select(state["datasets"], processor)
+
+
+def _parish(state):
+    processor = BillsProcessor()
+    parish_mapping = processor.create_parish_id_mapping(state["parish_records"])
+    week_mapping = processor.create_week_id_mapping(state["source_weeks"])
+
+    def run(engine, df, name):
+        bills, subtotals = engine(processor, df, name, parish_mapping, week_mapping)
+        return {"all_bills": bills, "subtotals": subtotals}
+
+    return _bill_sources(state, causes=False), run
+
+
+def _causes(state):
+    processor = BillsProcessor()
+    week_mapping = processor.create_week_id_mapping(state["source_weeks"])
+
+    def run(engine, df, name):
+        return {"causes_of_death": engine(processor, df, name, week_mapping)}
+
+    return _bill_sources(state, causes=True), run
+
+
+def _appending(processor_class, table, processor):
+    """A path whose engines append to ``processor.records``."""
+
+    def setup(state):
+        def run(engine, df, name):
+            processor = processor_class()
+            engine(processor, df, name)
+            return {table: processor.records}
+
+        return _routed(state, processor), run
+
+    return setup
+
+
+def _christenings_parish(state):
+    processor = ChristeningsParishProcessor()
+    parish_mapping = processor._create_parish_mapping(state["parish_records"])
+    week_mapping = {week.joinid: week for week in state["valid_weeks"]}
+
+    def run(engine, df, name):
+        processor = ChristeningsParishProcessor()
+        engine(processor, df, name, parish_mapping, week_mapping)
+        return {"christenings_by_parish": processor.records}
+
+    return _routed(state, "christenings_parish"), run
+
+
+# Path -> (suite steps it needs, setup returning its sources and runner)
+PATH_RUNNERS: Dict[str, Tuple[Tuple[str, ...], Callable]] = {
+    "parish": (("loader", "parish_extractor", "week_extractor"), _parish),
+    "causes": (("loader", "week_extractor"), _causes),
+    "christenings": (
+        ("loader",),
+        _appending(ChristeningsProcessor, "christenings", "christenings"),
+    ),
+    "christenings_gender": (
+        ("loader",),
+        _appending(
+            ChristeningsGenderProcessor, "christenings_by_gender", "christenings_gender"
+        ),
+    ),
+    "christenings_parish": (
+        ("loader", "parish_extractor", "week_extractor", "bills"),
+        _christenings_parish,
+    ),
+}
+
+
+def shadow_run(suite: Suite, path: str, engine: str) -> ShadowReport:
+    """
+    Run a candidate engine and the legacy engine of a path on a corpus.
+
+    Args:
+        suite: Suite over the corpus; steps the path needs are run on it
+            if they haven't been already
+        path: A ``bom.processors.engines`` path
+        engine: Name of the candidate engine
+
+    Returns:
+        The ShadowReport
+    """
+    candidate = engines.implementation(path, engine)
+    legacy = engines.implementation(path, engines.LEGACY)
+    steps, setup = PATH_RUNNERS[path]
+
+    with DiagnosticsCollector():
+        suite.ensure(*steps)
+        sources, run = setup(suite.state)
+
+        # Per engine, legacy first
+        seconds = [0.0, 0.0]
+        tables: List[Dict[str, list]] = [{}, {}]
+        with section(f"shadow-{path}"):
+            for df, name in sources:
+                with section(name):
+                    for i, implementation in enumerate((legacy, candidate)):
+                        start = time.perf_counter()
+                        produced = run(implementation, df, name)
+                        seconds[i] += time.perf_counter() - start
+                        for table, records in produced.items():
+                            tables[i].setdefault(table, []).extend(records)
+
+    diffs = []
+    for table, legacy_records in tables[0].items():
+        candidate_records = tables[1].get(table, [])
+        diffs.append(diff_tables(table, legacy_records, candidate_records))
+        if table in DEDUP_RULES:
+            rule = DEDUP_RULES[table]
+            kept, _ = deduplicate(legacy_records, rule)
+            candidate_kept, _ = deduplicate(candidate_records, rule)
+            deduplicated = diff_tables(table, kept, candidate_kept)
+            deduplicated.table = f"{table} (deduplicated)"
+            diffs.append(deduplicated)
+
+    return ShadowReport(
+        path=path,
+        engine=engine,
+        sources=len(sources),
+        legacy_seconds=seconds[0],
+        engine_seconds=seconds[1],
+        tables=diffs,
+    )
@@ -0,0 +1,282 @@
+"""Benchmark the loader, extractors and processors on synthetic corpora.
+
+For each scale, a synthetic corpus is generated (see ``synthetic.py``) and
+cached. Each component then runs once on it, in pipeline order, with the
+same inputs the pipeline stages give it:
+
+    loader, parish_extractor, week_extractor, year_extractor, bills,
+    foodstuffs, christenings_gender, christenings_parish, christenings
+
+For each component we record:
+
+- wall time
+- records produced, and records per second
+- RSS growth at its peak
+- approximate size of its result
+
+tracemalloc peaks are also recorded with ``trace=True``, which slows every
+component down. The whole pipeline is then run on the corpus and the
+SHA-256 of each output table is recorded, so a baseline also pins the
+outputs byte for byte.
+"""
+
+import gc
+import hashlib
+import platform
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set
+
+from ..extractors import ParishExtractor, WeekExtractor, YearExtractor
+from ..loaders import REGISTRY, CSVLoader
+from ..pipeline import run_pipeline
+from ..processors import (
+    BillsProcessor,
+    ChristeningsGenderProcessor,
+    ChristeningsParishProcessor,
+    ChristeningsProcessor,
+    FoodstuffsProcessor,
+)
+from ..utils.diagnostics import DiagnosticsCollector
+from ..utils.memory import MemoryTracker, estimate_bytes
+from ..utils.sections import section
+from .synthetic import GENERATOR_VERSION, generate_corpus
+
+BENCHMARKS = [
+    "loader",
+    "parish_extractor",
+    "week_extractor",
+    "year_extractor",
+    "bills",
+    "foodstuffs",
+    "christenings_gender",
+    "christenings_parish",
+    "christenings",
+]
+
+# Benchmarks that use the results of each one
+DEPENDENTS = {
+    "loader": BENCHMARKS[1:],
+    "parish_extractor": ["bills", "christenings_parish"],
+    "week_extractor": ["bills", "christenings_parish"],
+    "year_extractor": [],
+    "bills": ["christenings_parish"],
+    "foodstuffs": [],
+    "christenings_gender": [],
+    "christenings_parish": [],
+    "christenings": [],
+}
+
+MB = 1024 * 1024
+
+
+def corpus_dir(data_dir: Path, scale: float, seed: int) -> Path:
+    """The cached corpus for a scale, generated on first use."""
+    path = Path(data_dir) / f"v{GENERATOR_VERSION}-scale{scale:g}-seed{seed}"
+    if not (path / ".complete").exists():
+        print(f"Generating {scale:g}× corpus in {path} ...")
+        generate_corpus(path, scale, seed)
+        (path / ".complete").touch()
+    return path
+
+
+class Suite:
+    """The components run in order on one corpus, sharing their results."""
+
+    def __init__(self, files: List[Path]):
+        self.files = files
+        self.state: Dict[str, object] = {}
+        self.ran: Set[str] = set()
+
+    def run(self, name: str):
+        """Run one component; returns its result and record count."""
+        result = getattr(self, name)()
+        self.ran.add(name)
+        return result
+
+    def ensure(self, *names: str) -> None:
+        """Run the components that haven't run yet, in order."""
+        for name in names:
+            if name not in self.ran:
+                self.run(name)
+
+    def loader(self):
+        loader = CSVLoader()
+        datasets = []
+        for path in self.files:
+            df, info = loader.load(path)
+            datasets.append((df, path.name, info.dataset_type))
+        self.state["datasets"] = datasets
+        self.state["named"] = [(df, name) for df, name, _ in datasets]
+        return datasets, sum(len(df) for df, _, _ in datasets)
+
+    def parish_extractor(self):
+        parishes = ParishExtractor().extract_parishes_from_dataframes(
+            self.state["named"]
+        )
+        self.state["parish_records"] = parishes
+        return parishes, len(parishes)
+
+    def week_extractor(self):
+        named = sorted(
+            self.state["named"], key=lambda x: (not x[1].endswith("-parishes"), x[1])
+        )
+        extractor = WeekExtractor()
+        weeks = extractor.validate_weeks(extractor.extract_weeks_from_dataframes(named))
+        self.state["source_weeks"] = weeks
+        return weeks, len(weeks)
+
+    def year_extractor(self):
+        years = YearExtractor().extract_years_from_dataframes(self.state["named"])
+        return years, len(years)
+
+    def bills(self):
+        bill_dfs = REGISTRY.select(self.state["datasets"], "bills")
+        result = BillsProcessor().process_parish_dataframes(
+            bill_dfs, self.state["parish_records"], self.state["source_weeks"]
+        )
+        bills, causes, new_weeks, _, subtotals = result
+        known = {w.joinid for w in self.state["source_weeks"]}
+        self.state["valid_weeks"] = list(self.state["source_weeks"]) + [
+            w for w in new_weeks if w.joinid not in known
+        ]
+        return result, len(bills) + len(causes) + len(subtotals)
+
+    def _routed(self, processor: str) -> Dict:
+        routed = REGISTRY.select(self.state["datasets"], processor)
+        return {name: df for df, name in routed}
+
+    def foodstuffs(self):
+        processor = FoodstuffsProcessor()
+        processor.process_datasets(self._routed("foodstuffs"))
+        records = processor.get_records()
+        return records, len(records)
+
+    def christenings_gender(self):
+        processor = ChristeningsGenderProcessor()
+        processor.process_datasets(self._routed("christenings_gender"))
+        records = processor.get_records()
+        return records, len(records)
+
+    def christenings_parish(self):
+        processor = ChristeningsParishProcessor()
+        processor.process_datasets(
+            self._routed("christenings_parish"),
+            self.state["parish_records"],
+            self.state["valid_weeks"],
+        )
+        records = processor.get_records()
+        return records, len(records)
+
+    def christenings(self):
+        processor = ChristeningsProcessor()
+        processor.process_datasets(self._routed("christenings"))
+        records = processor.get_records()
+        return records, len(records)
+
+
+def run_scale(
+    data_dir: Path, scale: float, seed: int, only: Sequence[str], trace: bool
+) -> List[dict]:
+    """Run the benchmarks on one corpus and return one result per component."""
+    files = sorted(corpus_dir(data_dir, scale, seed).glob("*.csv"))
+    input_bytes = sum(path.stat().st_size for path in files)
+    suite = Suite(files)
+    results = []
+    needed = set(only)
+
+    with MemoryTracker(interval=0.01, trace=trace) as tracker:
+        with DiagnosticsCollector():
+            for name in BENCHMARKS:
+                if not needed & {name, *DEPENDENTS[name]}:
+                    continue
+                gc.collect()
+                start = time.perf_counter()
+                with section(name):
+                    result, records = suite.run(name)
+                seconds = time.perf_counter() - start
+                if name not in only:
+                    continue
+                measured = tracker.sections[name]
+                results.append(
+                    {
+                        "benchmark": name,
+                        "scale": scale,
+                        "files": len(files),
+                        "input_mb": round(input_bytes / MB, 2),
+                        "seconds": round(seconds, 4),
+                        "records": records,
+                        "records_per_sec": (
+                            round(records / seconds, 1) if seconds else None
+                        ),
+                        "rss_peak_mb": _mb(
+                            measured.rss_peak - measured.rss_start
+                            if measured.rss_peak is not None
+                            else None
+                        ),
+                        "result_mb": _mb(estimate_bytes(result)),
+                        "traced_peak_mb": _mb(measured.traced_peak) if trace else None,
+                    }
+                )
+    return results
+
+
+def output_hashes(data_dir: Path, scale: float, seed: int) -> List[dict]:
+    """Run the pipeline on a corpus and hash each output table."""
+    source_dir = corpus_dir(data_dir, scale, seed)
+    with tempfile.TemporaryDirectory(prefix="bom-bench-") as output_dir:
+        run_pipeline(source_dir, Path(output_dir), cache_dir=None)
+        return [
+            {
+                "scale": scale,
+                "table": path.name,
+                "bytes": path.stat().st_size,
+                "sha256": hashlib.sha256(path.read_bytes()).hexdigest(),
+            }
+            for path in sorted(Path(output_dir).glob("*.csv"))
+        ]
+
+
+def run_benchmarks(
+    data_dir: Path,
+    scales: Sequence[float] = (1.0,),
+    seed: int = 0,
+    only: Optional[Sequence[str]] = None,
+    trace: bool = False,
+    outputs: bool = True,
+) -> dict:
+    """
+    Run the benchmarks at each scale and return the report.
+
+    Args:
+        data_dir: Where synthetic corpora are cached
+        scales: Corpus sizes relative to the real corpus
+        seed: Random seed of the corpora
+        only: Run only these benchmarks (default: all)
+        trace: Also record tracemalloc peaks (slower)
+        outputs: Also run the whole pipeline and hash its output tables
+
+    Returns:
+        A JSON-serializable report with ``results`` and ``outputs``
+    """
+    results: List[dict] = []
+    hashes: List[dict] = []
+    for scale in scales:
+        results.extend(run_scale(data_dir, scale, seed, only or BENCHMARKS, trace))
+        if outputs:
+            hashes.extend(output_hashes(data_dir, scale, seed))
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "generator_version": GENERATOR_VERSION,
+        "results": results,
+        "outputs": hashes,
+    }
+
+
+def _mb(size: Optional[int]) -> Optional[float]:
+    return None if size is None else round(size / MB, 2)
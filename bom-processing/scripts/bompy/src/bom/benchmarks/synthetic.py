@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Synthetic DataScribe-shaped source CSVs for benchmarking.
+
+``generate_corpus(output_dir, scale)`` writes weekly parish bills, weekly
+causes, general bills (parishes and causes), foodstuffs and gender files
+laid out like the DataScribe exports in bom-data/data-csvs:
+
+- the Omeka/DataScribe id columns
+- every transcribed field followed by ``is_missing``/``is_illegible``
+  (except in foodstuffs and gender files)
+- 136 parishes with Buried and Plague columns
+- the aggregate columns between parish groups
+
+At scale 1 the row counts per kind of file match the real corpus. Files
+keep roughly the real size, so larger scales mean more files.
+File names contain the real source names (BLV3, Bodleian, Laxton, ...), so
+datasets are classified and routed as the real ones are. Output is
+deterministic for a given scale and seed.
+"""
+
+import argparse
+import csv
+import math
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# Bump when the generated files change, so cached corpora are rebuilt
+GENERATOR_VERSION = 1
+
+PARISHES = [
+    "St Alban Woodstreet", "Alhallows Barking", "Alhallows Breadstreet",
+    "Alhallows Great", "Alhallows Honylane", "Alhallows Lesse",
+    "Alhallows Lumbardstreet", "Alhallows Stayning", "Alhallows the Wall",
+    "St Alphage", "St Andrew Hubbard", "St Andrew Undershaft",
+    "St Andrew Wardrobe", "St Ann Aldersgate", "St Ann Blackfryers",
+    "St Antholins Parish", "St Austins Parish", "St Bartholomew Exchange",
+    "St Bennet Fynck", "St Bennet Gracechurch", "St Bennet Paulswharf",
+    "St Bennet Sherehog", "St Botolph Billingsgate", "Christ Church",
+    "St Christophers", "St Clement Eastcheap", "St Dionis Backchurch",
+    "St Dunstan East", "St Edmund Lumbardstr.", "St Ethelborough", "St Faith",
+    "St Gabriel Fenchurch", "St George Botolphlane", "St Gregory by St Pauls",
+    "St Hellen", "St James Dukes place", "St James Garlickhithe",
+    "St John Baptist", "St John Evangelist", "St John Zachary",
+    "St Katharine Coleman", "St Katharine Creechurch", "St Lawrence Jewry",
+    "St Lawrence Pountney", "St Leonard Eastcheap", "St Leonard Fosterlane",
+    "St Magnus Parish", "St Margaret Lothbury", "St Margaret Moses",
+    "St Margaret Newfishstreet", "St Margaret Pattons", "St Mary Abchurch",
+    "St Mary Aldermanbury", "St Mary Aldermary", "St Mary le Bow",
+    "St Mary Bothaw", "St Mary Colechurch", "St Mary Hill",
+    "St Maudlin Milkstreet", "St Maudlin Oldfishstreet", "St Mary Mounthaw",
+    "St Mary Sommerset", "St Mary Stayning", "St Mary Woolchurch",
+    "St Mary Woolnoth", "St Martin Iremongerlane", "St Martin Ludgate",
+    "St Martin Orgars", "St Martin Outwich", "St Martin Vintrey",
+    "St Matthew Fridaystreet", "St Michael Bassishaw", "St Michael Cornhil",
+    "St Michael Crookedlane", "St Michael Queenhithe", "St Michael Quern",
+    "St Michael Royal", "St Michael Woodstreet", "St Mildred Breadstreet",
+    "St Mildred Poultrey", "St Nicholas Acons", "St Nicholas Coleabby",
+    "St Nicholas Olaves", "St Olave Hartstreet", "St Olave Jewry",
+    "St Olave Silverstreet", "St Pancras Soperlane", "St Peter Cheap",
+    "St Peter Cornhil", "St Peter Paulswharf", "St Peter Poor",
+    "St Steven Colemanstreet", "St Steven Walbrook", "St Swithin",
+    "St Thomas Apostles", "Trinity Parish", "St Foster", "St Andrew Holborn",
+    "St Bartholomew Great", "St Bartholomew Less", "St Bridget",
+    "Bridewel Precinct", "St Botolph Aldersgate", "St Botolph Aldgate",
+    "St Botolph Bishopsgate", "St Dunstan West", "St George Southwark",
+    "St Giles Cripplegate", "St Olave Southwark", "Saviours Southwark",
+    "S Sepulchres Parish", "St Thomas Southwark", "Trinity Minories",
+    "Pesthouse Without the Walls", "Christ Church in Surry", "Hackney Parish",
+    "St Giles in the Field", "St James Clerkenwel", "St Katharine Tower",
+    "Lambeth Parish", "St Leonard Shoreditch", "St Magdalen Bermondsey",
+    "St Mary Islington", "St Mary Newington", "St Mary Whitechappel",
+    "St Pauls Shadwel", "Rothorith Parish", "Stepney Parish",
+    "St Ann in Westminster", "St Clement Danes", "St James in Westminster",
+    "St Paul Covent Garden", "St Martin in the fields", "St Mary Savoy",
+    "St Margaret Westminster", "Pesthouse in Westminster",
+]  # fmt: skip
+
+# Aggregate columns follow the parish group that ends at each index
+PARISH_GROUPS = {
+    97: "the 97 Parishes within the Walls",
+    114: "the parishes without the Walls",
+    128: "the out-Parishes in Middlesex and Surrey",
+    136: "the Parishes and Liberties of Westminster",
+}
+
+CAUSES = [
+    "Abortive", "Aged", "Ague", "Apoplexy", "Asthma", "Bed-ridden", "Blasted",
+    "Bleeding", "Bloody-flux", "Calenture", "Cancer", "Canker", "Chicken Pox",
+    "Child-Bed", "Chrisoms", "Cold", "Colick", "Consumption", "Convulsion",
+    "Cough", "Cramp", "Diabetes", "Dropsie", "Drowned", "Executed",
+    "Falling-sickness", "Fever", "Fistula", "Flox and Small-Pox", "Flux",
+    "Found dead", "French-Pox", "Frets", "Gangreen", "Gout", "Gravel", "Grief",
+    "Griping in the Guts", "Headmouldshot", "Hooping Cough", "Impostume",
+    "Infants", "Jaundies", "Jaw-fallen", "Kings Evil", "Lethargy",
+    "Liver-grown", "Lunatick and Frenzy", "Measles", "Miscarriage",
+    "Mortification", "Overlaid", "Palsie", "Plague", "Planet", "Plurisie",
+    "Purples", "Quinsie", "Rickets", "Rising of the Lights", "Rupture",
+    "Scowring", "Scurvy", "Sores", "Spleen", "Spotted-Fever", "Starved",
+    "Still-born", "Stone", "Stopping of the Stomach", "Strangury", "Suddenly",
+    "Surfeit", "Teeth", "Thrush", "Tissick", "Tympany", "Ulcer", "Vomiting",
+    "Wen", "Worms", "Killed", "Suicide", "Other",
+]  # fmt: skip
+
+# Causes followed by a "(Descriptive Text)" column
+DESCRIBED_CAUSES = {"Drowned", "Executed", "Found dead", "Killed", "Suicide", "Other"}
+
+CAUSE_TOTALS = [
+    "Christened (Male)", "Christened (Female)", "Christened (In All)",
+    "Buried (Male)", "Buried (Female)", "Buried (All)", "Plague Deaths",
+    "Increase/Decrease in Burials", "Increase/Decrease in Plague Deaths",
+    "Parishes Clear of the Plague", "Parishes Infected (with Plague)",
+]  # fmt: skip
+
+FOODSTUFFS = [
+    "Penny Loaf Troy Weight - White", "Penny Loaf Troy Weight - Wheaten",
+    "Penny Loaf Troy Weight - Household", "Penny Loaf Common Weight - White",
+    "Penny Loaf Common Weight - Wheaten", "Penny Loaf Common Weight - Household",
+    "Two Penny Loaf Common Weight - White",
+    "Two Penny Loaf Common Weight - Wheaten",
+    "Two Penny Loaf Common Weight - Household",
+    "Six Penny Loaf Common Weight - Wheaten",
+    "Six Penny Loaf Common Weight - Household",
+    "Quartern Loaf Common Weight - Wheaten",
+    "Quartern Loaf Common Weight - Household",
+    "Peck Loaf Common Weight - Wheaten", "Peck Loaf Common Weight - Household",
+]  # fmt: skip
+
+GENDER_COLUMNS = [
+    "Christened - Males", "Christened - Females", "Christened - Total",
+    "Burials - Males", "Burials - Females", "Burials - Total",
+]  # fmt: skip
+
+AGE_COLUMNS = [
+    "Under two", "Two to five", "Five to ten", "Ten to twenty",
+    "Twenty to thirty", "Thirty to forty", "Forty to fifty", "Fifty to sixty",
+    "Sixty to seventy", "Seventy to eighty", "Eighty to ninety", "Over ninety",
+]  # fmt: skip
+
+ID_COLUMNS = [
+    "Omeka Item #",
+    "DataScribe Item #",
+    "DataScribe Record #",
+    "DataScribe Record Position",
+]
+
+# Per kind of file: real sources cycled through for file names, files and
+# rows in the real corpus, and the file name suffix
+KINDS = {
+    "weekly_parishes": (
+        ["BLV1", "BLV2", "BLV3", "BodleianV1", "BodleianV2", "QC", "Wellcome"],
+        5_800,
+        400,
+        "weeklybills-parishes",
+    ),
+    "weekly_causes": (
+        ["BodleianV1", "BodleianV2", "Laxton", "QC", "Wellcome"],
+        5_900,
+        420,
+        "weeklybills-causes",
+    ),
+    "general_parishes": (["millar", "Guildhall"], 190, 48, "generalbills-parishes"),
+    "general_causes": (["millar", "Guildhall"], 140, 46, "generalbills-causes"),
+    "foodstuffs": (["Laxton"], 330, 330, "weeklybills-foodstuffs"),
+    "gender": (["Laxton"], 20, 20, "weeklybills-gender"),
+}
+
+MONTHS = [
+    "January", "February", "March", "April", "May", "June", "July", "August",
+    "September", "October", "November", "December",
+]  # fmt: skip
+
+FIRST_YEAR = 1603
+YEAR_SPAN = 190  # years stay inside the validator's 1400-1800 range
+
+
+def corpus_files(scale: float) -> Dict[str, List[int]]:
+    """Rows of each file, per kind, at a scale."""
+    plan = {}
+    for kind, (_, total_rows, rows_per_file, _) in KINDS.items():
+        rows = max(1, round(total_rows * scale))
+        files = max(1, math.ceil(rows / rows_per_file))
+        plan[kind] = [rows // files + (i < rows % files) for i in range(files)]
+    return plan
+
+
+def generate_corpus(output_dir: Path, scale: float = 1.0, seed: int = 0) -> List[Path]:
+    """
+    Write a synthetic corpus to ``output_dir``.
+
+    Args:
+        output_dir: Directory for the CSVs (created if missing)
+        scale: Size relative to the real corpus (1 = same row counts)
+        seed: Random seed
+
+    Returns:
+        Paths of the files written, in name order
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    writers = {
+        "weekly_parishes": _weekly_parishes,
+        "weekly_causes": _weekly_causes,
+        "general_parishes": _general_parishes,
+        "general_causes": _general_causes,
+        "foodstuffs": _foodstuffs,
+        "gender": _gender,
+    }
+    paths = []
+    file_number = 0
+    for kind, file_rows in corpus_files(scale).items():
+        sources, _, _, suffix = KINDS[kind]
+        for i, rows in enumerate(file_rows):
+            file_number += 1
+            source = sources[i % len(sources)]
+            name = f"synthetic-{file_number:05d}-{source}-{suffix}.csv"
+            rng = np.random.default_rng([seed, file_number])
+            first_year = FIRST_YEAR + (file_number * 7) % YEAR_SPAN
+            header, columns = writers[kind](rng, rows, first_year, source)
+            path = output_dir / name
+            _write_csv(path, header, columns, rows)
+            paths.append(path)
+    return sorted(paths)
+
+
+# --- Column helpers ---------------------------------------------------------
+
+
+def _write_csv(path: Path, header: List[str], columns: List, rows: int) -> None:
+    matrix = np.empty((rows, len(columns)), dtype=object)
+    for j, column in enumerate(columns):
+        matrix[:, j] = column
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(matrix.tolist())
+
+
+def _counts(rng, rows: int, mean: float, blank: float = 0.3) -> np.ndarray:
+    values = rng.poisson(mean, rows).astype(str).astype(object)
+    values[rng.random(rows) < blank] = ""
+    return values
+
+
+def _flags(rng, values: np.ndarray) -> List[np.ndarray]:
+    """is_missing/is_illegible columns for a transcribed column."""
+    blank = values == ""
+    missing = np.where(blank & (rng.random(len(values)) < 0.05), "1", "")
+    illegible = np.where(~blank & (rng.random(len(values)) < 0.005), "1", "")
+    return [missing.astype(object), illegible.astype(object)]
+
+
+class _Columns:
+    """Header and column arrays built in file order."""
+
+    def __init__(self, rng, rows: int):
+        self.rng = rng
+        self.rows = rows
+        self.header: List[str] = []
+        self.columns: List = []
+        for offset, name in enumerate(ID_COLUMNS):
+            self.plain(name, np.arange(rows) + 10_000 * (offset + 1))
+
+    def plain(self, name: str, values) -> None:
+        self.header.append(name)
+        self.columns.append(values)
+
+    def field(self, name: str, values) -> None:
+        """A transcribed field with its is_missing/is_illegible columns."""
+        values = np.asarray(values, dtype=object)
+        self.plain(name, values)
+        missing, illegible = _flags(self.rng, values)
+        self.plain("is_missing", missing)
+        self.plain("is_illegible", illegible)
+
+
+def _weeks(rows: int, first_year: int):
+    """Year, week and start/end dates of consecutive weekly bills."""
+    years, weeks, starts, ends = [], [], [], []
+    for i in range(rows):
+        year = first_year + (i // 52) % YEAR_SPAN
+        week = i % 52 + 1
+        start = date(year - 1, 12, 19) + timedelta(weeks=week - 1)
+        years.append(year)
+        weeks.append(week)
+        starts.append(start)
+        ends.append(start + timedelta(days=7))
+    return years, weeks, starts, ends
+
+
+def _date_fields(table: _Columns, starts: Sequence[date], ends: Sequence[date]):
+    table.field("Start Day", [d.day for d in starts])
+    table.field("Start Month", [MONTHS[d.month - 1] for d in starts])
+    table.field("End Day", [d.day for d in ends])
+    table.field("End month", [MONTHS[d.month - 1] for d in ends])
+
+
+def _parish_fields(table: _Columns, plague_years: np.ndarray, general: bool) -> None:
+    mean = 900 if general else 12
+    for index, parish in enumerate(PARISHES, start=1):
+        buried = _counts(table.rng, table.rows, mean)
+        plague = _counts(table.rng, table.rows, mean / 4, blank=0.1)
+        plague[~plague_years] = ""
+        table.field(f"{parish} - Buried", buried)
+        table.field(f"{parish} - Plague", plague)
+        if index in PARISH_GROUPS:
+            for count_type in ("Christened", "Buried", "Plague"):
+                table.plain(
+                    f"{count_type} in {PARISH_GROUPS[index]}",
+                    _counts(table.rng, table.rows, mean * 20, blank=0.05),
+                )
+
+
+# --- File kinds ---------------------------------------------------------------
+
+
+def _weekly_parishes(rng, rows: int, first_year: int, source: str):
+    table = _Columns(rng, rows)
+    years, weeks, starts, ends = _weeks(rows, first_year)
+    table.field("Year", years)
+    table.field("Week", weeks)
+    table.field(
+        "Unique ID", [f"{source}-{y}-{w:02d}-recto" for y, w in zip(years, weeks)]
+    )
+    _date_fields(table, starts, ends)
+    _parish_fields(table, np.isin(years, (1625, 1636, 1665, 1666)), general=False)
+    return table.header, table.columns
+
+
+def _weekly_causes(rng, rows: int, first_year: int, source: str):
+    table = _Columns(rng, rows)
+    years, weeks, starts, ends = _weeks(rows, first_year)
+    table.field("Year", years)
+    table.field("Week Number", weeks)
+    table.field(
+        "Unique Identifier",
+        [f"{source}-{y}-{w:02d}-verso" for y, w in zip(years, weeks)],
+    )
+    _date_fields(table, starts, ends)
+    for cause in CAUSES:
+        counts = _counts(rng, rows, 6, blank=0.6)
+        table.field(cause, counts)
+        if cause in DESCRIBED_CAUSES:
+            text = np.where(counts != "", f"{cause} at S. Giles 1;", "")
+            text[rng.random(rows) < 0.8] = ""
+            table.field(f"{cause} (Descriptive Text)", text.astype(object))
+    for total in CAUSE_TOTALS:
+        table.field(total, _counts(rng, rows, 150, blank=0.05))
+    return table.header, table.columns
+
+
+def _general_parishes(rng, rows: int, first_year: int, source: str):
+    table = _Columns(rng, rows)
+    starts = [
+        FIRST_YEAR + (first_year - FIRST_YEAR + i) % YEAR_SPAN for i in range(rows)
+    ]
+    table.field(
+        "Unique Identifier", [f"{source}-{y}-{y + 1}-GeneralBill" for y in starts]
+    )
+    table.field("Start day", np.full(rows, 17, dtype=object))
+    table.field("Start month", np.full(rows, "December", dtype=object))
+    table.field("Start year", starts)
+    table.field("End day", np.full(rows, 29, dtype=object))
+    table.field("End month", np.full(rows, "December", dtype=object))
+    table.field("End year", [y + 1 for y in starts])
+    _parish_fields(table, np.isin(starts, (1624, 1635, 1664, 1665)), general=True)
+    return table.header, table.columns
+
+
+def _general_causes(rng, rows: int, first_year: int, source: str):
+    table = _Columns(rng, rows)
+    years = [
+        FIRST_YEAR + (first_year - FIRST_YEAR + i) % YEAR_SPAN for i in range(rows)
+    ]
+    table.field("Year", years)
+    table.field(
+        "Unique Identifier", [f"{source}-{y - 1}-{y}-GeneralBill-Causes" for y in years]
+    )
+    for cause in CAUSES[:60]:
+        table.field("Cause", np.full(rows, cause, dtype=object))
+        table.field("Number", _counts(rng, rows, 300, blank=0.1))
+    return table.header, table.columns
+
+
+def _foodstuffs(rng, rows: int, first_year: int, source: str):
+    years, weeks, starts, ends = _weeks(rows, first_year)
+    header = ID_COLUMNS + [
+        "Year",
+        "Week",
+        "Unique Identifier",
+        "Start day",
+        "Start month",
+        "End day",
+        "End month",
+    ]
+    columns = [np.arange(rows) + 10_000 * (i + 1) for i in range(len(ID_COLUMNS))]
+    columns += [
+        years,
+        weeks,
+        [f"{source}-{y}-{w:02d}-verso" for y, w in zip(years, weeks)],
+        [d.day for d in starts],
+        [MONTHS[d.month - 1] for d in starts],
+        [d.day for d in ends],
+        [MONTHS[d.month - 1] for d in ends],
+    ]
+    for item in FOODSTUFFS:
+        ounces = rng.integers(0, 20, rows)
+        drams = rng.integers(0, 16, rows)
+        prices = np.array(
+            [f"00;{o:02d};{d:02d}" for o, d in zip(ounces, drams)], dtype=object
+        )
+        prices[rng.random(rows) < 0.5] = ""
+        header.append(item)
+        columns.append(prices)
+    header.append("Salt")
+    columns.append(np.full(rows, "56 l. to the Bushel 5 s.", dtype=object))
+    return header, columns
+
+
+def _gender(rng, rows: int, first_year: int, source: str):
+    years, weeks, starts, ends = _weeks(rows, first_year)
+    header = ID_COLUMNS + [
+        "Year",
+        "Week",
+        "Unique Identifier",
+        "Start day",
+        "Start month",
+        "End day",
+        "End month",
+    ]
+    columns = [np.arange(rows) + 10_000 * (i + 1) for i in range(len(ID_COLUMNS))]
+    columns += [
+        years,
+        weeks,
+        [f"{source}-{y}-{w:02d}-verso" for y, w in zip(years, weeks)],
+        [d.day for d in starts],
+        [MONTHS[d.month - 1] for d in starts],
+        [d.day for d in ends],
+        [MONTHS[d.month - 1] for d in ends],
+    ]
+    for name in GENDER_COLUMNS + AGE_COLUMNS:
+        header.append(name)
+        columns.append(_counts(rng, rows, 150, blank=0.4 if name in AGE_COLUMNS else 0))
+    header.append("Increase/decrease in burials this year")
+    columns.append(rng.integers(-80, 80, rows))
+    return header, columns
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output_dir", type=Path)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    written = generate_corpus(args.output_dir, args.scale, args.seed)
+    print(f"Wrote {len(written)} files to {args.output_dir}")
@@ -0,0 +1,463 @@
+"""Command line interface: ``bompy run`` and friends.
+
+Paths default to the layout of ``bom-processing/scripts/bompy``, so run the
+commands from that directory (e.g. ``uv run bompy run``). ``process_all_data.py``
+runs the ``run`` command, so pipeline options are only defined here.
+"""
+
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+from loguru import logger
+
+from .benchmarks import (
+    BENCHMARKS,
+    DEFAULT_THRESHOLD,
+    BaselineError,
+    compare_reports,
+    run_benchmarks,
+    shadow_run,
+)
+from .benchmarks.suite import Suite, corpus_dir
+from .loaders import PARSERS
+from .pipeline import (
+    OUTPUT_TABLES,
+    RECORD_FORMATS,
+    STAGE_NAMES,
+    FilterError,
+    RunFilter,
+    parse_year_range,
+    run_pipeline,
+)
+from .processors import engines
+from .utils.logging import setup_logging
+from .utils.memory import memory_report_path
+from .utils.metrics import metrics_report_path
+from .writers import OUTPUT_FORMATS, DeltaWriter
+from .writers.delta import STATE_DIR
+
+DEFAULT_SOURCE_DIR = Path("../../../bom-data/data-csvs")
+DEFAULT_OUTPUT_DIR = Path("data")
+# Filtered runs write here unless --output-dir is given, so a partial run
+# never overwrites the full tables in data/
+DEFAULT_FILTERED_OUTPUT_DIR = DEFAULT_OUTPUT_DIR / "filtered"
+DEFAULT_CACHE_DIR = Path(".cache") / "pipeline"
+DEFAULT_PROFILE_DIR = Path("logs") / "profile"
+DEFAULT_BENCH_DATA_DIR = Path(".cache") / "benchmarks"
+DEFAULT_BENCH_OUTPUT = Path("logs") / "benchmarks.json"
+DEFAULT_BASELINE = Path("benchmarks") / "baseline.json"
+
+app = typer.Typer(
+    help="Bills of Mortality processing pipeline.",
+    no_args_is_help=True,
+    add_completion=False,
+)
+
+
+bench_app = typer.Typer(
+    help="Benchmark the loader, extractors and processors on synthetic corpora.",
+    no_args_is_help=True,
+)
+app.add_typer(bench_app, name="bench")
+
+
+@app.callback()
+def main() -> None:
+    """Bills of Mortality processing pipeline."""
+
+
+def _check_choices(values: List[str], choices, option: str) -> None:
+    unknown = [v for v in values if v not in choices]
+    if unknown:
+        raise typer.BadParameter(
+            f"{', '.join(unknown)} (choose from {', '.join(choices)})",
+            param_hint=option,
+        )
+
+
+@app.command()
+def run(
+    source: List[str] = typer.Option(
+        [],
+        "--source",
+        "-s",
+        help="Only source files whose name matches this glob, "
+        "e.g. '*BLV3*' (repeatable)",
+    ),
+    dataset_type: List[str] = typer.Option(
+        [],
+        "--type",
+        "-t",
+        help="Only sources of this dataset type (a config.DATASET_PATTERNS "
+        "key; globs like 'blv*' work; repeatable)",
+    ),
+    table: List[str] = typer.Option(
+        [],
+        "--table",
+        help=f"Only produce this output table (repeatable): "
+        f"{', '.join(OUTPUT_TABLES)}",
+    ),
+    years: Optional[str] = typer.Option(
+        None,
+        "--years",
+        "-y",
+        help="Only source rows in this year range: 1665, 1665-1670, 1665- or -1670",
+    ),
+    source_dir: Path = typer.Option(
+        DEFAULT_SOURCE_DIR, "--source-dir", help="Directory of source CSVs"
+    ),
+    output_dir: Optional[Path] = typer.Option(
+        None,
+        "--output-dir",
+        "-o",
+        help="Output directory (default: data/, or data/filtered/ when "
+        "any filter is given)",
+    ),
+    output_format: str = typer.Option(
+        "csv", "--format", help=f"Output format: {', '.join(OUTPUT_FORMATS)}"
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Stream bills, causes and subtotals to disk source by source",
+    ),
+    database: Optional[Path] = typer.Option(
+        None,
+        "--database",
+        help="Also write an embedded SQLite (or .duckdb) analytics database",
+    ),
+    delta: bool = typer.Option(
+        False,
+        "--delta",
+        help="Also write insert/update/delete files for the Go updater",
+    ),
+    only: List[str] = typer.Option(
+        [], "--only", help="Run just this stage from cached inputs (repeatable)"
+    ),
+    start: Optional[str] = typer.Option(
+        None, "--from", help="Run this stage and every stage that depends on it"
+    ),
+    cache: bool = typer.Option(
+        False,
+        "--cache",
+        help="Memoize stage results and reuse them when their inputs are "
+        "unchanged (implied by --only, --from and --resume)",
+    ),
+    cache_dir: Path = typer.Option(
+        DEFAULT_CACHE_DIR, "--cache-dir", help="Directory for memoized stages"
+    ),
+    cache_format: str = typer.Option(
+        "pickle",
+        "--cache-format",
+        help=f"How record lists are cached: {', '.join(RECORD_FORMATS)} "
+        "(arrow writes memory-mapped Arrow IPC files; needs pyarrow)",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Continue a failed or interrupted run, reusing the sources a stage "
+        "had already processed",
+    ),
+    workers: int = typer.Option(
+        4, "--workers", min=1, help="Independent stages run at once"
+    ),
+    dedup: bool = typer.Option(
+        True,
+        "--dedup/--no-dedup",
+        help="Remove same-source duplicate bills and causes",
+    ),
+    enforce_contracts: bool = typer.Option(
+        False,
+        "--enforce-contracts",
+        help="Drop rows that violate their table contract instead of only "
+        "reporting them",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Profile each stage and per-source processor call (runs stages "
+        "one at a time)",
+    ),
+    profile_dir: Path = typer.Option(
+        DEFAULT_PROFILE_DIR,
+        "--profile-dir",
+        help="Where --profile writes pstats and collapsed-stack files",
+    ),
+    memory: bool = typer.Option(
+        False,
+        "--memory",
+        help="Track memory per stage and source and write it next to the log "
+        "(runs stages one at a time)",
+    ),
+    log_level: str = typer.Option("INFO", "--log-level", help="Log level"),
+    log_queue: bool = typer.Option(
+        False,
+        "--log-queue",
+        help="Write logs from a background queue instead of the processing thread",
+    ),
+    log_json: bool = typer.Option(
+        False, "--log-json", help="Also write logs/bom_pipeline.jsonl"
+    ),
+    engine: List[str] = typer.Option(
+        [],
+        "--engine",
+        help="Use this engine for a processor path, e.g. parish=vectorized "
+        "(repeatable)",
+    ),
+    parser: str = typer.Option(
+        "pandas",
+        "--parser",
+        help=f"CSV parser: {', '.join(PARSERS)} (arrow needs pyarrow)",
+    ),
+    prefetch: int = typer.Option(
+        0,
+        "--prefetch",
+        min=0,
+        metavar="K",
+        help="Pipelined run: stages load sources as they process them, at most "
+        "K frames at a time (0: load every source up front)",
+    ),
+) -> None:
+    """Process the source CSVs, optionally restricted to some of them."""
+    _check_choices([output_format], OUTPUT_FORMATS, "--format")
+    _check_choices([parser], PARSERS, "--parser")
+    _check_choices([cache_format], RECORD_FORMATS, "--cache-format")
+    _check_choices(only + ([start] if start else []), STAGE_NAMES, "--only/--from")
+    try:
+        run_filter = RunFilter(
+            sources=tuple(source),
+            dataset_types=tuple(dataset_type),
+            tables=tuple(table),
+            years=parse_year_range(years) if years else None,
+        )
+    except FilterError as e:
+        raise typer.BadParameter(str(e)) from e
+    if delta and output_format == "parquet":
+        raise typer.BadParameter("compares CSV outputs", param_hint="--delta")
+    if delta and run_filter.active:
+        raise typer.BadParameter(
+            "needs a run over every source and table", param_hint="--delta"
+        )
+    selection = _engine_selection(engine)
+    if output_dir is None:
+        output_dir = (
+            DEFAULT_FILTERED_OUTPUT_DIR if run_filter.active else DEFAULT_OUTPUT_DIR
+        )
+
+    log_file = setup_logging(
+        log_level=log_level,
+        log_name="bom_pipeline",
+        enqueue=log_queue,
+        json_output=log_json,
+    )
+    logger.info("🚀 Starting Bills of Mortality processing pipeline")
+    logger.info(f"📝 Log file: {log_file}")
+
+    result = run_pipeline(
+        source_dir,
+        output_dir,
+        output_format=output_format,
+        stream=stream,
+        database_path=database,
+        delta=delta,
+        run_filter=run_filter,
+        only=only or None,
+        start=start,
+        cache_dir=cache_dir if cache or only or start or resume else None,
+        workers=workers,
+        enable_dedup=dedup,
+        enforce_contracts=enforce_contracts,
+        dictionary_path=DEFAULT_OUTPUT_DIR / "dictionary.csv",
+        edited_causes_path=Path("data-raw") / "edited_causes.csv",
+        profile_dir=profile_dir if profile else None,
+        memory_path=memory_report_path(log_file) if memory else None,
+        metrics_path=metrics_report_path(log_file),
+        engines=selection,
+        csv_parser=parser,
+        prefetch=prefetch,
+        cache_format=cache_format,
+        resume=resume,
+    )
+    logger.info(f"📝 Detailed logs saved to: {log_file}")
+    if result is None:
+        raise typer.Exit(code=1)
+
+
+@app.command("ack-delta")
+def ack_delta(
+    delta_dir: Path = typer.Option(
+        DEFAULT_OUTPUT_DIR / "delta", "--delta-dir", help="Delta output directory"
+    ),
+) -> None:
+    """Record the last --delta run as applied to the database.
+
+    The Go updater's -delta mode does this itself when it commits; use this
+    after loading the database another way (e.g. a full make db-update).
+    """
+    promoted = DeltaWriter(delta_dir).promote()
+    if not promoted:
+        typer.echo(f"No pending delta state in {delta_dir / STATE_DIR}")
+        return
+    typer.echo(f"Marked as applied: {', '.join(promoted)}")
+
+
+def _engine_selection(options: List[str]) -> dict:
+    try:
+        return engines.parse_selection(options)
+    except engines.EngineError as e:
+        raise typer.BadParameter(str(e), param_hint="--engine") from e
+
+
+def _bench(
+    scales: List[float],
+    seed: int,
+    only: List[str],
+    data_dir: Path,
+    tracemalloc: bool,
+    outputs: bool,
+) -> dict:
+    _check_choices(only, BENCHMARKS, "--only")
+    setup_logging(log_level="ERROR", log_name="bom_bench")
+    return run_benchmarks(
+        data_dir,
+        scales=scales or [1.0],
+        seed=seed,
+        only=only or None,
+        trace=tracemalloc,
+        outputs=outputs,
+    )
+
+
+def _write_report(report: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    typer.echo(f"Wrote {path}")
+
+
+@bench_app.command("run")
+def bench_run(
+    scale: List[float] = typer.Option(
+        [], "--scale", help="Corpus size relative to the real one (repeatable)"
+    ),
+    seed: int = typer.Option(0, "--seed", help="Random seed of the corpus"),
+    only: List[str] = typer.Option(
+        [], "--only", help="Run only this benchmark (repeatable)"
+    ),
+    data_dir: Path = typer.Option(
+        DEFAULT_BENCH_DATA_DIR, "--data-dir", help="Where corpora are cached"
+    ),
+    output: Path = typer.Option(
+        DEFAULT_BENCH_OUTPUT, "--output", help="Where the results are written"
+    ),
+    save_baseline: bool = typer.Option(
+        False, "--save-baseline", help="Write the results as the new baseline"
+    ),
+    baseline: Path = typer.Option(
+        DEFAULT_BASELINE, "--baseline", help="Baseline file for --save-baseline"
+    ),
+    tracemalloc: bool = typer.Option(
+        False, "--tracemalloc", help="Also record Python allocation peaks (slower)"
+    ),
+    skip_outputs: bool = typer.Option(
+        False, "--skip-outputs", help="Don't run the pipeline to hash its outputs"
+    ),
+) -> None:
+    """Run the benchmarks and record their results."""
+    report = _bench(scale, seed, only, data_dir, tracemalloc, not skip_outputs)
+    _write_report(report, baseline if save_baseline else output)
+
+
+@bench_app.command("compare")
+def bench_compare(
+    baseline: Path = typer.Option(
+        DEFAULT_BASELINE, "--baseline", help="Baseline results to compare against"
+    ),
+    threshold: float = typer.Option(
+        DEFAULT_THRESHOLD,
+        "--threshold",
+        min=0,
+        help="Fail when a metric gets worse by more than this fraction",
+    ),
+    scale: List[float] = typer.Option(
+        [], "--scale", help="Only this baseline scale (repeatable; default: all)"
+    ),
+    only: List[str] = typer.Option(
+        [], "--only", help="Run only this benchmark (repeatable)"
+    ),
+    data_dir: Path = typer.Option(
+        DEFAULT_BENCH_DATA_DIR, "--data-dir", help="Where corpora are cached"
+    ),
+    output: Path = typer.Option(
+        DEFAULT_BENCH_OUTPUT, "--output", help="Where this run's results go"
+    ),
+    skip_outputs: bool = typer.Option(
+        False, "--skip-outputs", help="Don't check the output tables"
+    ),
+) -> None:
+    """Run the benchmarks and fail if any regressed past the baseline."""
+    if not baseline.exists():
+        raise typer.BadParameter(f"{baseline} not found", param_hint="--baseline")
+    stored = json.loads(baseline.read_text())
+    scales = sorted({r["scale"] for r in stored["results"]})
+    unknown = [s for s in scale if s not in scales]
+    if unknown:
+        raise typer.BadParameter(
+            f"{', '.join(map(str, unknown))} (the baseline has "
+            f"{', '.join(map(str, scales))})",
+            param_hint="--scale",
+        )
+
+    report = _bench(
+        scale or scales, stored["seed"], only, data_dir, False, not skip_outputs
+    )
+    _write_report(report, output)
+    try:
+        comparison = compare_reports(report, stored, threshold)
+    except BaselineError as e:
+        raise typer.BadParameter(str(e), param_hint="--baseline") from e
+    typer.echo(comparison.format())
+    if not comparison.passed:
+        raise typer.Exit(code=1)
+
+
+@bench_app.command("shadow")
+def bench_shadow(
+    engine: List[str] = typer.Option(
+        ...,
+        "--engine",
+        help="Compare this engine of a processor path with the legacy one, "
+        "e.g. parish=vectorized (repeatable)",
+    ),
+    scale: float = typer.Option(
+        0.1, "--scale", help="Size of the synthetic corpus relative to the real one"
+    ),
+    seed: int = typer.Option(0, "--seed", help="Random seed of the corpus"),
+    source_dir: Optional[Path] = typer.Option(
+        None,
+        "--source-dir",
+        help="Run on the CSVs in this directory instead of a synthetic corpus",
+    ),
+    data_dir: Path = typer.Option(
+        DEFAULT_BENCH_DATA_DIR, "--data-dir", help="Where corpora are cached"
+    ),
+) -> None:
+    """Run engines next to the legacy ones and fail if their outputs differ."""
+    selection = _engine_selection(engine)
+    setup_logging(log_level="ERROR", log_name="bom_bench")
+    if source_dir is None:
+        source_dir = corpus_dir(data_dir, scale, seed)
+    suite = Suite(sorted(source_dir.glob("*.csv")))
+
+    equivalent = True
+    for path, name in selection.items():
+        report = shadow_run(suite, path, name)
+        typer.echo(report.format())
+        equivalent = equivalent and report.equivalent
+    if not equivalent:
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    app()
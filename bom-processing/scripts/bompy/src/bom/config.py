@@ -57,18 +57,22 @@ COLUMN_NORMALIZATION = {
     "Count": "count",
 }
 
-# Data types for consistent processing
+# Data types of the metadata columns, used by the Arrow CSV parser (see
+# loaders/dtypes.py). Whole-number columns are nullable Int64; a column
+# that isn't all whole numbers keeps the type pandas infers for it.
 COLUMN_TYPES = {
-    "year": "int64",
-    "week": "str",
-    "week_number": "str",
-    "start_day": "str",
-    "end_day": "str",
-    "start_month": "str",
-    "end_month": "str",
+    "year": "Int64",
+    "start_year": "Int64",
+    "end_year": "Int64",
+    "week": "Int64",
+    "week_number": "Int64",
+    "start_day": "Int64",
+    "end_day": "Int64",
+    "start_month": "category",
+    "end_month": "category",
     "unique_identifier": "str",
     "parish_name": "str",
-    "count": "str",  # Keep as string initially to handle mixed types
+    "count": "Int64",
 }
 
 # Skip columns - these are typically metadata we don't need for processing
@@ -0,0 +1,664 @@
+"""Declarative contracts for the PostgreSQL-ready output tables.
+
+Each contract states what the Go updater's temp tables expect from one CSV:
+column order, column types, enumerations, foreign-key references to other
+output tables and uniqueness keys. A contract compiles into a list of
+vectorized checks that run over the whole table in a single pass, so bad
+rows are caught before they reach the database transaction.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from loguru import logger
+
+from .utils.dictionaries import encode_column
+from .utils.validation import (
+    DAY_MAX,
+    DAY_MIN,
+    VIOLATION_COLUMNS,
+    WEEK_NUMBER_MAX,
+    WEEK_NUMBER_MIN,
+    YEAR_MAX,
+    YEAR_MIN,
+)
+
+# Inclusive bounds matching the CHECK constraints in db/migrations
+YEAR_BOUNDS = (YEAR_MIN + 1, YEAR_MAX - 1)
+WEEK_NUMBER_BOUNDS = (WEEK_NUMBER_MIN, WEEK_NUMBER_MAX)
+DAY_BOUNDS = (DAY_MIN, DAY_MAX)
+
+BILL_TYPES = ("weekly", "general")
+COUNT_TYPES = ("buried", "plague", "christened", "other")
+
+INTEGER_DTYPE = "Int64"
+STRING_DTYPE = "string"
+BOOLEAN_DTYPE = "boolean"
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """Expected shape of a single output column.
+
+    Attributes:
+        name: CSV header / temp table column name
+        dtype: Declared pandas dtype ("Int64", "string" or "boolean")
+        nullable: Whether NULL values are allowed
+        choices: Allowed values for enumerated columns (built as categoricals)
+        bounds: Inclusive (low, high) range for integer columns
+        references: (table, column) this column must exist in
+    """
+
+    name: str
+    dtype: str = STRING_DTYPE
+    nullable: bool = True
+    choices: Optional[Tuple[str, ...]] = None
+    bounds: Optional[Tuple[int, int]] = None
+    references: Optional[Tuple[str, str]] = None
+
+    def build(self, values: List[Any]):
+        """
+        Build the column directly with its declared dtype.
+
+        Enumerated columns become categoricals over ``choices``, and label
+        and count columns take the compact form of ``encode_column``
+        (categoricals over shared dictionaries, ``Int32`` counts). Values
+        that do not fit the declared type are kept as objects so that
+        ``check`` reports them instead of the build failing.
+
+        Args:
+            values: Python values, with None for missing
+
+        Returns:
+            An array suitable for a DataFrame column
+        """
+        if self.choices:
+            array = pd.Categorical(values)
+            if set(array.categories) <= set(self.choices):
+                return array.set_categories(self.choices)
+            values = list(values)
+        else:
+            array = encode_column(self.name, values)
+            if array is not None:
+                return array
+        try:
+            return pd.array(values, dtype=self.dtype)
+        except (TypeError, ValueError):
+            return pd.array(values, dtype=object)
+
+
+@dataclass(frozen=True)
+class TableContract:
+    """Contract for one output table."""
+
+    name: str
+    columns: Tuple[ColumnSpec, ...]
+    unique: Tuple[Tuple[str, ...], ...] = ()
+
+    @property
+    def column_names(self) -> List[str]:
+        """Column order expected in the output file."""
+        return [col.name for col in self.columns]
+
+    @property
+    def integer_columns(self) -> List[str]:
+        """Columns declared as nullable integers."""
+        return [col.name for col in self.columns if col.dtype == INTEGER_DTYPE]
+
+    def build(self, rows: Sequence[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Build the table from record dicts with every column's declared dtype.
+
+        Building column by column skips pandas' type inference, which turns
+        integer columns containing None into floats (written as ``12.0`` and
+        silently NULL in the Go updater), and the cast needed to undo it.
+        Columns the contract does not declare are inferred as usual.
+
+        Args:
+            rows: Record dicts (``record.to_dict()``), all with the same keys
+
+        Returns:
+            DataFrame with the columns in the order of the dicts' keys
+        """
+        specs = {col.name: col for col in self.columns}
+        names = list(rows[0]) if rows else self.column_names
+        data = {}
+        for name in names:
+            values = [row.get(name) for row in rows]
+            spec = specs.get(name)
+            data[name] = spec.build(values) if spec else values
+        return pd.DataFrame(data, index=pd.RangeIndex(len(rows)))
+
+    def conform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cast declared integer columns to nullable integers.
+
+        Columns that already are (``Int64``, or ``Int32`` counts) are kept.
+
+        Only needed for tables not built with ``build`` (e.g. read back from
+        a file): pandas infers float for integer columns containing None.
+        Columns that cannot be cast losslessly are left untouched so that
+        ``check`` reports them as type violations.
+
+        Args:
+            df: Output table built from record dicts
+
+        Returns:
+            The same DataFrame with integer columns cast in place
+        """
+        for name in self.integer_columns:
+            if name not in df.columns or _is_nullable_integer(df[name].dtype):
+                continue
+            try:
+                df[name] = df[name].astype(INTEGER_DTYPE)
+            except (TypeError, ValueError):
+                logger.warning(f"{self.name}.{name} could not be cast to Int64")
+        return df
+
+    def compile(self) -> "CompiledContract":
+        """Compile this contract into vectorized checks."""
+        return CompiledContract(self)
+
+
+# A check receives the table, the reference tables and the column it applies
+# to, and returns a boolean mask of failing rows
+CheckFn = Callable[[pd.DataFrame, Dict[str, pd.DataFrame], str], pd.Series]
+
+
+@dataclass
+class ContractReport:
+    """Result of checking a table against its contract.
+
+    Attributes:
+        table: Table name
+        schema_errors: Table-level problems (missing/unexpected/out-of-order columns)
+        violations: One row per failed check with ``row``, ``rule`` and ``value``
+        invalid_rows: Index labels of rows with at least one violation
+        skipped: Foreign-key rules not checked because the referenced table
+            was not supplied
+    """
+
+    table: str
+    schema_errors: List[str]
+    violations: pd.DataFrame
+    invalid_rows: pd.Index = field(default_factory=pd.Index)
+    skipped: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True when the table satisfies its contract."""
+        return not self.schema_errors and self.violations.empty
+
+    def rule_counts(self) -> Dict[str, int]:
+        """Number of violations per rule."""
+        if self.violations.empty:
+            return {}
+        return self.violations["rule"].value_counts().to_dict()
+
+    def log(self) -> None:
+        """Log a summary of the report."""
+        for rule in self.skipped:
+            logger.info(
+                f"{self.table}: skipped {rule}, "
+                f"{rule.split('_fk_')[1]} is not part of this run"
+            )
+        if self.ok:
+            logger.info(f"✓ {self.table} satisfies its contract")
+            return
+
+        logger.warning(f"Contract violations for {self.table}:")
+        for error in self.schema_errors:
+            logger.warning(f"  - {error}")
+        for rule, count in self.rule_counts().items():
+            if count:
+                logger.warning(f"  - {rule}: {count:,} rows")
+        for sample in self.violations.head(5).itertuples(index=False):
+            logger.warning(
+                f"    row {sample.row}: {sample.rule} (value={sample.value!r})"
+            )
+
+
+class CompiledContract:
+    """A table contract compiled into a flat list of column checks."""
+
+    def __init__(self, contract: TableContract):
+        self.contract = contract
+        self.checks: List[Tuple[str, str, CheckFn]] = []
+
+        for spec in contract.columns:
+            if not spec.nullable:
+                self.checks.append((f"{spec.name}_not_null", spec.name, _not_null()))
+            if spec.dtype == INTEGER_DTYPE:
+                self.checks.append((f"{spec.name}_integer", spec.name, _integer()))
+            if spec.dtype == BOOLEAN_DTYPE:
+                self.checks.append((f"{spec.name}_boolean", spec.name, _boolean()))
+            if spec.choices:
+                self.checks.append(
+                    (f"{spec.name}_choices", spec.name, _choices(spec.choices))
+                )
+            if spec.bounds:
+                self.checks.append(
+                    (f"{spec.name}_range", spec.name, _bounds(*spec.bounds))
+                )
+            if spec.references:
+                table, column = spec.references
+                self.checks.append(
+                    (f"{spec.name}_fk_{table}", spec.name, _reference(table, column))
+                )
+
+        for key in contract.unique:
+            self.checks.append((f"unique_{'_'.join(key)}", key[0], _unique(key)))
+
+    def check(
+        self,
+        df: pd.DataFrame,
+        references: Optional[Dict[str, pd.DataFrame]] = None,
+    ) -> ContractReport:
+        """
+        Run every compiled check over ``df``.
+
+        Args:
+            df: Output table to check
+            references: Other output tables by name, for foreign-key checks.
+                References to tables not supplied are skipped and listed in
+                the report's ``skipped``.
+
+        Returns:
+            ContractReport describing all violations
+        """
+        references = references or {}
+        contract = self.contract
+        schema_errors = _schema_errors(df, contract)
+
+        parts = []
+        skipped = []
+        invalid = pd.Series(False, index=df.index)
+        for rule, column, check in self.checks:
+            if column not in df.columns:
+                continue
+            if "_fk_" in rule and rule.split("_fk_")[1] not in references:
+                skipped.append(rule)
+                continue
+            failed = check(df, references, column)
+            if not failed.any():
+                continue
+            invalid |= failed
+            values = df.loc[failed, column]
+            parts.append(
+                pd.DataFrame(
+                    {"row": values.index, "rule": rule, "value": values.to_numpy()}
+                )
+            )
+
+        if parts:
+            violations = pd.concat(parts, ignore_index=True)
+            violations["rule"] = violations["rule"].astype("category")
+        else:
+            violations = pd.DataFrame(columns=VIOLATION_COLUMNS)
+
+        return ContractReport(
+            table=contract.name,
+            schema_errors=schema_errors,
+            violations=violations,
+            invalid_rows=df.index[invalid.to_numpy()],
+            skipped=skipped,
+        )
+
+
+def _is_nullable_integer(dtype) -> bool:
+    return pd.api.types.is_extension_array_dtype(
+        dtype
+    ) and pd.api.types.is_integer_dtype(dtype)
+
+
+def _schema_errors(df: pd.DataFrame, contract: TableContract) -> List[str]:
+    """Compare the DataFrame's columns against the contract's column order."""
+    expected = contract.column_names
+    actual = df.columns.tolist()
+    errors = []
+
+    missing = [col for col in expected if col not in actual]
+    unexpected = [col for col in actual if col not in expected]
+    if missing:
+        errors.append(f"missing columns: {missing}")
+    if unexpected:
+        errors.append(f"unexpected columns: {unexpected}")
+    if not missing and not unexpected and actual != expected:
+        errors.append(f"column order {actual} does not match {expected}")
+
+    return errors
+
+
+def _not_null() -> CheckFn:
+    def check(df, refs, column):
+        return df[column].isna()
+
+    return check
+
+
+def _integer() -> CheckFn:
+    def check(df, refs, column):
+        series = df[column]
+        if pd.api.types.is_integer_dtype(series.dtype):
+            return pd.Series(False, index=df.index)
+        numeric = pd.to_numeric(series, errors="coerce")
+        not_integral = numeric.notna() & (numeric % 1 != 0)
+        return (series.notna() & numeric.isna()) | not_integral
+
+    return check
+
+
+def _boolean() -> CheckFn:
+    def check(df, refs, column):
+        series = df[column]
+        if pd.api.types.is_bool_dtype(series.dtype):
+            return pd.Series(False, index=df.index)
+        return series.notna() & ~series.isin([True, False])
+
+    return check
+
+
+def _choices(choices: Tuple[str, ...]) -> CheckFn:
+    def check(df, refs, column):
+        series = df[column]
+        return series.notna() & ~series.isin(choices)
+
+    return check
+
+
+def _bounds(low: int, high: int) -> CheckFn:
+    def check(df, refs, column):
+        numeric = pd.to_numeric(df[column], errors="coerce")
+        return numeric.notna() & ((numeric < low) | (numeric > high))
+
+    return check
+
+
+def _reference(table: str, ref_column: str) -> CheckFn:
+    def check(df, refs, column):
+        series = df[column]
+        ref = refs[table]
+        if ref_column not in ref.columns:
+            return pd.Series(False, index=df.index)
+        return series.notna() & ~series.isin(ref[ref_column].dropna())
+
+    return check
+
+
+def _unique(key: Tuple[str, ...]) -> CheckFn:
+    def check(df, refs, column):
+        present = [col for col in key if col in df.columns]
+        return df.duplicated(subset=present, keep="first")
+
+    return check
+
+
+def _int(name: str, **kwargs) -> ColumnSpec:
+    return ColumnSpec(name, INTEGER_DTYPE, **kwargs)
+
+
+def _str(name: str, **kwargs) -> ColumnSpec:
+    return ColumnSpec(name, STRING_DTYPE, **kwargs)
+
+
+def _bool(name: str, **kwargs) -> ColumnSpec:
+    return ColumnSpec(name, BOOLEAN_DTYPE, **kwargs)
+
+
+_YEAR_FK = ("years", "year")
+_WEEK_FK = ("weeks", "joinid")
+
+TABLE_CONTRACTS: Dict[str, TableContract] = {
+    "years": TableContract(
+        name="years",
+        columns=(_int("year", nullable=False, bounds=YEAR_BOUNDS),),
+        unique=(("year",),),
+    ),
+    "weeks": TableContract(
+        name="weeks",
+        columns=(
+            _str("joinid", nullable=False),
+            _int("start_day", bounds=DAY_BOUNDS),
+            _str("start_month"),
+            _int("end_day", bounds=DAY_BOUNDS),
+            _str("end_month"),
+            _int("year", bounds=YEAR_BOUNDS, references=_YEAR_FK),
+            _int("week_number", bounds=WEEK_NUMBER_BOUNDS),
+            _str("split_year"),
+            _str("unique_identifier"),
+            _str("week_id"),
+            _str("year_range"),
+        ),
+        unique=(("joinid",),),
+    ),
+    "parishes": TableContract(
+        name="parishes",
+        columns=(
+            _int("id", nullable=False),
+            _str("parish_name", nullable=False),
+            _str("canonical_name", nullable=False),
+            _str("bills_subunit"),
+            _str("foundation_year"),
+            _str("notes"),
+        ),
+        unique=(("id",), ("parish_name",)),
+    ),
+    "all_bills": TableContract(
+        name="all_bills",
+        columns=(
+            _int("parish_id", nullable=False, references=("parishes", "id")),
+            _str("count_type", nullable=False, choices=COUNT_TYPES),
+            _int("count"),
+            _int("year", nullable=False, bounds=YEAR_BOUNDS, references=_YEAR_FK),
+            _str("joinid", nullable=False, references=_WEEK_FK),
+            _str("bill_type", choices=BILL_TYPES),
+            _bool("missing"),
+            _bool("illegible"),
+            _str("source"),
+            _str("unique_identifier"),
+        ),
+        unique=(("parish_id", "count_type", "year", "joinid", "source", "bill_type"),),
+    ),
+    "causes_of_death": TableContract(
+        name="causes_of_death",
+        columns=(
+            _str("death", nullable=False),
+            _int("count"),
+            _int("year", bounds=YEAR_BOUNDS, references=_YEAR_FK),
+            _str("joinid", nullable=False, references=_WEEK_FK),
+            _str("descriptive_text"),
+            _str("source_name"),
+            _str("definition"),
+            _str("definition_source"),
+            _str("bill_type", nullable=False, choices=BILL_TYPES),
+            _str("edited_cause"),
+        ),
+        unique=(("death", "year", "joinid", "source_name", "bill_type"),),
+    ),
+    "subtotals": TableContract(
+        name="subtotals",
+        columns=(
+            _str("subtotal_category", nullable=False),
+            _str("count_type", nullable=False, choices=COUNT_TYPES),
+            _int("count"),
+            _int("year", nullable=False, bounds=YEAR_BOUNDS),
+            _str("joinid"),
+            _str("bill_type", choices=BILL_TYPES),
+            _bool("missing"),
+            _bool("illegible"),
+            _str("source"),
+            _str("unique_identifier"),
+        ),
+        unique=(
+            (
+                "subtotal_category",
+                "count_type",
+                "year",
+                "joinid",
+                "source",
+                "bill_type",
+            ),
+        ),
+    ),
+    "foodstuffs": TableContract(
+        name="foodstuffs",
+        columns=(
+            _int("year", nullable=False, bounds=YEAR_BOUNDS),
+            _int("week"),
+            _str("unique_identifier", nullable=False),
+            _int("start_day", bounds=DAY_BOUNDS),
+            _str("start_month"),
+            _int("end_day", bounds=DAY_BOUNDS),
+            _str("end_month"),
+            _str("commodity_category", nullable=False),
+            _str("commodity_type", nullable=False),
+            _str("quality_grade"),
+            _str("measurement_standard"),
+            _int("weight_pounds"),
+            _int("weight_ounces"),
+            _int("weight_drams"),
+            _int("price_shillings"),
+            _int("price_pence"),
+            _str("raw_value", nullable=False),
+            _str("source", nullable=False),
+            _str("column_name", nullable=False),
+        ),
+    ),
+    "christenings_by_gender": TableContract(
+        name="christenings_by_gender",
+        columns=(
+            _int("year", nullable=False, bounds=YEAR_BOUNDS),
+            _int("week_number", bounds=WEEK_NUMBER_BOUNDS),
+            _str("unique_identifier"),
+            _int("start_day", bounds=DAY_BOUNDS),
+            _str("start_month"),
+            _int("end_day", bounds=DAY_BOUNDS),
+            _str("end_month"),
+            _str("christening", nullable=False),
+            _int("count"),
+        ),
+    ),
+    "christenings_by_parish": TableContract(
+        name="christenings_by_parish",
+        columns=(
+            _int("year", nullable=False, bounds=YEAR_BOUNDS, references=_YEAR_FK),
+            _int("week", bounds=WEEK_NUMBER_BOUNDS),
+            _str("unique_identifier"),
+            _int("start_day", bounds=DAY_BOUNDS),
+            _str("start_month"),
+            _int("end_day", bounds=DAY_BOUNDS),
+            _str("end_month"),
+            _str("parish_name", nullable=False),
+            _int("count"),
+            _bool("missing"),
+            _bool("illegible"),
+            _str("source"),
+            _str("bill_type", choices=BILL_TYPES),
+            _str("joinid", references=_WEEK_FK),
+            _int("start_year"),
+            _int("end_year"),
+            _str("count_type", choices=COUNT_TYPES),
+        ),
+        # bom.christenings is loaded from this table (parish_name -> christening,
+        # week -> week_number); see migration 000007
+        unique=(
+            (
+                "parish_name",
+                "week",
+                "start_day",
+                "start_month",
+                "end_day",
+                "end_month",
+                "year",
+                "bill_type",
+            ),
+        ),
+    ),
+    "christenings": TableContract(
+        name="christenings",
+        columns=(
+            _str("christening", nullable=False),
+            _int("count"),
+            _int("week_number"),
+            _str("start_month"),
+            _str("end_month"),
+            _int("year", bounds=YEAR_BOUNDS),
+            _int("start_day"),
+            _int("end_day"),
+            _bool("missing"),
+            _bool("illegible"),
+            _str("source"),
+            _str("bill_type", choices=BILL_TYPES),
+            _str("joinid"),
+            _str("unique_identifier"),
+        ),
+        unique=(
+            (
+                "christening",
+                "week_number",
+                "start_day",
+                "start_month",
+                "end_day",
+                "end_month",
+                "year",
+                "bill_type",
+            ),
+        ),
+    ),
+}
+
+
+# ProcessingResult.to_dataframes() names for tables that differ from the CSVs
+TABLE_NAME_ALIASES = {
+    "bill_of_mortality": "all_bills",
+    "week": "weeks",
+    "year": "years",
+}
+
+
+def build_table(table_name: str, records: Iterable[Any]) -> pd.DataFrame:
+    """
+    Build an output table from records that provide ``to_dict()``.
+
+    Tables with a contract get their declared column dtypes; others are
+    built with ``pd.DataFrame`` as before.
+
+    Args:
+        table_name: Output table name (or a ``TABLE_NAME_ALIASES`` key)
+        records: Model records
+
+    Returns:
+        DataFrame of the records
+    """
+    rows = [record.to_dict() for record in records]
+    contract = TABLE_CONTRACTS.get(resolve_table_name(table_name))
+    if contract is None:
+        return pd.DataFrame(rows)
+    return contract.build(rows)
+
+
+def resolve_table_name(table_name: str) -> str:
+    """Map a ProcessingResult table name to its output table name."""
+    return TABLE_NAME_ALIASES.get(table_name, table_name)
+
+
+def check_tables(
+    tables: Dict[str, pd.DataFrame],
+) -> Dict[str, ContractReport]:
+    """
+    Check every output table that has a contract.
+
+    Args:
+        tables: Output tables by name; also used to resolve foreign keys
+
+    Returns:
+        Dictionary mapping table name to its ContractReport
+    """
+    reports = {}
+    for table_name, df in tables.items():
+        contract = TABLE_CONTRACTS.get(table_name)
+        if contract is None or df.empty:
+            continue
+        reports[table_name] = contract.compile().check(df, references=tables)
+    return reports
@@ -8,6 +8,12 @@ import pandas as pd
 from loguru import logger
 
 from ..models import ParishRecord
+from ..utils import diagnostics, metrics
+
+AUTHORITY_MISSES = metrics.counter(
+    "bom_parish_authority_misses_total",
+    "Parish name lookups with no entry in the authority file",
+)
 
 
 class ParishExtractor:
@@ -199,7 +205,8 @@ class ParishExtractor:
                 return parish_info
 
         # If no match found, use the cleaned name as canonical with no additional data
-        logger.warning(f"No authority mapping found for parish: '{cleaned_name}'")
+        AUTHORITY_MISSES.inc()
+        diagnostics.warning("No authority mapping found for parish: '{}'", cleaned_name)
         return {
             "canonical_name": cleaned_name,
             "bills_subunit": None,
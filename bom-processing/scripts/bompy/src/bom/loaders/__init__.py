@@ -1,6 +1,6 @@
 """Data loading modules."""
 
-from .csv_loader import CSVLoader
-from .registry import DatasetRegistry
+from .csv_loader import PARSERS, CSVLoader
+from .registry import REGISTRY, DatasetFile, DatasetRegistry
 
-__all__ = ["CSVLoader", "DatasetRegistry"]
+__all__ = ["CSVLoader", "DatasetFile", "DatasetRegistry", "PARSERS", "REGISTRY"]
@@ -1,23 +1,78 @@
-"""CSV loading with proper column normalization."""
-
+"""CSV loading with proper column normalization.
+
+The header is read and normalized once per file. Only the columns that
+survive ``filter_relevant_columns``' rules are parsed, and they are renamed
+in place, so a loaded file is held in memory once. ``CSVLoader.stream``
+yields the same columns in chunks of a fixed number of rows, for work that
+only needs one row at a time.
+
+With ``parser="arrow"``, ``load`` reads the file with Arrow's multithreaded
+CSV reader and gives each column the type planned for it in ``dtypes.py``:
+nullable integer counts, boolean flags and categorical months. pyarrow is an
+optional dependency (``pip install bom-processing[parquet]``) and is only
+imported for that parser.
+"""
+
+import csv
+from collections import defaultdict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List
 
 import pandas as pd
 from loguru import logger
 
 from ..models import DatasetInfo
-from ..utils.columns import (
-    filter_relevant_columns,
-    get_column_info,
-    normalize_dataframe_columns,
-)
+from ..utils.columns import normalize_column_names, should_skip_column
+from .registry import REGISTRY
+
+DEFAULT_CHUNK_ROWS = 50_000
+PARSERS = ("pandas", "arrow")
+
+
+@dataclass
+class _Header:
+    """A file's header and the columns kept from it."""
+
+    original_columns: List[str]
+    positions: List[int]  # Of the kept columns, in file order
+    columns: List[str]  # Normalized names of the kept columns
+
+
+def _read_column_names(file_path: Path) -> List[str]:
+    """The column names pandas gives a file, from its first line alone."""
+    with open(file_path, newline="", encoding="utf-8-sig") as handle:
+        names = next(csv.reader(handle), [])
+    # Unnamed and repeated columns are named as pandas' C parser names them,
+    # skipping suffixed names the header already has
+    columns = [name or f"Unnamed: {i}" for i, name in enumerate(names)]
+    counts: Dict[str, int] = defaultdict(int)
+    for i, original in enumerate(columns):
+        name = original
+        count = counts[name]
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in columns else counts[name]
+        columns[i] = name
+        counts[name] = count + 1
+    return columns
 
 
 class CSVLoader:
     """Loads CSV files with consistent column normalization."""
 
-    def __init__(self):
+    def __init__(self, parser: str = "pandas"):
+        """
+        Args:
+            parser: "pandas" (types inferred by pandas' C parser) or "arrow"
+                (Arrow's multithreaded reader with planned column types)
+        """
+        if parser not in PARSERS:
+            raise ValueError(
+                f"Unknown CSV parser '{parser}' (choose from {', '.join(PARSERS)})"
+            )
+        self.parser = parser
         self.processing_notes: list[str] = []
 
     def load(self, file_path: Path, **kwargs: Any) -> tuple[pd.DataFrame, DatasetInfo]:
@@ -26,11 +81,101 @@ class CSVLoader:
 
         Args:
             file_path: Path to CSV file
-            **kwargs: Additional arguments for pandas.read_csv()
+            **kwargs: Additional arguments for pandas.read_csv() (other
+                than ``usecols``; pandas parser only)
 
         Returns:
             Tuple of (DataFrame, DatasetInfo)
         """
+        if kwargs and self.parser == "arrow":
+            raise ValueError("read_csv arguments need the pandas parser")
+        header = self._read_header(file_path, **kwargs)
+
+        try:
+            if self.parser == "arrow":
+                df = self._read_arrow(file_path, header)
+            else:
+                df = pd.read_csv(file_path, usecols=header.positions, **kwargs)
+                df.columns = header.columns
+        except Exception as e:
+            logger.error(f"Failed to load {file_path}: {e}")
+            raise
+        logger.info(f"Loaded {len(df)} rows, {len(header.original_columns)} columns")
+
+        dataset_info = self._dataset_info(file_path, header, len(df))
+        logger.info(f"Processed dataset: {dataset_info.dataset_type}")
+        logger.info(f"Final shape: {df.shape}")
+
+        return df, dataset_info
+
+    def stream(
+        self, file_path: Path, chunk_rows: int = DEFAULT_CHUNK_ROWS, **kwargs: Any
+    ) -> tuple[Iterator[pd.DataFrame], DatasetInfo]:
+        """
+        Read a CSV file in chunks with the same columns ``load`` gives.
+
+        The file is parsed as the chunks are consumed, ``chunk_rows`` rows
+        at a time, so memory doesn't grow with the file. Each chunk's index
+        continues from the previous one's. Column types are inferred per
+        chunk and can differ between chunks where ``load`` would widen them
+        (e.g. an integer column that is empty in one chunk is float there).
+
+        Args:
+            file_path: Path to CSV file
+            chunk_rows: Rows per chunk
+            **kwargs: Additional arguments for pandas.read_csv() (other
+                than ``usecols`` and ``chunksize``)
+
+        Returns:
+            Tuple of (iterator of DataFrames, DatasetInfo). The info's
+            ``row_count`` counts the rows read so far.
+        """
+        header = self._read_header(file_path, **kwargs)
+        dataset_info = self._dataset_info(file_path, header, 0)
+
+        def chunks() -> Iterator[pd.DataFrame]:
+            with pd.read_csv(
+                file_path, usecols=header.positions, chunksize=chunk_rows, **kwargs
+            ) as reader:
+                for chunk in reader:
+                    chunk.columns = header.columns
+                    dataset_info.row_count += len(chunk)
+                    yield chunk
+
+        return chunks(), dataset_info
+
+    def _read_arrow(self, file_path: Path, header: _Header) -> pd.DataFrame:
+        """Read the kept columns as text with Arrow and convert them."""
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pv
+
+            from .dtypes import NA_VALUES, convert_table
+        except ImportError as e:
+            raise ImportError(
+                "The arrow CSV parser requires pyarrow: "
+                "pip install 'bom-processing[parquet]'"
+            ) from e
+
+        # Positional names: DataScribe headers repeat is_missing/is_illegible
+        names = [str(i) for i in range(len(header.original_columns))]
+        kept = [names[position] for position in header.positions]
+        table = pv.read_csv(
+            file_path,
+            read_options=pv.ReadOptions(column_names=names, skip_rows=1),
+            parse_options=pv.ParseOptions(newlines_in_values=True),
+            convert_options=pv.ConvertOptions(
+                include_columns=kept,
+                column_types={name: pa.string() for name in kept},
+                null_values=NA_VALUES,
+                strings_can_be_null=True,
+                quoted_strings_can_be_null=True,
+            ),
+        )
+        return convert_table(table, header.columns)
+
+    def _read_header(self, file_path: Path, **kwargs: Any) -> _Header:
+        """Read, normalize and filter a file's header."""
         self.processing_notes = []
 
         if not file_path.exists():
@@ -38,47 +183,53 @@ class CSVLoader:
 
         logger.info(f"Loading CSV: {file_path.name}")
 
-        # Load raw CSV
         try:
-            df_raw = pd.read_csv(file_path, **kwargs)
-            logger.info(f"Loaded {len(df_raw)} rows, {len(df_raw.columns)} columns")
+            if kwargs:
+                original_columns = pd.read_csv(file_path, nrows=0, **kwargs)
+                original_columns = original_columns.columns.tolist()
+            else:
+                original_columns = _read_column_names(file_path)
         except Exception as e:
             logger.error(f"Failed to load {file_path}: {e}")
             raise
 
-        original_columns = df_raw.columns.tolist()
-
         # Normalize column names (but preserve data!)
-        df_normalized, column_mapping = normalize_dataframe_columns(df_raw)
+        normalized, _ = normalize_column_names(original_columns)
 
         # Filter out irrelevant columns
-        df_filtered = filter_relevant_columns(df_normalized)
+        positions = []
+        columns_skipped = []
+        for position, col in enumerate(normalized):
+            if should_skip_column(col):
+                columns_skipped.append(col)
+            else:
+                positions.append(position)
 
         # Track what we did
-        columns_removed = len(df_normalized.columns) - len(df_filtered.columns)
-        if columns_removed > 0:
+        if columns_skipped:
+            logger.info(f"Skipping columns: {columns_skipped}")
             self.processing_notes.append(
-                f"Removed {columns_removed} irrelevant columns"
+                f"Removed {len(columns_skipped)} irrelevant columns"
             )
 
-        # Get column information
-        column_info = get_column_info(df_filtered, column_mapping)
+        return _Header(
+            original_columns=original_columns,
+            positions=positions,
+            columns=[normalized[position] for position in positions],
+        )
 
-        # Create dataset info
-        dataset_info = DatasetInfo(
+    def _dataset_info(
+        self, file_path: Path, header: _Header, row_count: int
+    ) -> DatasetInfo:
+        return DatasetInfo(
             file_path=str(file_path),
             dataset_type=self._detect_dataset_type(file_path.name),
-            original_columns=original_columns,
-            normalized_columns=df_filtered.columns.tolist(),
-            row_count=len(df_filtered),
+            original_columns=header.original_columns,
+            normalized_columns=list(header.columns),
+            row_count=row_count,
             processing_notes=self.processing_notes.copy(),
         )
 
-        logger.info(f"Processed dataset: {dataset_info.dataset_type}")
-        logger.info(f"Final shape: {df_filtered.shape}")
-
-        return df_filtered, dataset_info
-
     def _detect_dataset_type(self, filename: str) -> str:
         """
         Detect dataset type from filename patterns.
@@ -89,23 +240,7 @@ class CSVLoader:
         Returns:
             Dataset type string
         """
-        import re
-
-        from ..config import DATASET_PATTERNS
-
-        filename_lower = filename.lower()
-
-        for dataset_type, pattern in DATASET_PATTERNS.items():
-            if re.search(pattern, filename_lower, re.IGNORECASE):
-                return dataset_type
-
-        # Fallback detection
-        if "cause" in filename_lower:
-            return "causes_unknown"
-        elif "parish" in filename_lower:
-            return "parishes_unknown"
-        else:
-            return "unknown"
+        return REGISTRY.get_dataset_type(filename)
 
     def load_multiple(
         self, file_paths: list[Path], **kwargs: Any
@@ -0,0 +1,169 @@
+"""Column types for the Arrow CSV parser.
+
+Every column is read as text by Arrow's multithreaded CSV reader and then
+converted according to its role:
+
+- ``is_missing``/``is_illegible`` flags become nullable ``boolean``
+- columns listed in ``config.COLUMN_TYPES`` take their listed type
+- every other column holds counts and becomes nullable ``Int64``, except
+  ``*_descriptive_text`` columns
+
+Text columns (``str``) and columns that can't take their planned type
+without losing values, such as a "count" column holding cause names or 9.5,
+get the type the pandas parser would infer. Processors then see the same
+values from either parser.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ..config import COLUMN_TYPES
+
+FLAG_COLUMN = re.compile(r"^is_(missing|illegible)(_\d+)?$")
+
+# Flag values the processors count as set (see BillsProcessor._is_flag_true)
+FLAG_TRUE = ["1", "true", "yes", "y"]
+
+# pandas' default na_values, so both parsers find the same missing cells
+NA_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
+_FLAG_TRUE = pa.array(FLAG_TRUE)
+
+# Arrow types of the converted columns and their pandas dtypes
+_PANDAS_TYPES = {pa.int64(): pd.Int64Dtype(), pa.bool_(): pd.BooleanDtype()}
+
+# pandas' default true_values and false_values
+_TRUE = {"True", "TRUE", "true"}
+_FALSE = {"False", "FALSE", "false"}
+
+
+def column_dtype(column: str) -> str:
+    """The planned dtype of a normalized column."""
+    if FLAG_COLUMN.match(column):
+        return "boolean"
+    if column in COLUMN_TYPES:
+        return COLUMN_TYPES[column]
+    if column.endswith("_descriptive_text"):
+        return "str"
+    return "Int64"
+
+
+def dtype_plan(columns: List[str]) -> Dict[str, str]:
+    """The planned dtype of each normalized column."""
+    return {column: column_dtype(column) for column in columns}
+
+
+def convert_table(table: pa.Table, columns: List[str]) -> pd.DataFrame:
+    """
+    Convert a table of text columns to a DataFrame following the plan.
+
+    Args:
+        table: Arrow table whose columns are all strings, in file order
+        columns: Normalized names of the table's columns
+
+    Returns:
+        DataFrame with the normalized column names
+    """
+    converters = {
+        "boolean": _to_flags,
+        "category": _to_category,
+        "Int64": _to_int,
+        "str": lambda array: None,
+    }
+    arrays = []
+    inferred = {}
+    for i, column in enumerate(columns):
+        array = table.column(i)
+        converted = converters[column_dtype(column)](array)
+        if converted is None:
+            inferred[column] = _infer(array)
+            converted = array
+        arrays.append(converted)
+
+    # One conversion for the whole table, then the inferred columns
+    df = pa.Table.from_arrays(arrays, names=columns).to_pandas(
+        types_mapper=_PANDAS_TYPES.get
+    )
+    for column, values in inferred.items():
+        df[column] = values
+    return df
+
+
+def _to_flags(array: pa.ChunkedArray) -> pa.Array:
+    missing = array.is_null().to_numpy(zero_copy_only=False)
+    if missing.all():
+        return pa.nulls(len(array), pa.bool_())
+    text = pc.utf8_lower(pc.utf8_trim_whitespace(array))
+    flags = pc.is_in(text, value_set=_FLAG_TRUE).to_numpy(zero_copy_only=False)
+    # Numeric flags count as set when equal to 1, as "1.0" does
+    other = ~flags & ~missing
+    if other.any():
+        values = text.to_numpy(zero_copy_only=False)[other]
+        flags[other] = pd.to_numeric(values, errors="coerce") == 1
+    return pa.array(flags, mask=missing)
+
+
+def _to_category(array: pa.ChunkedArray) -> Optional[pa.ChunkedArray]:
+    if array.null_count == len(array):
+        return None
+    return pc.dictionary_encode(array)
+
+
+def _to_int(array: pa.ChunkedArray) -> Optional[pa.ChunkedArray]:
+    try:
+        return pc.cast(array, pa.int64())
+    except pa.ArrowInvalid:
+        pass
+    # Padded or written as 2.0: whole numbers still become Int64
+    numbers = pd.Series(pd.to_numeric(_strings(array), errors="coerce"))
+    if numbers.notna().sum() == len(array) - array.null_count:
+        if (numbers.dropna() % 1 == 0).all():
+            return pa.array(numbers.astype("Int64"), type=pa.int64())
+    return None
+
+
+def _strings(array: pa.ChunkedArray) -> np.ndarray:
+    """Object array of str, with NaN for missing cells as pandas has."""
+    values = array.to_numpy(zero_copy_only=False)
+    values[array.is_null().to_numpy(zero_copy_only=False)] = np.nan
+    return values
+
+
+def _infer(array: pa.ChunkedArray):
+    """The column the pandas parser would infer from this text."""
+    values = pd.Series(_strings(array), dtype=object)
+    present = values.dropna()
+    if present.empty:
+        return np.full(len(values), np.nan)
+    if present.isin(_TRUE | _FALSE).all():
+        flags = values.map(lambda v: v in _TRUE if isinstance(v, str) else v)
+        return (flags.astype(bool) if len(present) == len(values) else flags).array
+    numbers = pd.to_numeric(values, errors="coerce")
+    if numbers.notna().sum() == len(present):
+        return numbers.to_numpy()
+    return values.to_numpy()
@@ -1,21 +1,90 @@
-"""Dataset registry for identifying and routing different dataset types."""
+"""Dataset registry for identifying and routing different dataset types.
+
+A file's dataset type is the first of ``config.DATASET_PATTERNS`` its name
+matches, else ``causes_unknown`` or ``parishes_unknown`` for names that
+mention causes or parishes, else ``unknown``. The patterns and fallbacks are
+compiled into one expression, so each name is matched once.
+
+Each type maps to the processors that consume it, named as their pipeline
+stages. The defaults follow the kind of data the type names (its causes,
+parishes, gender or foodstuffs part); ``register`` adds more. Stages take
+their datasets with ``select``, and files of a type no processor consumes
+are not loaded at all.
+"""
 
 import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Type
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from ..config import DATA_RAW_DIR, DATASET_PATTERNS
+
+UNKNOWN = "unknown"
+
+# Tried after DATASET_PATTERNS, for names none of them match
+FALLBACK_PATTERNS = {"causes_unknown": r"cause", "parishes_unknown": r"parish"}
+
+# Processors that consume each kind of dataset
+KIND_PROCESSORS = {
+    "causes": ("bills",),
+    "parishes": ("bills", "christenings_parish", "christenings"),
+    "gender": ("christenings_gender", "christenings"),
+    "foodstuffs": ("foodstuffs",),
+}
 
-from ..config import DATASET_PATTERNS
+# Types whose name doesn't say their kind
+TYPE_KINDS = {"bl_special": "parishes"}  # The other BL1877 parish bills
+
+
+@dataclass(frozen=True)
+class DatasetFile:
+    """A source file and its dataset type."""
+
+    path: Path
+    dataset_type: str
+
+
+def _kind(dataset_type: str) -> Optional[str]:
+    if dataset_type in TYPE_KINDS:
+        return TYPE_KINDS[dataset_type]
+    words = dataset_type.split("_")
+    return next((kind for kind in KIND_PROCESSORS if kind in words), None)
 
 
 class DatasetRegistry:
     """Registry for mapping dataset types to processors."""
 
-    def __init__(self):
-        self.processors: Dict[str, Type] = {}
+    def __init__(self, patterns: Optional[Mapping[str, str]] = None):
+        """
+        Args:
+            patterns: Dataset type -> file name regex, tried in order
+                (default ``config.DATASET_PATTERNS``)
+        """
+        patterns = {
+            **(DATASET_PATTERNS if patterns is None else patterns),
+            **FALLBACK_PATTERNS,
+        }
+        # Anchored alternatives are tried in order, each searching the name
+        self._matcher = re.compile(
+            "|".join(
+                f"(?P<{dataset_type}>.*?(?:{pattern}))"
+                for dataset_type, pattern in patterns.items()
+            ),
+            re.IGNORECASE,
+        )
+        self.processors: Dict[str, List[str]] = {
+            dataset_type: list(KIND_PROCESSORS.get(_kind(dataset_type), ()))
+            for dataset_type in [*patterns, UNKNOWN]
+        }
+        self.datasets: Dict[str, List[DatasetFile]] = {}
 
-    def register(self, dataset_type: str, processor_class: Type):
+    def register(self, dataset_type: str, processor: str):
         """Register a processor for a dataset type."""
-        self.processors[dataset_type] = processor_class
+        consumers = self.processors.setdefault(dataset_type, [])
+        if processor not in consumers:
+            consumers.append(processor)
 
     def get_dataset_type(self, filename: str) -> str:
         """
@@ -27,23 +96,54 @@ class DatasetRegistry:
         Returns:
             Dataset type string
         """
-        filename_lower = filename.lower()
-
-        for dataset_type, pattern in DATASET_PATTERNS.items():
-            if re.search(pattern, filename_lower, re.IGNORECASE):
-                return dataset_type
-
-        # Fallback detection
-        if "cause" in filename_lower:
-            return "causes_unknown"
-        elif "parish" in filename_lower:
-            return "parishes_unknown"
-        else:
-            return "unknown"
-
-    def get_processor(self, filename: str):
-        """Get appropriate processor for a file (placeholder for now)."""
-        dataset_type = self.get_dataset_type(filename)
-        # For now, just return the dataset type
-        # Later we'll return actual processor instances
-        return dataset_type
+        match = self._matcher.match(filename)
+        return match.lastgroup if match else UNKNOWN
+
+    def processors_for(self, dataset_type: str) -> Tuple[str, ...]:
+        """Processors that consume a dataset type (none for unknown types)."""
+        return tuple(self.processors.get(dataset_type, ()))
+
+    def kind(self, dataset_type: str) -> Optional[str]:
+        """The kind of data a type holds (see ``KIND_PROCESSORS``), if known."""
+        return _kind(dataset_type)
+
+    def get_processor(self, filename: str) -> Tuple[str, ...]:
+        """Processors that consume a file."""
+        return self.processors_for(self.get_dataset_type(filename))
+
+    def route(self, files: Iterable[Path]) -> Dict[str, List[DatasetFile]]:
+        """
+        Group files by dataset type, in the order given.
+
+        Files of a type no processor consumes are left out.
+        """
+        routed: Dict[str, List[DatasetFile]] = {}
+        for path in files:
+            path = Path(path)
+            dataset_type = self.get_dataset_type(path.name)
+            if self.processors_for(dataset_type):
+                routed.setdefault(dataset_type, []).append(
+                    DatasetFile(path, dataset_type)
+                )
+        return routed
+
+    def discover_datasets(
+        self, source_dir: Path = DATA_RAW_DIR
+    ) -> Dict[str, List[DatasetFile]]:
+        """Route the CSV files in a directory, keeping them in ``datasets``."""
+        self.datasets = self.route(sorted(Path(source_dir).glob("*.csv")))
+        return self.datasets
+
+    def select(
+        self, datasets: Iterable[Tuple[pd.DataFrame, str, str]], processor: str
+    ) -> List[Tuple[pd.DataFrame, str]]:
+        """The (df, name) of loaded datasets whose type ``processor`` consumes."""
+        return [
+            (df, name)
+            for df, name, dataset_type in datasets
+            if processor in self.processors_for(dataset_type)
+        ]
+
+
+# Routing used by the loader, filters and pipeline stages
+REGISTRY = DatasetRegistry()
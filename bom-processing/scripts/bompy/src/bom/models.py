@@ -198,9 +198,9 @@ class ParishRecord:
     id: int  # Primary key
     parish_name: str  # Must be unique
     canonical_name: str  # Required canonical name
-    bills_subunit: Optional[str] = (
-        None  # Bills subunit classification (e.g., "97 parishes within the walls")
-    )
+    bills_subunit: Optional[
+        str
+    ] = None  # Bills subunit classification (e.g., "97 parishes within the walls")
     foundation_year: Optional[str] = None  # Year the parish was founded
     notes: Optional[str] = None  # Notes from Wikipedia and other sources
 
@@ -276,18 +276,16 @@ class ProcessingResult:
 
     def to_dataframes(self) -> Dict[str, pd.DataFrame]:
         """Convert to pandas DataFrames matching PostgreSQL schema."""
+        from .contracts import build_table
+
         return {
-            "bill_of_mortality": pd.DataFrame([bill.to_dict() for bill in self.bills]),
-            "causes_of_death": pd.DataFrame([cause.to_dict() for cause in self.causes]),
-            "christenings": pd.DataFrame(
-                [christening.to_dict() for christening in self.christenings]
-            ),
-            "parishes": pd.DataFrame([parish.to_dict() for parish in self.parishes]),
-            "week": pd.DataFrame([week.to_dict() for week in self.weeks]),
-            "year": pd.DataFrame([year.to_dict() for year in self.years]),
-            "subtotals": pd.DataFrame(
-                [subtotal.to_dict() for subtotal in self.subtotals]
-            ),
+            "bill_of_mortality": build_table("bill_of_mortality", self.bills),
+            "causes_of_death": build_table("causes_of_death", self.causes),
+            "christenings": build_table("christenings", self.christenings),
+            "parishes": build_table("parishes", self.parishes),
+            "week": build_table("week", self.weeks),
+            "year": build_table("year", self.years),
+            "subtotals": build_table("subtotals", self.subtotals),
         }
 
 
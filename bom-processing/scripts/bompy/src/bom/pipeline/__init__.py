@@ -0,0 +1,56 @@
+"""Stage-based pipeline runner with on-disk memoization."""
+
+from .cache import (
+    RECORD_FORMATS,
+    CacheError,
+    StageCache,
+    fingerprint_source,
+    fingerprint_value,
+)
+from .checkpoints import Checkpoints
+from .dag import Pipeline, PipelineError, PipelineRun, Stage
+from .filters import (
+    DATASET_TYPES,
+    OUTPUT_TABLES,
+    FilterError,
+    RunFilter,
+    filter_years,
+    parse_year_range,
+)
+from .intermediates import read_intermediate
+from .runner import run_pipeline
+from .stages import (
+    STAGE_NAMES,
+    STREAMED_TABLES,
+    NoDatasetsError,
+    RunContext,
+    SourceFailuresError,
+    build_pipeline,
+)
+
+__all__ = [
+    "CacheError",
+    "Checkpoints",
+    "DATASET_TYPES",
+    "OUTPUT_TABLES",
+    "RECORD_FORMATS",
+    "STAGE_NAMES",
+    "STREAMED_TABLES",
+    "FilterError",
+    "NoDatasetsError",
+    "Pipeline",
+    "PipelineError",
+    "PipelineRun",
+    "RunContext",
+    "RunFilter",
+    "SourceFailuresError",
+    "Stage",
+    "StageCache",
+    "build_pipeline",
+    "filter_years",
+    "fingerprint_source",
+    "fingerprint_value",
+    "parse_year_range",
+    "read_intermediate",
+    "run_pipeline",
+]
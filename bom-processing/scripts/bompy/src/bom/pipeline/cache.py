@@ -0,0 +1,148 @@
+"""On-disk memo of stage results keyed by input fingerprint.
+
+A stage's fingerprint combines its name, the package source, its parameters
+and the fingerprints of its inputs. Inputs produced by another stage take
+that stage's fingerprint, so a whole run can be fingerprinted before any
+stage executes and an unchanged stage is never re-run just to find out that
+its result would be the same.
+"""
+
+import hashlib
+import os
+import pickle
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable
+
+COMPLETE_MARKER = "COMPLETE"
+RECORD_FORMATS = ("pickle", "arrow")
+
+
+class CacheError(Exception):
+    """Raised when a cache entry that should exist cannot be read."""
+
+
+def fingerprint_value(value: Any) -> str:
+    """
+    Fingerprint a root input or stage parameter.
+
+    Files are fingerprinted by path, size and modification time rather than
+    content, so large source CSVs are not read twice.
+    """
+    digest = hashlib.sha256()
+    _update(digest, value)
+    return digest.hexdigest()
+
+
+def _update(digest, value: Any) -> None:
+    if isinstance(value, Path):
+        digest.update(b"path:" + str(value.resolve()).encode())
+        if value.exists():
+            stat = value.stat()
+            digest.update(f":{stat.st_size}:{stat.st_mtime_ns}".encode())
+    elif isinstance(value, (list, tuple)):
+        digest.update(b"[")
+        for item in value:
+            _update(digest, item)
+            digest.update(b",")
+        digest.update(b"]")
+    elif isinstance(value, dict):
+        digest.update(b"{")
+        for key in sorted(value, key=str):
+            _update(digest, key)
+            digest.update(b":")
+            _update(digest, value[key])
+        digest.update(b"}")
+    else:
+        digest.update(repr(value).encode())
+
+
+def fingerprint_source(package_dir: Path) -> str:
+    """Fingerprint the Python source of a package, so code changes invalidate the cache."""
+    digest = hashlib.sha256()
+    for path in sorted(Path(package_dir).rglob("*.py")):
+        digest.update(str(path.relative_to(package_dir)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class StageCache:
+    """Pickled stage outputs under ``<cache_dir>/<stage>/<fingerprint>/``.
+
+    Each output is a separate file so a run loads only the artifacts it
+    needs. Only the latest result of each stage is kept. With
+    ``record_format="arrow"`` lists of model records are written as
+    memory-mappable Arrow IPC files instead (see ``intermediates``); entries
+    in either format are read back the same way.
+    """
+
+    def __init__(self, cache_dir: Path, record_format: str = "pickle"):
+        if record_format not in RECORD_FORMATS:
+            raise ValueError(
+                f"Unknown record format '{record_format}' "
+                f"(choose from {', '.join(RECORD_FORMATS)})"
+            )
+        self.cache_dir = Path(cache_dir)
+        self.record_format = record_format
+
+    def path(self, stage: str, fingerprint: str) -> Path:
+        return self.cache_dir / stage / fingerprint
+
+    def has(self, stage: str, fingerprint: str) -> bool:
+        return (self.path(stage, fingerprint) / COMPLETE_MARKER).exists()
+
+    def load(
+        self, stage: str, fingerprint: str, names: Iterable[str]
+    ) -> Dict[str, Any]:
+        """
+        Load some outputs of a cached stage.
+
+        Raises:
+            CacheError: If an entry is missing or cannot be unpickled
+        """
+        entry = self.path(stage, fingerprint)
+        outputs = {}
+        for name in names:
+            try:
+                if (entry / f"{name}.arrow").exists():
+                    from .intermediates import read_table, table_to_records
+
+                    outputs[name] = table_to_records(
+                        read_table(entry / f"{name}.arrow")
+                    )
+                    continue
+                with open(entry / f"{name}.pkl", "rb") as handle:
+                    outputs[name] = pickle.load(handle)
+            except Exception as e:
+                raise CacheError(
+                    f"Cannot read cached {stage}/{name} ({e}); "
+                    f"delete {self.cache_dir} or run without the cache"
+                ) from e
+        return outputs
+
+    def save(self, stage: str, fingerprint: str, outputs: Dict[str, Any]) -> Path:
+        """Write a stage's outputs atomically and drop its older entries."""
+        entry = self.path(stage, fingerprint)
+        tmp_entry = entry.with_name(entry.name + ".tmp")
+        if tmp_entry.exists():
+            shutil.rmtree(tmp_entry)
+        tmp_entry.mkdir(parents=True)
+        for name, value in outputs.items():
+            if self.record_format == "arrow":
+                from .intermediates import records_to_table, write_table
+
+                table = records_to_table(value)
+                if table is not None:
+                    write_table(table, tmp_entry / f"{name}.arrow")
+                    continue
+            with open(tmp_entry / f"{name}.pkl", "wb") as handle:
+                pickle.dump(value, handle, pickle.HIGHEST_PROTOCOL)
+        (tmp_entry / COMPLETE_MARKER).touch()
+
+        if entry.exists():
+            shutil.rmtree(entry)
+        os.replace(tmp_entry, entry)
+        for old in entry.parent.iterdir():
+            if old != entry:
+                shutil.rmtree(old, ignore_errors=True)
+        return entry
@@ -0,0 +1,157 @@
+"""Per-source checkpoints inside a stage, for resuming interrupted runs.
+
+The stage cache checkpoints whole stages: each finished stage is saved
+atomically under its fingerprint, and a later run loads it instead of
+running it again, so a run that fails in validation or writing only
+repeats the stages that had not finished. The bills stage, which takes most
+of a run, also checkpoints each source's result as it goes, under
+``<cache_dir>/checkpoints/bills/``. Each checkpoint is keyed by that source
+file (its path, size and modification time), the code, and the settings
+and other inputs the stage processes it with. Fixing one source therefore
+only invalidates that source's checkpoint, while a code change invalidates
+them all.
+
+A source that fails is recorded in ``failures.json`` there and skipped; the
+other sources are still processed and checkpointed, then the stage raises
+``SourceFailuresError``. ``--resume`` restores the checkpointed sources and
+processes only those that failed or were never reached. Without it an
+interrupted stage starts over. A run that finishes removes its checkpoints.
+"""
+
+import json
+import os
+import pickle
+import shutil
+from glob import escape as glob_escape
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from loguru import logger
+
+from .cache import fingerprint_value
+
+FAILURES_FILE = "failures.json"
+
+# Characters of a source's key in its checkpoint's file name
+KEY_LENGTH = 16
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+class SourceCheckpoints:
+    """Checkpointed per-source results of one stage.
+
+    Args:
+        directory: Where the checkpoints go
+        reuse: Keep the checkpoints an earlier attempt left; otherwise they
+            are removed and the stage starts over
+        keys: Source name -> key of what its result depends on; a
+            checkpoint saved under another key is not used
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        reuse: bool = False,
+        keys: Optional[Mapping[str, str]] = None,
+    ):
+        self.directory = Path(directory)
+        self.keys = keys or {}
+        if not reuse and self.directory.exists():
+            shutil.rmtree(self.directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, source: str) -> Path:
+        key = self.keys.get(source)
+        if key is None:
+            return self.directory / f"{source}.pkl"
+        return self.directory / f"{source}.{key[:KEY_LENGTH]}.pkl"
+
+    def _stale(self, source: str) -> Iterable[Path]:
+        """Checkpoints of ``source`` saved under other keys."""
+        current = self._path(source)
+        pattern = f"{glob_escape(source)}.{'?' * KEY_LENGTH}.pkl"
+        return [path for path in self.directory.glob(pattern) if path != current]
+
+    def __contains__(self, source: str) -> bool:
+        return self._path(source).exists()
+
+    def load(self, source: str) -> Any:
+        with open(self._path(source), "rb") as handle:
+            return pickle.load(handle)
+
+    def save(self, source: str, result: Any) -> None:
+        """Checkpoint a source's result, clearing any failure it had."""
+        _write_atomic(self._path(source), pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+        for stale in self._stale(source):
+            stale.unlink(missing_ok=True)
+        failures = self.failures()
+        if failures.pop(source, None) is not None:
+            self._write_failures(failures)
+
+    def record_failure(self, source: str, error: BaseException) -> None:
+        failures = self.failures()
+        failures[source] = f"{type(error).__name__}: {error}"
+        self._write_failures(failures)
+
+    def failures(self) -> Dict[str, str]:
+        """Source name -> error of the sources that failed."""
+        path = self.directory / FAILURES_FILE
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def _write_failures(self, failures: Dict[str, str]) -> None:
+        _write_atomic(
+            self.directory / FAILURES_FILE, json.dumps(failures, indent=2).encode()
+        )
+
+
+class Checkpoints:
+    """Per-source checkpoints of a run's stages, under ``<cache_dir>/checkpoints``.
+
+    Args:
+        directory: Root of the checkpoints
+        code: Fingerprint of the code (and engines) the run uses
+        sources: The run's source files
+        resume: Reuse what an interrupted run checkpointed for sources
+            whose keys are unchanged
+    """
+
+    def __init__(
+        self, directory: Path, code: str, sources: Iterable[Path], resume: bool
+    ):
+        self.directory = Path(directory)
+        self.code = code
+        self.sources = {Path(path).name: Path(path) for path in sources}
+        self.resume = resume
+
+    def stage(self, name: str, depends: Any = None) -> SourceCheckpoints:
+        """
+        The checkpoints of a stage.
+
+        Args:
+            name: Stage name
+            depends: Settings and inputs, other than the source itself, that
+                a source's result depends on
+        """
+        shared = fingerprint_value(
+            {"stage": name, "code": self.code, "depends": depends}
+        )
+        keys = {
+            source: fingerprint_value([shared, path])
+            for source, path in self.sources.items()
+        }
+        checkpoints = SourceCheckpoints(
+            self.directory / name, reuse=self.resume, keys=keys
+        )
+        restored = sum(source in checkpoints for source in keys)
+        if restored:
+            logger.info(f"Resuming {name}: {restored} source(s) checkpointed")
+        return checkpoints
+
+    def clear(self) -> None:
+        """Remove every checkpoint, once the run has finished."""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,314 @@
+"""A small DAG runner for pipeline stages.
+
+Stages declare the artifacts they read and produce; the graph and execution
+order follow from those names. Before anything runs, every stage is
+fingerprinted and the plan is worked out backwards from the selected stages:
+a stage whose result is cached for its fingerprint is loaded instead of run,
+and its own inputs are then not needed at all. Stages whose inputs are
+ready run concurrently on a thread pool, or one after another in the
+calling thread with ``workers=1``.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from loguru import logger
+
+from ..utils.sections import section
+from .cache import StageCache, fingerprint_value
+
+
+class PipelineError(Exception):
+    """Raised for invalid pipeline definitions, selections or stage results."""
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One named step of a pipeline.
+
+    Attributes:
+        name: Stage name, used on the command line and in the cache
+        func: Called as ``func(context, **inputs)``; returns a dict with
+            exactly the declared outputs
+        inputs: Artifacts the stage reads (outputs of other stages or root
+            inputs passed to ``Pipeline.run``)
+        outputs: Artifacts the stage produces
+        params: Attributes of the run context that affect the result
+        cache: Whether the result may be memoized; stages with side effects
+            (writing files) are never cached
+    """
+
+    name: str
+    func: Callable[..., Dict[str, Any]]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    params: Tuple[str, ...] = ()
+    cache: bool = True
+
+
+@dataclass
+class PipelineRun:
+    """Result of running a pipeline.
+
+    Attributes:
+        artifacts: Every artifact produced or loaded from the cache
+        ran: Stages that executed, in completion order
+        cached: Stages whose results were loaded from the cache
+        timings: Wall time in seconds of each executed stage
+    """
+
+    artifacts: Dict[str, Any] = field(default_factory=dict)
+    ran: List[str] = field(default_factory=list)
+    cached: List[str] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class Pipeline:
+    """A set of stages connected by the artifacts they read and produce."""
+
+    def __init__(self, stages: Sequence[Stage]):
+        self.stages: Dict[str, Stage] = {}
+        self.producers: Dict[str, str] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise PipelineError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+            for output in stage.outputs:
+                if output in self.producers:
+                    raise PipelineError(
+                        f"{output} is produced by both {self.producers[output]} "
+                        f"and {stage.name}"
+                    )
+                self.producers[output] = stage.name
+
+        self.upstream: Dict[str, Set[str]] = {
+            name: {self.producers[i] for i in stage.inputs if i in self.producers}
+            for name, stage in self.stages.items()
+        }
+        self.order = self._topological_order()
+
+    @property
+    def root_inputs(self) -> Set[str]:
+        """Inputs no stage produces; they must be passed to ``run``."""
+        return {
+            i
+            for stage in self.stages.values()
+            for i in stage.inputs
+            if i not in self.producers
+        }
+
+    def _topological_order(self) -> List[str]:
+        """Stage names with dependencies first, otherwise in declaration order."""
+        order: List[str] = []
+        done: Set[str] = set()
+        remaining = list(self.stages)
+        while remaining:
+            ready = [n for n in remaining if self.upstream[n] <= done]
+            if not ready:
+                raise PipelineError(f"Dependency cycle among stages: {remaining}")
+            order.extend(ready)
+            done.update(ready)
+            remaining = [n for n in remaining if n not in done]
+        return order
+
+    def downstream(self, name: str) -> Set[str]:
+        """All stages that depend, directly or not, on ``name``."""
+        result: Set[str] = set()
+        for other in self.order:
+            if self.upstream[other] & (result | {name}):
+                result.add(other)
+        return result
+
+    def upstream_of(self, name: str) -> Set[str]:
+        """All stages that ``name`` depends on, directly or not."""
+        result: Set[str] = set()
+        for other in reversed(self.order):
+            if other in self.upstream[name] or any(
+                other in self.upstream[r] for r in result
+            ):
+                result.add(other)
+        return result
+
+    def select(
+        self, only: Optional[Iterable[str]] = None, start: Optional[str] = None
+    ) -> List[str]:
+        """
+        Stages chosen by ``--only``/``--from``, in execution order.
+
+        Args:
+            only: Run just these stages
+            start: Run this stage and everything downstream of it
+
+        Returns:
+            Selected stage names (all stages when neither is given)
+        """
+        names = set(only or ())
+        if start is not None:
+            names |= {start} | self.downstream(start)
+        unknown = names - set(self.stages)
+        if unknown:
+            raise PipelineError(
+                f"Unknown stage(s): {sorted(unknown)}; choose from {self.order}"
+            )
+        if not names:
+            return list(self.order)
+        return [name for name in self.order if name in names]
+
+    def fingerprints(
+        self, context: Any, inputs: Dict[str, Any], code: str = ""
+    ) -> Dict[str, str]:
+        """Fingerprint every stage from its parameters and inputs."""
+        artifact_fps = {
+            name: fingerprint_value(value) for name, value in inputs.items()
+        }
+        stage_fps: Dict[str, str] = {}
+        for name in self.order:
+            stage = self.stages[name]
+            stage_fps[name] = fingerprint_value(
+                {
+                    "stage": name,
+                    "code": code,
+                    "params": {p: getattr(context, p) for p in stage.params},
+                    "inputs": {i: artifact_fps.get(i) for i in stage.inputs},
+                }
+            )
+            for output in stage.outputs:
+                artifact_fps[output] = fingerprint_value([stage_fps[name], output])
+        return stage_fps
+
+    def run(
+        self,
+        context: Any,
+        inputs: Dict[str, Any],
+        cache: Optional[StageCache] = None,
+        only: Optional[Iterable[str]] = None,
+        start: Optional[str] = None,
+        workers: int = 4,
+        code: str = "",
+        keep: Iterable[str] = (),
+    ) -> PipelineRun:
+        """
+        Run the selected stages, loading or running what they depend on.
+
+        Selected stages always run when ``only`` or ``start`` is given.
+        Otherwise, and for the stages they depend on, a cached result with
+        a matching fingerprint is loaded instead of running the stage.
+
+        Args:
+            context: Passed to every stage; ``Stage.params`` are read from it
+            inputs: Root inputs by name
+            cache: Stage cache, or None to run everything without memoizing
+            only: Run just these stages (see ``select``)
+            start: Run this stage and everything downstream of it
+            workers: Maximum number of stages running at once; with 1 they
+                run in the calling thread
+            code: Fingerprint of the code, part of every stage fingerprint
+            keep: Artifacts to load from the cache for the caller even if
+                no running stage reads them
+
+        Returns:
+            PipelineRun with the artifacts and what ran or was loaded
+        """
+        selected = self.select(only, start)
+        forced = set(selected) if (only or start is not None) else set()
+        stage_fps = self.fingerprints(context, inputs, code)
+        result = PipelineRun(artifacts=dict(inputs))
+
+        # Plan backwards: a stage loaded from the cache needs nothing upstream
+        needed = set(selected)
+        to_run: List[str] = []
+        cached: List[str] = []
+        for name in reversed(self.order):
+            if name not in needed:
+                continue
+            stage = self.stages[name]
+            if (
+                name not in forced
+                and stage.cache
+                and cache is not None
+                and cache.has(name, stage_fps[name])
+            ):
+                cached.append(name)
+                continue
+            to_run.append(name)
+            needed |= self.upstream[name]
+        to_run.reverse()
+
+        # Load only the cached artifacts that a running stage (or the caller) reads
+        wanted = set(keep) | {i for name in to_run for i in self.stages[name].inputs}
+        for name in reversed(cached):
+            outputs = [o for o in self.stages[name].outputs if o in wanted]
+            result.artifacts.update(cache.load(name, stage_fps[name], outputs))
+            result.cached.append(name)
+            logger.info(f"↺ Stage {name}: loaded {len(outputs)} output(s) from cache")
+
+        missing = {
+            i
+            for name in to_run
+            for i in self.stages[name].inputs
+            if i not in self.producers and i not in inputs
+        }
+        if missing:
+            raise PipelineError(f"Missing pipeline inputs: {sorted(missing)}")
+
+        def finish(name: str, outputs: Dict[str, Any], elapsed: float) -> None:
+            result.artifacts.update(outputs)
+            result.ran.append(name)
+            result.timings[name] = elapsed
+            if self.stages[name].cache and cache is not None:
+                cache.save(name, stage_fps[name], outputs)
+
+        if workers <= 1:
+            for name in to_run:
+                finish(name, *self._execute(name, context, result.artifacts))
+            return result
+
+        pending = {name: self.upstream[name] & set(to_run) for name in to_run}
+        running: Dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while pending or running:
+                for name in [n for n in self.order if n in pending]:
+                    if not pending[name] and len(running) < workers:
+                        del pending[name]
+                        future = executor.submit(
+                            self._execute, name, context, result.artifacts
+                        )
+                        running[future] = name
+
+                if not running:
+                    raise PipelineError(f"Stages cannot start: {sorted(pending)}")
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        outputs, elapsed = future.result()
+                    except BaseException:
+                        for other in running:
+                            other.cancel()
+                        raise
+                    finish(name, outputs, elapsed)
+                    for deps in pending.values():
+                        deps.discard(name)
+
+        return result
+
+    def _execute(
+        self, name: str, context: Any, artifacts: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], float]:
+        stage = self.stages[name]
+        logger.info(f"▶ Stage {name}")
+        start = time.perf_counter()
+        with section(name) as stage_section:
+            outputs = stage.func(context, **{i: artifacts[i] for i in stage.inputs})
+            outputs = stage_section.outputs = outputs or {}
+        elapsed = time.perf_counter() - start
+
+        if set(outputs) != set(stage.outputs):
+            raise PipelineError(
+                f"Stage {name} returned {sorted(outputs)}, "
+                f"expected {sorted(stage.outputs)}"
+            )
+        logger.info(f"✓ Stage {name} finished in {elapsed:.1f}s")
+        return outputs, elapsed
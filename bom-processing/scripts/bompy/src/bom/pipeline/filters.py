@@ -0,0 +1,178 @@
+"""Filters that restrict a run to some sources, tables or years.
+
+Filters are pushed down as far as they go: source and dataset type filters
+pick the files before anything is loaded, the year range drops rows as each
+file is loaded so no extractor or processor sees them, and the table filter
+prunes the pipeline to the stages those tables need.
+"""
+
+import re
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from ..config import DATASET_PATTERNS
+from ..loaders import REGISTRY
+from ..loaders.registry import FALLBACK_PATTERNS, UNKNOWN
+
+# Every type DatasetRegistry.get_dataset_type can return
+DATASET_TYPES = (*DATASET_PATTERNS, *FALLBACK_PATTERNS, UNKNOWN)
+
+# Output tables in the order they are written
+OUTPUT_TABLES = (
+    "parishes",
+    "weeks",
+    "years",
+    "all_bills",
+    "causes_of_death",
+    "subtotals",
+    "foodstuffs",
+    "christenings_by_gender",
+    "christenings_by_parish",
+    "christenings",
+)
+
+YearRange = Tuple[Optional[int], Optional[int]]
+
+_YEAR_RANGE = re.compile(r"^\s*(\d{4})?\s*(?:(-)\s*(\d{4})?)?\s*$")
+
+
+class FilterError(ValueError):
+    """Raised for filters that name unknown tables or types, or bad ranges."""
+
+
+def parse_year_range(text: str) -> YearRange:
+    """
+    Parse ``1665``, ``1665-1670``, ``1665-`` or ``-1670``.
+
+    Returns:
+        (first, last) inclusive, with None for an open end
+    """
+    match = _YEAR_RANGE.match(text)
+    if not match or not (match.group(1) or match.group(3)):
+        raise FilterError(f"Invalid year range {text!r}; use e.g. 1665 or 1665-1670")
+    first = int(match.group(1)) if match.group(1) else None
+    if match.group(2):
+        last = int(match.group(3)) if match.group(3) else None
+    else:
+        last = first
+    if first is not None and last is not None and first > last:
+        raise FilterError(f"Invalid year range {text!r}: {first} is after {last}")
+    return first, last
+
+
+def filter_years(df: pd.DataFrame, years: Optional[YearRange]) -> pd.DataFrame:
+    """
+    Keep the rows of a source DataFrame that fall in a year range.
+
+    Weekly bills are matched on ``year``; general bills, which only have
+    ``start_year``/``end_year``, are kept when their span overlaps the
+    range. Rows without any year, and frames without year columns, are
+    kept as they are.
+    """
+    if years is None or years == (None, None):
+        return df
+    first, last = years
+
+    if "year" in df.columns:
+        start = end = pd.to_numeric(df["year"], errors="coerce")
+    elif "start_year" in df.columns or "end_year" in df.columns:
+        start = pd.to_numeric(df.get("start_year", df.get("end_year")), errors="coerce")
+        end = pd.to_numeric(df.get("end_year", df.get("start_year")), errors="coerce")
+    else:
+        return df
+
+    keep = start.isna() & end.isna()
+    in_range = pd.Series(True, index=df.index)
+    if first is not None:
+        in_range &= end.fillna(start) >= first
+    if last is not None:
+        in_range &= start.fillna(end) <= last
+    keep |= in_range
+    if keep.all():
+        return df
+    return df[keep.to_numpy()]
+
+
+@dataclass(frozen=True)
+class RunFilter:
+    """What a run is restricted to; empty fields mean no restriction.
+
+    Attributes:
+        sources: Glob patterns matched against source file names
+        dataset_types: Glob patterns matched against dataset types
+            (see ``DATASET_TYPES``)
+        tables: Output tables to produce (see ``OUTPUT_TABLES``)
+        years: Inclusive (first, last) year range, either end may be None
+    """
+
+    sources: Tuple[str, ...] = ()
+    dataset_types: Tuple[str, ...] = ()
+    tables: Tuple[str, ...] = ()
+    years: Optional[YearRange] = None
+
+    def __post_init__(self):
+        unknown = [t for t in self.tables if t not in OUTPUT_TABLES]
+        if unknown:
+            raise FilterError(
+                f"Unknown table(s): {unknown}; choose from {list(OUTPUT_TABLES)}"
+            )
+        unmatched = [
+            pattern
+            for pattern in self.dataset_types
+            if not any(fnmatch(t, pattern) for t in DATASET_TYPES)
+        ]
+        if unmatched:
+            raise FilterError(
+                f"Unknown dataset type(s): {unmatched}; "
+                f"choose from {list(DATASET_TYPES)}"
+            )
+
+    @property
+    def active(self) -> bool:
+        """Whether the filter restricts the run at all."""
+        return bool(
+            self.sources
+            or self.dataset_types
+            or self.tables
+            or (self.years is not None and self.years != (None, None))
+        )
+
+    @property
+    def output_tables(self) -> Tuple[str, ...]:
+        """Selected tables in output order (all of them when unrestricted)."""
+        if not self.tables:
+            return OUTPUT_TABLES
+        return tuple(t for t in OUTPUT_TABLES if t in self.tables)
+
+    def select_files(self, files: Iterable[Path]) -> List[Path]:
+        """Source files whose name and dataset type match the filter."""
+        selected = []
+        for path in files:
+            if self.sources and not any(
+                fnmatch(path.name.lower(), pattern.lower()) for pattern in self.sources
+            ):
+                continue
+            if self.dataset_types:
+                dataset_type = REGISTRY.get_dataset_type(path.name)
+                if not any(fnmatch(dataset_type, p) for p in self.dataset_types):
+                    continue
+            selected.append(path)
+        return selected
+
+    def describe(self) -> str:
+        """One-line summary for the run log."""
+        parts = []
+        if self.sources:
+            parts.append(f"sources {', '.join(self.sources)}")
+        if self.dataset_types:
+            parts.append(f"types {', '.join(self.dataset_types)}")
+        if self.tables:
+            parts.append(f"tables {', '.join(self.output_tables)}")
+        if self.years is not None and self.years != (None, None):
+            first, last = self.years
+            parts.append(f"years {first or ''}-{last or ''}")
+        return "; ".join(parts) or "none"
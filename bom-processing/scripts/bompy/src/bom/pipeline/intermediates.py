@@ -0,0 +1,197 @@
+"""Stage outputs stored as memory-mapped Arrow IPC files.
+
+With ``StageCache(cache_dir, record_format="arrow")`` (``bompy run
+--cache-format arrow``) every output that is a list of model records, such
+as extracted parishes and weeks, bill, cause and subtotal records and the
+validated tables, is written to the cache entry as ``<artifact>.arrow``.
+These are Arrow IPC (Feather v2) files, one column per record field and
+uncompressed, so they can be memory-mapped. Label fields (source, joinid,
+month names, ...) are dictionary-encoded with the dictionaries shared by every
+table of the run, and counts are stored as int32 where they fit (see
+``bom.utils.dictionaries``). Other outputs are pickled as before.
+
+Stages that load such an output get the records back as they were, with
+one string object per distinct label rather than one per record.
+``read_intermediate`` gives downstream tools (``analyze_subtotal_arithmetic.py
+--format cache``) the latest run's records as a DataFrame without
+re-deriving them from the source CSVs. The file is memory-mapped, so
+numeric columns without nulls are not copied and only the columns asked
+for are read; label columns come back as categoricals.
+
+A list is kept as a pickle when its records are not all of one dataclass
+type, or when a field holds values of more than one type (say int and
+float), which Arrow would coerce. Every value must come back as it went in.
+
+pyarrow is an optional dependency (``pip install bom-processing[parquet]``)
+and is only imported when the Arrow format is used.
+"""
+
+import dataclasses
+import importlib
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+import pandas as pd
+
+from ..utils.dictionaries import COUNT_FIELDS, DICTIONARIES, DICTIONARY_FIELDS
+from .cache import COMPLETE_MARKER
+
+RECORD_TYPE_KEY = b"bom.record_type"
+
+# Field values Arrow holds without changing their type
+_PLAIN_TYPES = {int, float, str, bool, type(None)}
+
+
+def _import_pyarrow():
+    """Import pyarrow, raising a helpful error when it is not installed."""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError(
+            "Arrow intermediates require pyarrow: "
+            "pip install 'bom-processing[parquet]'"
+        ) from e
+    return pa
+
+
+def records_to_table(value: Any):
+    """
+    A list of records as an Arrow table, or None if it cannot round-trip.
+
+    Args:
+        value: A stage output
+
+    Returns:
+        A pyarrow Table with one column per dataclass field, or None
+    """
+    if not isinstance(value, list) or not value:
+        return None
+    record_type = type(value[0])
+    if not dataclasses.is_dataclass(record_type) or not all(
+        type(record) is record_type for record in value
+    ):
+        return None
+    fields = dataclasses.fields(record_type)
+    if not all(field.init for field in fields):
+        return None
+
+    pa = _import_pyarrow()
+    arrays = []
+    for field in fields:
+        column = [getattr(record, field.name) for record in value]
+        types = set(map(type, column))
+        if not types <= _PLAIN_TYPES or len(types - {type(None)}) > 1:
+            return None
+        arrays.append(_column_array(pa, field.name, column, types))
+    name = f"{record_type.__module__}:{record_type.__qualname__}"
+    return pa.table(
+        arrays,
+        names=[field.name for field in fields],
+        metadata={RECORD_TYPE_KEY: name.encode()},
+    )
+
+
+def _column_array(pa, name: str, column: List[Any], types: set):
+    """One field's values as an Arrow array, in its compact form."""
+    if name in DICTIONARY_FIELDS and types <= {str, type(None)}:
+        codes, categories = DICTIONARIES.get(name).encode(column)
+        return pa.DictionaryArray.from_arrays(
+            pa.array(codes, mask=codes < 0), pa.array(categories, pa.string())
+        )
+    if name in COUNT_FIELDS and types <= {int, type(None)}:
+        try:
+            return pa.array(column, pa.int32())
+        except (pa.ArrowInvalid, OverflowError):
+            pass
+    return pa.array(column)
+
+
+def _column_values(column) -> List[Any]:
+    """A column's values; labels repeat one object per distinct value."""
+    pa = _import_pyarrow()
+    if not pa.types.is_dictionary(column.type):
+        return column.to_pylist()
+    values = []
+    for chunk in column.chunks:
+        labels = chunk.dictionary.to_pylist() + [None]
+        indices = chunk.indices.fill_null(len(labels) - 1)
+        values.extend(map(labels.__getitem__, indices.to_numpy()))
+    return values
+
+
+def table_to_records(table) -> List[Any]:
+    """The records ``records_to_table`` stored, rebuilt from their columns."""
+    module, _, qualname = table.schema.metadata[RECORD_TYPE_KEY].decode().partition(":")
+    record_type = importlib.import_module(module)
+    for part in qualname.split("."):
+        record_type = getattr(record_type, part)
+    columns = [_column_values(table.column(name)) for name in table.column_names]
+    return list(map(record_type, *columns))
+
+
+def write_table(table, path: Path) -> None:
+    """Write a table as an uncompressed Arrow IPC file."""
+    pa = _import_pyarrow()
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def read_table(path: Path, columns: Optional[Sequence[str]] = None):
+    """Memory-map an Arrow IPC file; the table's buffers point into the map."""
+    pa = _import_pyarrow()
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    return table.select(list(columns)) if columns is not None else table
+
+
+def find_intermediate(cache_dir: Path, stage: str, artifact: str) -> Optional[Path]:
+    """The Arrow file of an output in a stage's latest complete cache entry."""
+    for entry in sorted(Path(cache_dir, stage).glob("*")):
+        path = entry / f"{artifact}.arrow"
+        if (entry / COMPLETE_MARKER).exists() and path.exists():
+            return path
+    return None
+
+
+def read_intermediate(
+    cache_dir: Path,
+    stage: str,
+    artifact: str,
+    columns: Optional[Sequence[str]] = None,
+    categorical: bool = True,
+) -> pd.DataFrame:
+    """
+    Read a stage output from an Arrow-format cache as a DataFrame.
+
+    Args:
+        cache_dir: The run's ``--cache-dir``
+        stage: Stage that produced the output, e.g. "bills"
+        artifact: Output name, e.g. "subtotal_records"
+        columns: Record fields to read (default all)
+        categorical: Keep dictionary-encoded label columns as categoricals
+
+    Returns:
+        One row per record
+
+    Raises:
+        FileNotFoundError: If no run stored the output in the Arrow format
+    """
+    path = find_intermediate(cache_dir, stage, artifact)
+    if path is None:
+        raise FileNotFoundError(
+            f"No {stage}/{artifact}.arrow under {cache_dir}; "
+            "run the pipeline with --cache-format arrow"
+        )
+    table = read_table(path, columns)
+    if not categorical:
+        pa = _import_pyarrow()
+        table = pa.table(
+            [
+                col.cast(col.type.value_type)
+                if pa.types.is_dictionary(col.type)
+                else col
+                for col in table.columns
+            ],
+            names=table.column_names,
+        )
+    return table.to_pandas()
@@ -0,0 +1,266 @@
+"""Run the processing pipeline over a directory of source CSVs."""
+
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from loguru import logger
+
+from ..processors import engines as processor_engines
+from ..utils import metrics
+from ..utils.diagnostics import DiagnosticsCollector
+from ..utils.dictionaries import DICTIONARIES
+from ..utils.logging import log_processing_summary
+from ..utils.memory import MemoryTracker
+from ..utils.profiling import Profiler
+from ..writers import AnalyticsDatabase, open_table_sink
+from .cache import StageCache, fingerprint_source, fingerprint_value
+from .checkpoints import Checkpoints
+from .dag import PipelineRun
+from .filters import RunFilter
+from .stages import (
+    STREAMED_TABLES,
+    NoDatasetsError,
+    RunContext,
+    SourceFailuresError,
+    build_pipeline,
+)
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+STAGE_SECONDS = metrics.timer("bom_stage_seconds", "Wall time of each stage run")
+
+
+def run_pipeline(
+    source_dir: Path,
+    output_dir: Path,
+    output_format: str = "csv",
+    stream: bool = False,
+    database_path: Optional[Path] = None,
+    delta: bool = False,
+    run_filter: Optional[RunFilter] = None,
+    only: Optional[Iterable[str]] = None,
+    start: Optional[str] = None,
+    cache_dir: Optional[Path] = None,
+    workers: int = 4,
+    enable_dedup: bool = True,
+    enforce_contracts: bool = False,
+    dictionary_path: Optional[Path] = None,
+    edited_causes_path: Optional[Path] = None,
+    profile_dir: Optional[Path] = None,
+    memory_path: Optional[Path] = None,
+    metrics_path: Optional[Path] = None,
+    engines: Optional[Dict[str, str]] = None,
+    csv_parser: str = "pandas",
+    prefetch: int = 0,
+    cache_format: str = "pickle",
+    resume: bool = False,
+) -> Optional[PipelineRun]:
+    """
+    Process the source CSVs in ``source_dir`` and write the output tables.
+
+    Args:
+        source_dir: Directory of DataScribe source CSVs
+        output_dir: Directory for the outputs (created if missing)
+        output_format: "csv", "parquet" or "both"
+        stream: Write bills, causes and subtotals through streaming sinks
+        database_path: Also export the tables to this SQLite/DuckDB file
+        delta: Also write insert/update/delete files under output_dir/delta
+        run_filter: Restrict the run to some sources, tables or years
+        only: Run just these stages, loading their inputs from the cache
+        start: Run this stage and every stage downstream of it
+        cache_dir: Where stage results are memoized (None to disable)
+        workers: Maximum number of independent stages run concurrently
+        enable_dedup: Remove same-source duplicate bills and causes
+        enforce_contracts: Drop rows that violate their table contract
+        dictionary_path: Cause definitions (optional)
+        edited_causes_path: Edited cause names (optional)
+        profile_dir: Profile every stage and per-source processor call and
+            write pstats and collapsed-stack files here; stages then run
+            one at a time
+        memory_path: Track peak and retained memory per stage and source,
+            and the size of each stage's artifacts, and write them to this
+            JSON file; stages then run one at a time
+        metrics_path: Write the run's counters and timers to this path plus
+            ``.prom`` (Prometheus text) and append them to it plus ``.jsonl``
+        engines: Processor engine to use per path instead of the legacy one,
+            e.g. ``{"parish": "vectorized"}`` (see ``bom.processors.engines``)
+        csv_parser: "pandas", or "arrow" for Arrow's multithreaded CSV
+            reader with planned column types (see ``bom.loaders.dtypes``)
+        prefetch: Pipelined run: stages load the sources as they process
+            them, at most this many frames at a time, instead of holding
+            every source in memory (see ``bom.pipeline.sources``)
+        cache_format: "pickle", or "arrow" to cache record lists as
+            memory-mapped Arrow IPC files that tools can read with
+            ``read_intermediate`` (see ``bom.pipeline.intermediates``)
+        resume: Continue an interrupted run: besides the finished stages,
+            which the cache supplies anyway, reuse the sources a stage had
+            checkpointed (see ``bom.pipeline.checkpoints``)
+
+    Returns:
+        The PipelineRun, or None if no source files were found or loaded, or
+        if some sources failed
+    """
+    start_time = time.time()
+    run_filter = run_filter or RunFilter()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Find the CSV files, keeping only those the filter selects
+    csv_files = list(Path(source_dir).glob("*.csv"))
+    logger.info(f"Found {len(csv_files)} CSV files to process")
+    if run_filter.active:
+        csv_files = run_filter.select_files(csv_files)
+        logger.info(f"Filter ({run_filter.describe()}): {len(csv_files)} files")
+
+    if not csv_files:
+        logger.error(f"No CSV files to process in {source_dir}")
+        return None
+
+    tables = run_filter.output_tables
+    ctx = RunContext(
+        output_dir=output_dir,
+        output_format=output_format,
+        stream=stream,
+        database_path=database_path,
+        delta=delta,
+        enable_dedup=enable_dedup,
+        enforce_contracts=enforce_contracts,
+        dictionary_path=dictionary_path,
+        edited_causes_path=edited_causes_path,
+        tables=tables,
+        years=run_filter.years,
+        csv_parser=csv_parser,
+        prefetch=prefetch,
+    )
+    pipeline = build_pipeline(stream=stream, tables=tables)
+    selected = pipeline.select(only, start)
+    logger.info(f"Stages: {', '.join(selected)}")
+    if engines:
+        logger.info(
+            "Engines: " + ", ".join(f"{path}={name}" for path, name in engines.items())
+        )
+    if prefetch:
+        logger.info(f"Pipelined: stages load sources at most {prefetch} at a time")
+
+    cache = StageCache(cache_dir, cache_format) if cache_dir else None
+    # The engines this run uses, which ``use(engines)`` only enables below
+    run_engines = {**processor_engines.enabled(), **(engines or {})}
+    code = fingerprint_value((fingerprint_source(PACKAGE_DIR), run_engines))
+    inputs = {"source_files": csv_files}
+    if cache is not None:
+        stage_fps = pipeline.fingerprints(ctx, inputs, code)
+        ctx.checkpoints = Checkpoints(
+            Path(cache_dir) / "checkpoints", code, csv_files, resume
+        )
+        if resume:
+            done = [name for name in selected if cache.has(name, stage_fps[name])]
+            left = [name for name in selected if name not in done]
+            if left:
+                logger.info(
+                    f"Resuming at {left[0]}"
+                    + (f" ({', '.join(done)} already done)" if done else "")
+                )
+    elif resume:
+        logger.warning("Nothing to resume from with the stage cache disabled")
+
+    # The database is finished by the write stage; streaming sinks are fed
+    # by the bills stage and closed by the write stage
+    if database_path and "write" in selected:
+        ctx.database = AnalyticsDatabase(database_path)
+    if stream:
+        ctx.sinks = {
+            table_name: open_table_sink(
+                table_name,
+                output_format,
+                output_dir,
+                ctx.parquet_dir,
+                enforce=enforce_contracts,
+                database=ctx.database,
+            )
+            for table_name in STREAMED_TABLES
+            if table_name in tables
+        }
+
+    profiler = Profiler(profile_dir) if profile_dir is not None else None
+    memory = MemoryTracker() if memory_path is not None else None
+    if (profiler or memory) and workers > 1:
+        logger.info("Profiling: running stages one at a time")
+        workers = 1
+
+    metrics.REGISTRY.reset()
+    DICTIONARIES.reset()
+    diagnostics = DiagnosticsCollector()
+    try:
+        with ExitStack() as instruments:
+            for instrument in (memory, profiler, diagnostics):
+                if instrument is not None:
+                    instruments.enter_context(instrument)
+            instruments.enter_context(processor_engines.use(engines or {}))
+            run = pipeline.run(
+                ctx,
+                inputs,
+                cache=cache,
+                only=only,
+                start=start,
+                workers=workers,
+                code=code,
+                keep=["source_loads"],
+            )
+    except NoDatasetsError as e:
+        logger.error(str(e))
+        return None
+    except SourceFailuresError as e:
+        logger.error(str(e))
+        return None
+    if ctx.checkpoints is not None:
+        ctx.checkpoints.clear()
+
+    for name, elapsed in run.timings.items():
+        logger.info(f"   • {name}: {elapsed:.1f}s")
+        STAGE_SECONDS.observe(elapsed, stage=name)
+    if run.cached:
+        logger.info(f"Loaded from cache: {', '.join(run.cached)}")
+    diagnostics.log_summary()
+    if profiler is not None:
+        profiler.write()
+        profiler.log_summary()
+    if memory is not None:
+        memory.write(memory_path)
+        memory.log_summary()
+        logger.info(f"Memory report written to {memory_path}")
+    if metrics_path is not None:
+        metrics.REGISTRY.write(
+            metrics_path,
+            stages=run.ran,
+            cached=run.cached,
+            filter=run_filter.describe(),
+        )
+        logger.info(f"Metrics written to {metrics_path}.prom and .jsonl")
+
+    if "output_files" not in run.artifacts:
+        logger.success(f"🎉 Finished stages: {', '.join(run.ran)}")
+        return run
+
+    # Generate comprehensive summary report
+    processing_time = time.time() - start_time
+    log_processing_summary(
+        input_files=len(csv_files),
+        input_rows=run.artifacts["source_loads"].input_rows,
+        output_records=run.artifacts["record_counts"],
+        processing_time=processing_time,
+        errors=run.artifacts["error_count"],
+    )
+
+    logger.info("📁 Output Files:")
+    for file_path in run.artifacts["output_files"]:
+        if file_path.is_dir():
+            size_bytes = sum(f.stat().st_size for f in file_path.rglob("*.parquet"))
+        else:
+            size_bytes = file_path.stat().st_size
+        file_size = size_bytes / (1024 * 1024)  # MB
+        logger.info(f"   • {file_path} ({file_size:.1f} MB)")
+
+    logger.success("🎉 Processing pipeline completed successfully!")
+    return run
@@ -0,0 +1,217 @@
+"""Source datasets loaded as each stage uses them, for pipelined runs.
+
+With ``RunContext.prefetch`` set (``bompy run --prefetch K``), the load
+stage only routes the source files; it reads none of them. Each stage that
+reads the datasets loads them as it iterates them, on a loader thread that
+stays at most K frames ahead (see ``utils.prefetch``). Loading the next
+source overlaps processing of the current one, and no stage holds more
+than K frames, at the cost of reading each source once per stage that uses
+it. Rows and load errors are counted in ``SourceLoads`` the first time each
+source is loaded; a source that fails is skipped by every later stage.
+"""
+
+import threading
+from contextlib import closing
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+import pandas as pd
+from loguru import logger
+
+from ..loaders import REGISTRY, CSVLoader
+from ..utils.logging import log_data_quality_metrics
+from ..utils.prefetch import prefetch
+from .dag import PipelineError
+from .filters import YearRange, filter_years
+
+Dataset = Tuple[pd.DataFrame, str, str]
+
+# Sources whose data quality metrics are logged, in load order
+QUALITY_LOGGED = 3
+
+
+class NoDatasetsError(PipelineError):
+    """Raised when none of the source files could be loaded."""
+
+
+@dataclass
+class SourceLoads:
+    """Rows and failures of the sources loaded so far, each counted once.
+
+    Attributes:
+        sources: Number of source files in the run
+        rows: Rows kept (after the year filter) per loaded source
+        errors: Error message per source that failed to load
+    """
+
+    sources: int = 0
+    rows: Dict[str, int] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    @property
+    def input_rows(self) -> int:
+        return sum(self.rows.values())
+
+    @property
+    def load_errors(self) -> int:
+        return len(self.errors)
+
+    def loaded(
+        self, name: str, dataset_type: str, loaded_rows: int, df: pd.DataFrame
+    ) -> None:
+        """Count a source's rows and log it, the first time it is loaded."""
+        with self._lock:
+            if name in self.rows:
+                return
+            self.rows[name] = len(df)
+            first_few = len(self.rows) <= QUALITY_LOGGED
+
+        if len(df) < loaded_rows:
+            logger.info(
+                f"Kept {len(df):,} of {loaded_rows:,} rows of {name} "
+                "in the year range"
+            )
+        logger.info(f"✓ Loaded {dataset_type}: {df.shape} from {name}")
+        if first_few:
+            log_data_quality_metrics(
+                dataset_name=name,
+                shape=df.shape,
+                null_counts=df.isnull().sum().to_dict(),
+                unique_counts={col: df[col].nunique() for col in df.columns[:5]},
+                data_types=df.dtypes.to_dict(),
+            )
+
+    def failed(self, name: str, error: Exception) -> None:
+        """Record a source that failed to load."""
+        with self._lock:
+            if name in self.errors:
+                return
+            self.errors[name] = str(error)
+        logger.error(f"✗ Failed to load {name}: {error}")
+
+    @property
+    def all_failed(self) -> bool:
+        return bool(self.sources) and len(self.errors) == self.sources
+
+
+@dataclass(frozen=True)
+class PipelinedDatasets:
+    """Source files iterated as (df, name, dataset_type), loaded on demand.
+
+    Sources that failed to load are left out. The views ``routed``,
+    ``ordered`` and ``excluding`` make share ``loads`` with the datasets
+    they came from.
+
+    Attributes:
+        sources: (path, dataset_type) of each source, in load order
+        parser: CSVLoader parser
+        years: Year range rows are filtered to, as in the load stage
+        depth: Most frames loaded at once while iterating
+        loads: Rows and failures of the sources loaded so far
+    """
+
+    sources: Tuple[Tuple[Path, str], ...]
+    parser: str = "pandas"
+    years: Optional[YearRange] = None
+    depth: int = 2
+    loads: SourceLoads = field(default_factory=SourceLoads, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def __iter__(self) -> Iterator[Dataset]:
+        sources = [s for s in self.sources if s[0].name not in self.loads.errors]
+        with closing(prefetch(self._load, sources, self.depth)) as datasets:
+            for dataset in datasets:
+                if dataset is not None:
+                    yield dataset
+        if self.loads.all_failed:
+            raise NoDatasetsError("No datasets loaded successfully")
+
+    def _load(self, source: Tuple[Path, str]) -> Optional[Dataset]:
+        path, dataset_type = source
+        try:
+            df, _ = CSVLoader(self.parser).load(path)
+            loaded_rows = len(df)
+            df = filter_years(df, self.years)
+        except Exception as e:
+            self.loads.failed(path.name, e)
+            return None
+        self.loads.loaded(path.name, dataset_type, loaded_rows, df)
+        return df, path.name, dataset_type
+
+    def names(self) -> List[str]:
+        """File names of the sources, in order."""
+        return [path.name for path, _ in self.sources]
+
+    def routed(self, processor: str) -> "PipelinedDatasets":
+        """The datasets whose type ``processor`` consumes."""
+        return replace(
+            self,
+            sources=tuple(
+                source
+                for source in self.sources
+                if processor in REGISTRY.processors_for(source[1])
+            ),
+        )
+
+    def ordered(self, key: Callable[[str], Any]) -> "PipelinedDatasets":
+        """The datasets sorted by ``key`` of their file names."""
+        return replace(
+            self, sources=tuple(sorted(self.sources, key=lambda s: key(s[0].name)))
+        )
+
+    def excluding(self, names: AbstractSet[str]) -> "PipelinedDatasets":
+        """The datasets except the files called ``names``."""
+        return replace(
+            self,
+            sources=tuple(
+                source for source in self.sources if source[0].name not in names
+            ),
+        )
+
+    def by_name(self) -> "DatasetFrames":
+        """The datasets as a name -> DataFrame mapping, still loaded on demand."""
+        return DatasetFrames(self)
+
+
+class DatasetFrames(Mapping):
+    """Name -> DataFrame of pipelined datasets.
+
+    ``items()`` loads the frames in order, prefetching, which is how the
+    processors' ``process_datasets`` reads them; looking up one name loads
+    just that file.
+    """
+
+    def __init__(self, datasets: PipelinedDatasets):
+        self._datasets = datasets
+        self._sources = {path.name: (path, kind) for path, kind in datasets.sources}
+
+    def __getitem__(self, name: str) -> pd.DataFrame:
+        dataset = self._datasets._load(self._sources[name])
+        if dataset is None:
+            raise KeyError(name)
+        return dataset[0]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sources)
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def items(self) -> Iterator[Tuple[str, pd.DataFrame]]:
+        return ((name, df) for df, name, _ in self._datasets)
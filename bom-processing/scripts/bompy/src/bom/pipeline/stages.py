@@ -0,0 +1,882 @@
+"""The Bills of Mortality processing pipeline as a DAG of stages.
+
+    load ─┬─ entities ─┬─ bills ─┬─ calendar ── christenings_parish ─┐
+          │            │         ├─ validate_bills ───────────────────┤
+          │            │         └─ validate_causes ──────────────────┤
+          ├─ foodstuffs ──────────────────────────────────────────────┤
+          ├─ christenings_gender ─────────────────────────────────────┼─ write
+          └─ christenings ────────────────────────────────────────────┘
+
+With ``stream=True`` the bills and validate stages are replaced by a
+single ``bills`` stage that validates, deduplicates and writes bills,
+causes and subtotals through streaming sinks as each source is processed.
+When only some output tables are wanted, the write stage reads just their
+records and the stages nothing else needs are left out.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import pandas as pd
+from loguru import logger
+
+from ..contracts import build_table, check_tables
+from ..extractors import ParishExtractor, WeekExtractor, YearExtractor
+from ..loaders import REGISTRY, CSVLoader
+from ..models import ProcessingResult
+from ..processors import (
+    BillsProcessor,
+    ChristeningsGenderProcessor,
+    ChristeningsParishProcessor,
+    ChristeningsProcessor,
+    FoodstuffsProcessor,
+)
+from ..processors.dedup import (
+    BILL_DEDUP_RULE,
+    CAUSE_DEDUP_RULE,
+    ExternalDeduplicator,
+    deduplicate,
+)
+from ..utils.logging import log_validation_results
+from ..utils.validation import VIOLATION_COLUMNS, SchemaValidator
+from ..writers import (
+    AnalyticsDatabase,
+    iter_chunks,
+    open_table_sink,
+    write_csv_table,
+    write_deltas,
+    write_parquet_table,
+)
+from .checkpoints import Checkpoints
+from .dag import Pipeline, PipelineError, Stage
+from .filters import OUTPUT_TABLES, YearRange, filter_years
+from .sources import NoDatasetsError, PipelinedDatasets, SourceLoads
+
+# Large tables written through streaming sinks with --stream
+STREAMED_TABLES = ("all_bills", "causes_of_death", "subtotals")
+
+# Artifact holding each output table's records
+TABLE_RECORDS = {
+    "parishes": "parish_records",
+    "weeks": "valid_weeks",
+    "years": "year_records",
+    "all_bills": "valid_bills",
+    "causes_of_death": "valid_causes",
+    "subtotals": "subtotal_records",
+    "foodstuffs": "foodstuff_records",
+    "christenings_by_gender": "gender_christening_records",
+    "christenings_by_parish": "parish_christening_records",
+    "christenings": "christening_records",
+}
+
+# Validation violations counted as errors for each table
+TABLE_VIOLATIONS = {
+    "all_bills": "bill_violations",
+    "causes_of_death": "cause_violations",
+}
+
+# Names used for the tables in the processing summary
+_SUMMARY_NAMES = {"all_bills": "bill_of_mortality"}
+
+
+@dataclass
+class RunContext:
+    """Settings and shared resources for one pipeline run.
+
+    Attributes:
+        output_dir: Directory for CSV outputs (and dictionary.csv)
+        output_format: "csv", "parquet" or "both"
+        stream: Write bills, causes and subtotals through streaming sinks
+        database_path: Also export the tables to this SQLite/DuckDB file
+        delta: Also write insert/update/delete files under output_dir/delta
+        enable_dedup: Remove same-source duplicate bills and causes
+        enforce_contracts: Drop rows that violate their table contract
+        dictionary_path: Cause definitions (optional)
+        edited_causes_path: Edited cause names (optional)
+        tables: Output tables to write
+        years: Keep only source rows in this (first, last) year range
+        csv_parser: CSVLoader parser, "pandas" or "arrow"
+        prefetch: Pipelined run: stages load the sources as they use them,
+            at most this many frames at a time (0 loads them all up front)
+        checkpoints: Per-source checkpoints of stages that process sources
+            one at a time (None when the stage cache is off)
+    """
+
+    output_dir: Path
+    output_format: str = "csv"
+    stream: bool = False
+    database_path: Optional[Path] = None
+    delta: bool = False
+    enable_dedup: bool = True
+    enforce_contracts: bool = False
+    dictionary_path: Optional[Path] = None
+    edited_causes_path: Optional[Path] = None
+    tables: Tuple[str, ...] = OUTPUT_TABLES
+    years: Optional[YearRange] = None
+    csv_parser: str = "pandas"
+    prefetch: int = 0
+    database: Optional[AnalyticsDatabase] = field(default=None, repr=False)
+    sinks: Dict[str, Any] = field(default_factory=dict, repr=False)
+    checkpoints: Optional[Checkpoints] = field(default=None, repr=False)
+
+    @property
+    def parquet_dir(self) -> Path:
+        return self.output_dir / "parquet"
+
+    @property
+    def delta_dir(self) -> Path:
+        return self.output_dir / "delta"
+
+
+class SourceFailuresError(PipelineError):
+    """Raised by a stage that processed every source but some of them failed."""
+
+
+# --- Stages -----------------------------------------------------------------
+
+
+def load_sources(ctx: RunContext, source_files: List[Path]) -> Dict[str, Any]:
+    """
+    Load every source CSV that some processor consumes.
+
+    With ``ctx.prefetch`` nothing is read here: ``datasets`` is then a
+    PipelinedDatasets of the files, which later stages load as they go,
+    counting rows and load errors in ``source_loads`` as each file is first
+    loaded.
+    """
+    logger.info("\n=== Loading All Datasets ===")
+    routed = REGISTRY.route(source_files)
+    for dataset_type, files in routed.items():
+        logger.info(
+            f"{dataset_type}: {len(files)} files -> "
+            f"{', '.join(REGISTRY.processors_for(dataset_type))}"
+        )
+    routed_files = {dataset.path for files in routed.values() for dataset in files}
+    skipped = [path.name for path in source_files if path not in routed_files]
+    if skipped:
+        logger.warning(f"Skipping {len(skipped)} files no processor reads: {skipped}")
+
+    files = [path for path in source_files if path in routed_files]
+    loads = SourceLoads(sources=len(files))
+    if ctx.prefetch:
+        types = {
+            dataset.path: dataset_type
+            for dataset_type, datasets in routed.items()
+            for dataset in datasets
+        }
+        datasets = PipelinedDatasets(
+            tuple((path, types[path]) for path in files),
+            ctx.csv_parser,
+            ctx.years,
+            ctx.prefetch,
+            loads,
+        )
+        logger.info(f"{len(datasets)} datasets will be loaded as stages use them")
+        return {"datasets": datasets, "source_loads": loads}
+
+    datasets = []
+    for csv_file in files:
+        try:
+            df, info = CSVLoader(ctx.csv_parser).load(csv_file)
+            loaded_rows = len(df)
+            df = filter_years(df, ctx.years)
+        except Exception as e:
+            loads.failed(csv_file.name, e)
+            continue
+        loads.loaded(csv_file.name, info.dataset_type, loaded_rows, df)
+        datasets.append((df, csv_file.name, info.dataset_type))
+
+    if not datasets:
+        raise NoDatasetsError("No datasets loaded successfully")
+
+    logger.info(f"Successfully loaded {len(datasets)} datasets")
+    logger.info(f"Total input rows: {loads.input_rows:,}")
+    if loads.load_errors > 0:
+        logger.warning(f"Load errors: {loads.load_errors} files failed")
+
+    return {"datasets": datasets, "source_loads": loads}
+
+
+def extract_entities(ctx: RunContext, datasets) -> Dict[str, Any]:
+    """Extract parishes, weeks and years from every dataset."""
+    logger.info("\n=== Extracting All Entities ===")
+
+    # Prioritize -parishes files (cleanest data) by processing them first
+    # The extractor won't duplicate weeks, so first-seen records are kept
+    def week_order(name: str):
+        return not name.endswith("-parishes"), name
+
+    week_extractor = WeekExtractor()
+    if isinstance(datasets, PipelinedDatasets):
+        dataframes_for_parishes, dataframes_for_weeks = _entity_frames(
+            datasets.ordered(week_order), week_extractor
+        )
+        dataframes_for_years = dataframes_for_weeks
+    else:
+        dataframes_for_parishes = dataframes_for_years = _named(datasets)
+        dataframes_for_weeks = sorted(_named(datasets), key=lambda x: week_order(x[1]))
+
+    parish_records = ParishExtractor().extract_parishes_from_dataframes(
+        dataframes_for_parishes
+    )
+    logger.info(f"✓ Extracted {len(parish_records)} unique parishes")
+
+    week_records = week_extractor.extract_weeks_from_dataframes(dataframes_for_weeks)
+    source_weeks = week_extractor.validate_weeks(week_records)
+    logger.info(f"✓ Extracted {len(source_weeks)} valid weeks")
+
+    source_years = YearExtractor().extract_years_from_dataframes(dataframes_for_years)
+    logger.info(f"✓ Extracted {len(source_years)} unique years")
+
+    return {
+        "parish_records": parish_records,
+        "source_weeks": source_weeks,
+        "source_years": source_years,
+    }
+
+
+def _entity_frames(
+    datasets: PipelinedDatasets, week_extractor: WeekExtractor
+) -> Tuple[List[Tuple[pd.DataFrame, str]], List[Tuple[pd.DataFrame, str]]]:
+    """
+    Read pipelined datasets once for all three entity extractors.
+
+    The extractors only tell rows apart by their parish name (parishes,
+    which also read every column name) or their week columns (weeks and
+    years), so for each source this keeps one row per distinct value of
+    those. Each extractor then finds the same entities, in the same order,
+    as it would in the whole frames.
+
+    Returns:
+        (df, name) for the parish extractor, and for the week and year ones
+    """
+    parish_frames = []
+    week_frames = []
+    for df, name, _ in datasets:
+        if "parish_name" in df.columns:
+            parish_frames.append((df.drop_duplicates("parish_name"), name))
+        else:
+            parish_frames.append((df.iloc[:0], name))
+        week_columns = week_extractor._find_week_columns(df)
+        if week_columns:
+            week_frames.append((df[week_columns].drop_duplicates(), name))
+        else:
+            week_frames.append((df.iloc[:0, :0], name))
+    return parish_frames, week_frames
+
+
+def _bills_processor(ctx: RunContext) -> BillsProcessor:
+    def existing(path: Optional[Path]) -> Optional[str]:
+        return str(path) if path is not None and path.exists() else None
+
+    return BillsProcessor(
+        dictionary_path=existing(ctx.dictionary_path),
+        edited_causes_path=existing(ctx.edited_causes_path),
+    )
+
+
+def _routed(datasets, processor: str):
+    """The datasets ``processor`` consumes (still loaded on demand if pipelined)."""
+    if isinstance(datasets, PipelinedDatasets):
+        return datasets.routed(processor)
+    return [
+        dataset
+        for dataset in datasets
+        if processor in REGISTRY.processors_for(dataset[2])
+    ]
+
+
+def _excluding(datasets, names: AbstractSet[str]):
+    """The datasets except those called ``names`` (not loaded if pipelined)."""
+    if isinstance(datasets, PipelinedDatasets):
+        return datasets.excluding(names)
+    return [dataset for dataset in datasets if dataset[1] not in names]
+
+
+def _names(datasets) -> List[str]:
+    """Names of the datasets, in order, without loading pipelined ones."""
+    if isinstance(datasets, PipelinedDatasets):
+        return datasets.names()
+    return [name for _, name, _ in datasets]
+
+
+def _named(datasets) -> Iterable[Tuple[pd.DataFrame, str]]:
+    """(df, name) of each dataset; a generator when the datasets are pipelined."""
+    if isinstance(datasets, PipelinedDatasets):
+        return ((df, name) for df, name, _ in datasets)
+    return [(df, name) for df, name, _ in datasets]
+
+
+def _by_name(datasets) -> Mapping[str, pd.DataFrame]:
+    """Name -> DataFrame, as the processors' ``process_datasets`` takes them."""
+    if isinstance(datasets, PipelinedDatasets):
+        return datasets.by_name()
+    return {name: df for df, name, _ in datasets}
+
+
+def _bill_results(
+    ctx: RunContext, datasets, parish_records, source_weeks
+) -> Iterator[ProcessingResult]:
+    """
+    The bills processor's result for each source, checkpointing each one.
+
+    Sources checkpointed by an interrupted attempt are restored instead of
+    processed (see ``checkpoints``), without loading their frames, in their
+    place among the others. A source that fails is recorded and skipped;
+    once every other source is done, SourceFailuresError is raised.
+    """
+    processor = _bills_processor(ctx)
+    checkpoints = None
+    if ctx.checkpoints is not None:
+        # What each source's result depends on besides the source itself
+        depends = {
+            "params": [getattr(ctx, name) for name in _BILL_PARAMS],
+            "inputs": [parish_records, source_weeks],
+        }
+        checkpoints = ctx.checkpoints.stage("bills", depends)
+    bill_datasets = _routed(datasets, "bills")
+    logger.info(f"Processing {len(bill_datasets)} datasets (parish + causes) for bills")
+
+    order = {name: i for i, name in enumerate(_names(bill_datasets))}
+    restored = deque(
+        name for name in order if checkpoints is not None and name in checkpoints
+    )
+    failed = []
+    for df, source_name in _named(_excluding(bill_datasets, set(restored))):
+        while restored and order[restored[0]] < order[source_name]:
+            yield checkpoints.load(restored.popleft())
+        try:
+            (result,) = processor.iter_parish_dataframes(
+                [(df, source_name)], parish_records, source_weeks
+            )
+        except Exception as e:
+            logger.exception(f"✗ Failed to process bills from {source_name}: {e}")
+            failed.append(source_name)
+            if checkpoints is not None:
+                checkpoints.record_failure(source_name, e)
+            continue
+        if checkpoints is not None:
+            checkpoints.save(source_name, result)
+        yield result
+    while restored:
+        yield checkpoints.load(restored.popleft())
+
+    if failed:
+        hint = " Re-run with --resume to retry only them." if checkpoints else ""
+        raise SourceFailuresError(
+            f"Bills failed for {len(failed)} source(s): {', '.join(failed)}.{hint}"
+        )
+
+
+def process_bills(
+    ctx: RunContext, datasets, parish_records, source_weeks
+) -> Dict[str, Any]:
+    """Turn parish and causes datasets into bill, cause and subtotal records."""
+    logger.info("\n=== Processing Bills of Mortality ===")
+    bill_records = []
+    cause_records = []
+    subtotal_records = []
+    new_weeks = []
+    new_years = []
+    for result in _bill_results(ctx, datasets, parish_records, source_weeks):
+        bill_records.extend(result.bills)
+        cause_records.extend(result.causes)
+        subtotal_records.extend(result.subtotals)
+        new_weeks.extend(result.weeks)
+        new_years.extend(result.years)
+    logger.info(f"✓ Generated {len(bill_records)} bill of mortality records")
+    logger.info(f"✓ Generated {len(cause_records)} causes of death records")
+    logger.info(f"✓ Generated {len(subtotal_records)} subtotal records")
+    return {
+        "bill_records": bill_records,
+        "cause_records": cause_records,
+        "subtotal_records": subtotal_records,
+        "bill_weeks": new_weeks,
+        "bill_years": new_years,
+    }
+
+
+def stream_bills(
+    ctx: RunContext, datasets, parish_records, source_weeks
+) -> Dict[str, Any]:
+    """
+    Process bill datasets one source at a time, writing records to sinks.
+
+    Subtotals are written as each source finishes. Bills and causes are
+    validated per source and, when deduplication is enabled, spilled to an
+    ExternalDeduplicator whose output is written in chunks at the end, so
+    memory holds at most one source's records or one dedup bucket. Only
+    tables with an open sink are written.
+    """
+    logger.info("\n=== Processing Bills of Mortality ===")
+    validator = SchemaValidator()
+    sinks = ctx.sinks
+
+    tables = {
+        table_name: spec
+        for table_name, spec in {
+            "all_bills": ("bill_of_mortality", "Bills of Mortality", BILL_DEDUP_RULE),
+            "causes_of_death": (
+                "causes_of_death",
+                "Causes of Death",
+                CAUSE_DEDUP_RULE,
+            ),
+        }.items()
+        if table_name in sinks
+    }
+    dedupers = {}
+    if ctx.enable_dedup:
+        dedupers = {
+            table_name: ExternalDeduplicator(rule)
+            for table_name, (_, _, rule) in tables.items()
+        }
+    violations = {table_name: [] for table_name in tables}
+    totals = {table_name: 0 for table_name in tables}
+    valid_totals = {table_name: 0 for table_name in tables}
+
+    new_week_records = []
+    new_year_records = []
+    for result in _bill_results(ctx, datasets, parish_records, source_weeks):
+        new_week_records.extend(result.weeks)
+        new_year_records.extend(result.years)
+        if "subtotals" in sinks:
+            sinks["subtotals"].write_records(result.subtotals)
+
+        for table_name, records in (
+            ("all_bills", result.bills),
+            ("causes_of_death", result.causes),
+        ):
+            if not records or table_name not in tables:
+                continue
+            validation = validator.validate_records(records, tables[table_name][0])
+            valid = [records[i] for i in validation.valid_positions]
+            if not validation.violations.empty:
+                chunk_violations = validation.violations.copy()
+                chunk_violations["row"] += totals[table_name]
+                violations[table_name].append(chunk_violations)
+            totals[table_name] += len(records)
+            valid_totals[table_name] += len(valid)
+
+            if table_name in dedupers:
+                dedupers[table_name].add(valid)
+            else:
+                sinks[table_name].write_records(valid)
+
+    logger.info("\n=== Validating All Records ===")
+    merged_violations = {
+        table_name: pd.DataFrame(columns=VIOLATION_COLUMNS)
+        for table_name in TABLE_VIOLATIONS
+    }
+    for table_name, (_, component, rule) in tables.items():
+        merged_violations[table_name] = (
+            pd.concat(violations[table_name], ignore_index=True)
+            if violations[table_name]
+            else pd.DataFrame(columns=VIOLATION_COLUMNS)
+        )
+        log_validation_results(
+            component=component,
+            total_records=totals[table_name],
+            valid_records=valid_totals[table_name],
+            violations=merged_violations[table_name],
+        )
+
+        if table_name in dedupers:
+            logger.info(f"Performing source-aware deduplication on {rule.name}s...")
+            deduper = dedupers[table_name]
+            for chunk in iter_chunks(deduper.finish()):
+                sinks[table_name].write_records(chunk)
+            deduper.stats.log(rule)
+        else:
+            logger.info(
+                "Source-aware deduplication disabled - preserving all source records"
+            )
+
+    return {
+        "bill_weeks": new_week_records,
+        "bill_years": new_year_records,
+        "bill_violations": merged_violations["all_bills"],
+        "cause_violations": merged_violations["causes_of_death"],
+        "streamed_tables": tuple(sinks),
+    }
+
+
+def merge_calendar(
+    ctx: RunContext, source_weeks, source_years, bill_weeks, bill_years
+) -> Dict[str, Any]:
+    """Add the weeks and years first seen in general bills."""
+    valid_weeks = list(source_weeks)
+    if bill_weeks:
+        existing_joinids = {w.joinid for w in source_weeks}
+        deduplicated_weeks = [w for w in bill_weeks if w.joinid not in existing_joinids]
+        valid_weeks.extend(deduplicated_weeks)
+        logger.info(
+            f"✓ Added {len(deduplicated_weeks)} new unique week records from general bills (filtered {len(bill_weeks) - len(deduplicated_weeks)} duplicates)"
+        )
+
+    year_records = list(source_years)
+    if bill_years:
+        existing_years = {y.year for y in source_years}
+        deduplicated_years = [y for y in bill_years if y.year not in existing_years]
+        year_records.extend(deduplicated_years)
+        logger.info(
+            f"✓ Added {len(deduplicated_years)} new unique year records from general bills (filtered {len(bill_years) - len(deduplicated_years)} duplicates)"
+        )
+
+    return {"valid_weeks": valid_weeks, "year_records": year_records}
+
+
+def _validate_and_deduplicate(ctx, records, table_name, component, rule):
+    """
+    Validate records column-wise and optionally deduplicate them in memory.
+
+    Returns:
+        Tuple of (valid records, violations DataFrame)
+    """
+    validation = SchemaValidator().validate_records(records, table_name)
+    valid = [records[i] for i in validation.valid_positions]
+
+    log_validation_results(
+        component=component,
+        total_records=len(records),
+        valid_records=len(valid),
+        violations=validation.violations,
+    )
+
+    if ctx.enable_dedup:
+        logger.info(f"Performing source-aware deduplication on {rule.name}s...")
+        valid, stats = deduplicate(valid, rule)
+        stats.log(rule)
+    else:
+        logger.info(
+            "Source-aware deduplication disabled - preserving all source records"
+        )
+
+    return valid, validation.violations
+
+
+def validate_bills(ctx: RunContext, bill_records) -> Dict[str, Any]:
+    """Validate and deduplicate bill records."""
+    valid_bills, violations = _validate_and_deduplicate(
+        ctx, bill_records, "bill_of_mortality", "Bills of Mortality", BILL_DEDUP_RULE
+    )
+    return {"valid_bills": valid_bills, "bill_violations": violations}
+
+
+def validate_causes(ctx: RunContext, cause_records) -> Dict[str, Any]:
+    """Validate and deduplicate cause of death records."""
+    valid_causes, violations = _validate_and_deduplicate(
+        ctx, cause_records, "causes_of_death", "Causes of Death", CAUSE_DEDUP_RULE
+    )
+    return {"valid_causes": valid_causes, "cause_violations": violations}
+
+
+def process_foodstuffs(ctx: RunContext, datasets) -> Dict[str, Any]:
+    """Turn foodstuffs datasets into price records."""
+    logger.info("\n=== Processing Foodstuffs Data ===")
+    foodstuffs_datasets = _by_name(_routed(datasets, "foodstuffs"))
+
+    if not foodstuffs_datasets:
+        logger.info("No foodstuffs datasets found")
+        return {"foodstuff_records": []}
+
+    logger.info(f"Processing {len(foodstuffs_datasets)} foodstuffs datasets")
+    processor = FoodstuffsProcessor()
+    processor.process_datasets(foodstuffs_datasets)
+    records = processor.get_records()
+    logger.info(f"✓ Generated {len(records)} foodstuffs records")
+    return {"foodstuff_records": records}
+
+
+def process_gender_christenings(ctx: RunContext, datasets) -> Dict[str, Any]:
+    """Turn gender datasets into christening records."""
+    logger.info("\n=== Processing Christenings Data ===")
+    gender_datasets = _by_name(_routed(datasets, "christenings_gender"))
+
+    if not gender_datasets:
+        logger.info("No gender datasets found for christenings")
+        return {"gender_christening_records": []}
+
+    logger.info(f"Processing {len(gender_datasets)} gender datasets for christenings")
+    processor = ChristeningsGenderProcessor()
+    processor.process_datasets(gender_datasets)
+    records = processor.get_records()
+    logger.info(f"✓ Generated {len(records)} gender christening records")
+    return {"gender_christening_records": records}
+
+
+def process_parish_christenings(
+    ctx: RunContext, datasets, parish_records, valid_weeks
+) -> Dict[str, Any]:
+    """Turn parish datasets into per-parish christening records."""
+    parish_datasets = _by_name(_routed(datasets, "christenings_parish"))
+
+    if not parish_datasets:
+        logger.info("No parish datasets found for christenings")
+        return {"parish_christening_records": []}
+
+    logger.info(f"Processing {len(parish_datasets)} parish datasets for christenings")
+    processor = ChristeningsParishProcessor()
+    processor.process_datasets(parish_datasets, parish_records, valid_weeks)
+    records = processor.get_records()
+    logger.info(f"✓ Generated {len(records)} parish christening records")
+    return {"parish_christening_records": records}
+
+
+def process_christenings(ctx: RunContext, datasets) -> Dict[str, Any]:
+    """Combined christening records (kept for backward compatibility)."""
+    christenings_datasets = _by_name(_routed(datasets, "christenings"))
+
+    if not christenings_datasets:
+        return {"christening_records": []}
+
+    processor = ChristeningsProcessor()
+    processor.process_datasets(christenings_datasets)
+    records = processor.get_records()
+    logger.info(f"✓ Generated {len(records)} total christening records (combined)")
+    return {"christening_records": records}
+
+
+def write_outputs(ctx: RunContext, **tables) -> Dict[str, Any]:
+    """Check the selected tables against their contracts and write them."""
+    logger.info("\n=== Generating CSV Outputs ===")
+
+    # Create DataFrames with the column types declared in their contracts;
+    # streamed tables were already written by the bills stage
+    dataframes = {
+        table_name: build_table(table_name, tables[TABLE_RECORDS[table_name]])
+        for table_name in ctx.tables
+        if table_name not in ctx.sinks
+    }
+
+    # Check every table against its contract
+    contract_reports = check_tables(dataframes)
+    for table_name, report in contract_reports.items():
+        report.log()
+        if ctx.enforce_contracts and len(report.invalid_rows) > 0:
+            dataframes[table_name] = dataframes[table_name].drop(
+                index=report.invalid_rows
+            )
+            logger.warning(
+                f"Dropped {len(report.invalid_rows):,} {table_name} rows "
+                "violating the table contract"
+            )
+
+    # Write output files
+    output_files = []
+    for table_name, df in dataframes.items():
+        if len(df) > 0:
+            if ctx.output_format in ("csv", "both"):
+                output_file = write_csv_table(df, ctx.output_dir, table_name)
+                output_files.append(output_file)
+                logger.info(f"✓ {table_name}: {len(df):,} records → {output_file}")
+            if ctx.output_format in ("parquet", "both"):
+                output_path = write_parquet_table(df, ctx.parquet_dir, table_name)
+                output_files.append(output_path)
+                logger.info(f"✓ {table_name}: {len(df):,} records → {output_path}")
+            if ctx.database is not None:
+                ctx.database.write_frame(table_name, df)
+        else:
+            logger.warning(f"✗ {table_name}: No records to write")
+
+    # Close streaming sinks
+    for table_name, sink in ctx.sinks.items():
+        paths = sink.close()
+        if not paths:
+            logger.warning(f"✗ {table_name}: No records to write")
+        for output_path in paths:
+            output_files.append(output_path)
+            logger.info(
+                f"✓ {table_name}: {sink.rows_written:,} records → {output_path}"
+            )
+
+    if ctx.database is not None:
+        output_files.append(ctx.database.close())
+
+    if ctx.delta:
+        deltas = write_deltas(ctx.output_dir, ctx.delta_dir)
+        for table_delta in deltas.values():
+            output_files.extend(table_delta.paths.values())
+
+    record_counts = {}
+    for table_name in ctx.tables:
+        if table_name in ctx.sinks:
+            count = ctx.sinks[table_name].rows_written
+        else:
+            count = len(tables[TABLE_RECORDS[table_name]])
+        record_counts[_SUMMARY_NAMES.get(table_name, table_name)] = count
+
+    error_count = tables["source_loads"].load_errors + sum(
+        len(tables[violations])
+        for table_name, violations in TABLE_VIOLATIONS.items()
+        if table_name in ctx.tables
+    )
+    return {
+        "output_files": output_files,
+        "record_counts": record_counts,
+        "error_count": error_count,
+    }
+
+
+# --- Pipeline ---------------------------------------------------------------
+
+_ENTITY_INPUTS = ("datasets", "parish_records", "source_weeks")
+_CAUSE_PATHS = ("dictionary_path", "edited_causes_path")
+# Settings a bills result depends on: how its source is loaded, and causes
+_BILL_PARAMS = ("csv_parser", "years") + _CAUSE_PATHS
+
+
+def _write_inputs(stream: bool, tables: Sequence[str]) -> Tuple[str, ...]:
+    """Artifacts the write stage reads to produce ``tables``."""
+    inputs = ["source_loads"]
+    for table_name in tables:
+        if stream and table_name in STREAMED_TABLES:
+            inputs.append("streamed_tables")
+        else:
+            inputs.append(TABLE_RECORDS[table_name])
+        if table_name in TABLE_VIOLATIONS:
+            inputs.append(TABLE_VIOLATIONS[table_name])
+    return tuple(dict.fromkeys(inputs))
+
+
+def build_pipeline(
+    stream: bool = False, tables: Optional[Sequence[str]] = None
+) -> Pipeline:
+    """
+    Build the processing pipeline.
+
+    Args:
+        stream: Use the streaming bills stage, which writes bills, causes and
+            subtotals itself and therefore is never cached
+        tables: Output tables to produce (default all); stages none of them
+            need are left out
+
+    Returns:
+        The Pipeline; run it with a RunContext and ``source_files``
+    """
+    write_inputs = _write_inputs(stream, tables or OUTPUT_TABLES)
+    if stream:
+        bill_stages = [
+            Stage(
+                "bills",
+                stream_bills,
+                inputs=_ENTITY_INPUTS,
+                outputs=(
+                    "bill_weeks",
+                    "bill_years",
+                    "bill_violations",
+                    "cause_violations",
+                    "streamed_tables",
+                ),
+                params=_CAUSE_PATHS,
+                cache=False,
+            ),
+        ]
+    else:
+        bill_stages = [
+            Stage(
+                "bills",
+                process_bills,
+                inputs=_ENTITY_INPUTS,
+                outputs=(
+                    "bill_records",
+                    "cause_records",
+                    "subtotal_records",
+                    "bill_weeks",
+                    "bill_years",
+                ),
+                params=_CAUSE_PATHS,
+            ),
+            Stage(
+                "validate_bills",
+                validate_bills,
+                inputs=("bill_records",),
+                outputs=("valid_bills", "bill_violations"),
+                params=("enable_dedup",),
+            ),
+            Stage(
+                "validate_causes",
+                validate_causes,
+                inputs=("cause_records",),
+                outputs=("valid_causes", "cause_violations"),
+                params=("enable_dedup",),
+            ),
+        ]
+
+    pipeline = Pipeline(
+        [
+            # Reading the CSVs again is quicker than unpickling their frames,
+            # so only the stages after load are worth caching
+            Stage(
+                "load",
+                load_sources,
+                inputs=("source_files",),
+                outputs=("datasets", "source_loads"),
+                params=("csv_parser", "prefetch", "years"),
+                cache=False,
+            ),
+            Stage(
+                "entities",
+                extract_entities,
+                inputs=("datasets",),
+                outputs=("parish_records", "source_weeks", "source_years"),
+            ),
+            *bill_stages,
+            Stage(
+                "calendar",
+                merge_calendar,
+                inputs=("source_weeks", "source_years", "bill_weeks", "bill_years"),
+                outputs=("valid_weeks", "year_records"),
+            ),
+            Stage(
+                "foodstuffs",
+                process_foodstuffs,
+                inputs=("datasets",),
+                outputs=("foodstuff_records",),
+            ),
+            Stage(
+                "christenings_gender",
+                process_gender_christenings,
+                inputs=("datasets",),
+                outputs=("gender_christening_records",),
+            ),
+            Stage(
+                "christenings_parish",
+                process_parish_christenings,
+                inputs=("datasets", "parish_records", "valid_weeks"),
+                outputs=("parish_christening_records",),
+            ),
+            Stage(
+                "christenings",
+                process_christenings,
+                inputs=("datasets",),
+                outputs=("christening_records",),
+            ),
+            Stage(
+                "write",
+                write_outputs,
+                inputs=write_inputs,
+                outputs=("output_files", "record_counts", "error_count"),
+                cache=False,
+            ),
+        ]
+    )
+    needed = {"write"} | pipeline.upstream_of("write")
+    return Pipeline(
+        [pipeline.stages[name] for name in pipeline.order if name in needed]
+    )
+
+
+STAGE_NAMES = tuple(build_pipeline().order)
@@ -1,7 +1,7 @@
 """Bills processor for converting parish data to BillOfMortalityRecord objects."""
 
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 from loguru import logger
@@ -10,13 +10,45 @@ from ..models import (
     BillOfMortalityRecord,
     CausesOfDeathRecord,
     ParishRecord,
+    ProcessingResult,
     SubtotalRecord,
     WeekRecord,
     YearRecord,
 )
+from ..utils import diagnostics, metrics
+from ..utils.sections import section
 from ..utils.validation import SchemaValidator
+from . import engines
 from .general_bills import GeneralBillsProcessor
 
+FUZZY_WEEK_MATCHES = metrics.counter(
+    "bom_fuzzy_week_matches_total",
+    "Bill rows whose dates matched no week record exactly, by how they were "
+    "resolved",
+    ["strategy"],
+)
+FUZZY_WEEK_MATCH_OFFSETS = metrics.histogram(
+    "bom_fuzzy_week_match_offset_days",
+    "Days a fuzzy-matched bill date was moved to find its week",
+    ["strategy"],
+    buckets=(0, 1, 2, 3),
+)
+FUZZY_WEEK_MATCH_SECONDS = metrics.timer(
+    "bom_fuzzy_week_match_seconds", "Time spent fuzzy-matching bill dates to weeks"
+)
+PARISH_ID_MISSES = metrics.counter(
+    "bom_parish_id_misses_total", "Parish columns with no matching parish ID"
+)
+EDITED_CAUSE_FALLBACKS = metrics.counter(
+    "bom_edited_cause_fallbacks_total",
+    "Cause lookups with no exact edited-cause entry, by how they were resolved",
+    ["outcome"],
+)
+EDITED_CAUSE_FALLBACK_SECONDS = metrics.timer(
+    "bom_edited_cause_fallback_seconds",
+    "Time spent on edited-cause lookups that missed the exact entry",
+)
+
 
 class BillsProcessor:
     """Processes parish datasets into individual BillOfMortalityRecord objects."""
@@ -147,6 +179,22 @@ class BillsProcessor:
         if key in self.edited_causes_lookup:
             return self.edited_causes_lookup[key]
 
+        with EDITED_CAUSE_FALLBACK_SECONDS.time():
+            edited_cause, outcome = self._lookup_edited_cause_variant(
+                normalized_death, year
+            )
+        EDITED_CAUSE_FALLBACKS.inc(outcome=outcome)
+        return edited_cause
+
+    def _lookup_edited_cause_variant(
+        self, normalized_death: str, year: int
+    ) -> Tuple[Optional[str], str]:
+        """Look up an edited cause allowing common spelling variations.
+
+        Returns:
+            Tuple of (edited cause or None, which lookup found it)
+        """
+
         # Try fuzzy matching with common spelling variations
         # This handles cases where edited_causes.csv doesn't have all variants
         def normalize_variants(text: str) -> str:
@@ -176,7 +224,7 @@ class BillsProcessor:
         ), edited_cause in self.edited_causes_lookup.items():
             if lookup_year == year:
                 if normalize_variants(lookup_cause) == fuzzy_normalized:
-                    return edited_cause
+                    return edited_cause, "variant"
 
         # If still no match, try without year constraint
         # This helps when a cause appears in new years not in edited_causes.csv
@@ -185,9 +233,9 @@ class BillsProcessor:
             lookup_cause,
         ), edited_cause in self.edited_causes_lookup.items():
             if normalize_variants(lookup_cause) == fuzzy_normalized:
-                return edited_cause
+                return edited_cause, "other_year"
 
-        return None
+        return None, "unmapped"
 
     def _normalize_cause_name(self, cause_name: str) -> str:
         """Normalize cause name for dictionary lookup."""
@@ -408,69 +456,20 @@ class BillsProcessor:
         Returns:
             Tuple of (BillOfMortalityRecord list, CausesOfDeathRecord list, WeekRecord list, YearRecord list, SubtotalRecord list)
         """
-        parish_mapping = self.create_parish_id_mapping(parish_records)
-        week_mapping = self.create_week_id_mapping(week_records)
-
         bill_records = []
         cause_records = []
         subtotal_records = []
         all_new_week_records = []
         all_new_year_records = []
 
-        for df, source_name in dataframes:
-            logger.info(f"Processing bills from {source_name}")
-
-            # Determine if this is parish data or causes data
-            is_causes_data = "causes" in source_name.lower()
-
-            if is_causes_data:
-                # Process causes data
-                records = self._process_causes_dataframe(df, source_name, week_mapping)
-                cause_records.extend(records)
-                logger.info(
-                    f"Generated {len(records)} cause records from {source_name}"
-                )
-            else:
-                # Check if this is a General Bills dataset
-                if self.general_bills_processor.is_general_bill_dataset(source_name):
-                    # Use specialized General Bills processor
-                    (
-                        records,
-                        new_week_records,
-                        new_year_records,
-                        general_subtotals,
-                    ) = self.general_bills_processor.process_general_bills_dataframe(
-                        df, source_name, parish_records, week_records
-                    )
-                    bill_records.extend(records)
-                    all_new_week_records.extend(new_week_records)
-                    all_new_year_records.extend(new_year_records)
-                    subtotal_records.extend(general_subtotals)
-                    logger.info(
-                        f"Generated {len(records)} General Bills records from {source_name}"
-                    )
-                    logger.info(
-                        f"Generated {len(general_subtotals)} General Bills subtotal records from {source_name}"
-                    )
-                    logger.info(
-                        f"Created {len(new_week_records)} new week records from {source_name}"
-                    )
-                    logger.info(
-                        f"Created {len(new_year_records)} new year records from {source_name}"
-                    )
-                else:
-                    # Process as Weekly Bills data
-                    records, subtotal_recs = self._process_parish_dataframe(
-                        df, source_name, parish_mapping, week_mapping
-                    )
-                    bill_records.extend(records)
-                    subtotal_records.extend(subtotal_recs)
-                    logger.info(
-                        f"Generated {len(records)} Weekly Bills records from {source_name}"
-                    )
-                    logger.info(
-                        f"Generated {len(subtotal_recs)} subtotal records from {source_name}"
-                    )
+        for result in self.iter_parish_dataframes(
+            dataframes, parish_records, week_records
+        ):
+            bill_records.extend(result.bills)
+            cause_records.extend(result.causes)
+            subtotal_records.extend(result.subtotals)
+            all_new_week_records.extend(result.weeks)
+            all_new_year_records.extend(result.years)
 
         logger.info(f"Total bill of mortality records: {len(bill_records)}")
         logger.info(f"Total causes of death records: {len(cause_records)}")
@@ -485,6 +484,98 @@ class BillsProcessor:
             subtotal_records,
         )
 
+    def iter_parish_dataframes(
+        self,
+        dataframes: List[tuple[pd.DataFrame, str]],
+        parish_records: List[ParishRecord],
+        week_records: List[WeekRecord],
+    ) -> Iterator[ProcessingResult]:
+        """
+        Process DataFrames one source at a time.
+
+        Yields one ProcessingResult per source as soon as it is processed, so
+        callers can write each source's records out before the next one is
+        built. ``weeks`` and ``years`` hold the new records created by General
+        Bills processing.
+
+        Args:
+            dataframes: List of (DataFrame, source_name) tuples
+            parish_records: List of ParishRecord objects for ID mapping
+            week_records: List of WeekRecord objects for week_id mapping
+
+        Yields:
+            ProcessingResult for each source
+        """
+        parish_mapping = self.create_parish_id_mapping(parish_records)
+        week_mapping = self.create_week_id_mapping(week_records)
+
+        for df, source_name in dataframes:
+            with section(source_name):
+                logger.info(f"Processing bills from {source_name}")
+                result = ProcessingResult(
+                    bills=[],
+                    causes=[],
+                    christenings=[],
+                    parishes=[],
+                    weeks=[],
+                    years=[],
+                    subtotals=[],
+                    source_file=source_name,
+                    processing_notes=[],
+                )
+
+                # Determine if this is parish data or causes data
+                is_causes_data = "causes" in source_name.lower()
+
+                if is_causes_data:
+                    # Process causes data
+                    result.causes = engines.implementation("causes")(
+                        self, df, source_name, week_mapping
+                    )
+                    logger.info(
+                        f"Generated {len(result.causes)} cause records from {source_name}"
+                    )
+                else:
+                    # Check if this is a General Bills dataset
+                    if self.general_bills_processor.is_general_bill_dataset(
+                        source_name
+                    ):
+                        # Use specialized General Bills processor
+                        (
+                            result.bills,
+                            result.weeks,
+                            result.years,
+                            result.subtotals,
+                        ) = self.general_bills_processor.process_general_bills_dataframe(
+                            df, source_name, parish_records, week_records
+                        )
+                        logger.info(
+                            f"Generated {len(result.bills)} General Bills records from {source_name}"
+                        )
+                        logger.info(
+                            f"Generated {len(result.subtotals)} General Bills subtotal records from {source_name}"
+                        )
+                        logger.info(
+                            f"Created {len(result.weeks)} new week records from {source_name}"
+                        )
+                        logger.info(
+                            f"Created {len(result.years)} new year records from {source_name}"
+                        )
+                    else:
+                        # Process as Weekly Bills data
+                        result.bills, result.subtotals = engines.implementation(
+                            "parish"
+                        )(self, df, source_name, parish_mapping, week_mapping)
+                        logger.info(
+                            f"Generated {len(result.bills)} Weekly Bills records from {source_name}"
+                        )
+                        logger.info(
+                            f"Generated {len(result.subtotals)} subtotal records from {source_name}"
+                        )
+
+            yield result
+
+    @engines.register("parish", engines.LEGACY)
     def _process_parish_dataframe(
         self,
         df: pd.DataFrame,
@@ -603,8 +694,11 @@ class BillsProcessor:
             if parish_id:
                 parish_count_combinations.append((parish_id, count_type, col))
             else:
-                logger.warning(
-                    f"Could not find parish ID for '{parish_name}' from column '{col}'"
+                PARISH_ID_MISSES.inc()
+                diagnostics.warning(
+                    "Could not find parish ID for '{}' from column '{}'",
+                    parish_name,
+                    col,
                 )
 
         # Extract subtotal categories and count types from subtotal columns
@@ -953,6 +1047,7 @@ class BillsProcessor:
 
         return transformed_df
 
+    @engines.register("causes", engines.LEGACY)
     def _process_causes_dataframe(
         self, df: pd.DataFrame, source_name: str, week_mapping: Dict[str, str]
     ) -> List[CausesOfDeathRecord]:
@@ -1245,9 +1340,10 @@ class BillsProcessor:
                 return joinid
 
             # If exact match fails, try fuzzy matching with existing week records
-            return self._fuzzy_match_week_record(
-                year, start_month, start_day, end_month, end_day, week_mapping
-            )
+            with FUZZY_WEEK_MATCH_SECONDS.time():
+                return self._fuzzy_match_week_record(
+                    year, start_month, start_day, end_month, end_day, week_mapping
+                )
         except Exception:
             return None
 
@@ -1277,7 +1373,8 @@ class BillsProcessor:
                 year_week_records.append(joinid)
 
         if not year_week_records:
-            logger.warning(f"No week records found for year {year}")
+            FUZZY_WEEK_MATCHES.inc(strategy="no_weeks_in_year")
+            diagnostics.warning("No week records found for year {}", year)
             return None
 
         # Strategy 1: Try variations with different end days (±1, ±2, ±3 days)
@@ -1289,12 +1386,18 @@ class BillsProcessor:
                         year, start_month, start_day, year, end_month, adjusted_end_day
                     )
                     if test_joinid in week_mapping:
-                        logger.info(
-                            f"Found week match with {day_offset} day offset: {test_joinid}"
+                        FUZZY_WEEK_MATCHES.inc(strategy="end_day")
+                        FUZZY_WEEK_MATCH_OFFSETS.observe(
+                            abs(day_offset), strategy="end_day"
+                        )
+                        diagnostics.info(
+                            "Found week match with {} day offset: {}",
+                            day_offset,
+                            test_joinid,
                         )
                         return test_joinid
                 except Exception as e:
-                    logger.warning(f"Failed to find week match: {e}")
+                    diagnostics.warning("Failed to find week match: {}", e)
                     continue
 
         # Strategy 2: Try variations with different start days (±1, ±2 days)
@@ -1306,12 +1409,18 @@ class BillsProcessor:
                         year, start_month, adjusted_start_day, year, end_month, end_day
                     )
                     if test_joinid in week_mapping:
-                        logger.info(
-                            f"Found week match with {day_offset} start day offset: {test_joinid}"
+                        FUZZY_WEEK_MATCHES.inc(strategy="start_day")
+                        FUZZY_WEEK_MATCH_OFFSETS.observe(
+                            abs(day_offset), strategy="start_day"
+                        )
+                        diagnostics.info(
+                            "Found week match with {} start day offset: {}",
+                            day_offset,
+                            test_joinid,
                         )
                         return test_joinid
                 except Exception as e:
-                    logger.warning(f"Failed to find week match: {e}")
+                    diagnostics.warning("Failed to find week match: {}", e)
                     continue
 
         # Strategy 3: Match by month and approximate date range
@@ -1321,7 +1430,8 @@ class BillsProcessor:
             # Parse existing joinid to extract date info
             if start_month_lower in existing_joinid.lower():
                 # If months match, this is likely the right week
-                logger.info(f"Found month-based week match: {existing_joinid}")
+                FUZZY_WEEK_MATCHES.inc(strategy="same_month")
+                diagnostics.info("Found month-based week match: {}", existing_joinid)
                 return existing_joinid
 
         # Strategy 4: Use the first week record for this year as last resort
@@ -1330,7 +1440,10 @@ class BillsProcessor:
             fallback_joinid = sorted(year_week_records)[
                 0
             ]  # Use earliest week as fallback
-            logger.warning(f"Using fallback week record for {year}: {fallback_joinid}")
+            FUZZY_WEEK_MATCHES.inc(strategy="first_week_of_year")
+            diagnostics.warning(
+                "Using fallback week record for {}: {}", year, fallback_joinid
+            )
             return fallback_joinid
 
         return None
@@ -6,8 +6,22 @@ from typing import Any, Dict, List, Optional, Set, Tuple
 import pandas as pd
 from loguru import logger
 
+from ..contracts import build_table
 from ..models import ChristeningRecord
 from ..utils.columns import normalize_column_name
+from ..utils.sections import section
+from . import engines
+
+# Columns each row field is read from, in order of preference
+YEAR_FIELDS = ["year", "Year", "start_year", "Start Year"]
+WEEK_FIELDS = ["week", "Week", "week_number", "Week Number"]
+ID_FIELDS = ["unique_identifier", "Unique Identifier", "identifier", "id"]
+DATE_FIELDS = {
+    "start_day": ["start_day", "Start Day"],
+    "start_month": ["start_month", "Start Month"],
+    "end_day": ["end_day", "End Day"],
+    "end_month": ["end_month", "End Month"],
+}
 
 
 class ChristeningsProcessor:
@@ -27,10 +41,12 @@ class ChristeningsProcessor:
 
         for dataset_name, df in datasets.items():
             logger.info(f"Processing christenings from {dataset_name}")
-            self._process_single_dataset(df, dataset_name)
+            with section(dataset_name):
+                engines.implementation("christenings")(self, df, dataset_name)
 
         logger.info(f"Generated {len(self.records)} christenings records total")
 
+    @engines.register("christenings", engines.LEGACY)
     def _process_single_dataset(self, df: pd.DataFrame, dataset_name: str) -> None:
         """Process a single dataset for christenings data.
 
@@ -101,6 +117,100 @@ class ChristeningsProcessor:
 
                 self.records.append(record)
 
+    @engines.register("christenings", "columnar")
+    def _process_single_dataset_columnar(
+        self, df: pd.DataFrame, dataset_name: str
+    ) -> None:
+        """Process a single dataset a column at a time.
+
+        Produces the same records as ``_process_single_dataset``, but reads
+        each column once as a list instead of building a Series per row, and
+        parses each christening column name once per dataset.
+
+        Args:
+            df: DataFrame to process
+            dataset_name: Name of the dataset for source tracking
+        """
+        christening_columns = self._find_christening_columns(df)
+
+        if not christening_columns:
+            logger.info(f"No christening columns found in {dataset_name}")
+            return
+
+        logger.info(
+            f"Found {len(christening_columns)} christening columns in {dataset_name}"
+        )
+
+        def field(fields: List[str], parse) -> List[Any]:
+            # The first value of the first field that is present and parses
+            columns = [df[name].tolist() for name in fields if name in df.columns]
+            values = []
+            for row in zip(*columns) if columns else ((),) * len(df):
+                value = None
+                for raw in row:
+                    if pd.isna(raw):
+                        continue
+                    try:
+                        value = parse(raw)
+                    except (ValueError, TypeError):
+                        continue
+                    break
+                values.append(value)
+            return values
+
+        def to_int(raw: Any) -> int:
+            return int(float(raw))
+
+        rows = zip(
+            field(YEAR_FIELDS, int),
+            field(WEEK_FIELDS, to_int),
+            field(ID_FIELDS, str),
+            field(DATE_FIELDS["start_day"], to_int),
+            field(DATE_FIELDS["start_month"], str),
+            field(DATE_FIELDS["end_day"], to_int),
+            field(DATE_FIELDS["end_month"], str),
+        )
+        christenings = [
+            (self._parse_christening_column(name)["type"], df[name].tolist())
+            for name in christening_columns
+        ]
+        general = "general" in dataset_name.lower()
+
+        for i, row in enumerate(rows):
+            year, week_number, unique_identifier = row[:3]
+            start_day, start_month, end_day, end_month = row[3:]
+
+            # For General Bills, set week_number to 90 if not present
+            if week_number is None and general:
+                week_number = 90
+
+            joinid = self._create_week_joinid(year, week_number, unique_identifier)
+            bill_type = self._determine_bill_type(dataset_name, week_number)
+
+            for christening, values in christenings:
+                raw_value = values[i]
+                if pd.isna(raw_value) or raw_value == "":
+                    continue
+
+                self.records.append(
+                    ChristeningRecord(
+                        christening=christening,
+                        count=self._parse_count(raw_value),
+                        week_number=week_number,
+                        start_month=start_month,
+                        end_month=end_month,
+                        year=year,
+                        start_day=start_day,
+                        end_day=end_day,
+                        missing=self._is_missing_value(raw_value),
+                        illegible=self._is_illegible_value(raw_value),
+                        source=dataset_name,
+                        bill_type=bill_type,
+                        joinid=joinid,
+                        unique_identifier=unique_identifier,
+                    )
+                )
+
     def _find_christening_columns(self, df: pd.DataFrame) -> List[str]:
         """Find columns related to christenings data.
 
@@ -145,7 +255,7 @@ class ChristeningsProcessor:
                     christening_columns.append(column)
                     break
 
-        return list(set(christening_columns))  # Remove duplicates
+        return list(dict.fromkeys(christening_columns))  # Remove duplicates, in order
 
     def _parse_christening_column(self, column_name: str) -> Dict[str, Optional[str]]:
         """Parse a christening column name to extract christening information.
@@ -194,9 +304,7 @@ class ChristeningsProcessor:
 
     def _extract_year(self, row: pd.Series) -> Optional[int]:
         """Extract year from row data."""
-        year_fields = ["year", "Year", "start_year", "Start Year"]
-
-        for field in year_fields:
+        for field in YEAR_FIELDS:
             if field in row.index and not pd.isna(row[field]):
                 try:
                     return int(row[field])
@@ -207,9 +315,7 @@ class ChristeningsProcessor:
 
     def _extract_week_number(self, row: pd.Series) -> Optional[int]:
         """Extract week number from row data."""
-        week_fields = ["week", "Week", "week_number", "Week Number"]
-
-        for field in week_fields:
+        for field in WEEK_FIELDS:
             if field in row.index and not pd.isna(row[field]):
                 try:
                     # Convert decimal values to integers (e.g., 14.0 -> 14)
@@ -221,9 +327,7 @@ class ChristeningsProcessor:
 
     def _extract_unique_identifier(self, row: pd.Series) -> Optional[str]:
         """Extract unique identifier from row data."""
-        id_fields = ["unique_identifier", "Unique Identifier", "identifier", "id"]
-
-        for field in id_fields:
+        for field in ID_FIELDS:
             if field in row.index and not pd.isna(row[field]):
                 return str(row[field])
 
@@ -236,14 +340,7 @@ class ChristeningsProcessor:
             row: Pandas Series containing row data
             field_type: Type of field ('start_day', 'start_month', 'end_day', 'end_month')
         """
-        field_mappings = {
-            "start_day": ["start_day", "Start Day"],
-            "start_month": ["start_month", "Start Month"],
-            "end_day": ["end_day", "End Day"],
-            "end_month": ["end_month", "End Month"],
-        }
-
-        fields = field_mappings.get(field_type, [])
+        fields = DATE_FIELDS.get(field_type, [])
 
         for field in fields:
             if field in row.index and not pd.isna(row[field]):
@@ -365,7 +462,7 @@ class ChristeningsProcessor:
             return
 
         # Convert records to DataFrame
-        df = pd.DataFrame([record.to_dict() for record in self.records])
+        df = build_table("christenings", self.records)
 
         # Save to CSV
         df.to_csv(output_path, index=False)
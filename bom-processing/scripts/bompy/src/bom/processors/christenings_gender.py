@@ -7,7 +7,10 @@ from typing import Any, Dict, List, Optional
 import pandas as pd
 from loguru import logger
 
+from ..contracts import build_table
 from ..utils.columns import normalize_column_name
+from ..utils.sections import section
+from . import engines
 
 
 @dataclass
@@ -58,10 +61,14 @@ class ChristeningsGenderProcessor:
             # Only process gender datasets for this processor
             if "gender" in dataset_name.lower():
                 logger.info(f"Processing gender christenings from {dataset_name}")
-                self._process_single_dataset(df, dataset_name)
+                with section(dataset_name):
+                    engines.implementation("christenings_gender")(
+                        self, df, dataset_name
+                    )
 
         logger.info(f"Generated {len(self.records)} gender christenings records total")
 
+    @engines.register("christenings_gender", engines.LEGACY)
     def _process_single_dataset(self, df: pd.DataFrame, dataset_name: str) -> None:
         """Process a single dataset for gender christenings data.
 
@@ -154,7 +161,7 @@ class ChristeningsGenderProcessor:
                     gender_columns.append(column)
                     break
 
-        return list(set(gender_columns))  # Remove duplicates
+        return list(dict.fromkeys(gender_columns))  # Remove duplicates, in order
 
     def _parse_gender_column(self, column_name: str) -> str:
         """Parse a gender column name to extract christening type.
@@ -274,7 +281,7 @@ class ChristeningsGenderProcessor:
             return
 
         # Convert records to DataFrame
-        df = pd.DataFrame([record.to_dict() for record in self.records])
+        df = build_table("christenings_by_gender", self.records)
 
         # Save to CSV
         df.to_csv(output_path, index=False)
@@ -7,8 +7,11 @@ from typing import Any, Dict, List, Optional
 import pandas as pd
 from loguru import logger
 
+from ..contracts import build_table
 from ..models import ParishRecord, WeekRecord
 from ..utils.columns import normalize_column_name
+from ..utils.sections import section
+from . import engines
 
 
 @dataclass
@@ -86,12 +89,14 @@ class ChristeningsParishProcessor:
             # Only process parish datasets for this processor
             if "parish" in dataset_name.lower():
                 logger.info(f"Processing parish christenings from {dataset_name}")
-                self._process_single_dataset(
-                    df, dataset_name, parish_mapping, week_mapping
-                )
+                with section(dataset_name):
+                    engines.implementation("christenings_parish")(
+                        self, df, dataset_name, parish_mapping, week_mapping
+                    )
 
         logger.info(f"Generated {len(self.records)} parish christenings records total")
 
+    @engines.register("christenings_parish", engines.LEGACY)
     def _process_single_dataset(
         self,
         df: pd.DataFrame,
@@ -245,7 +250,7 @@ class ChristeningsParishProcessor:
                     christening_columns.append(column)
                     break
 
-        return list(set(christening_columns))  # Remove duplicates
+        return list(dict.fromkeys(christening_columns))  # Remove duplicates, in order
 
     def _extract_parish_name_from_column(self, column_name: str) -> str:
         """Extract parish name from column name.
@@ -490,7 +495,7 @@ class ChristeningsParishProcessor:
             return
 
         # Convert records to DataFrame
-        df = pd.DataFrame([record.to_dict() for record in self.records])
+        df = build_table("christenings_by_parish", self.records)
 
         # Save to CSV
         df.to_csv(output_path, index=False)
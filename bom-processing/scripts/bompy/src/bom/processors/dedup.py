@@ -0,0 +1,361 @@
+"""Source-aware deduplication of bill and cause records.
+
+Records are grouped by their database key. Within a group, records from
+different sources are all kept; records from the same source are collapsed
+to the one the rule prefers (e.g. the higher count).
+
+``deduplicate`` works on an in-memory list. When the rule names the record
+fields it reads, the list is grouped column-wise: each key field and the
+source are dictionary-encoded into integer codes and the survivors are
+picked with array operations instead of a dict of groups per record.
+``ExternalDeduplicator`` gives
+the same result, in the same order, for records that arrive in chunks: it
+spills them to hash buckets on disk so only one bucket is held in memory at
+a time, then merges the sorted survivors of every bucket back into a single
+stream.
+"""
+
+import heapq
+import pickle
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from ..models import BillOfMortalityRecord, CausesOfDeathRecord
+from ..utils import metrics
+
+DEDUP_REMOVALS = metrics.counter(
+    "bom_dedup_removed_total",
+    "Same-source duplicate records removed, by rule and source file",
+    ["rule"],
+)
+
+
+@dataclass(frozen=True)
+class DedupFields:
+    """The record fields a rule's callables read, for grouping columns.
+
+    Attributes:
+        key: Fields making up ``DedupRule.key``
+        source: Field returned by ``DedupRule.source``
+        origin: Field returned by ``DedupRule.origin``
+        count: Field ``DedupRule.prefer`` compares; the earliest record with
+            the highest count survives
+        missing_count: What a missing count compares as (None: below every
+            count)
+    """
+
+    key: Tuple[str, ...]
+    source: str
+    origin: str
+    count: str = "count"
+    missing_count: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class DedupRule:
+    """How to group records and pick a survivor among same-source duplicates.
+
+    Attributes:
+        name: Label used in log messages
+        key: Returns the grouping key of a record
+        source: Returns the source a record came from
+        prefer: ``prefer(existing, candidate)`` is True if candidate should
+            replace the record already kept for its source
+        origin: Returns the source file of a record, for metrics
+        fields: The fields the callables read, to deduplicate column-wise
+    """
+
+    name: str
+    key: Callable[[Any], Tuple]
+    source: Callable[[Any], Any]
+    prefer: Callable[[Any, Any], bool]
+    origin: Callable[[Any], Any] = lambda r: None
+    fields: Optional[DedupFields] = None
+
+
+@dataclass
+class DedupStats:
+    """Counts reported after deduplication."""
+
+    input_count: int = 0
+    output_count: int = 0
+    same_source_removed: int = 0
+    cross_source_kept: int = 0
+
+    def log(self, rule: DedupRule) -> None:
+        """Log the deduplication results."""
+        logger.info(f"Source-aware {rule.name} deduplication results:")
+        logger.info(
+            f"  • Removed {self.same_source_removed} same-source duplicate records"
+        )
+        logger.info(f"  • Preserved {self.cross_source_kept} cross-source records")
+        logger.info(f"  • Total records: {self.input_count} → {self.output_count}")
+
+
+def _prefer_higher_count(existing: BillOfMortalityRecord, candidate) -> bool:
+    return (candidate.count or 0) > (existing.count or 0)
+
+
+def _prefer_known_higher_count(existing: CausesOfDeathRecord, candidate) -> bool:
+    if existing.count is None:
+        return candidate.count is not None
+    return candidate.count is not None and candidate.count > existing.count
+
+
+BILL_DEDUP_RULE = DedupRule(
+    name="bill",
+    key=lambda r: (r.parish_id, r.count_type, r.year, r.joinid),
+    source=lambda r: r.unique_identifier,
+    prefer=_prefer_higher_count,
+    origin=lambda r: r.source,
+    fields=DedupFields(
+        key=("parish_id", "count_type", "year", "joinid"),
+        source="unique_identifier",
+        origin="source",
+        missing_count=0,
+    ),
+)
+
+CAUSE_DEDUP_RULE = DedupRule(
+    name="cause",
+    key=lambda r: (r.original_name, r.year, r.joinid),
+    source=lambda r: r.source_name,
+    prefer=_prefer_known_higher_count,
+    origin=lambda r: r.source_name,
+    fields=DedupFields(
+        key=("original_name", "year", "joinid"),
+        source="source_name",
+        origin="source_name",
+    ),
+)
+
+
+def _dedup_groups(
+    items: Iterable[Tuple[int, Any]], rule: DedupRule, stats: DedupStats
+) -> List[Tuple[Tuple[int, int], Any]]:
+    """
+    Deduplicate ``(sequence, record)`` pairs.
+
+    Returns the survivors tagged with their output position: the sequence
+    number of the first record of their group, then of the first record from
+    their source within that group. Sorting on it reproduces the order of
+    the in-memory algorithm.
+    """
+    groups: Dict[Tuple, Dict[Any, List]] = {}
+    removed: Dict[Any, int] = {}
+    for seq, record in items:
+        stats.input_count += 1
+        by_source = groups.setdefault(rule.key(record), {})
+        source = rule.source(record)
+        kept = by_source.get(source)
+        if kept is None:
+            by_source[source] = [seq, record]
+        else:
+            if rule.prefer(kept[1], record):
+                kept[1] = record
+            stats.same_source_removed += 1
+            origin = rule.origin(record)
+            removed[origin] = removed.get(origin, 0) + 1
+    for origin, count in removed.items():
+        DEDUP_REMOVALS.inc(count, rule=rule.name, source=origin or "")
+
+    survivors = []
+    for by_source in groups.values():
+        kept = list(by_source.values())
+        group_seq = kept[0][0]
+        survivors.extend(((group_seq, seq), record) for seq, record in kept)
+        if len(kept) > 1:
+            stats.cross_source_kept += len(kept)
+
+    stats.output_count += len(survivors)
+    return survivors
+
+
+def deduplicate(records: List[Any], rule: DedupRule) -> Tuple[List[Any], DedupStats]:
+    """
+    Deduplicate an in-memory list of records.
+
+    Args:
+        records: Bill or cause records
+        rule: Grouping and survivor rule
+
+    Returns:
+        Tuple of (surviving records, DedupStats)
+    """
+    stats = DedupStats()
+    if rule.fields is not None and records:
+        try:
+            positions = _dedup_columns(records, rule, stats)
+        except (TypeError, ValueError):
+            # Counts that are not numbers: compare them record by record
+            stats = DedupStats()
+        else:
+            return [records[i] for i in positions], stats
+    survivors = _dedup_groups(enumerate(records), rule, stats)
+    return [record for _, record in survivors], stats
+
+
+def _codes(records: List[Any], field: str) -> np.ndarray:
+    """Dictionary-encode a field: equal values (as dict keys) share a code."""
+    values = np.empty(len(records), dtype=object)
+    values[:] = [getattr(record, field) for record in records]
+    codes, _ = pd.factorize(values, use_na_sentinel=False)
+    return codes
+
+
+def _group_ids(columns: List[np.ndarray]) -> np.ndarray:
+    """Number the distinct rows of code columns in order of first appearance."""
+    ids = columns[0]
+    for codes in columns[1:]:
+        ids, _ = pd.factorize(ids.astype(np.int64) * (int(codes.max()) + 1) + codes)
+    return ids
+
+
+def _dedup_columns(records: List[Any], rule: DedupRule, stats: DedupStats):
+    """
+    ``_dedup_groups`` over columns of codes; returns the survivors' positions.
+
+    Groups and (group, source) pairs are numbered in order of first
+    appearance, which is also the order the in-memory algorithm emits them.
+    """
+    fields = rule.fields
+    counts = np.array([getattr(r, fields.count) for r in records], dtype=float)
+    missing = -np.inf if fields.missing_count is None else fields.missing_count
+    counts[np.isnan(counts)] = missing
+
+    groups = _group_ids([_codes(records, name) for name in fields.key])
+    pairs = _group_ids([groups, _codes(records, fields.source)])
+    pair_count = int(pairs.max()) + 1
+    positions = np.arange(len(records))
+
+    # The earliest record with the highest count survives in each pair
+    order = np.lexsort((positions, -counts, pairs))
+    first_in_order = np.flatnonzero(np.r_[True, np.diff(pairs[order]) != 0])
+    survivors = order[first_in_order]
+
+    _, first = np.unique(pairs, return_index=True)
+    pair_groups = groups[first]
+    pairs_per_group = np.bincount(pair_groups)
+
+    stats.input_count += len(records)
+    stats.output_count += pair_count
+    stats.same_source_removed += len(records) - pair_count
+    stats.cross_source_kept += int((pairs_per_group[pair_groups] > 1).sum())
+
+    if pair_count < len(records):
+        later = np.ones(len(records), dtype=bool)
+        later[first] = False
+        removed: Dict[Any, int] = {}
+        for i in np.flatnonzero(later):
+            origin = getattr(records[i], fields.origin)
+            removed[origin] = removed.get(origin, 0) + 1
+        for origin, count in removed.items():
+            DEDUP_REMOVALS.inc(count, rule=rule.name, source=origin or "")
+
+    return survivors[np.lexsort((np.arange(pair_count), pair_groups))]
+
+
+class ExternalDeduplicator:
+    """Deduplicate records arriving in chunks using on-disk hash buckets."""
+
+    def __init__(
+        self,
+        rule: DedupRule,
+        spill_dir: Optional[Path] = None,
+        buckets: int = 64,
+        run_batch_size: int = 10_000,
+    ):
+        """
+        Args:
+            rule: Grouping and survivor rule
+            spill_dir: Directory for bucket files (a temporary one by default)
+            buckets: Number of hash buckets; peak memory is about one bucket
+            run_batch_size: Records per pickled batch in the sorted run files
+        """
+        self.rule = rule
+        self.buckets = buckets
+        self.run_batch_size = run_batch_size
+        self.stats = DedupStats()
+        self._owns_dir = spill_dir is None
+        self._dir = Path(spill_dir or tempfile.mkdtemp(prefix="bom-dedup-"))
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._bucket_files = [
+            open(self._dir / f"bucket-{i:03d}.pkl", "wb") for i in range(buckets)
+        ]
+        self._next_seq = 0
+
+    def add(self, records: List[Any]) -> None:
+        """Spill a chunk of records to their hash buckets."""
+        batches: Dict[int, List[Tuple[int, Any]]] = {}
+        for record in records:
+            bucket = hash(self.rule.key(record)) % self.buckets
+            batches.setdefault(bucket, []).append((self._next_seq, record))
+            self._next_seq += 1
+
+        for bucket, batch in batches.items():
+            pickle.dump(batch, self._bucket_files[bucket], pickle.HIGHEST_PROTOCOL)
+
+    def finish(self) -> Iterator[Any]:
+        """
+        Yield the deduplicated records in the same order as ``deduplicate``.
+
+        Each bucket is deduplicated in memory and written back as a sorted
+        run; the runs are then merged lazily.
+        """
+        for handle in self._bucket_files:
+            handle.close()
+
+        runs = []
+        for i in range(self.buckets):
+            bucket_path = self._dir / f"bucket-{i:03d}.pkl"
+            survivors = _dedup_groups(_read_batches(bucket_path), self.rule, self.stats)
+            bucket_path.unlink()
+            if not survivors:
+                continue
+            survivors.sort(key=lambda item: item[0])
+            run_path = self._dir / f"run-{i:03d}.pkl"
+            with open(run_path, "wb") as handle:
+                for start in range(0, len(survivors), self.run_batch_size):
+                    pickle.dump(
+                        survivors[start : start + self.run_batch_size],
+                        handle,
+                        pickle.HIGHEST_PROTOCOL,
+                    )
+            runs.append(run_path)
+
+        try:
+            merged = heapq.merge(
+                *(_read_batches(path) for path in runs), key=lambda item: item[0]
+            )
+            for _, record in merged:
+                yield record
+        finally:
+            self.cleanup()
+
+    def cleanup(self) -> None:
+        """Remove spill files."""
+        for handle in self._bucket_files:
+            handle.close()
+        if self._owns_dir:
+            shutil.rmtree(self._dir, ignore_errors=True)
+        else:
+            for path in self._dir.glob("*.pkl"):
+                path.unlink()
+
+
+def _read_batches(path: Path) -> Iterator[Any]:
+    """Yield the items of every pickled batch in a spill file."""
+    with open(path, "rb") as handle:
+        while True:
+            try:
+                batch = pickle.load(handle)
+            except EOFError:
+                return
+            yield from batch
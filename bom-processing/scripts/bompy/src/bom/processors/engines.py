@@ -0,0 +1,117 @@
+"""Interchangeable implementations of the processors' per-source paths.
+
+Each path below is one processor's work on a single source DataFrame. The
+row-wise code the processors have always used is registered as the
+``legacy`` engine of its path. A faster engine registers under its own
+name with the same signature::
+
+    @engines.register("parish", "vectorized")
+    def process_parish_vectorized(processor, df, source_name, parish_mapping,
+                                  week_mapping):
+        ...
+
+Processors call ``engines.implementation(path)``, which is the legacy
+engine unless another one has been enabled for that path (``enable``,
+``use``, or ``bompy run --engine parish=vectorized``). Before a new engine
+is enabled, ``bompy bench shadow`` runs it next to the legacy one and checks
+that they produce the same tables.
+"""
+
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+LEGACY = "legacy"
+
+# Paths and what their engines are called with, for one source:
+#   parish: BillsProcessor, df, source_name, parish_mapping, week_mapping
+#       -> (bill records, subtotal records)
+#   causes: BillsProcessor, df, source_name, week_mapping -> cause records
+#   christenings, christenings_gender: the processor, df, dataset_name
+#       -> None (records are appended to processor.records)
+#   christenings_parish: ChristeningsParishProcessor, df, dataset_name,
+#       parish_mapping, week_mapping -> None (as above)
+PATHS = (
+    "parish",
+    "causes",
+    "christenings",
+    "christenings_gender",
+    "christenings_parish",
+)
+
+_registry: Dict[str, Dict[str, Callable]] = {path: {} for path in PATHS}
+_enabled: Dict[str, str] = {}
+
+
+class EngineError(ValueError):
+    """Raised for an unknown path or engine."""
+
+
+def _check_path(path: str) -> None:
+    if path not in PATHS:
+        raise EngineError(f"Unknown path '{path}' (choose from {', '.join(PATHS)})")
+
+
+def register(path: str, name: str) -> Callable[[Callable], Callable]:
+    """Decorator registering a function (or method) as an engine of a path."""
+    _check_path(path)
+
+    def decorator(function: Callable) -> Callable:
+        _registry[path][name] = function
+        return function
+
+    return decorator
+
+
+def engines(path: str) -> List[str]:
+    """Names of the engines registered for a path."""
+    _check_path(path)
+    return list(_registry[path])
+
+
+def implementation(path: str, name: Optional[str] = None) -> Callable:
+    """The engine ``name`` of a path (default: the enabled one)."""
+    _check_path(path)
+    name = name or _enabled.get(path, LEGACY)
+    try:
+        return _registry[path][name]
+    except KeyError:
+        raise EngineError(
+            f"No '{name}' engine for '{path}' "
+            f"(registered: {', '.join(_registry[path]) or 'none'})"
+        ) from None
+
+
+def enable(path: str, name: str) -> None:
+    """Use engine ``name`` for a path from now on."""
+    implementation(path, name)
+    _enabled[path] = name
+
+
+def enabled() -> Dict[str, str]:
+    """The engine used for each path."""
+    return {path: _enabled.get(path, LEGACY) for path in PATHS}
+
+
+@contextmanager
+def use(selection: Dict[str, str]) -> Iterator[None]:
+    """Enable engines per path for the duration of the block."""
+    previous = dict(_enabled)
+    try:
+        for path, name in selection.items():
+            enable(path, name)
+        yield
+    finally:
+        _enabled.clear()
+        _enabled.update(previous)
+
+
+def parse_selection(options: Iterable[str]) -> Dict[str, str]:
+    """Parse ``path=engine`` options, e.g. from ``--engine parish=fast``."""
+    selection = {}
+    for option in options:
+        path, sep, name = option.partition("=")
+        if not sep or not name:
+            raise EngineError(f"Expected path=engine, got '{option}'")
+        implementation(path, name)
+        selection[path] = name
+    return selection
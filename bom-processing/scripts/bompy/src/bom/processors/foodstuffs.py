@@ -13,8 +13,10 @@ from typing import Dict, List, Optional
 import pandas as pd
 from loguru import logger
 
+from ..contracts import build_table
 from ..models import FoodstuffsRecord
 from ..utils.columns import normalize_column_name
+from ..utils.sections import section
 
 
 class FoodstuffsProcessor:
@@ -61,7 +63,8 @@ class FoodstuffsProcessor:
 
         for dataset_name, df in datasets.items():
             logger.info(f"Processing foodstuffs from {dataset_name}")
-            self._process_single_dataset(df, dataset_name)
+            with section(dataset_name):
+                self._process_single_dataset(df, dataset_name)
 
         logger.info(f"Generated {len(self.records)} foodstuffs records total")
 
@@ -313,7 +316,7 @@ class FoodstuffsProcessor:
         if not self.records:
             return pd.DataFrame()
 
-        return pd.DataFrame([record.to_dict() for record in self.records])
+        return build_table("foodstuffs", self.records)
 
     def save_csv(self, output_path: Path) -> None:
         """
@@ -38,23 +38,20 @@ def normalize_column_name(column_name: str) -> str:
     return normalized
 
 
-def normalize_dataframe_columns(
-    df: pd.DataFrame,
-) -> tuple[pd.DataFrame, Dict[str, str]]:
+def normalize_column_names(columns: List[str]) -> tuple[List[str], Dict[str, str]]:
     """
-    Normalize all column names in a DataFrame while preserving data.
+    Normalize a header, suffixing names that collide after normalization.
 
     Args:
-        df: Input DataFrame
+        columns: Original column names, in order
 
     Returns:
-        Tuple of (normalized DataFrame, column mapping dict)
+        Tuple of (normalized names in the same order, column mapping dict)
     """
-    original_columns = df.columns.tolist()
     column_mapping = {}
 
     new_columns = []
-    for col in original_columns:
+    for col in columns:
         normalized = normalize_column_name(col)
         column_mapping[col] = normalized
         new_columns.append(normalized)
@@ -76,11 +73,27 @@ def normalize_dataframe_columns(
                 final_columns.append(col)
         new_columns = final_columns
 
+    logger.info(f"Normalized {len(columns)} columns")
+    return new_columns, column_mapping
+
+
+def normalize_dataframe_columns(
+    df: pd.DataFrame,
+) -> tuple[pd.DataFrame, Dict[str, str]]:
+    """
+    Normalize all column names in a DataFrame while preserving data.
+
+    Args:
+        df: Input DataFrame
+
+    Returns:
+        Tuple of (normalized DataFrame, column mapping dict)
+    """
+    new_columns, column_mapping = normalize_column_names(df.columns.tolist())
+
     # Create new DataFrame with normalized columns
     df_normalized = df.copy()
     df_normalized.columns = new_columns
-
-    logger.info(f"Normalized {len(original_columns)} columns")
     return df_normalized, column_mapping
 
 
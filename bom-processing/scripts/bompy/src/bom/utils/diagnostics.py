@@ -0,0 +1,140 @@
+"""Aggregated diagnostics for messages repeated per row or per column.
+
+Processors report per-cell problems (an unmatched parish column, a week
+found by shifting the date) with a ``{}`` template and its arguments::
+
+    diagnostics.warning("Could not find parish ID for '{}'", parish_name)
+
+While a ``DiagnosticsCollector`` is active, reports are grouped by the
+section they happen in (see ``bom.utils.sections``) and by template. Each
+template is counted, and its first few arguments are kept as samples.
+When the section exits, one line per template is logged. Arguments are
+only formatted for the samples that are logged.
+
+Without an active collector, or outside any section, each report is
+logged straight away as before.
+"""
+
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from . import sections
+
+# Arguments kept per template for the summary line
+MAX_SAMPLES = 3
+
+_active: Optional["DiagnosticsCollector"] = None
+
+
+@dataclass
+class Occurrences:
+    """How often one template was reported in a section, with samples."""
+
+    level: str
+    template: str
+    count: int = 0
+    samples: List[Tuple] = field(default_factory=list)
+
+    def summary(self, section_name: str) -> str:
+        if self.count == 1:
+            return self.template.format(*self.samples[0])
+        examples = "; ".join(self.template.format(*args) for args in self.samples)
+        if self.count > len(self.samples):
+            examples += "; ..."
+        shape = self.template.replace("{}", "…")
+        return f"{self.count}× {shape} in {section_name} (e.g. {examples})"
+
+
+class DiagnosticsCollector:
+    """Groups diagnostics per section and logs a summary as each one exits.
+
+    Use as a context manager around a run.
+    """
+
+    def __init__(self, max_samples: int = MAX_SAMPLES):
+        self.max_samples = max_samples
+        self.totals: Dict[Tuple[str, str], int] = {}
+        self._pending: Dict[str, Dict[Tuple[str, str], Occurrences]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "DiagnosticsCollector":
+        global _active
+        if _active is not None:
+            raise RuntimeError("A diagnostics collector is already active")
+        sections.activate(self)
+        _active = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        global _active
+        _active = None
+        sections.deactivate(self)
+        self.flush()
+
+    @contextmanager
+    def section(self, entered: sections.Section) -> Iterator[None]:
+        try:
+            yield
+        finally:
+            self.flush(entered.name)
+
+    def add(self, section_name: str, level: str, template: str, args: Tuple) -> None:
+        key = (level, template)
+        with self._lock:
+            pending = self._pending.setdefault(section_name, {})
+            occurrences = pending.get(key)
+            if occurrences is None:
+                occurrences = pending[key] = Occurrences(level, template)
+            occurrences.count += 1
+            if len(occurrences.samples) < self.max_samples:
+                occurrences.samples.append(args)
+            self.totals[key] = self.totals.get(key, 0) + 1
+
+    def flush(self, section_name: Optional[str] = None) -> None:
+        """Log and forget the summaries of one section (default: all)."""
+        with self._lock:
+            if section_name is None:
+                flushed = list(self._pending.items())
+                self._pending.clear()
+            else:
+                flushed = [(section_name, self._pending.pop(section_name, {}))]
+        for name, pending in flushed:
+            for occurrences in pending.values():
+                logger.opt(lazy=True).log(
+                    occurrences.level,
+                    "{}",
+                    lambda o=occurrences, n=name: o.summary(n),
+                )
+
+    def log_summary(self, limit: int = 10) -> None:
+        """Log the most frequent templates over the whole run."""
+        if not self.totals:
+            return
+        logger.info("\n=== Diagnostics ===")
+        ranked = sorted(self.totals.items(), key=lambda item: item[1], reverse=True)
+        for (level, template), count in ranked[:limit]:
+            logger.info(f"{count:>9,}× {level.lower()}: {template.replace('{}', '…')}")
+        if len(ranked) > limit:
+            logger.info(f"   • ... {len(ranked) - limit} more messages")
+
+
+def _report(level: str, template: str, *args) -> None:
+    """Report a diagnostic, collected if a collector and section are active."""
+    entered = sections.current()
+    collector = _active
+    if collector is None or entered is None:
+        logger.opt(depth=2).log(level, template, *args)
+        return
+    collector.add(entered.name, level, template, args)
+
+
+def info(template: str, *args) -> None:
+    _report("INFO", template, *args)
+
+
+def warning(template: str, *args) -> None:
+    _report("WARNING", template, *args)
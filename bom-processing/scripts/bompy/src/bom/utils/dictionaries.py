@@ -0,0 +1,144 @@
+"""Dictionary-encoded record columns with dictionaries shared across sources.
+
+Label fields such as ``source``, ``unique_identifier``, ``count_type``,
+``bill_type``, ``joinid``, ``subtotal_category`` and the month names take a
+few thousand distinct values over millions of records. Wherever records are
+turned into columns (output tables built from their contracts, validation
+frames and Arrow intermediates), these fields become categoricals: one small
+integer code per row, plus each distinct value stored once.
+
+The codes come from a ``SharedDictionary`` per field, held in
+``DICTIONARIES``. Within a run a dictionary only grows, so a value keeps the
+same code in every source, chunk and table that uses the field. Columns
+built at different times differ only in how many categories they list.
+``run_pipeline`` resets the dictionaries when a run starts, so a long-lived
+process does not keep the values of earlier runs. Count fields are built as
+``Int32`` arrays: 4 bytes a row plus a validity mask, where ``Int64`` takes
+8.
+"""
+
+import threading
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DICTIONARY_FIELDS = frozenset(
+    {
+        "source",
+        "source_name",
+        "unique_identifier",
+        "count_type",
+        "bill_type",
+        "joinid",
+        "subtotal_category",
+        "start_month",
+        "end_month",
+    }
+)
+COUNT_FIELDS = frozenset({"count"})
+COUNT_DTYPE = "Int32"
+
+# Fields holding the same kind of value share one dictionary
+_SHARED_WITH = {"source_name": "source"}
+
+
+class SharedDictionary:
+    """Append-only mapping of one field's values to integer codes.
+
+    Values are stored as strings, the way a ``string`` column holds them, so
+    ``1665`` and ``"1665"`` get the same code. None and NaN are missing
+    (code -1).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._categories = pd.Index([], dtype=object)
+
+    def __len__(self) -> int:
+        return len(self._categories)
+
+    @property
+    def categories(self) -> pd.Index:
+        """Every value seen so far, in the order of their codes."""
+        return self._categories
+
+    def encode(self, values: Sequence[Any]) -> Tuple[np.ndarray, pd.Index]:
+        """
+        Code each value, adding the ones not seen before.
+
+        Args:
+            values: Field values, with None for missing
+
+        Returns:
+            Tuple of (int32 codes with -1 for missing, the categories the
+            codes index into)
+        """
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        local, distinct = pd.factorize(array)
+        labels = pd.Index(
+            [v if isinstance(v, str) else str(v) for v in distinct], dtype=object
+        )
+        with self._lock:
+            fresh = labels[~labels.isin(self._categories)].unique()
+            if len(fresh):
+                self._categories = self._categories.append(fresh)
+            categories = self._categories
+        shared = np.append(categories.get_indexer(labels), -1).astype(np.int32)
+        return shared[local], categories
+
+    def categorical(self, values: Sequence[Any]) -> pd.Categorical:
+        """The values as a categorical over this dictionary."""
+        codes, categories = self.encode(values)
+        return pd.Categorical.from_codes(
+            codes, dtype=pd.CategoricalDtype(categories, ordered=False)
+        )
+
+
+class SharedDictionaries:
+    """The shared dictionary of every dictionary-encoded field."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dictionaries: Dict[str, SharedDictionary] = {}
+
+    def get(self, field: str) -> SharedDictionary:
+        """The dictionary a field's values are coded with."""
+        name = _SHARED_WITH.get(field, field)
+        with self._lock:
+            return self._dictionaries.setdefault(name, SharedDictionary())
+
+    def reset(self) -> None:
+        """Drop every dictionary; columns already built keep their categories."""
+        with self._lock:
+            self._dictionaries.clear()
+
+
+DICTIONARIES = SharedDictionaries()
+
+
+def encode_column(field: str, values: Sequence[Any]):
+    """
+    Build a record field's column in its compact form.
+
+    Dictionary fields become categoricals over their shared dictionary and
+    count fields ``Int32`` arrays (``Int64`` if a count does not fit).
+
+    Args:
+        field: Record attribute name
+        values: The field's values, with None for missing
+
+    Returns:
+        The column, or None for other fields and for counts that are not
+        all integers
+    """
+    if field in DICTIONARY_FIELDS:
+        return DICTIONARIES.get(field).categorical(values)
+    if field in COUNT_FIELDS:
+        for dtype in (COUNT_DTYPE, "Int64"):
+            try:
+                return pd.array(values, dtype=dtype)
+            except (TypeError, ValueError, OverflowError):
+                continue
+    return None
@@ -13,6 +13,8 @@ def setup_logging(
     log_dir: Optional[Path] = None,
     log_name: Optional[str] = None,
     console_output: bool = True,
+    enqueue: bool = False,
+    json_output: bool = False,
 ) -> Path:
     """
     Set up structured logging for the processing pipeline.
@@ -22,6 +24,12 @@ def setup_logging(
         log_dir: Directory for log files (defaults to logs/)
         log_name: Base name for log files (defaults to timestamp)
         console_output: Whether to also output to console
+        enqueue: Hand messages to a queue written by a background thread, so
+            logging does not block processing and is safe from worker
+            processes (forked workers inherit the queue; spawned ones call
+            ``init_worker_logging``)
+        json_output: Also write one JSON object per message to
+            ``<log_name>.jsonl`` for machine analysis
 
     Returns:
         Path to the main log file
@@ -29,6 +37,10 @@ def setup_logging(
     # Remove default logger
     logger.remove()
 
+    # Queued sinks use a spawn-context queue, which forked and spawned
+    # workers can both write to
+    queued = {"enqueue": True, "context": "spawn"} if enqueue else {}
+
     # Set up log directory
     if log_dir is None:
         log_dir = Path.cwd() / "logs"
@@ -68,6 +80,7 @@ def setup_logging(
             colorize=True,
             backtrace=False,
             diagnose=False,
+            **queued,
         )
 
     # Add main log file handler
@@ -80,6 +93,7 @@ def setup_logging(
         compression="gz",
         backtrace=True,
         diagnose=True,
+        **queued,
     )
 
     # Add error log file handler (only errors and critical)
@@ -92,15 +106,59 @@ def setup_logging(
         compression="gz",
         backtrace=True,
         diagnose=True,
+        **queued,
     )
 
+    # Add structured JSON log (one serialized record per line)
+    if json_output:
+        json_log_file = log_dir / f"{log_name}.jsonl"
+        logger.add(
+            json_log_file,
+            level=log_level,
+            serialize=True,
+            rotation="50 MB",
+            retention="30 days",
+            compression="gz",
+            **queued,
+        )
+
     # Log setup completion
     logger.info(f"Logging initialized - Main log: {main_log_file}")
     logger.info(f"Error log: {error_log_file}")
+    if json_output:
+        logger.info(f"JSON log: {json_log_file}")
 
     return main_log_file
 
 
+def init_worker_logging(parent_logger) -> None:
+    """
+    Send a spawned worker process's log messages to the parent's sinks.
+
+    Use as the process pool initializer with the parent's ``logger`` as its
+    argument, after ``setup_logging(enqueue=True)`` (only queued loggers can
+    be passed to another process). Forked workers need no initializer.
+    """
+    logger.remove()
+    logger.add(_ForwardToParent(parent_logger), level=0, format="{message}")
+
+
+class _ForwardToParent:
+    """Sink re-emitting a worker's records through the parent's queued logger."""
+
+    _FIELDS = ("name", "function", "line", "module", "file", "process", "thread")
+
+    def __init__(self, parent_logger):
+        self.parent_logger = parent_logger
+
+    def __call__(self, message) -> None:
+        record = message.record
+        fields = {key: record[key] for key in self._FIELDS}
+        self.parent_logger.patch(lambda r: r.update(fields)).opt(
+            exception=record["exception"]
+        ).log(record["level"].name, record["message"])
+
+
 def setup_component_logging(component_name: str, log_level: str = "INFO") -> Path:
     """
     Set up logging for a specific component (e.g., 'bills_processor', 'schema_test').
@@ -153,8 +211,13 @@ def log_validation_results(
     total_records: int,
     valid_records: int,
     validation_errors: list = None,
+    violations=None,
 ):
-    """Log validation results for a component."""
+    """Log validation results for a component.
+
+    Accepts either a list of error strings or a violation frame (``row``,
+    ``rule``, ``value``) from the table-level validators.
+    """
     success_rate = (valid_records / total_records * 100) if total_records > 0 else 0
 
     logger.info(f"🔍 {component} Validation Results:")
@@ -162,6 +225,16 @@ def log_validation_results(
     logger.info(f"   • Valid records: {valid_records:,}")
     logger.info(f"   • Success rate: {success_rate:.1f}%")
 
+    if violations is not None and len(violations) > 0:
+        logger.warning(f"   • Validation errors: {len(violations)}")
+        for rule, count in violations["rule"].value_counts().items():
+            if count:
+                logger.warning(f"     - {rule}: {count:,}")
+        for sample in violations.head(5).itertuples(index=False):
+            logger.warning(
+                f"     - row {sample.row}: {sample.rule} (value={sample.value!r})"
+            )
+
     if validation_errors:
         logger.warning(f"   • Validation errors: {len(validation_errors)}")
         for error in validation_errors[:5]:  # Log first 5 errors
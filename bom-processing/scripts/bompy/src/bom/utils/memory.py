@@ -0,0 +1,284 @@
+"""Memory accounting per pipeline stage and per source.
+
+While a ``MemoryTracker`` is active it records, for every section (see
+``bom.utils.sections``):
+
+- the peak and retained Python allocations, from tracemalloc
+- the process RSS on entry and exit and its peak, sampled by a background
+  thread
+
+It also records the approximate bytes held by each artifact a stage
+returns: record lists, DataFrames and so on. The report is written as
+JSON.
+
+Retained memory is what a section allocated and did not free, which for a
+stage is mostly the artifacts it returns. tracemalloc's peak is process
+wide, so sections are measured one at a time and stages must run serially
+while tracking.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pandas as pd
+from loguru import logger
+
+from . import sections
+
+# Large record lists are sized from this many evenly spaced records
+SIZE_SAMPLE = 2_000
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = None
+
+
+def memory_report_path(log_file: Path) -> Path:
+    """The memory report kept next to a log file: ``<log>_memory.json``."""
+    log_file = Path(log_file)
+    return log_file.with_name(f"{log_file.stem}_memory.json")
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, or None if unavailable."""
+    if _PAGE_SIZE is not None:
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * _PAGE_SIZE
+        except OSError:
+            pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+def estimate_bytes(value: Any) -> int:
+    """
+    Approximate bytes held by an artifact.
+
+    DataFrames and Series report their deep memory usage. Lists, tuples and
+    dicts are sized as the container plus their items; long lists of
+    records are extrapolated from a sample. Objects shared between items
+    (interned strings, small ints) are counted for every item, so the
+    figure is an upper bound.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (list, tuple)):
+        size = sys.getsizeof(value)
+        if len(value) <= SIZE_SAMPLE:
+            return size + sum(estimate_bytes(item) for item in value)
+        step = len(value) / SIZE_SAMPLE
+        sample = [value[int(i * step)] for i in range(SIZE_SAMPLE)]
+        return size + int(sum(estimate_bytes(item) for item in sample) * step)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(k) + estimate_bytes(v) for k, v in value.items()
+        )
+    size = sys.getsizeof(value)
+    attributes = getattr(value, "__dict__", None)
+    if attributes is not None:
+        size += sys.getsizeof(attributes)
+        size += sum(sys.getsizeof(v) for v in attributes.values())
+    return size
+
+
+@dataclass
+class SectionMemory:
+    """Memory measured for one section (summed over repeated entries)."""
+
+    name: str
+    stage: str
+    source: Optional[str]
+    wall_time: float = 0.0
+    traced_peak: int = 0
+    traced_retained: int = 0
+    rss_start: Optional[int] = None
+    rss_end: Optional[int] = None
+    rss_peak: Optional[int] = None
+
+    @property
+    def rss_retained(self) -> Optional[int]:
+        if self.rss_start is None or self.rss_end is None:
+            return None
+        return self.rss_end - self.rss_start
+
+
+class MemoryTracker:
+    """Tracks memory per section for one run.
+
+    Use as a context manager around the run. tracemalloc is started with
+    one frame per allocation (if not already tracing), which slows the run
+    and adds its own memory overhead. With ``trace=False`` only RSS is
+    measured and the traced figures stay at zero.
+    """
+
+    def __init__(self, interval: float = 0.05, trace: bool = True):
+        self.interval = interval
+        self.trace = trace
+        self.sections: Dict[str, SectionMemory] = {}
+        self.artifacts: Dict[str, Dict[str, dict]] = {}
+        self.process: Dict[str, Optional[int]] = {}
+        self._open: List[SectionMemory] = []
+        self._peaks: List[int] = []
+        self._traced_peak = 0
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_tracing = False
+
+    def __enter__(self) -> "MemoryTracker":
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start(1)
+            self._started_tracing = True
+        self.process = {"rss_start": current_rss(), "rss_peak": current_rss()}
+        self._stop.clear()
+        self._sampler = threading.Thread(
+            target=self._sample, name="memory-sampler", daemon=True
+        )
+        self._sampler.start()
+        sections.activate(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        sections.deactivate(self)
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.process["rss_end"] = current_rss()
+        self.process["traced_peak"] = max(
+            self._traced_peak, tracemalloc.get_traced_memory()[1]
+        )
+        if self._started_tracing:
+            tracemalloc.stop()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            rss = current_rss()
+            if rss is None:
+                return
+            self.process["rss_peak"] = max(self.process["rss_peak"] or 0, rss)
+            for record in list(self._open):
+                record.rss_peak = max(record.rss_peak or 0, rss)
+
+    @contextmanager
+    def section(self, entered: sections.Section) -> Iterator[None]:
+        """Measure one section; nested sections are folded into its peak."""
+        record = self.sections.get(entered.name)
+        if record is None:
+            record = self.sections[entered.name] = SectionMemory(
+                name=entered.name, stage=entered.stage, source=entered.source
+            )
+
+        # tracemalloc has a single peak: keep the enclosing section's peak
+        # so far and restart it for this one
+        current, peak = tracemalloc.get_traced_memory()
+        self._traced_peak = max(self._traced_peak, peak)
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        tracemalloc.reset_peak()
+        self._peaks.append(current)
+
+        rss = current_rss()
+        if record.rss_start is None:
+            record.rss_start = rss
+        if rss is not None:
+            record.rss_peak = max(record.rss_peak or 0, rss)
+        self._open.append(record)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record.wall_time += time.perf_counter() - start
+            self._open.remove(record)
+            end, peak = tracemalloc.get_traced_memory()
+            section_peak = max(self._peaks.pop(), peak)
+            self._traced_peak = max(self._traced_peak, peak)
+            record.traced_peak = max(record.traced_peak, section_peak - current)
+            record.traced_retained += end - current
+            record.rss_end = current_rss()
+            if record.rss_end is not None:
+                record.rss_peak = max(record.rss_peak or 0, record.rss_end)
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], section_peak)
+            tracemalloc.reset_peak()
+
+            if entered.outputs:
+                self.artifacts[entered.name] = {
+                    name: _describe_artifact(value)
+                    for name, value in entered.outputs.items()
+                }
+
+    def report(self) -> dict:
+        """The measurements as a JSON-serializable dict."""
+        return {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "process": self.process,
+            "sections": [
+                {**asdict(record), "rss_retained": record.rss_retained}
+                for record in self.sections.values()
+            ],
+            "artifacts": self.artifacts,
+        }
+
+    def write(self, path: Path) -> Path:
+        """Write the report as JSON to ``path``."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2))
+        return path
+
+    def log_summary(self, limit: int = 10) -> None:
+        """Log stage peaks and the largest artifacts."""
+        logger.info("\n=== Memory ===")
+        if self.process.get("rss_peak") is not None:
+            logger.info(f"Peak RSS: {_mb(self.process['rss_peak'])}")
+        logger.info(f"Peak traced: {_mb(self.process.get('traced_peak'))}")
+        for record in self.sections.values():
+            if record.source is not None:
+                continue
+            logger.info(
+                f"{record.stage}: peak {_mb(record.traced_peak)}, "
+                f"retained {_mb(record.traced_retained)}, "
+                f"RSS peak {_mb(record.rss_peak)}"
+            )
+
+        largest = sorted(
+            (
+                (info["bytes"], stage, name)
+                for stage, artifacts in self.artifacts.items()
+                for name, info in artifacts.items()
+            ),
+            reverse=True,
+        )
+        logger.info("Largest artifacts:")
+        for size, stage, name in largest[:limit]:
+            logger.info(f"   • {name} ({stage}): {_mb(size)}")
+
+
+def _describe_artifact(value: Any) -> dict:
+    info = {"type": type(value).__name__, "bytes": estimate_bytes(value)}
+    if isinstance(value, pd.DataFrame):
+        info["rows"] = len(value)
+    elif isinstance(value, (list, tuple, dict)):
+        info["items"] = len(value)
+    return info
+
+
+def _mb(size: Optional[int]) -> str:
+    if size is None:
+        return "n/a"
+    return f"{size / (1024 * 1024):,.1f} MB"
@@ -0,0 +1,322 @@
+"""Counters, timers and histograms for the processors' hot paths.
+
+Metrics are declared once at module level and updated wherever the event
+happens::
+
+    FUZZY_WEEK_MATCHES = metrics.counter(
+        "bom_fuzzy_week_matches_total", "Weeks matched by fuzzy date", ["strategy"]
+    )
+    FUZZY_WEEK_MATCHES.inc(strategy="end_day")
+
+Every sample is labelled with the stage and source of the section it was
+recorded in (see ``bom.utils.sections``), so counts come out per source
+without passing the source name down to the code that records them.
+Explicit ``stage``/``source`` labels take precedence.
+
+The runner resets the registry at the start of a run and writes it at the
+end in Prometheus text format (for a node_exporter textfile collector) and
+as a JSON line appended to a history file for trend tracking.
+"""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from . import sections
+
+SECTION_LABELS = ("stage", "source")
+
+# Default histogram buckets, for small counts such as day offsets
+DEFAULT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+LabelValues = Tuple[str, ...]
+
+
+class Metric:
+    """Base class: a named metric with one sample per label combination."""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = SECTION_LABELS + tuple(
+            label for label in labels if label not in SECTION_LABELS
+        )
+        self._samples: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        unknown = set(labels) - set(self.labels)
+        if unknown:
+            raise ValueError(f"{self.name} has no labels {sorted(unknown)}")
+        entered = sections.current()
+        if entered is not None:
+            labels.setdefault("stage", entered.stage)
+            labels.setdefault("source", entered.source or "")
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    def samples(self) -> List[Tuple[Dict[str, str], object]]:
+        """``(labels, value)`` pairs, sorted by label values."""
+        with self._lock:
+            items = sorted(self._samples.items())
+        return [(dict(zip(self.labels, key)), value) for key, value in items]
+
+
+class Counter(Metric):
+    """A count that only goes up."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._samples[key] = self._samples.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """Total over every sample matching ``labels``."""
+        return sum(
+            value
+            for sample_labels, value in self.samples()
+            if all(sample_labels[k] == str(v) for k, v in labels.items())
+        )
+
+
+class Timer(Metric):
+    """Durations in seconds: count, total and longest."""
+
+    kind = "summary"
+
+    def observe(self, seconds: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            stats = self._samples.get(key)
+            if stats is None:
+                stats = self._samples[key] = [0, 0.0, 0.0]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Time a block (labels are resolved when it starts)."""
+        key_labels = dict(zip(self.labels, self._key(labels)))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **key_labels)
+
+
+class Histogram(Metric):
+    """Observed values counted into cumulative ``le`` buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            stats = self._samples.get(key)
+            if stats is None:
+                stats = self._samples[key] = [[0] * len(self.buckets), 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    stats[0][i] += 1
+            stats[1] += 1
+            stats[2] += value
+
+
+class MetricsRegistry:
+    """The metrics of one process, exported together."""
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self.metrics.get(metric.name)
+            if existing is None:
+                self.metrics[metric.name] = metric
+                return metric
+        if type(existing) is not type(metric) or existing.labels != metric.labels:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        return existing
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._get(Counter(name, help, labels))
+
+    def timer(self, name: str, help: str, labels: Sequence[str] = ()) -> Timer:
+        return self._get(Timer(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get(Histogram(name, help, labels, buckets))
+
+    def reset(self) -> None:
+        """Clear every sample, keeping the registered metrics."""
+        for metric in self.metrics.values():
+            metric.reset()
+
+    def to_prometheus(self) -> str:
+        """The metrics in Prometheus text exposition format."""
+        lines = []
+        for name in sorted(self.metrics):
+            metric = self.metrics[name]
+            lines.append(f"# HELP {name} {_escape_help(metric.help)}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels, value in metric.samples():
+                if isinstance(metric, Counter):
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                elif isinstance(metric, Timer):
+                    count, total, _ = value
+                    lines.append(f"{name}_count{_labels(labels)} {count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+                else:
+                    counts, count, total = value
+                    for bound, bucket in zip(metric.buckets, counts):
+                        bucket_labels = {**labels, "le": _number(bound)}
+                        lines.append(f"{name}_bucket{_labels(bucket_labels)} {bucket}")
+                    inf_labels = {**labels, "le": "+Inf"}
+                    lines.append(f"{name}_bucket{_labels(inf_labels)} {count}")
+                    lines.append(f"{name}_count{_labels(labels)} {count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+        return "".join(f"{line}\n" for line in lines)
+
+    def to_dict(self) -> dict:
+        """The metrics as a JSON-serializable dict keyed by metric name."""
+        exported = {}
+        for name in sorted(self.metrics):
+            metric = self.metrics[name]
+            samples = []
+            for labels, value in metric.samples():
+                labels = {k: v for k, v in labels.items() if v != ""}
+                if isinstance(metric, Counter):
+                    samples.append({"labels": labels, "value": value})
+                elif isinstance(metric, Timer):
+                    count, total, longest = value
+                    samples.append(
+                        {
+                            "labels": labels,
+                            "count": count,
+                            "sum": total,
+                            "max": longest,
+                        }
+                    )
+                else:
+                    counts, count, total = value
+                    samples.append(
+                        {
+                            "labels": labels,
+                            "buckets": dict(zip(map(_number, metric.buckets), counts)),
+                            "count": count,
+                            "sum": total,
+                        }
+                    )
+            exported[name] = {
+                "type": metric.kind,
+                "help": metric.help,
+                "samples": samples,
+            }
+        return exported
+
+    def write(self, path: Path, **run_info) -> List[Path]:
+        """
+        Write ``<path>.prom`` and append a JSON line to ``<path>.jsonl``.
+
+        Args:
+            path: Path without suffix, e.g. ``logs/bom_pipeline_metrics``
+            run_info: Extra fields stored with the JSON line
+
+        Returns:
+            Paths written
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        prom_path = path.with_name(f"{path.name}.prom")
+        prom_path.write_text(self.to_prometheus())
+        history_path = path.with_name(f"{path.name}.jsonl")
+        entry = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            **run_info,
+            "metrics": self.to_dict(),
+        }
+        with open(history_path, "a") as history:
+            history.write(json.dumps(entry) + "\n")
+        return [prom_path, history_path]
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+    """Register (or fetch) a counter in the default registry."""
+    return REGISTRY.counter(name, help, labels)
+
+
+def timer(name: str, help: str, labels: Sequence[str] = ()) -> Timer:
+    """Register (or fetch) a timer in the default registry."""
+    return REGISTRY.timer(name, help, labels)
+
+
+def histogram(
+    name: str,
+    help: str,
+    labels: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    """Register (or fetch) a histogram in the default registry."""
+    return REGISTRY.histogram(name, help, labels, buckets)
+
+
+def metrics_report_path(log_file: Path) -> Path:
+    """Where a run's metrics go: ``<log>_metrics`` (.prom and .jsonl)."""
+    log_file = Path(log_file)
+    return log_file.with_name(f"{log_file.stem}_metrics")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    pairs = [
+        f'{name}="{_escape_value(value)}"' for name, value in labels.items() if value
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
@@ -0,0 +1,76 @@
+"""Load items on a background thread while the caller works on earlier ones.
+
+``prefetch(load, items, depth)`` is a producer–consumer pair: a loader
+thread calls ``load`` on each item in turn and hands the results over a
+queue, and the caller iterates them in order. The loader waits for a free
+slot before it loads anything, so at most ``depth`` results exist at once,
+counting the one the caller is working on. Loading item N+1 then overlaps
+the caller's work on item N without every result being held in memory.
+"""
+
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE = object()
+
+
+def prefetch(load: Callable[[T], R], items: Iterable[T], depth: int = 2) -> Iterator[R]:
+    """
+    Yield ``load(item)`` for each item, loading ahead on a background thread.
+
+    An exception raised by ``load`` is raised to the caller when it reaches
+    that item, and ends the iteration. Closing the iterator early (or
+    breaking out of the loop) stops the loader thread.
+
+    Args:
+        load: Called on the loader thread with each item
+        items: Items to load, in order
+        depth: Most results held at once, including the one being used;
+            1 loads the next item only when the caller asks for it
+
+    Yields:
+        The loaded results, in the order of ``items``
+    """
+    if depth < 1:
+        raise ValueError(f"depth must be at least 1, got {depth}")
+
+    slots = threading.Semaphore(depth)
+    results: queue.Queue = queue.Queue()
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in items:
+                slots.acquire()
+                if stop.is_set():
+                    return
+                try:
+                    results.put((load(item), None))
+                except Exception as e:
+                    results.put((None, e))
+                    return
+        finally:
+            results.put(_DONE)
+
+    loader = threading.Thread(target=produce, name="prefetch", daemon=True)
+    loader.start()
+    try:
+        while True:
+            entry = results.get()
+            if entry is _DONE:
+                return
+            result, error = entry
+            if error is not None:
+                raise error
+            yield result
+            # The caller has moved on; the loader may fill the slot again
+            result = None
+            slots.release()
+    finally:
+        stop.set()
+        slots.release()
+        loader.join()
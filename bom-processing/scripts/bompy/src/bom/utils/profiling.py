@@ -0,0 +1,295 @@
+"""CPU profiling of pipeline stages and per-source processor calls.
+
+While a ``Profiler`` is active, every section (see ``bom.utils.sections``)
+records its own cProfile profile: each pipeline stage, and each processor's
+per-source call inside it as ``<stage>/<source>``. Only the innermost
+section's profiler is enabled at a time (cProfile allows one active
+profiler per process), and a stage's statistics are its own profile plus
+those of its children.
+
+``Profiler.write`` saves, per stage, a pstats file loadable with
+``pstats.Stats`` or snakeviz, and a collapsed-stack file for flamegraph.pl
+or speedscope. cProfile records caller/callee pairs rather than full
+stacks, so the stacks are reconstructed from the call graph by splitting
+each function's time between its callers in proportion to their calls.
+"""
+
+import cProfile
+import pstats
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from . import sections
+
+Func = Tuple[str, int, str]
+
+# Stacks with less own time than this are left out of collapsed files
+MIN_STACK_SECONDS = 1e-4
+MAX_STACK_DEPTH = 64
+
+
+@dataclass
+class SectionProfile:
+    """Profiles and wall time recorded for one section name."""
+
+    name: str
+    profiles: List[cProfile.Profile] = field(default_factory=list)
+    wall_time: float = 0.0
+    calls: int = 0
+
+    def stats(self) -> Optional[pstats.Stats]:
+        stats = None
+        for profile in self.profiles:
+            profile.create_stats()
+            if not profile.stats:
+                continue
+            if stats is None:
+                stats = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+        return stats
+
+
+class Profiler:
+    """Collects per-section cProfile data for one run.
+
+    Use as a context manager around the run; sections are recorded from
+    whichever thread enters them, but only one section runs at a time, so
+    stages must run one after another while profiling.
+    """
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+        self.sections: Dict[str, SectionProfile] = {}
+        self._stack: List[Tuple[str, cProfile.Profile]] = []
+
+    def __enter__(self) -> "Profiler":
+        sections.activate(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        sections.deactivate(self)
+
+    @contextmanager
+    def section(self, entered: sections.Section) -> Iterator[None]:
+        """Profile one section, suspending the enclosing one meanwhile."""
+        full_name = entered.name
+        if self._stack:
+            self._stack[-1][1].disable()
+
+        profile = cProfile.Profile()
+        self._stack.append((full_name, profile))
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            section = self.sections.setdefault(full_name, SectionProfile(full_name))
+            section.profiles.append(profile)
+            section.wall_time += elapsed
+            section.calls += 1
+            if self._stack:
+                self._stack[-1][1].enable()
+
+    @property
+    def stages(self) -> List[str]:
+        """Top-level section names in the order they finished."""
+        return [name for name in self.sections if "/" not in name]
+
+    def children(self, stage: str) -> List[SectionProfile]:
+        return [s for n, s in self.sections.items() if n.startswith(stage + "/")]
+
+    def stage_stats(self, stage: str) -> Optional[pstats.Stats]:
+        """Statistics of a stage including its per-source sections."""
+        stats = self.sections[stage].stats()
+        for child in self.children(stage):
+            child_stats = child.stats()
+            if child_stats is None:
+                continue
+            if stats is None:
+                stats = child_stats
+            else:
+                stats.add(child_stats)
+        return stats
+
+    def write(self) -> List[Path]:
+        """
+        Write ``<stage>.pstats``, ``<stage>.collapsed`` and per-source
+        ``<stage>/<source>.pstats`` files to the output directory.
+
+        Returns:
+            Paths written
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for pattern in ("*.pstats", "*.collapsed"):
+            for stale in self.output_dir.rglob(pattern):
+                stale.unlink()
+        written = []
+        for stage in self.stages:
+            stats = self.stage_stats(stage)
+            if stats is None:
+                continue
+            stats.dump_stats(self.output_dir / f"{_file_name(stage)}.pstats")
+            written.append(self.output_dir / f"{_file_name(stage)}.pstats")
+
+            lines = collapsed_stacks(self.sections[stage].stats())
+            for child in self.children(stage):
+                source = child.name.split("/", 1)[1]
+                child_stats = child.stats()
+                if child_stats is None:
+                    continue
+                child_dir = self.output_dir / _file_name(stage)
+                child_dir.mkdir(exist_ok=True)
+                path = child_dir / f"{_file_name(source)}.pstats"
+                child_stats.dump_stats(path)
+                written.append(path)
+                lines.extend(
+                    f"{_frame_name(source)};{line}"
+                    for line in collapsed_stacks(child_stats)
+                )
+
+            path = self.output_dir / f"{_file_name(stage)}.collapsed"
+            path.write_text("".join(f"{line}\n" for line in lines))
+            written.append(path)
+        return written
+
+    def hot_functions(self, limit: int = 20) -> List[dict]:
+        """
+        Functions ranked by their own (exclusive) time across all stages.
+
+        Returns:
+            Dicts with function, own and cumulative seconds, calls, and the
+            stage the function spent most of its own time in
+        """
+        totals: Dict[Func, dict] = {}
+        for stage in self.stages:
+            stats = self.stage_stats(stage)
+            if stats is None:
+                continue
+            for func, (cc, nc, tt, ct, _) in stats.stats.items():
+                entry = totals.setdefault(
+                    func,
+                    {
+                        "function": _describe(func),
+                        "own": 0.0,
+                        "cumulative": 0.0,
+                        "calls": 0,
+                        "stage": stage,
+                        "_stage_own": 0.0,
+                    },
+                )
+                entry["own"] += tt
+                entry["cumulative"] += ct
+                entry["calls"] += nc
+                if tt > entry["_stage_own"]:
+                    entry["stage"], entry["_stage_own"] = stage, tt
+        ranked = sorted(totals.values(), key=lambda e: e["own"], reverse=True)
+        return [
+            {k: v for k, v in e.items() if not k.startswith("_")}
+            for e in ranked[:limit]
+        ]
+
+    def log_summary(self, limit: int = 20) -> None:
+        """Log stage and source wall times and the hottest functions."""
+        logger.info("\n=== Profile ===")
+        for stage in self.stages:
+            logger.info(f"{stage}: {self.sections[stage].wall_time:.2f}s")
+            children = sorted(
+                self.children(stage), key=lambda s: s.wall_time, reverse=True
+            )
+            for child in children[:5]:
+                logger.info(
+                    f"   • {child.name.split('/', 1)[1]}: {child.wall_time:.2f}s"
+                )
+            if len(children) > 5:
+                logger.info(f"   • ... {len(children) - 5} more sources")
+
+        logger.info(f"Hot functions (own time, top {limit}):")
+        for rank, entry in enumerate(self.hot_functions(limit), start=1):
+            logger.info(
+                f"{rank:>3}. {entry['own']:8.2f}s own {entry['cumulative']:8.2f}s cum "
+                f"{entry['calls']:>11,} calls  {entry['function']}  [{entry['stage']}]"
+            )
+        logger.info(f"Profiles written to {self.output_dir}")
+
+
+def collapsed_stacks(stats: Optional[pstats.Stats]) -> List[str]:
+    """
+    Collapsed ``frame;frame;frame microseconds`` lines from pstats data.
+
+    Each function's own time is split between the paths reaching it in
+    proportion to the time spent under each caller. Recursive calls end a
+    path rather than repeating the frame.
+    """
+    if stats is None:
+        return []
+    entries = stats.stats
+    callees: Dict[Func, List[Func]] = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(func)
+
+    samples: Dict[str, float] = {}
+
+    def visit(func: Func, path: Tuple[str, ...], share: float, seen) -> None:
+        _, _, tt, ct, _ = entries[func]
+        frames = path + (_frame_name(_describe(func)),)
+        own = tt * share
+        if own >= MIN_STACK_SECONDS:
+            key = ";".join(frames)
+            samples[key] = samples.get(key, 0.0) + own
+        if len(frames) >= MAX_STACK_DEPTH:
+            return
+        for callee in callees.get(func, ()):
+            if callee in seen or callee not in entries:
+                continue
+            callee_ct = entries[callee][3]
+            edge_ct = entries[callee][4][func][3]
+            if callee_ct <= 0:
+                continue
+            callee_share = share * edge_ct / callee_ct
+            if edge_ct * share < MIN_STACK_SECONDS:
+                continue
+            visit(callee, frames, callee_share, seen | {callee})
+
+    roots = [func for func, entry in entries.items() if not entry[4]]
+    for root in roots:
+        visit(root, (), 1.0, frozenset({root}))
+    return [
+        f"{stack} {round(seconds * 1e6)}"
+        for stack, seconds in sorted(samples.items())
+        if round(seconds * 1e6) > 0
+    ]
+
+
+def _describe(func: Func) -> str:
+    filename, line, name = func
+    if filename == "~" and line == 0:
+        return name  # built-ins are reported as ('~', 0, '<method ...>')
+    parts = Path(filename).parts
+    for anchor in ("bom", "site-packages"):
+        if anchor in parts:
+            start = len(parts) - parts[::-1].index(anchor)
+            filename = "/".join(parts[start - (anchor == "bom") :])
+            break
+    else:
+        filename = Path(filename).name
+    return f"{filename}:{line}({name})"
+
+
+def _frame_name(name: str) -> str:
+    # ';' separates frames and a trailing space separates the count
+    return name.replace(";", ",").replace(" ", "_")
+
+
+def _file_name(name: str) -> str:
+    return re.sub(r"[^\w.-]+", "_", name)
@@ -0,0 +1,91 @@
+"""Named sections of a run that profiling and accounting tools observe.
+
+Pipeline stages and each processor's per-source work are wrapped in
+``section(name)``. Sections nest, so a source processed inside the
+``bills`` stage is the section ``bills/<source>``. Instruments such as the
+profiler or the memory tracker are activated for the duration of a run and
+see every section that is entered; with none active, ``section`` costs
+next to nothing. Nesting is tracked per thread, so stages running
+concurrently each see their own sources.
+"""
+
+import threading
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+_instruments: List[Any] = []
+_local = threading.local()
+
+
+@dataclass
+class Section:
+    """One entered section.
+
+    Attributes:
+        name: Full name, e.g. ``bills`` or ``bills/<source>``
+        outputs: Artifacts produced by the section, set by pipeline stages
+            so instruments can inspect them on exit
+    """
+
+    name: str
+    outputs: Optional[Dict[str, Any]] = field(default=None, repr=False)
+
+    @property
+    def stage(self) -> str:
+        return self.name.split("/", 1)[0]
+
+    @property
+    def source(self) -> Optional[str]:
+        parts = self.name.split("/", 1)
+        return parts[1] if len(parts) > 1 else None
+
+
+def activate(instrument: Any) -> None:
+    """
+    Start sending sections to an instrument.
+
+    Instruments provide ``section(section)``, a context manager entered
+    and exited with each section.
+    """
+    if instrument in _instruments:
+        raise RuntimeError(f"{type(instrument).__name__} is already active")
+    _instruments.append(instrument)
+
+
+def deactivate(instrument: Any) -> None:
+    """Stop sending sections to an instrument."""
+    if instrument in _instruments:
+        _instruments.remove(instrument)
+
+
+def _stack() -> List[Section]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def current() -> Optional[Section]:
+    """The innermost section open in this thread, if any."""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def section(name: str) -> Iterator[Section]:
+    """Run a block as a section nested in the current one."""
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    entered = Section(f"{parent.name}/{name}" if parent else name)
+    stack.append(entered)
+    try:
+        if not _instruments:
+            yield entered
+            return
+        with ExitStack() as contexts:
+            for instrument in list(_instruments):
+                contexts.enter_context(instrument.section(entered))
+            yield entered
+    finally:
+        stack.pop()
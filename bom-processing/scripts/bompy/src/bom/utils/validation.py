@@ -1,6 +1,7 @@
 """Data validation utilities for PostgreSQL schema compliance."""
 
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import pandas as pd
 from loguru import logger
@@ -13,6 +14,94 @@ from ..models import (
     WeekRecord,
     YearRecord,
 )
+from .dictionaries import encode_column
+
+YEAR_MIN = 1400  # Exclusive lower bound (CHECK year > 1400)
+YEAR_MAX = 1800  # Exclusive upper bound (CHECK year < 1800)
+WEEK_NUMBER_MIN = 1
+WEEK_NUMBER_MAX = 90
+DAY_MIN = 1
+DAY_MAX = 31
+
+VIOLATION_COLUMNS = ["row", "rule", "value"]
+
+
+@dataclass(frozen=True)
+class TableRules:
+    """Column-level constraints checked by the table validators.
+
+    Column names are record attribute names (e.g. ``original_name`` rather
+    than the ``death`` CSV header).
+    """
+
+    required: Tuple[str, ...] = ()
+    year_columns: Tuple[str, ...] = ()
+    week_number_columns: Tuple[str, ...] = ()
+    day_columns: Tuple[str, ...] = ()
+
+    @property
+    def columns(self) -> List[str]:
+        """All columns referenced by these rules, in first-seen order."""
+        seen: Dict[str, None] = {}
+        for group in (
+            self.required,
+            self.year_columns,
+            self.week_number_columns,
+            self.day_columns,
+        ):
+            for col in group:
+                seen.setdefault(col, None)
+        return list(seen)
+
+
+# Mirrors the per-record validators below, keyed by PostgreSQL table name
+TABLE_RULES: Dict[str, TableRules] = {
+    "bill_of_mortality": TableRules(
+        required=("count_type", "year", "joinid", "parish_id"),
+        year_columns=("year",),
+    ),
+    "causes_of_death": TableRules(
+        required=("original_name", "joinid"),
+        year_columns=("year",),
+    ),
+    "christenings": TableRules(
+        required=("christening",),
+        year_columns=("year",),
+        week_number_columns=("week_number",),
+        day_columns=("start_day", "end_day"),
+    ),
+    "week": TableRules(
+        required=("joinid",),
+        year_columns=("year",),
+        week_number_columns=("week_number",),
+        day_columns=("start_day", "end_day"),
+    ),
+    "year": TableRules(year_columns=("year",)),
+}
+
+
+@dataclass
+class TableValidationResult:
+    """Outcome of validating a whole table at once.
+
+    Attributes:
+        valid: Rows that passed every rule (original index preserved)
+        violations: One row per failed check with ``row``, ``rule`` and ``value``
+    """
+
+    valid: pd.DataFrame
+    violations: pd.DataFrame
+
+    @property
+    def valid_positions(self) -> List[int]:
+        """Index labels of valid rows, for selecting from a parallel record list."""
+        return self.valid.index.tolist()
+
+    def rule_counts(self) -> Dict[str, int]:
+        """Number of violations per rule."""
+        if self.violations.empty:
+            return {}
+        return self.violations["rule"].value_counts().to_dict()
 
 
 class SchemaValidator:
@@ -146,75 +235,159 @@ class SchemaValidator:
         return errors
 
     @staticmethod
-    def validate_dataframe_for_postgres(df: pd.DataFrame, table_name: str) -> List[str]:
-        """Validate a DataFrame before PostgreSQL insertion."""
-        errors = []
+    def required_mask(series: pd.Series) -> pd.Series:
+        """Mask of rows where a required value is present (``not value`` is False)."""
+        present = series.notna()
+        if series.dtype == object:
+            present &= series.astype(str) != ""
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            present &= series != ""
+        present &= ~(series == 0).fillna(False).astype(bool)
+        return present
 
-        # Check for duplicate keys based on unique constraints
-        if table_name == "bill_of_mortality":
-            # Unique constraint: (parish_id, count_type, year, joinid)
-            key_cols = ["parish_id", "count_type", "year", "joinid"]
-            if all(col in df.columns for col in key_cols):
-                duplicates = df.duplicated(subset=key_cols)
-                if duplicates.any():
-                    errors.append(
-                        f"Found {duplicates.sum()} duplicate records for unique constraint"
-                    )
+    @staticmethod
+    def range_mask(
+        series: pd.Series, low: int, high: int, inclusive: bool
+    ) -> pd.Series:
+        """Mask of rows that are null or fall within ``low``/``high``."""
+        numeric = pd.to_numeric(series, errors="coerce")
+        if inclusive:
+            in_range = (numeric >= low) & (numeric <= high)
+        else:
+            in_range = (numeric > low) & (numeric < high)
+        return series.isna() | in_range.fillna(False).astype(bool)
 
-        elif table_name == "causes_of_death":
-            # Unique constraint: (original_name, year, joinid)
-            key_cols = ["original_name", "year", "joinid"]
-            if all(col in df.columns for col in key_cols):
-                duplicates = df.duplicated(subset=key_cols)
-                if duplicates.any():
-                    errors.append(
-                        f"Found {duplicates.sum()} duplicate records for unique constraint"
+    @staticmethod
+    def validate_table(df: pd.DataFrame, rules: TableRules) -> TableValidationResult:
+        """
+        Validate every row of a table against column constraints in one pass.
+
+        Each rule is evaluated as a boolean mask over the whole column rather
+        than per record. Columns absent from ``df`` are treated as all-null.
+
+        Args:
+            df: Table to validate (columns named after record attributes)
+            rules: Constraints to apply
+
+        Returns:
+            TableValidationResult with the valid subset and a violation frame
+        """
+        checks: List[Tuple[str, str, pd.Series]] = []
+        null_column = pd.Series(None, index=df.index, dtype=object)
+
+        for col in rules.required:
+            series = df[col] if col in df.columns else null_column
+            checks.append(
+                (f"{col}_required", col, SchemaValidator.required_mask(series))
+            )
+
+        bounds = [
+            (rules.year_columns, YEAR_MIN, YEAR_MAX, False),
+            (rules.week_number_columns, WEEK_NUMBER_MIN, WEEK_NUMBER_MAX, True),
+            (rules.day_columns, DAY_MIN, DAY_MAX, True),
+        ]
+        for columns, low, high, inclusive in bounds:
+            for col in columns:
+                if col not in df.columns:
+                    continue
+                mask = SchemaValidator.range_mask(df[col], low, high, inclusive)
+                checks.append((f"{col}_range", col, mask))
+
+        valid_mask = pd.Series(True, index=df.index)
+        violation_parts = []
+        for rule, col, ok in checks:
+            valid_mask &= ok
+            failed = ~ok
+            if failed.any():
+                values = df[col][failed] if col in df.columns else null_column[failed]
+                violation_parts.append(
+                    pd.DataFrame(
+                        {"row": values.index, "rule": rule, "value": values.to_numpy()}
                     )
+                )
 
-        elif table_name == "christenings":
-            # Unique constraint: (christening, week_number, start_day, start_month, end_day, end_month, year)
-            key_cols = [
-                "christening",
-                "week_number",
-                "start_day",
-                "start_month",
-                "end_day",
-                "end_month",
-                "year",
-            ]
-            if all(col in df.columns for col in key_cols):
-                duplicates = df.duplicated(subset=key_cols)
-                if duplicates.any():
-                    errors.append(
-                        f"Found {duplicates.sum()} duplicate records for unique constraint"
-                    )
+        if violation_parts:
+            violations = pd.concat(violation_parts, ignore_index=True)
+            violations["rule"] = violations["rule"].astype("category")
+        else:
+            violations = pd.DataFrame(columns=VIOLATION_COLUMNS)
+
+        return TableValidationResult(valid=df[valid_mask], violations=violations)
 
-        elif table_name == "parishes":
-            # Unique constraint: parish_name
-            if "parish_name" in df.columns:
-                duplicates = df.duplicated(subset=["parish_name"])
-                if duplicates.any():
-                    errors.append(f"Found {duplicates.sum()} duplicate parish names")
-
-        # Check for NULL values in required fields
-        required_fields = {
-            "bill_of_mortality": ["parish_id", "count_type", "year", "joinid"],
-            "causes_of_death": ["original_name", "joinid"],
-            "christenings": ["christening"],
-            "parishes": ["parish_name", "canonical_name"],
-            "week": ["joinid"],
-            "year": ["year"],
-        }
-
-        if table_name in required_fields:
-            for field in required_fields[table_name]:
-                if field in df.columns:
-                    null_count = df[field].isnull().sum()
-                    if null_count > 0:
-                        errors.append(
-                            f"Found {null_count} NULL values in required field '{field}'"
-                        )
+    @staticmethod
+    def records_to_frame(
+        records: Sequence[Any], columns: Sequence[str]
+    ) -> pd.DataFrame:
+        """
+        Build a column-oriented frame of selected record attributes.
+
+        Label and count attributes take the compact form of
+        ``bom.utils.dictionaries.encode_column``.
+        """
+        data = {}
+        for col in columns:
+            values = [getattr(record, col) for record in records]
+            encoded = encode_column(col, values)
+            data[col] = values if encoded is None else encoded
+        return pd.DataFrame(data, index=pd.RangeIndex(len(records)))
+
+    @staticmethod
+    def validate_records(
+        records: Sequence[Any], table_name: str
+    ) -> TableValidationResult:
+        """
+        Validate a list of records against the table-level rules for a table.
+
+        The ``valid`` frame is positionally indexed, so
+        ``[records[i] for i in result.valid_positions]`` selects the valid records.
+
+        Args:
+            records: Dataclass records (e.g. BillOfMortalityRecord)
+            table_name: Key into TABLE_RULES
+
+        Returns:
+            TableValidationResult for the records
+        """
+        rules = TABLE_RULES[table_name]
+        df = SchemaValidator.records_to_frame(records, rules.columns)
+        return SchemaValidator.validate_table(df, rules)
+
+    @staticmethod
+    def validate_bills_table(df: pd.DataFrame) -> TableValidationResult:
+        """Validate a bill_of_mortality table column-wise."""
+        return SchemaValidator.validate_table(df, TABLE_RULES["bill_of_mortality"])
 
+    @staticmethod
+    def validate_causes_table(df: pd.DataFrame) -> TableValidationResult:
+        """Validate a causes_of_death table column-wise."""
+        return SchemaValidator.validate_table(df, TABLE_RULES["causes_of_death"])
+
+    @staticmethod
+    def validate_dataframe_for_postgres(df: pd.DataFrame, table_name: str) -> List[str]:
+        """
+        Validate a DataFrame before PostgreSQL insertion.
+
+        The checks are compiled from the table's contract in ``bom.contracts``
+        (column types, NOT NULL, enumerations, ranges and unique keys).
+
+        Args:
+            df: Table to validate
+            table_name: Output table name or ProcessingResult table name
+
+        Returns:
+            List of error messages, empty if the table is valid
+        """
+        from ..contracts import TABLE_CONTRACTS, resolve_table_name
+
+        contract = TABLE_CONTRACTS.get(resolve_table_name(table_name))
+        if contract is None:
+            return []
+
+        report = contract.compile().check(df)
+        errors = list(report.schema_errors)
+        for rule, count in report.rule_counts().items():
+            if count:
+                errors.append(f"Found {count} rows violating {rule}")
         return errors
 
     @staticmethod
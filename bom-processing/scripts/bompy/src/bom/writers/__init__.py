@@ -0,0 +1,38 @@
+"""Output writers for the PostgreSQL-ready tables."""
+
+from .csv import write_csv_table
+from .database import AnalyticsDatabase, export_database
+from .delta import DELTA_KEYS, DeltaWriter, TableDelta, write_deltas
+from .parquet import read_parquet_table, write_parquet_chunk, write_parquet_table
+from .sinks import (
+    CSVTableSink,
+    DatabaseTableSink,
+    FanOutSink,
+    ParquetTableSink,
+    TableSink,
+    iter_chunks,
+    open_table_sink,
+)
+
+OUTPUT_FORMATS = ("csv", "parquet", "both")
+
+__all__ = [
+    "DELTA_KEYS",
+    "OUTPUT_FORMATS",
+    "AnalyticsDatabase",
+    "CSVTableSink",
+    "DatabaseTableSink",
+    "DeltaWriter",
+    "FanOutSink",
+    "ParquetTableSink",
+    "TableDelta",
+    "TableSink",
+    "export_database",
+    "iter_chunks",
+    "open_table_sink",
+    "read_parquet_table",
+    "write_csv_table",
+    "write_deltas",
+    "write_parquet_chunk",
+    "write_parquet_table",
+]
@@ -0,0 +1,22 @@
+"""CSV output for the PostgreSQL-ready tables."""
+
+from pathlib import Path
+
+import pandas as pd
+
+
+def write_csv_table(df: pd.DataFrame, output_dir: Path, table_name: str) -> Path:
+    """
+    Write one table as ``<output_dir>/<table_name>.csv``.
+
+    Args:
+        df: Table to write
+        output_dir: Output directory
+        table_name: Output table name
+
+    Returns:
+        Path to the written file
+    """
+    output_file = Path(output_dir) / f"{table_name}.csv"
+    df.to_csv(output_file, index=False)
+    return output_file
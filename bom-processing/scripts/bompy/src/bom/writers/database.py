@@ -0,0 +1,319 @@
+"""Embedded analytics database export.
+
+Writes the output tables to a single SQLite (default) or DuckDB file whose
+core tables mirror the PostgreSQL schema in ``db/migrations`` after all
+migrations: ``year``, ``week``, ``parishes``, ``christenings``,
+``causes_of_death`` and ``bill_of_mortality``, with columns renamed the same
+way the Go updater maps the CSVs. Subtotals, foodstuffs and gender
+christenings, which have no PostgreSQL table, are added with their CSV
+columns. Indexes and precomputed summary tables are built after loading.
+
+DuckDB is optional (``pip install bom-processing[duckdb]``) and used when the file name ends
+in ``.duckdb``.
+"""
+
+import os
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+from loguru import logger
+
+from ..contracts import BOOLEAN_DTYPE, INTEGER_DTYPE, TABLE_CONTRACTS
+
+
+@dataclass(frozen=True)
+class DatabaseTable:
+    """How an output table is stored in the analytics database.
+
+    Attributes:
+        name: Database table name
+        rename: Output column -> database column
+        drop: Output columns not stored in the database
+        ddl: CREATE TABLE statement; generated from the contract if None
+    """
+
+    name: str
+    rename: Dict[str, str] = field(default_factory=dict)
+    drop: tuple = ()
+    ddl: Optional[str] = None
+
+
+DATABASE_TABLES: Dict[str, DatabaseTable] = {
+    "years": DatabaseTable(
+        name="year",
+        ddl="""
+        CREATE TABLE year (
+            year INTEGER PRIMARY KEY CHECK (year > 1400 AND year < 1800)
+        )""",
+    ),
+    "weeks": DatabaseTable(
+        name="week",
+        ddl="""
+        CREATE TABLE week (
+            joinid TEXT PRIMARY KEY,
+            start_day INTEGER CHECK (start_day BETWEEN 1 AND 31),
+            start_month TEXT,
+            end_day INTEGER CHECK (end_day BETWEEN 1 AND 31),
+            end_month TEXT,
+            year INTEGER REFERENCES year(year),
+            week_number INTEGER CHECK (week_number BETWEEN 1 AND 90),
+            split_year TEXT,
+            unique_identifier TEXT,
+            week_id TEXT,
+            year_range TEXT
+        )""",
+    ),
+    "parishes": DatabaseTable(
+        name="parishes",
+        ddl="""
+        CREATE TABLE parishes (
+            id INTEGER PRIMARY KEY,
+            parish_name TEXT NOT NULL UNIQUE,
+            canonical_name TEXT NOT NULL,
+            bills_subunit TEXT,
+            foundation_year TEXT,
+            notes TEXT
+        )""",
+    ),
+    "christenings_by_parish": DatabaseTable(
+        name="christenings",
+        rename={"parish_name": "christening", "week": "week_number"},
+        drop=("start_year", "end_year", "count_type"),
+        ddl="""
+        CREATE TABLE christenings (
+            christening TEXT NOT NULL,
+            count INTEGER,
+            week_number INTEGER,
+            start_month TEXT,
+            end_month TEXT,
+            year INTEGER REFERENCES year(year),
+            start_day INTEGER,
+            end_day INTEGER,
+            missing BOOLEAN,
+            illegible BOOLEAN,
+            source TEXT,
+            bill_type TEXT,
+            joinid TEXT REFERENCES week(joinid),
+            unique_identifier TEXT,
+            UNIQUE (christening, week_number, start_day, start_month,
+                    end_day, end_month, year, bill_type)
+        )""",
+    ),
+    "causes_of_death": DatabaseTable(
+        name="causes_of_death",
+        rename={"death": "original_name", "joinid": "week_id", "edited_cause": "name"},
+        drop=("descriptive_text",),
+        ddl="""
+        CREATE TABLE causes_of_death (
+            original_name TEXT,
+            count INTEGER,
+            year INTEGER REFERENCES year(year),
+            week_id TEXT NOT NULL REFERENCES week(joinid),
+            source_name TEXT,
+            definition TEXT,
+            definition_source TEXT,
+            bill_type TEXT NOT NULL DEFAULT 'weekly',
+            name TEXT,
+            UNIQUE (original_name, year, week_id, source_name, bill_type)
+        )""",
+    ),
+    "all_bills": DatabaseTable(
+        name="bill_of_mortality",
+        rename={"joinid": "week_id"},
+        ddl="""
+        CREATE TABLE bill_of_mortality (
+            parish_id INTEGER NOT NULL REFERENCES parishes(id),
+            count_type TEXT NOT NULL,
+            count INTEGER,
+            year INTEGER NOT NULL REFERENCES year(year),
+            week_id TEXT NOT NULL REFERENCES week(joinid),
+            bill_type TEXT,
+            missing BOOLEAN,
+            illegible BOOLEAN,
+            source TEXT,
+            unique_identifier TEXT,
+            UNIQUE (parish_id, count_type, year, week_id, source, bill_type)
+        )""",
+    ),
+    "subtotals": DatabaseTable(name="subtotals"),
+    "foodstuffs": DatabaseTable(name="foodstuffs"),
+    "christenings_by_gender": DatabaseTable(name="christenings_by_gender"),
+}
+
+INDEXES = [
+    # Mirrors the PostgreSQL indexes
+    "CREATE INDEX idx_week_year ON week(year)",
+    "CREATE INDEX idx_christenings_year ON christenings(year)",
+    "CREATE INDEX idx_mortality_parish ON bill_of_mortality(parish_id)",
+    "CREATE INDEX idx_mortality_year ON bill_of_mortality(year)",
+    "CREATE INDEX idx_mortality_week ON bill_of_mortality(week_id)",
+    # Common local query paths
+    "CREATE INDEX idx_mortality_year_week ON bill_of_mortality(year, week_id)",
+    "CREATE INDEX idx_mortality_count_type ON bill_of_mortality(count_type)",
+    "CREATE INDEX idx_causes_year_week ON causes_of_death(year, week_id)",
+    "CREATE INDEX idx_christenings_year_week ON christenings(year, joinid)",
+    "CREATE INDEX idx_subtotals_year_week ON subtotals(year, joinid)",
+    "CREATE INDEX idx_subtotals_count_type ON subtotals(count_type)",
+]
+
+SUMMARIES = {
+    "parish_year_summary": """
+        SELECT b.parish_id, p.parish_name, b.year, b.count_type, b.bill_type,
+               SUM(b.count) AS total, COUNT(*) AS records
+        FROM bill_of_mortality b
+        LEFT JOIN parishes p ON p.id = b.parish_id
+        GROUP BY b.parish_id, p.parish_name, b.year, b.count_type, b.bill_type""",
+    "week_summary": """
+        SELECT year, week_id, count_type, bill_type,
+               SUM(count) AS total, COUNT(DISTINCT parish_id) AS parishes
+        FROM bill_of_mortality
+        GROUP BY year, week_id, count_type, bill_type""",
+    "cause_year_summary": """
+        SELECT COALESCE(name, original_name) AS cause, year, bill_type,
+               SUM(count) AS total, COUNT(*) AS records
+        FROM causes_of_death
+        GROUP BY COALESCE(name, original_name), year, bill_type""",
+    "christening_year_summary": """
+        SELECT year, bill_type, SUM(count) AS total, COUNT(*) AS records
+        FROM christenings
+        GROUP BY year, bill_type""",
+}
+
+SUMMARY_INDEXES = [
+    "CREATE INDEX idx_parish_year_summary ON parish_year_summary(year, count_type)",
+    "CREATE INDEX idx_week_summary ON week_summary(year, week_id)",
+    "CREATE INDEX idx_cause_year_summary ON cause_year_summary(year)",
+]
+
+_SQL_TYPES = {INTEGER_DTYPE: "INTEGER", BOOLEAN_DTYPE: "BOOLEAN"}
+_REFERENCES = re.compile(r"\s+REFERENCES\s+\w+\(\w+\)")
+
+
+def contract_ddl(table_name: str, db_name: str) -> str:
+    """Generate a CREATE TABLE statement from an output table contract."""
+    contract = TABLE_CONTRACTS[table_name]
+    columns = []
+    for col in contract.columns:
+        sql_type = _SQL_TYPES.get(col.dtype, "TEXT")
+        not_null = "" if col.nullable else " NOT NULL"
+        columns.append(f"{col.name} {sql_type}{not_null}")
+    for key in contract.unique:
+        columns.append(f"UNIQUE ({', '.join(key)})")
+    return f"CREATE TABLE {db_name} (\n    " + ",\n    ".join(columns) + "\n)"
+
+
+class AnalyticsDatabase:
+    """Single-file SQLite or DuckDB copy of the output tables."""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Database file; ``.duckdb`` selects DuckDB, anything else SQLite.
+                The file is built next to ``path`` and moved into place by
+                ``close()``, so an interrupted run leaves the old file intact.
+        """
+        self.path = Path(path)
+        self.engine = "duckdb" if self.path.suffix == ".duckdb" else "sqlite"
+        self.rows: Dict[str, int] = {}
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        if self._tmp_path.exists():
+            self._tmp_path.unlink()
+
+        if self.engine == "duckdb":
+            try:
+                import duckdb
+            except ImportError as e:
+                raise ImportError(
+                    "DuckDB export requires duckdb: pip install 'bom-processing[duckdb]'"
+                ) from e
+            self._conn = duckdb.connect(str(self._tmp_path))
+        else:
+            # Written from pipeline worker threads, one stage at a time
+            self._conn = sqlite3.connect(self._tmp_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode = OFF")
+            self._conn.execute("PRAGMA synchronous = OFF")
+
+        self._keyed_tables = set()
+        for table_name, table in DATABASE_TABLES.items():
+            ddl = table.ddl or contract_ddl(table_name, table.name)
+            if "UNIQUE" in ddl or "PRIMARY KEY" in ddl:
+                self._keyed_tables.add(table.name)
+            if self.engine == "duckdb":
+                # DuckDB always enforces foreign keys; SQLite only declares
+                # them. Tables are loaded in any order and may hold rows the
+                # Go updater would skip, so leave them out for DuckDB.
+                ddl = _REFERENCES.sub("", ddl)
+            self._conn.execute(ddl)
+
+    def write_frame(self, table_name: str, df: pd.DataFrame) -> None:
+        """
+        Insert rows of an output table.
+
+        Rows that repeat a unique key already in the database are skipped,
+        keeping the first one.
+
+        Args:
+            table_name: Output table name (e.g. "all_bills")
+            df: Rows with the output table's columns
+        """
+        table = DATABASE_TABLES.get(table_name)
+        if table is None or df.empty:
+            return
+
+        frame = df.drop(columns=[c for c in table.drop if c in df.columns])
+        frame = frame.rename(columns=table.rename)
+        columns = ", ".join(frame.columns)
+        insert = "INSERT OR IGNORE" if table.name in self._keyed_tables else "INSERT"
+
+        if self.engine == "duckdb":
+            self._conn.register("chunk", frame)
+            self._conn.execute(
+                f"{insert} INTO {table.name} ({columns}) SELECT {columns} FROM chunk"
+            )
+            self._conn.unregister("chunk")
+        else:
+            placeholders = ", ".join("?" for _ in frame.columns)
+            rows = frame.astype(object).where(frame.notna(), None)
+            self._conn.executemany(
+                f"{insert} INTO {table.name} ({columns}) VALUES ({placeholders})",
+                rows.itertuples(index=False, name=None),
+            )
+        self.rows[table.name] = self.rows.get(table.name, 0) + len(frame)
+
+    def close(self) -> Path:
+        """Build indexes and summaries, then move the file into place."""
+        for statement in INDEXES:
+            self._conn.execute(statement)
+        for name, query in SUMMARIES.items():
+            self._conn.execute(f"CREATE TABLE {name} AS {query}")
+        for statement in SUMMARY_INDEXES:
+            self._conn.execute(statement)
+        if self.engine == "sqlite":
+            self._conn.execute("ANALYZE")
+        self._conn.commit()
+        self._conn.close()
+
+        os.replace(self._tmp_path, self.path)
+        logger.info(f"✓ Analytics database ({self.engine}) → {self.path}")
+        return self.path
+
+
+def export_database(path: Path, tables: Dict[str, pd.DataFrame]) -> Path:
+    """
+    Write output tables to an analytics database file.
+
+    Args:
+        path: Database file (``.duckdb`` for DuckDB, otherwise SQLite)
+        tables: Output tables by name; tables without a mapping are ignored
+
+    Returns:
+        Path to the database file
+    """
+    database = AnalyticsDatabase(path)
+    for table_name, df in tables.items():
+        database.write_frame(table_name, df)
+    return database.close()
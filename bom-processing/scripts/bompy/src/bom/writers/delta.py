@@ -0,0 +1,278 @@
+"""Incremental (delta) output for the Go database updater.
+
+The updater in ``db/updater`` upserts every row of every CSV on each run.
+With delta output, each run compares the CSV files it just wrote with the
+keys and row hashes saved by the previous run and writes only what changed:
+
+    delta/<table>.inserts.csv   rows whose key is new
+    delta/<table>.updates.csv   rows whose key exists but whose values changed
+    delta/<table>.deletes.csv   key columns of rows that no longer exist
+
+Keys are the conflict targets the updater upserts on. A key can appear on
+several rows (the updater picks one with ``DISTINCT ON``), so changes are
+detected per key: if any row under a key is added, removed or changed, all
+current rows for that key are written out and the updater makes the same
+choice it would make on a full load.
+
+Rows are hashed as the text written to the CSV, so the result does not
+depend on how the tables were produced (in memory or streamed). Tables are
+read in chunks and the state files hold only keys and 64-bit hashes.
+
+The state a run compares against is what the database last received, not
+what the previous run wrote. A run saves its state as
+``state/<table>.pending.csv``; the updater's ``-delta`` mode promotes it to
+``state/<table>.csv`` once its transaction commits (``bompy ack-delta`` does
+the same after the database was loaded some other way). If a delta is never
+applied, the next run is still computed against the last applied state and
+so includes the changes the unapplied delta held.
+"""
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .sinks import DEFAULT_CHUNK_SIZE
+
+# Output table -> columns the Go updater upserts on (in CSV column names).
+# Only the tables the updater loads are tracked.
+DELTA_KEYS: Dict[str, Tuple[str, ...]] = {
+    "years": ("year",),
+    "weeks": ("joinid",),
+    "parishes": ("id",),
+    "christenings_by_parish": (
+        "parish_name",
+        "week",
+        "start_day",
+        "start_month",
+        "end_day",
+        "end_month",
+        "year",
+        "bill_type",
+    ),
+    "causes_of_death": ("death", "year", "joinid", "source_name", "bill_type"),
+    "all_bills": ("parish_id", "count_type", "year", "joinid", "source", "bill_type"),
+}
+
+DELTA_KINDS = ("inserts", "updates", "deletes")
+STATE_DIR = "state"
+PENDING_SUFFIX = ".pending.csv"
+KEY_HASH = "_key_hash"
+ROW_HASH = "_row_hash"
+
+
+@dataclass
+class TableDelta:
+    """Rows written to each delta file of one table."""
+
+    table_name: str
+    inserts: int = 0
+    updates: int = 0
+    deletes: int = 0
+    paths: Dict[str, Path] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> int:
+        return self.inserts + self.updates + self.deletes
+
+
+def _read_text_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """Read a CSV as raw text, exactly as written."""
+    yield from pd.read_csv(
+        path, dtype=str, keep_default_na=False, na_filter=False, chunksize=chunk_size
+    )
+
+
+def _hash_rows(chunk: pd.DataFrame, key: Tuple[str, ...]) -> Tuple[np.ndarray, ...]:
+    """Return (key hashes, row hashes) for a chunk of text rows."""
+    key_hash = pd.util.hash_pandas_object(chunk[list(key)], index=False).to_numpy()
+    row_hash = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+    return key_hash, row_hash
+
+
+def _key_digests(key_hash: np.ndarray, row_hash: np.ndarray) -> pd.Series:
+    """Order-insensitive digest of all row hashes under each key."""
+    if len(key_hash) == 0:
+        return pd.Series([], dtype="uint64")
+    return pd.Series(row_hash, dtype="uint64").groupby(key_hash).sum()
+
+
+class DeltaWriter:
+    """Compute per-table deltas against the state left by the previous run."""
+
+    def __init__(self, delta_dir: Path, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            delta_dir: Directory for the delta files; the key/hash state is
+                kept in its ``state/`` subdirectory
+            chunk_size: Rows read from a table at a time
+        """
+        self.delta_dir = Path(delta_dir)
+        self.state_dir = self.delta_dir / STATE_DIR
+        self.chunk_size = chunk_size
+
+    def state_path(self, table_name: str) -> Path:
+        """State of the rows the database last received."""
+        return self.state_dir / f"{table_name}.csv"
+
+    def pending_path(self, table_name: str) -> Path:
+        """State of this run's rows, until its delta has been applied."""
+        return self.state_dir / f"{table_name}{PENDING_SUFFIX}"
+
+    def write(self, table_name: str, csv_path: Path) -> TableDelta:
+        """
+        Write the delta files for one table and its pending state.
+
+        Without applied state (the first run) every row is an insert.
+
+        Args:
+            table_name: Output table name (a key of ``DELTA_KEYS``)
+            csv_path: The table's CSV output from this run
+
+        Returns:
+            TableDelta with the row counts and paths written
+        """
+        key = DELTA_KEYS[table_name]
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        delta = TableDelta(table_name)
+        for kind in DELTA_KINDS:
+            path = self.delta_dir / f"{table_name}.{kind}.csv"
+            if path.exists():
+                path.unlink()
+
+        # Pass 1: hash the current table
+        key_parts, row_parts = [], []
+        for chunk in _read_text_chunks(csv_path, self.chunk_size):
+            key_hash, row_hash = _hash_rows(chunk, key)
+            key_parts.append(key_hash)
+            row_parts.append(row_hash)
+        key_hashes = np.concatenate(key_parts) if key_parts else np.array([], "uint64")
+        row_hashes = np.concatenate(row_parts) if row_parts else np.array([], "uint64")
+        current = _key_digests(key_hashes, row_hashes)
+
+        previous = self._previous_digests(table_name)
+        status = pd.Series("inserts", index=current.index)
+        if previous is not None:
+            known = current.index.isin(previous.index)
+            changed = (
+                current[known].to_numpy()
+                != previous.reindex(current.index[known]).to_numpy()
+            )
+            status[known] = np.where(changed, "updates", "")
+
+        # Pass 2: write changed rows and the pending state
+        state_tmp = self.pending_path(table_name).with_suffix(".tmp")
+        offset = 0
+        for i, chunk in enumerate(_read_text_chunks(csv_path, self.chunk_size)):
+            chunk_keys = key_hashes[offset : offset + len(chunk)]
+            chunk_rows = row_hashes[offset : offset + len(chunk)]
+            offset += len(chunk)
+
+            chunk_status = status.reindex(chunk_keys).to_numpy()
+            for kind in ("inserts", "updates"):
+                rows = chunk[chunk_status == kind]
+                if len(rows):
+                    self._append(delta, kind, rows)
+
+            state = chunk[list(key)].assign(
+                **{KEY_HASH: chunk_keys, ROW_HASH: chunk_rows}
+            )
+            state.to_csv(
+                state_tmp, mode="w" if i == 0 else "a", header=i == 0, index=False
+            )
+
+        if previous is not None:
+            deleted = set()
+            for chunk in self._read_state(table_name):
+                gone = chunk[~chunk[KEY_HASH].isin(current.index)]
+                gone = gone[~gone[KEY_HASH].isin(deleted)].drop_duplicates(KEY_HASH)
+                if len(gone):
+                    deleted.update(gone[KEY_HASH])
+                    self._append(delta, "deletes", gone[list(key)])
+
+        if not offset:
+            pd.DataFrame(columns=[*key, KEY_HASH, ROW_HASH]).to_csv(
+                state_tmp, index=False
+            )
+        os.replace(state_tmp, self.pending_path(table_name))
+        return delta
+
+    def promote(self) -> List[str]:
+        """
+        Make the pending state the applied state, once the delta files have
+        been applied to the database.
+
+        Returns:
+            Names of the tables whose state was promoted
+        """
+        promoted = []
+        for table_name in DELTA_KEYS:
+            pending = self.pending_path(table_name)
+            if pending.exists():
+                os.replace(pending, self.state_path(table_name))
+                promoted.append(table_name)
+        return promoted
+
+    def _previous_digests(self, table_name: str) -> Optional[pd.Series]:
+        if not self.state_path(table_name).exists():
+            return None
+        key_parts, row_parts = [], []
+        for chunk in self._read_state(table_name):
+            key_parts.append(chunk[KEY_HASH].to_numpy())
+            row_parts.append(chunk[ROW_HASH].to_numpy())
+        if not key_parts:
+            return _key_digests(np.array([], "uint64"), np.array([], "uint64"))
+        return _key_digests(np.concatenate(key_parts), np.concatenate(row_parts))
+
+    def _read_state(self, table_name: str) -> Iterator[pd.DataFrame]:
+        key = DELTA_KEYS[table_name]
+        yield from pd.read_csv(
+            self.state_path(table_name),
+            dtype={**{col: str for col in key}, KEY_HASH: "uint64", ROW_HASH: "uint64"},
+            keep_default_na=False,
+            na_filter=False,
+            chunksize=self.chunk_size,
+        )
+
+    def _append(self, delta: TableDelta, kind: str, rows: pd.DataFrame) -> None:
+        path = self.delta_dir / f"{delta.table_name}.{kind}.csv"
+        first = kind not in delta.paths
+        rows.to_csv(path, mode="w" if first else "a", header=first, index=False)
+        delta.paths[kind] = path
+        setattr(delta, kind, getattr(delta, kind) + len(rows))
+
+
+def write_deltas(output_dir: Path, delta_dir: Path) -> Dict[str, TableDelta]:
+    """
+    Write delta files for every tracked table found in ``output_dir``.
+
+    Args:
+        output_dir: Directory holding this run's CSV outputs
+        delta_dir: Directory for the delta files and saved state
+
+    Returns:
+        TableDelta per table
+    """
+    writer = DeltaWriter(delta_dir)
+    deltas = {}
+    for table_name in DELTA_KEYS:
+        csv_path = Path(output_dir) / f"{table_name}.csv"
+        if not csv_path.exists():
+            logger.warning(f"✗ {table_name}: no CSV output, delta skipped")
+            continue
+        delta = writer.write(table_name, csv_path)
+        deltas[table_name] = delta
+        logger.info(
+            f"Δ {table_name}: {delta.inserts:,} inserts, {delta.updates:,} updates, "
+            f"{delta.deletes:,} deletes"
+        )
+    if deltas:
+        logger.info(
+            "Delta state stays pending until the updater applies these files "
+            "(make db-update-delta)"
+        )
+    return deltas
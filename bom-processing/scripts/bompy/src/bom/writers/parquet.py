@@ -0,0 +1,234 @@
+"""Partitioned Parquet output for the PostgreSQL-ready tables.
+
+Tables are written as hive-partitioned datasets under ``<output>/<table>/``,
+split by ``bill_type`` and ``decade`` where those columns exist, e.g.
+``subtotals/bill_type=general/decade=1660/part-0.parquet``. Rows are sorted
+by year and joinid inside each partition so the row-group statistics on
+those columns let readers skip most of a file.
+
+pyarrow is an optional dependency (``pip install bom-processing[parquet]``)
+and is only imported when Parquet output is requested.
+"""
+
+import shutil
+from pathlib import Path
+from typing import Any, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from ..contracts import BOOLEAN_DTYPE, INTEGER_DTYPE, TABLE_CONTRACTS
+
+DECADE_COLUMN = "decade"
+STATISTICS_COLUMNS = ("year", "joinid")
+ROW_GROUP_SIZE = 64 * 1024
+
+Filter = Tuple[str, str, Any]
+
+
+def _import_pyarrow():
+    """Import pyarrow, raising a helpful error when it is not installed."""
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Parquet output requires pyarrow: pip install 'bom-processing[parquet]'"
+        ) from e
+    return pa, ds, pq
+
+
+def partition_columns(df: pd.DataFrame) -> List[str]:
+    """Partition keys used for a table with the given columns."""
+    columns = []
+    if "bill_type" in df.columns:
+        columns.append("bill_type")
+    if "year" in df.columns:
+        columns.append(DECADE_COLUMN)
+    return columns
+
+
+def arrow_schema(df: pd.DataFrame, table_name: str):
+    """
+    Build the Arrow schema for a table from its contract.
+
+    Integer columns become int64, boolean columns bool and every string
+    column is dictionary-encoded. Columns without a contract keep the type
+    Arrow infers for them.
+    """
+    pa, _, _ = _import_pyarrow()
+    contract = TABLE_CONTRACTS.get(table_name)
+    declared = {col.name: col.dtype for col in contract.columns} if contract else {}
+
+    fields = []
+    for name in df.columns:
+        dtype = declared.get(name)
+        if name == DECADE_COLUMN:
+            arrow_type = pa.int32()
+        elif dtype == INTEGER_DTYPE:
+            arrow_type = pa.int64()
+        elif dtype == BOOLEAN_DTYPE:
+            arrow_type = pa.bool_()
+        elif dtype is not None:
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        else:
+            arrow_type = pa.Schema.from_pandas(df[[name]], preserve_index=False)[0].type
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _declared_columns(df: pd.DataFrame, table_name: str) -> pd.DataFrame:
+    """
+    Undo the compact in-memory forms of ``bom.utils.dictionaries``.
+
+    Counts held as ``Int32`` are written as the declared int64, and
+    categoricals over shared dictionaries only keep the labels in ``df``.
+    """
+    contract = TABLE_CONTRACTS.get(table_name)
+    integers = set(contract.integer_columns) if contract else set()
+    columns = {}
+    for name in df.columns:
+        dtype = df[name].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            columns[name] = df[name].cat.remove_unused_categories()
+        elif (
+            name in integers
+            and dtype != INTEGER_DTYPE
+            and pd.api.types.is_integer_dtype(dtype)
+        ):
+            columns[name] = df[name].astype(INTEGER_DTYPE)
+    return df.assign(**columns) if columns else df
+
+
+def _sort_key(column: pd.Series) -> pd.Series:
+    """Sort categoricals by their labels rather than their codes."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.reorder_categories(sorted(column.cat.categories))
+    return column
+
+
+def write_parquet_table(df: pd.DataFrame, output_dir: Path, table_name: str) -> Path:
+    """
+    Write one table as a partitioned Parquet dataset.
+
+    Args:
+        df: Table to write (already conformed to its contract)
+        output_dir: Directory holding one dataset directory per table
+        table_name: Output table name
+
+    Returns:
+        Path to the dataset directory
+    """
+    table_dir = Path(output_dir) / table_name
+    if table_dir.exists():
+        shutil.rmtree(table_dir)
+
+    write_parquet_chunk(df, table_dir, table_name)
+    return table_dir
+
+
+def write_parquet_chunk(
+    df: pd.DataFrame, table_dir: Path, table_name: str, chunk: int = 0
+) -> None:
+    """
+    Add one chunk of rows to a partitioned Parquet dataset.
+
+    Every chunk writes its own ``part-<chunk>-<n>.parquet`` file in each
+    partition it touches, so chunks can be appended as they are produced.
+
+    Args:
+        df: Rows to write (already conformed to the table contract)
+        table_dir: Dataset directory
+        table_name: Output table name
+        chunk: Chunk number, unique within the dataset
+    """
+    pa, ds, _ = _import_pyarrow()
+
+    partitions = partition_columns(df)
+    frame = _declared_columns(df, table_name)
+    if DECADE_COLUMN in partitions:
+        frame = frame.assign(
+            **{DECADE_COLUMN: (pd.to_numeric(df["year"]) // 10 * 10).astype("Int32")}
+        )
+    sort_keys = [col for col in STATISTICS_COLUMNS if col in frame.columns]
+    if sort_keys:
+        frame = frame.sort_values(sort_keys, kind="stable", key=_sort_key)
+
+    schema = arrow_schema(frame, table_name)
+    table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+
+    file_format = ds.ParquetFileFormat()
+    write_options = file_format.make_write_options(
+        compression="zstd",
+        use_dictionary=True,
+        write_statistics=sort_keys or False,
+    )
+    partitioning = None
+    if partitions:
+        partitioning = ds.partitioning(
+            pa.schema([schema.field(col) for col in partitions]), flavor="hive"
+        )
+
+    ds.write_dataset(
+        table,
+        Path(table_dir),
+        format=file_format,
+        file_options=write_options,
+        partitioning=partitioning,
+        basename_template=f"part-{chunk}-{{i}}.parquet",
+        max_rows_per_group=ROW_GROUP_SIZE,
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+
+def read_parquet_table(
+    path: Path,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[List[Filter]] = None,
+    categorical: bool = True,
+    nullable: bool = True,
+) -> pd.DataFrame:
+    """
+    Read a partitioned Parquet table with column and predicate pushdown.
+
+    Args:
+        path: Dataset directory written by ``write_parquet_table``
+        columns: Columns to read (None for all)
+        filters: Conjunction of ``(column, op, value)`` predicates, e.g.
+            ``[("bill_type", "=", "general"), ("year", ">=", 1660)]``.
+            Partition keys prune directories; year/joinid predicates skip
+            row groups using their statistics.
+        categorical: Keep dictionary-encoded columns as pandas categoricals
+        nullable: Use nullable Int/boolean dtypes; otherwise integer columns
+            with missing values come back as float, as with ``pd.read_csv``
+
+    Returns:
+        DataFrame with the requested columns
+    """
+    pa, ds, pq = _import_pyarrow()
+
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    table = dataset.to_table(
+        columns=list(columns) if columns else None,
+        filter=pq.filters_to_expression(filters) if filters else None,
+    )
+    if not categorical:
+        table = pa.table(
+            [
+                col.cast(col.type.value_type)
+                if pa.types.is_dictionary(col.type)
+                else col
+                for col in table.columns
+            ],
+            names=table.column_names,
+        )
+
+    if not nullable:
+        return table.to_pandas()
+
+    nullable_types = {
+        pa.int32(): pd.Int32Dtype(),
+        pa.int64(): pd.Int64Dtype(),
+        pa.bool_(): pd.BooleanDtype(),
+    }
+    return table.to_pandas(types_mapper=nullable_types.get)
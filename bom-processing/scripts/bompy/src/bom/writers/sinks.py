@@ -0,0 +1,216 @@
+"""Streaming sinks that write an output table chunk by chunk.
+
+A sink is opened once per table, receives records as each source is
+processed and writes them straight to disk, so only the current chunk is
+held in memory. Each chunk is conformed to the table contract and checked
+against it (foreign keys and uniqueness need the whole table, so they are
+only checked within a chunk).
+"""
+
+import shutil
+from abc import ABC, abstractmethod
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+import pandas as pd
+from loguru import logger
+
+from ..contracts import TABLE_CONTRACTS, build_table
+from .database import AnalyticsDatabase
+from .parquet import write_parquet_chunk
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def iter_chunks(
+    records: Iterable[Any], size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[List[Any]]:
+    """Group a stream of records into lists of at most ``size`` records."""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class TableSink(ABC):
+    """Base class for chunked table writers."""
+
+    def __init__(self, output_dir: Path, table_name: str, enforce: bool = False):
+        """
+        Args:
+            output_dir: Output directory
+            table_name: Output table name
+            enforce: Drop rows that violate the table contract
+        """
+        self.output_dir = Path(output_dir)
+        self.table_name = table_name
+        self.enforce = enforce
+        self.rows_written = 0
+        self.chunks_written = 0
+        self.violation_counts: Dict[str, int] = {}
+        self.skipped_rules: Set[str] = set()
+
+        contract = TABLE_CONTRACTS.get(table_name)
+        self._contract = contract
+        self._compiled = contract.compile() if contract else None
+
+    @property
+    @abstractmethod
+    def path(self) -> Path:
+        """Path of the table's output file or directory."""
+
+    def write_records(self, records: List[Any]) -> None:
+        """Write a chunk of records that provide ``to_dict()``."""
+        if records:
+            self.write_frame(build_table(self.table_name, records))
+
+    def write_frame(self, df: pd.DataFrame) -> None:
+        """Conform, check and write a chunk of rows."""
+        if df.empty:
+            return
+
+        if self._contract is not None:
+            self._contract.conform(df)
+            report = self._compiled.check(df)
+            for rule, count in report.rule_counts().items():
+                self.violation_counts[rule] = self.violation_counts.get(rule, 0) + count
+            self.skipped_rules.update(report.skipped)
+            if self.enforce and len(report.invalid_rows) > 0:
+                df = df.drop(index=report.invalid_rows)
+
+        self._write(df)
+        self.rows_written += len(df)
+        self.chunks_written += 1
+
+    def paths(self) -> List[Path]:
+        """Output paths written by this sink."""
+        return [self.path] if self.chunks_written else []
+
+    def close(self) -> List[Path]:
+        """
+        Finish the table and log any contract violations.
+
+        Returns:
+            The output paths written (empty if there were no rows)
+        """
+        if self.skipped_rules:
+            logger.info(
+                f"{self.table_name}: skipped {', '.join(sorted(self.skipped_rules))} "
+                "(chunks are checked without the referenced tables)"
+            )
+        violations = {rule: n for rule, n in self.violation_counts.items() if n}
+        if violations:
+            logger.warning(f"Contract violations for {self.table_name} (per chunk):")
+            for rule, count in violations.items():
+                logger.warning(f"  - {rule}: {count:,} rows")
+        return self.paths()
+
+    @abstractmethod
+    def _write(self, df: pd.DataFrame) -> None:
+        """Write one conformed and checked chunk."""
+
+
+class CSVTableSink(TableSink):
+    """Append chunks to ``<output_dir>/<table>.csv``."""
+
+    @property
+    def path(self) -> Path:
+        return self.output_dir / f"{self.table_name}.csv"
+
+    def _write(self, df: pd.DataFrame) -> None:
+        first = self.chunks_written == 0
+        df.to_csv(self.path, mode="w" if first else "a", header=first, index=False)
+
+
+class ParquetTableSink(TableSink):
+    """Add chunks as new files in a partitioned Parquet dataset."""
+
+    @property
+    def path(self) -> Path:
+        return self.output_dir / self.table_name
+
+    def _write(self, df: pd.DataFrame) -> None:
+        if self.chunks_written == 0 and self.path.exists():
+            shutil.rmtree(self.path)
+        write_parquet_chunk(df, self.path, self.table_name, chunk=self.chunks_written)
+
+
+class DatabaseTableSink(TableSink):
+    """Insert chunks into an analytics database shared by several tables."""
+
+    def __init__(self, database: AnalyticsDatabase, table_name: str, **kwargs):
+        super().__init__(database.path.parent, table_name, **kwargs)
+        self.database = database
+
+    @property
+    def path(self) -> Path:
+        return self.database.path
+
+    def _write(self, df: pd.DataFrame) -> None:
+        self.database.write_frame(self.table_name, df)
+
+
+class FanOutSink(TableSink):
+    """Send every chunk to several sinks for the same table.
+
+    Chunks are conformed and checked once here, then handed to each sink's
+    writer.
+    """
+
+    def __init__(self, sinks: List[TableSink], enforce: bool = False):
+        super().__init__(sinks[0].output_dir, sinks[0].table_name, enforce=enforce)
+        self.sinks = sinks
+
+    @property
+    def path(self) -> Path:
+        return self.sinks[0].path
+
+    def paths(self) -> List[Path]:
+        return [path for sink in self.sinks for path in sink.paths()]
+
+    def _write(self, df: pd.DataFrame) -> None:
+        for sink in self.sinks:
+            sink._write(df)
+            sink.rows_written += len(df)
+            sink.chunks_written += 1
+
+
+def open_table_sink(
+    table_name: str,
+    output_format: str,
+    output_dir: Path,
+    parquet_dir: Path,
+    enforce: bool = False,
+    database: Optional[AnalyticsDatabase] = None,
+) -> TableSink:
+    """
+    Open the sink(s) for one table.
+
+    Args:
+        table_name: Output table name
+        output_format: "csv", "parquet" or "both"
+        output_dir: Directory for CSV files
+        parquet_dir: Directory for Parquet datasets
+        enforce: Drop rows that violate the table contract
+        database: Also insert chunks into this analytics database
+
+    Returns:
+        A TableSink (a FanOutSink when writing to more than one place)
+    """
+    sinks: List[TableSink] = []
+    if output_format in ("csv", "both"):
+        sinks.append(CSVTableSink(output_dir, table_name))
+    if output_format in ("parquet", "both"):
+        sinks.append(ParquetTableSink(parquet_dir, table_name))
+    if not sinks:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if database is not None:
+        sinks.append(DatabaseTableSink(database, table_name))
+
+    if len(sinks) == 1:
+        sinks[0].enforce = enforce
+        return sinks[0]
+    return FanOutSink(sinks, enforce=enforce)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Tests for the Arrow CSV parser and its column type plan."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.loaders import CSVLoader
+from bom.loaders.csv_loader import _read_column_names
+from bom.loaders.dtypes import dtype_plan
+
+HEADER = (
+    "Omeka Item #,Year,is_missing,is_illegible,Week,Unique ID,Start Month,"
+    "St Alban Woodstreet - Buried,is_missing,is_illegible,Plague,Cause,"
+    "Drowned (Descriptive Text),Padded,Empty"
+)
+ROWS = [
+    "1,1665,,,1,BL-1665-01,December,3,,1,2,Aged,1,1,",
+    "2,1665,1,,2,BL-1665-02,January,,1,,9.5,Fever,,2.0,",
+    "3,1666,,,3,BL-1666-03,,0,,,4,7, in the Thames, 3 ,",
+]
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "2025-01-01-BLV1-weeklybills-parishes.csv"
+    path.write_text("\n".join([HEADER, *ROWS]) + "\n")
+    return path
+
+
+def test_plan_follows_column_roles():
+    assert dtype_plan(
+        ["year", "start_month", "is_missing_3", "unique_identifier", "aged"]
+    ) == {
+        "year": "Int64",
+        "start_month": "category",
+        "is_missing_3": "boolean",
+        "unique_identifier": "str",
+        "aged": "Int64",
+    }
+    assert dtype_plan(["drowned_descriptive_text"]) == {
+        "drowned_descriptive_text": "str"
+    }
+
+
+def test_arrow_types_columns_by_plan(csv_path):
+    df, info = CSVLoader("arrow").load(csv_path)
+    legacy, legacy_info = CSVLoader().load(csv_path)
+    assert list(df.columns) == list(legacy.columns) == info.normalized_columns
+    assert info.row_count == 3
+
+    assert df["year"].dtype == "Int64"
+    assert df["st_alban_woodstreet_buried"].tolist() == [3, pd.NA, 0]
+    assert df["start_month"].dtype == "category"
+    assert df["is_missing"].dtype == "boolean"
+    assert df["is_missing"].tolist() == [pd.NA, True, pd.NA]
+    assert df["is_illegible_1"].tolist() == [True, pd.NA, pd.NA]
+    # Whole numbers, however written, are counts
+    assert df["padded"].dtype == "Int64"
+    assert df["padded"].tolist() == [1, 2, 3]
+
+
+def test_arrow_keeps_pandas_types_where_plan_does_not_fit(csv_path):
+    df, _ = CSVLoader("arrow").load(csv_path)
+    legacy, _ = CSVLoader().load(csv_path)
+    for column in ("plague", "cause", "drowned_descriptive_text", "unique_identifier"):
+        assert df[column].dtype == legacy[column].dtype, column
+        pd.testing.assert_series_equal(df[column], legacy[column])
+    # An empty column is what pandas makes of it
+    assert df["empty"].isna().all()
+
+
+def test_column_names_match_pandas(csv_path, tmp_path):
+    assert (
+        _read_column_names(csv_path) == pd.read_csv(csv_path, nrows=0).columns.tolist()
+    )
+    odd = tmp_path / "odd.csv"
+    odd.write_text('﻿"a",a,,a.1,a\n1,2,3,4,5\n')
+    assert _read_column_names(odd) == pd.read_csv(odd, nrows=0).columns.tolist()
+
+
+def test_unknown_parser():
+    with pytest.raises(ValueError, match="Unknown CSV parser"):
+        CSVLoader("polars")
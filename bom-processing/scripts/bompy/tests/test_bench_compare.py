@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for the benchmark regression gate."""
+
+import copy
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.benchmarks import BaselineError, compare_reports
+
+
+def report(bills_seconds=10.0, rss=100.0, records=1000, sha="aaa"):
+    def result(name, seconds, rss_mb):
+        return {
+            "benchmark": name,
+            "scale": 1.0,
+            "seconds": seconds,
+            "records": records,
+            "records_per_sec": records / seconds,
+            "rss_peak_mb": rss_mb,
+        }
+
+    return {
+        "generator_version": 1,
+        "results": [
+            result("bills", bills_seconds, rss),
+            result("foodstuffs", 0.004, 0.5),
+        ],
+        "outputs": [
+            {"scale": 1.0, "table": "all_bills.csv", "bytes": 10, "sha256": sha},
+            {"scale": 1.0, "table": "weeks.csv", "bytes": 5, "sha256": "bbb"},
+        ],
+    }
+
+
+def test_same_run_passes():
+    comparison = compare_reports(report(), report())
+    assert comparison.passed
+    assert comparison.outputs_checked == 2
+    assert "2 tables identical" in comparison.format()
+
+
+def test_slower_and_larger_stages_fail_past_the_threshold():
+    baseline = report()
+    baseline["results"][1]["seconds"] = 0.001  # 4× slower, but 3 ms
+
+    comparison = compare_reports(report(bills_seconds=14, rss=104), baseline, 0.25)
+    regressed = {(c.benchmark, c.metric) for c in comparison.regressions}
+    # RSS grew 4%, and foodstuffs only by milliseconds
+    assert regressed == {("bills", "seconds"), ("bills", "records_per_sec")}
+    assert not comparison.passed
+    text = comparison.format()
+    assert "+40.0%  ✗ regression" in text
+    assert "FAIL: 2 regressions past 25%" in text
+
+    assert compare_reports(report(bills_seconds=14), baseline, 0.5).passed
+    assert not compare_reports(report(rss=200), baseline).passed
+
+
+def test_changed_outputs_fail():
+    current = report(records=999, sha="ccc")
+    del current["outputs"][1]
+    comparison = compare_reports(current, report())
+    assert comparison.output_diffs == [
+        "bills at scale 1: 999 records, baseline 1,000",
+        "foodstuffs at scale 1: 999 records, baseline 1,000",
+        "all_bills.csv at scale 1: 10 bytes, baseline 10 " "(sha256 ccc, baseline aaa)",
+        "weeks.csv at scale 1: not written",
+    ]
+    assert not comparison.passed
+
+    skipped = copy.deepcopy(report())
+    skipped["outputs"] = []
+    assert compare_reports(skipped, report()).outputs_checked == 0
+
+
+def test_baseline_from_another_generator_is_refused():
+    old = report()
+    old["generator_version"] = 0
+    with pytest.raises(BaselineError):
+        compare_reports(report(), old)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Tests for per-source checkpoints and resuming failed runs."""
+
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.benchmarks.synthetic import generate_corpus
+from bom.loaders import REGISTRY, CSVLoader
+from bom.pipeline import (
+    RunContext,
+    RunFilter,
+    SourceFailuresError,
+    build_pipeline,
+    run_pipeline,
+)
+from bom.pipeline.checkpoints import FAILURES_FILE, Checkpoints, SourceCheckpoints
+from bom.processors.bills import BillsProcessor
+
+FAILING = "synthetic-00003-millar-generalbills-parishes.csv"
+
+
+def _tables(run):
+    return {path.name: path.read_bytes() for path in run.artifacts["output_files"]}
+
+
+def _count_loads(monkeypatch) -> Counter:
+    loads = Counter()
+    original = CSVLoader.load
+
+    def load(self, path, *args, **kwargs):
+        loads[Path(path).name] += 1
+        return original(self, path, *args, **kwargs)
+
+    monkeypatch.setattr(CSVLoader, "load", load)
+    return loads
+
+
+def test_source_checkpoints_are_kept_only_when_reused(tmp_path):
+    checkpoints = SourceCheckpoints(tmp_path / "fp")
+    checkpoints.save("a.csv", {"rows": [1, 2]})
+    checkpoints.record_failure("b.csv", ValueError("bad week"))
+    assert "a.csv" in checkpoints and "b.csv" not in checkpoints
+    assert checkpoints.failures() == {"b.csv": "ValueError: bad week"}
+    assert not list(tmp_path.glob("fp/*.tmp"))
+
+    reused = SourceCheckpoints(tmp_path / "fp", reuse=True)
+    assert reused.load("a.csv") == {"rows": [1, 2]}
+    reused.save("b.csv", {"rows": []})
+    assert reused.failures() == {}
+
+    assert "a.csv" not in SourceCheckpoints(tmp_path / "fp")
+
+
+def test_source_checkpoints_are_keyed_by_their_own_source(tmp_path):
+    sources = [tmp_path / "a.csv", tmp_path / "b.csv"]
+    for path in sources:
+        path.write_text("Year\n1665\n")
+
+    def stage(code="code", depends="params"):
+        checkpoints = Checkpoints(tmp_path / "checkpoints", code, sources, True)
+        return checkpoints.stage("bills", depends)
+
+    checkpoints = stage()
+    checkpoints.save("a.csv", "a")
+    checkpoints.save("b.csv", "b")
+
+    # Fixing one source only invalidates its own checkpoint
+    sources[1].write_text("Year\n1666\n")
+    checkpoints = stage()
+    assert "a.csv" in checkpoints and "b.csv" not in checkpoints
+    checkpoints.save("b.csv", "b fixed")
+    assert len(list((tmp_path / "checkpoints" / "bills").glob("b.csv.*"))) == 1
+    assert stage().load("b.csv") == "b fixed"
+
+    # The code and the stage's settings and inputs key every source
+    assert "a.csv" not in stage(code="changed")
+    assert "a.csv" not in stage(depends="changed")
+
+
+@pytest.mark.parametrize("stream, prefetch", [(False, 0), (True, 0), (False, 1)])
+def test_resume_reprocesses_only_the_failed_source(
+    tmp_path, monkeypatch, stream, prefetch
+):
+    source_dir = generate_corpus(tmp_path / "corpus", scale=0.005, seed=3)[0].parent
+    expected = _tables(
+        run_pipeline(source_dir, tmp_path / "clean", stream=stream, cache_dir=None)
+    )
+
+    processed = []
+    original = BillsProcessor.iter_parish_dataframes
+
+    def failing(self, dataframes, *args):
+        for df, source_name in dataframes:
+            processed.append(source_name)
+            if source_name == FAILING and fail:
+                raise ValueError("unreadable week")
+        return original(self, dataframes, *args)
+
+    monkeypatch.setattr(BillsProcessor, "iter_parish_dataframes", failing)
+    cache_dir = tmp_path / "cache"
+    fail = True
+    assert (
+        run_pipeline(
+            source_dir,
+            tmp_path / "out",
+            stream=stream,
+            cache_dir=cache_dir,
+            prefetch=prefetch,
+        )
+        is None
+    )
+    entry = cache_dir / "checkpoints" / "bills"
+    failures = json.loads((entry / FAILURES_FILE).read_text())
+    assert failures == {FAILING: "ValueError: unreadable week"}
+    # <source>.<key>.pkl
+    done = sorted(path.name.rsplit(".", 2)[0] for path in entry.glob("*.pkl"))
+    assert len(done) == 3 and FAILING not in done
+
+    processed.clear()
+    fail = False
+    loads = _count_loads(monkeypatch)
+    run = run_pipeline(
+        source_dir,
+        tmp_path / "out",
+        stream=stream,
+        cache_dir=cache_dir,
+        resume=True,
+        prefetch=prefetch,
+    )
+    assert processed == [FAILING]
+    if prefetch:
+        # Of the sources the same stages read, only the failed one is loaded
+        # again for the bills stage
+        readers = REGISTRY.processors_for(REGISTRY.get_dataset_type(FAILING))
+        same = [
+            name
+            for name in done
+            if REGISTRY.processors_for(REGISTRY.get_dataset_type(name)) == readers
+        ]
+        assert same and all(loads[name] == loads[FAILING] - 1 for name in same)
+    assert _tables(run) == expected
+    assert not (cache_dir / "checkpoints").exists()
+
+
+def test_source_failures_error_names_the_sources(tmp_path, monkeypatch):
+    source_dir = generate_corpus(tmp_path / "corpus", scale=0.005, seed=3)[0].parent
+
+    def failing(self, dataframes, *args):
+        raise KeyError("Year")
+
+    monkeypatch.setattr(BillsProcessor, "iter_parish_dataframes", failing)
+    with pytest.raises(SourceFailuresError, match="failed for 4 source") as e:
+        build_pipeline().run(
+            RunContext(output_dir=tmp_path / "out"),
+            {"source_files": sorted(source_dir.glob("*.csv"))},
+            workers=1,
+        )
+    assert FAILING in str(e.value) and "--resume" not in str(e.value)
+
+
+def test_year_filter_is_part_of_the_load_fingerprint(tmp_path):
+    source_dir = generate_corpus(tmp_path / "corpus", scale=0.005, seed=3)[0].parent
+    cache_dir = tmp_path / "cache"
+    run_pipeline(source_dir, tmp_path / "all", cache_dir=cache_dir)
+    years = (tmp_path / "all" / "years.csv").read_text().split()[1:]
+    year = int(years[0].split(",")[0])
+    assert len(years) > 1
+
+    run = run_pipeline(
+        source_dir,
+        tmp_path / "some",
+        cache_dir=cache_dir,
+        run_filter=RunFilter(years=(year, year)),
+    )
+    # load itself is never cached; its fingerprint reaches the stages after it
+    assert not (cache_dir / "load").exists()
+    assert "entities" in run.ran and "entities" not in run.cached
+    filtered = (tmp_path / "some" / "years.csv").read_text().split()[1:]
+    assert [int(row.split(",")[0]) for row in filtered] == [year]
+
+
+def test_engine_selection_keys_the_cache_and_checkpoints(tmp_path, monkeypatch):
+    source_dir = generate_corpus(tmp_path / "corpus", scale=0.005, seed=3)[0].parent
+    cache_dir = tmp_path / "cache"
+    columnar = {"christenings": "columnar"}
+    run_pipeline(source_dir, tmp_path / "out", cache_dir=cache_dir, engines=columnar)
+    again = run_pipeline(
+        source_dir, tmp_path / "out", cache_dir=cache_dir, engines=columnar
+    )
+    assert "christenings" in again.cached
+    legacy = run_pipeline(source_dir, tmp_path / "out", cache_dir=cache_dir)
+    assert "christenings" in legacy.ran and "christenings" not in legacy.cached
+
+    processed = []
+    original = BillsProcessor.iter_parish_dataframes
+
+    def failing(self, dataframes, *args):
+        for df, source_name in dataframes:
+            processed.append(source_name)
+            if source_name == FAILING and fail:
+                raise ValueError("unreadable week")
+        return original(self, dataframes, *args)
+
+    monkeypatch.setattr(BillsProcessor, "iter_parish_dataframes", failing)
+    fail = True
+    failed_dir = tmp_path / "failed"
+    assert (
+        run_pipeline(
+            source_dir, tmp_path / "out", cache_dir=failed_dir, engines=columnar
+        )
+        is None
+    )
+    # Resuming with other engines reprocesses every source
+    processed.clear()
+    fail = False
+    run_pipeline(source_dir, tmp_path / "out", cache_dir=failed_dir, resume=True)
+    assert len(processed) == 4 and FAILING in processed
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Tests for the declarative output table contracts."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.contracts import TABLE_CONTRACTS, build_table, check_tables
+from bom.models import WeekRecord
+from bom.utils.validation import SchemaValidator
+
+
+def _bills() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "parish_id": [1, 2, 99, 1],
+            "count_type": ["buried", "plague", "baptised", "buried"],
+            "count": [3, None, 1, 3],
+            "year": [1665, 1665, 1900, 1665],
+            "joinid": ["1665010316650110"] * 3 + ["1665010316650110"],
+            "bill_type": ["weekly", "weekly", "weekly", "weekly"],
+            "missing": [False, False, False, False],
+            "illegible": [False, False, False, False],
+            "source": ["a", "a", "a", "a"],
+            "unique_identifier": ["x", "x", "x", "x"],
+        }
+    )
+
+
+def _references() -> dict:
+    return {
+        "parishes": pd.DataFrame({"id": [1, 2]}),
+        "weeks": pd.DataFrame({"joinid": ["1665010316650110"]}),
+        "years": pd.DataFrame({"year": [1665]}),
+    }
+
+
+def test_conform_casts_integer_columns():
+    df = _bills()
+    assert df["count"].dtype == "float64"
+    TABLE_CONTRACTS["all_bills"].conform(df)
+    assert df["count"].dtype == "Int64"
+    assert df.to_csv(index=False).splitlines()[2].split(",")[2] == ""
+
+
+def test_build_table_uses_declared_dtypes(tmp_path):
+    week = dict(
+        start_day=3,
+        start_month="january",
+        end_day=10,
+        end_month="january",
+        split_year="1665",
+        unique_identifier=None,
+        week_id="1665-1666-1",
+        year_range="1665-1666",
+    )
+    weeks = [
+        WeekRecord(joinid="1665010316650110", year=1665, week_number=1, **week),
+        WeekRecord(joinid="1665011016650117", year=None, week_number=None, **week),
+    ]
+    df = build_table("weeks", weeks)
+
+    assert df["year"].dtype == "Int64"
+    assert df["week_number"].dtype == "Int64"
+    assert isinstance(df["joinid"].dtype, pd.CategoricalDtype)
+    assert df["start_month"].tolist() == ["january", "january"]
+    df.to_csv(tmp_path / "weeks.csv", index=False)
+    assert ".0" not in (tmp_path / "weeks.csv").read_text()
+
+    bills = _bills().to_dict("records")
+    built = TABLE_CONTRACTS["all_bills"].build(bills)
+    assert built["missing"].dtype == "boolean"
+    # Values outside the declared choices are kept for check() to report
+    assert built["count_type"].dtype == "string"
+    assert built["count_type"].tolist()[2] == "baptised"
+    assert isinstance(built["bill_type"].dtype, pd.CategoricalDtype)
+    assert list(built["bill_type"].cat.categories) == ["weekly", "general"]
+    assert built["count"].dtype == "Int32"
+    assert built["joinid"].cat.codes[0] == df["joinid"].cat.codes[0]
+
+
+def test_check_reports_each_rule():
+    df = TABLE_CONTRACTS["all_bills"].conform(_bills())
+    tables = {"all_bills": df, **_references()}
+    report = check_tables(tables)["all_bills"]
+
+    assert report.schema_errors == []
+    assert report.rule_counts() == {
+        "count_type_choices": 1,
+        "year_range": 1,
+        "year_fk_years": 1,
+        "parish_id_fk_parishes": 1,
+        "unique_parish_id_count_type_year_joinid_source_bill_type": 1,
+    }
+    assert sorted(report.invalid_rows) == [2, 3]
+
+
+def test_foreign_keys_skipped_without_references():
+    df = TABLE_CONTRACTS["all_bills"].conform(_bills())
+    report = TABLE_CONTRACTS["all_bills"].compile().check(df)
+    assert not any("_fk_" in rule for rule in report.rule_counts())
+    assert sorted(report.skipped) == [
+        "joinid_fk_weeks",
+        "parish_id_fk_parishes",
+        "year_fk_years",
+    ]
+
+    report = TABLE_CONTRACTS["all_bills"].compile().check(df, _references())
+    assert report.skipped == []
+
+
+def test_christenings_unique_key_matches_the_database():
+    row = dict(
+        christening="Christened",
+        count=5,
+        week_number=1,
+        start_month="January",
+        end_month="January",
+        year=1665,
+        start_day=3,
+        end_day=10,
+        bill_type="weekly",
+    )
+    df = pd.DataFrame([row, row, {**row, "bill_type": "general"}])
+    report = TABLE_CONTRACTS["christenings"].compile().check(df)
+    assert list(report.rule_counts()) == [
+        "unique_christening_week_number_start_day_start_month_end_day_"
+        "end_month_year_bill_type"
+    ]
+    assert list(report.invalid_rows) == [1]
+
+    by_parish = df.rename(columns={"christening": "parish_name", "week_number": "week"})
+    report = TABLE_CONTRACTS["christenings_by_parish"].compile().check(by_parish)
+    assert list(report.invalid_rows) == [1]
+
+
+def test_schema_errors_for_column_order():
+    df = _bills()
+    df = df[list(reversed(df.columns))]
+    report = TABLE_CONTRACTS["all_bills"].compile().check(df)
+    assert len(report.schema_errors) == 1
+    assert "column order" in report.schema_errors[0]
+
+
+def test_validate_dataframe_for_postgres_uses_contract():
+    df = TABLE_CONTRACTS["all_bills"].conform(_bills())
+    errors = SchemaValidator.validate_dataframe_for_postgres(df, "bill_of_mortality")
+    assert "Found 1 rows violating count_type_choices" in errors
+    assert SchemaValidator.validate_dataframe_for_postgres(df, "unknown") == []
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Tests for loading CSVs whole and in chunks."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.loaders import CSVLoader
+from bom.utils.columns import filter_relevant_columns, normalize_dataframe_columns
+
+
+def write_csv(path: Path, rows: int = 25) -> Path:
+    pd.DataFrame(
+        {
+            "Omeka Item #": range(rows),
+            "Year": [1665 + i % 3 for i in range(rows)],
+            "Week Number": range(1, rows + 1),
+            "St Alban Wood Street": [i * 2 for i in range(rows)],
+            "st alban wood street": [None if i % 5 else i for i in range(rows)],
+            "Image Filename": ["x.jpg"] * rows,
+        }
+    ).to_csv(path, index=False)
+    return path
+
+
+def test_load_matches_normalize_then_filter(tmp_path):
+    path = write_csv(tmp_path / "2025-01-01-BLV1-weeklybills-parishes.csv")
+    expected = filter_relevant_columns(
+        normalize_dataframe_columns(pd.read_csv(path))[0]
+    )
+
+    df, info = CSVLoader().load(path)
+    pd.testing.assert_frame_equal(df, expected)
+    assert info.normalized_columns == [
+        "year",
+        "week_number",
+        "st_alban_wood_street",
+        "st_alban_wood_street_1",
+    ]
+    assert len(info.original_columns) == 6
+    assert info.row_count == 25
+    assert info.processing_notes == ["Removed 2 irrelevant columns"]
+
+
+def test_stream_yields_the_loaded_rows_in_chunks(tmp_path):
+    path = write_csv(tmp_path / "2025-01-01-BLV1-weeklybills-parishes.csv")
+    loader = CSVLoader()
+    df, info = loader.load(path)
+
+    chunks, stream_info = loader.stream(path, chunk_rows=10)
+    assert stream_info.dataset_type == info.dataset_type
+    assert stream_info.normalized_columns == info.normalized_columns
+    assert stream_info.row_count == 0
+
+    sizes = []
+    for chunk in chunks:
+        assert list(chunk.columns) == info.normalized_columns
+        sizes.append(len(chunk))
+        assert stream_info.row_count == sum(sizes)
+    assert sizes == [10, 10, 5]
+
+    # Chunk indexes continue, so the chunks concatenate back to the file
+    streamed = pd.concat(list(loader.stream(path, chunk_rows=10)[0]))
+    pd.testing.assert_frame_equal(streamed, df, check_dtype=False)
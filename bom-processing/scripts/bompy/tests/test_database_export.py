@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Tests for the embedded analytics database export."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.writers import export_database
+
+
+def _tables() -> dict:
+    return {
+        "years": pd.DataFrame({"year": [1665]}),
+        "weeks": pd.DataFrame(
+            {
+                "joinid": ["1665010316650110"],
+                "start_day": [3],
+                "start_month": ["January"],
+                "end_day": [10],
+                "end_month": ["January"],
+                "year": [1665],
+                "week_number": [1],
+                "split_year": [None],
+                "unique_identifier": ["1665-1"],
+                "week_id": ["1665-01"],
+                "year_range": ["1665"],
+            }
+        ),
+        "parishes": pd.DataFrame(
+            {
+                "id": [1, 2],
+                "parish_name": ["St Bride", "St Giles"],
+                "canonical_name": ["St Bride", "St Giles"],
+                "bills_subunit": [None, None],
+                "foundation_year": [None, None],
+                "notes": [None, None],
+            }
+        ),
+        "all_bills": pd.DataFrame(
+            {
+                "parish_id": [1, 1, 2, 2],
+                "count_type": ["buried", "plague", "plague", "plague"],
+                "count": [10, 4, 7, 9],
+                "year": [1665] * 4,
+                "joinid": ["1665010316650110"] * 4,
+                "bill_type": ["weekly"] * 4,
+                "missing": [False] * 4,
+                "illegible": [False] * 4,
+                "source": ["a", "a", "a", "a"],
+                "unique_identifier": ["x"] * 4,
+            }
+        ),
+        "causes_of_death": pd.DataFrame(
+            {
+                "death": ["Plague", "Feaver"],
+                "count": [11, 2],
+                "year": [1665, 1665],
+                "joinid": ["1665010316650110"] * 2,
+                "descriptive_text": [None, None],
+                "source_name": ["a", "a"],
+                "definition": [None, None],
+                "definition_source": [None, None],
+                "bill_type": ["weekly", "weekly"],
+                "edited_cause": ["Plague", "Fever"],
+            }
+        ),
+    }
+
+
+def test_export_mirrors_postgres_schema(tmp_path):
+    path = export_database(tmp_path / "bom.sqlite", _tables())
+    conn = sqlite3.connect(path)
+
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(causes_of_death)")]
+    assert "original_name" in columns and "name" in columns
+    assert "descriptive_text" not in columns
+
+    # Second plague row for parish 2 repeats the unique key and is skipped
+    assert conn.execute("SELECT COUNT(*) FROM bill_of_mortality").fetchone() == (3,)
+    assert not (tmp_path / "bom.sqlite.tmp").exists()
+
+
+def test_indexes_and_summaries(tmp_path):
+    path = export_database(tmp_path / "bom.sqlite", _tables())
+    conn = sqlite3.connect(path)
+
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    assert {
+        "idx_mortality_year_week",
+        "idx_mortality_parish",
+        "idx_mortality_count_type",
+    } <= indexes
+
+    plague = conn.execute(
+        "SELECT parish_name, total FROM parish_year_summary "
+        "WHERE year = 1665 AND count_type = 'plague' ORDER BY parish_name"
+    ).fetchall()
+    assert plague == [("St Bride", 4), ("St Giles", 7)]
+    causes = dict(
+        conn.execute("SELECT cause, total FROM cause_year_summary").fetchall()
+    )
+    assert causes == {"Plague": 11, "Fever": 2}
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Tests for delta output against the previous run's saved state."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.writers import DeltaWriter, write_csv_table
+
+
+def _bills() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "parish_id": [1, 1, 2, 3, 3],
+            "count_type": ["buried", "plague", "buried", "buried", "buried"],
+            "count": [5, 2, None, 7, 9],
+            "year": [1665] * 5,
+            "joinid": ["166501031665011"] * 5,
+            "bill_type": ["weekly"] * 5,
+            "missing": [False] * 5,
+            "illegible": [False] * 5,
+            "source": ["a", "a", "a", "a", "a"],
+            "unique_identifier": ["a-1", "a-2", "a-3", "a-4", "a-5"],
+        }
+    )
+
+
+def _run(tmp_path: Path, df: pd.DataFrame, chunk_size: int = 2, applied=True):
+    csv_path = write_csv_table(df, tmp_path / "out", "all_bills")
+    writer = DeltaWriter(tmp_path / "delta", chunk_size=chunk_size)
+    delta = writer.write("all_bills", csv_path)
+    if applied:
+        # What the Go updater does once it has committed the delta
+        assert writer.promote() == ["all_bills"]
+    return delta
+
+
+def test_first_run_inserts_everything_then_nothing_changes(tmp_path):
+    (tmp_path / "out").mkdir()
+    first = _run(tmp_path, _bills())
+    assert (first.inserts, first.updates, first.deletes) == (5, 0, 0)
+
+    second = _run(tmp_path, _bills(), chunk_size=3)
+    assert second.changed == 0
+    assert not list((tmp_path / "delta").glob("all_bills.*.csv"))
+
+
+def test_insert_update_delete(tmp_path):
+    (tmp_path / "out").mkdir()
+    _run(tmp_path, _bills())
+
+    changed = _bills()
+    changed.loc[0, "count"] = 6  # update
+    changed = changed.drop(index=1)  # delete (1, plague)
+    changed.loc[10] = changed.loc[2].copy()
+    changed.loc[10, "parish_id"] = 4  # insert
+    delta = _run(tmp_path, changed)
+
+    assert (delta.inserts, delta.updates, delta.deletes) == (1, 1, 1)
+    updates = pd.read_csv(delta.paths["updates"])
+    assert updates[["parish_id", "count"]].values.tolist() == [[1, 6]]
+    deletes = pd.read_csv(delta.paths["deletes"])
+    assert list(deletes.columns) == [
+        "parish_id",
+        "count_type",
+        "year",
+        "joinid",
+        "source",
+        "bill_type",
+    ]
+    assert deletes[["parish_id", "count_type"]].values.tolist() == [[1, "plague"]]
+
+
+def test_duplicate_keys_are_written_together(tmp_path):
+    (tmp_path / "out").mkdir()
+    _run(tmp_path, _bills())
+
+    # Parish 3 has two rows under one key; changing one re-sends both
+    changed = _bills()
+    changed.loc[4, "count"] = 10
+    delta = _run(tmp_path, changed)
+
+    assert (delta.inserts, delta.updates, delta.deletes) == (0, 2, 0)
+    updates = pd.read_csv(delta.paths["updates"])
+    assert sorted(updates["count"]) == [7, 10]
+
+
+def test_unapplied_delta_is_included_in_the_next_one(tmp_path):
+    (tmp_path / "out").mkdir()
+    _run(tmp_path, _bills())
+
+    changed = _bills()
+    changed.loc[0, "count"] = 6
+    first = _run(tmp_path, changed, applied=False)
+    assert first.updates == 1
+    writer = DeltaWriter(tmp_path / "delta")
+    assert writer.pending_path("all_bills").exists()
+
+    # The update never reached the database, so it is sent again
+    changed = changed.drop(index=1)
+    second = _run(tmp_path, changed)
+    assert (second.inserts, second.updates, second.deletes) == (0, 1, 1)
+    assert not writer.pending_path("all_bills").exists()
+
+    # Once applied, an empty table deletes everything it held
+    third = _run(tmp_path, changed.iloc[0:0])
+    assert (third.inserts, third.updates, third.deletes) == (0, 0, 3)
+    assert writer.promote() == []
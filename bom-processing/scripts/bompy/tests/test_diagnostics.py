@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for aggregated per-cell diagnostics."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from loguru import logger
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.utils import diagnostics
+from bom.utils.diagnostics import DiagnosticsCollector
+from bom.utils.sections import section
+
+
+@pytest.fixture
+def messages():
+    captured = []
+    sink = logger.add(
+        lambda message: captured.append(message.record),
+        level="DEBUG",
+        format="{message}",
+    )
+    yield captured
+    logger.remove(sink)
+
+
+class Lazy:
+    """An argument that records whether it was formatted."""
+
+    formatted = 0
+
+    def __str__(self):
+        Lazy.formatted += 1
+        return "lazy"
+
+
+def test_one_summary_per_template_and_source(messages):
+    with DiagnosticsCollector(max_samples=2) as collector:
+        with section("bills"):
+            for done, source in enumerate(("a.csv", "b.csv")):
+                with section(source):
+                    for i in range(5):
+                        diagnostics.warning("Could not find parish ID for '{}'", i)
+                    diagnostics.info("Found week match with {} day offset", 1)
+                    # Nothing is logged until the source finishes
+                    assert len(messages) == 2 * done
+            diagnostics.warning("No week records found for year {}", 1665)
+
+    texts = [(m["level"].name, m["message"]) for m in messages]
+    assert texts[:2] == [
+        (
+            "WARNING",
+            "5× Could not find parish ID for '…' in bills/a.csv "
+            "(e.g. Could not find parish ID for '0'; "
+            "Could not find parish ID for '1'; ...)",
+        ),
+        ("INFO", "Found week match with 1 day offset"),
+    ]
+    assert texts[-1] == ("WARNING", "No week records found for year 1665")
+    assert collector.totals[("WARNING", "Could not find parish ID for '{}'")] == 10
+
+
+def test_only_logged_samples_are_formatted(messages):
+    Lazy.formatted = 0
+    with DiagnosticsCollector(max_samples=1):
+        with section("entities"):
+            for _ in range(100):
+                diagnostics.warning(
+                    "No authority mapping found for parish: '{}'", Lazy()
+                )
+    assert Lazy.formatted == 1
+    assert messages[0]["message"].startswith("100× ")
+
+
+def test_reports_are_logged_directly_without_a_collector(messages):
+    with section("bills"):
+        diagnostics.warning("Using fallback week record for {}: {}", 1665, "x")
+    assert messages[0]["message"] == "Using fallback week record for 1665: x"
+    assert (
+        messages[0]["function"]
+        == "test_reports_are_logged_directly_without_a_collector"
+    )
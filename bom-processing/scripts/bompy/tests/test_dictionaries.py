@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Tests for dictionary-encoded record columns and column-wise dedup."""
+
+import dataclasses
+import random
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.benchmarks.synthetic import generate_corpus
+from bom.models import BillOfMortalityRecord, CausesOfDeathRecord
+from bom.pipeline import run_pipeline
+from bom.processors.dedup import BILL_DEDUP_RULE, CAUSE_DEDUP_RULE, deduplicate
+from bom.utils.dictionaries import DICTIONARIES, encode_column
+
+
+def test_labels_share_codes_across_columns():
+    first = encode_column("joinid", ["a-1", 1665, None, "1665", float("nan")])
+    second = encode_column("joinid", ["b-2", "a-1", "1665"])
+
+    # Values are held as strings, as a "string" column would hold them
+    assert first.tolist()[:2] == ["a-1", "1665"]
+    assert list(pd.isna(first)) == [False, False, True, False, True]
+    assert first.codes[1] == first.codes[3]
+    # A value keeps its code in every column built from the dictionary
+    assert second.codes[1] == first.codes[0]
+    assert second.codes[2] == first.codes[1]
+    assert list(second.categories[: len(first.categories)]) == list(first.categories)
+
+    # Causes' source_name shares the bills' source dictionary
+    assert DICTIONARIES.get("source_name") is DICTIONARIES.get("source")
+    assert encode_column("source_name", ["qc.csv"]).codes[0] == (
+        encode_column("source", ["x.csv", "qc.csv"]).codes[1]
+    )
+
+
+def test_dictionaries_are_reset_for_each_run(tmp_path):
+    before = encode_column("joinid", ["from-an-earlier-run"])
+    paths = generate_corpus(tmp_path / "corpus", scale=0.005, seed=1)
+    run_pipeline(paths[0].parent, tmp_path / "out", only=["entities"])
+
+    assert "from-an-earlier-run" not in DICTIONARIES.get("joinid").categories
+    # Columns built before the reset keep their own categories
+    assert before.tolist() == ["from-an-earlier-run"]
+
+
+def test_counts_are_compact_integers():
+    assert encode_column("count", [3, None, 0]).dtype == "Int32"
+    assert encode_column("count", [2**40, None]).dtype == "Int64"
+    assert encode_column("count", [1.5]) is None
+    assert encode_column("year", [1665]) is None
+
+
+def _bill(rnd):
+    return BillOfMortalityRecord(
+        parish_id=rnd.choice([1, 2, 3]),
+        count_type=rnd.choice(["buried", "plague"]),
+        count=rnd.choice([None, 0, 1, 2, 5]),
+        year=rnd.choice([1665, 1666]),
+        joinid=rnd.choice(["1665010316650110", "1665011016650117"]),
+        bill_type="weekly",
+        missing=None,
+        illegible=None,
+        source=rnd.choice(["laxton.csv", "qc.csv", None]),
+        unique_identifier=rnd.choice(["Laxton-1665-01", "QC-1665-01", None]),
+    )
+
+
+def _cause(rnd):
+    return CausesOfDeathRecord(
+        original_name=rnd.choice(["Ague", "Fever"]),
+        count=rnd.choice([None, 0, 1, 3]),
+        year=rnd.choice([1665, None]),
+        joinid=rnd.choice(["1665010316650110", "1665011016650117"]),
+        descriptive_text=None,
+        source_name=rnd.choice(["laxton.csv", "qc.csv", None]),
+        definition=None,
+        definition_source=None,
+        bill_type="weekly",
+        name=None,
+    )
+
+
+@pytest.mark.parametrize(
+    "make, rule", [(_bill, BILL_DEDUP_RULE), (_cause, CAUSE_DEDUP_RULE)]
+)
+def test_column_dedup_matches_record_dedup(make, rule):
+    rnd = random.Random(7)
+    by_record = dataclasses.replace(rule, fields=None)
+    for _ in range(100):
+        records = [make(rnd) for _ in range(rnd.randint(1, 60))]
+        survivors, stats = deduplicate(records, rule)
+        expected, expected_stats = deduplicate(records, by_record)
+        assert list(map(id, survivors)) == list(map(id, expected))
+        assert stats == expected_stats
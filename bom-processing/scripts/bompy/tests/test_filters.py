@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Tests for restricting a run to some sources, tables or years."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.pipeline import (
+    FilterError,
+    RunFilter,
+    build_pipeline,
+    filter_years,
+    parse_year_range,
+)
+
+FILES = [
+    Path("2025-10-29-BLV3-weeklybills-parishes.csv"),
+    Path("2025-12-09-BLV3-weeklybills-causes-DIRTYDATA.csv"),
+    Path("2025-12-10-Guildhall-generalbills-parishes.csv"),
+    Path("2025-12-11-Laxton-weeklybills-foodstuffs.csv"),
+]
+
+
+def test_parse_year_range():
+    assert parse_year_range("1665") == (1665, 1665)
+    assert parse_year_range("1665-1670") == (1665, 1670)
+    assert parse_year_range("1665-") == (1665, None)
+    assert parse_year_range("-1670") == (None, 1670)
+    for text in ("1670-1665", "abc", "-"):
+        with pytest.raises(FilterError):
+            parse_year_range(text)
+
+
+def test_filter_years_weekly_and_general_bills():
+    weekly = pd.DataFrame({"year": [1664, 1665, 1666, None]})
+    assert filter_years(weekly, (1665, 1665))["year"].tolist()[0] == 1665
+    assert len(filter_years(weekly, (1665, 1665))) == 2  # plus the row without
+
+    # General bills overlapping the range are kept
+    general = pd.DataFrame(
+        {"start_year": [1660, 1664, 1666], "end_year": [1661, 1665, 1667]}
+    )
+    assert filter_years(general, (1665, None))["start_year"].tolist() == [1664, 1666]
+    assert filter_years(general, None) is general
+
+
+def test_select_files_by_source_and_type():
+    assert RunFilter(sources=("*blv3*",)).select_files(FILES) == FILES[:2]
+    assert RunFilter(dataset_types=("blv3_parishes",)).select_files(FILES) == FILES[:1]
+    # Fallback types are accepted, and globs match several types
+    assert RunFilter(dataset_types=("parishes_unknown",)).select_files(FILES) == [
+        FILES[2]
+    ]
+    assert RunFilter(dataset_types=("laxton_*",)).select_files(FILES) == [FILES[3]]
+    with pytest.raises(FilterError):
+        RunFilter(dataset_types=("nope",))
+    with pytest.raises(FilterError):
+        RunFilter(tables=("nope",))
+
+
+def test_table_filter_prunes_stages():
+    assert build_pipeline(tables=["foodstuffs"]).order == [
+        "load",
+        "foodstuffs",
+        "write",
+    ]
+    assert "validate_bills" not in build_pipeline(tables=["causes_of_death"]).order
+    streamed = build_pipeline(stream=True, tables=["subtotals"])
+    assert streamed.order == ["load", "entities", "bills", "write"]
+    assert RunFilter(tables=("years", "parishes")).output_tables == (
+        "parishes",
+        "years",
+    )
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Tests for stage outputs cached as memory-mapped Arrow IPC files."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.benchmarks.synthetic import generate_corpus
+from bom.models import SubtotalRecord, YearRecord
+from bom.pipeline import StageCache, read_intermediate, run_pipeline
+from bom.pipeline.intermediates import read_table
+
+pa = pytest.importorskip("pyarrow")
+
+
+def _subtotal(count, missing=None):
+    return SubtotalRecord(
+        subtotal_category="Within the walls",
+        count_type="buried",
+        count=count,
+        year=1665,
+        joinid="1665090516650912",
+        bill_type="weekly",
+        missing=missing,
+        illegible=None,
+        source="QC",
+        unique_identifier=None,
+    )
+
+
+def test_record_lists_round_trip_through_arrow_files(tmp_path):
+    outputs = {
+        "subtotal_records": [_subtotal(12), _subtotal(None, missing=True)],
+        # Arrow would turn these ints into floats, so they stay pickled
+        "mixed": [YearRecord(1665), YearRecord(1665.5)],
+        "empty": [],
+        "input_rows": 42,
+    }
+    cache = StageCache(tmp_path, record_format="arrow")
+    entry = cache.save("bills", "abc", outputs)
+    assert sorted(path.name for path in entry.iterdir()) == [
+        "COMPLETE",
+        "empty.pkl",
+        "input_rows.pkl",
+        "mixed.pkl",
+        "subtotal_records.arrow",
+    ]
+
+    loaded = StageCache(tmp_path).load("bills", "abc", outputs)
+    assert loaded == outputs
+    assert type(loaded["mixed"][0].year) is int
+
+    # Labels are stored once per distinct value and rebuilt sharing objects
+    table = read_table(entry / "subtotal_records.arrow")
+    assert pa.types.is_dictionary(table.schema.field("joinid").type)
+    assert table.schema.field("count").type == pa.int32()
+    assert loaded["subtotal_records"][0].joinid is loaded["subtotal_records"][1].joinid
+
+    df = read_intermediate(tmp_path, "bills", "subtotal_records", ["count", "year"])
+    assert list(df.columns) == ["count", "year"]
+    assert df["year"].tolist() == [1665, 1665]
+    labels = read_intermediate(tmp_path, "bills", "subtotal_records", ["source"])
+    assert isinstance(labels["source"].dtype, pd.CategoricalDtype)
+    plain = read_intermediate(
+        tmp_path, "bills", "subtotal_records", ["source"], categorical=False
+    )
+    assert plain["source"].tolist() == ["QC", "QC"]
+    with pytest.raises(FileNotFoundError):
+        read_intermediate(tmp_path, "bills", "cause_records")
+    with pytest.raises(ValueError):
+        StageCache(tmp_path, record_format="feather")
+
+
+def test_arrow_cache_runs_write_the_same_tables(tmp_path):
+    paths = generate_corpus(tmp_path / "corpus", scale=0.005, seed=3)
+    tables = []
+    for cache_format, name in (
+        ("pickle", "plain"),
+        ("arrow", "first"),
+        ("arrow", "cached"),
+    ):
+        run = run_pipeline(
+            paths[0].parent,
+            tmp_path / name,
+            cache_dir=tmp_path / f"cache-{cache_format}",
+            cache_format=cache_format,
+        )
+        tables.append(
+            {path.name: path.read_bytes() for path in run.artifacts["output_files"]}
+        )
+    assert tables[0] == tables[1] == tables[2]
+    assert "bills" in run.cached
+
+    subtotals = read_intermediate(tmp_path / "cache-arrow", "bills", "subtotal_records")
+    assert len(subtotals) == tables[0]["subtotals.csv"].count(b"\n") - 1
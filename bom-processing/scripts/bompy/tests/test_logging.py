@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Tests for queued, worker-safe and JSON logging sinks."""
+
+import json
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.utils.logging import init_worker_logging, setup_logging
+
+
+def _log_from_worker(value: int) -> int:
+    logger.warning(f"worker {{value}} saw {value}")
+    return os.getpid()
+
+
+def test_queued_json_logging_from_spawned_workers(tmp_path):
+    log_file = setup_logging(
+        log_dir=tmp_path,
+        log_name="run",
+        console_output=False,
+        enqueue=True,
+        json_output=True,
+    )
+    try:
+        logger.info("from the parent")
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(
+            2, initializer=init_worker_logging, initargs=(logger,)
+        ) as pool:
+            worker_pids = set(pool.map(_log_from_worker, range(4)))
+        logger.complete()
+    finally:
+        logger.remove()  # drains the queues
+
+    text = log_file.read_text()
+    assert "from the parent" in text
+    assert "worker {value} saw 3" in text
+    assert "_log_from_worker" in text
+
+    records = [
+        json.loads(line)["record"]
+        for line in (tmp_path / "run.jsonl").read_text().splitlines()
+    ]
+    from_workers = [r for r in records if r["function"] == "_log_from_worker"]
+    assert len(from_workers) == 4
+    assert {r["process"]["id"] for r in from_workers} == worker_pids
+    assert {r["level"]["name"] for r in from_workers} == {"WARNING"}
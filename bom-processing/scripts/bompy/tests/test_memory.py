@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Tests for per-stage and per-source memory tracking."""
+
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.models import BillOfMortalityRecord
+from bom.utils.memory import MemoryTracker, estimate_bytes, memory_report_path
+from bom.utils.sections import section
+
+
+def test_sections_report_peak_retained_and_artifacts(tmp_path):
+    kept = []
+    with MemoryTracker(interval=0.01) as tracker:
+        with section("bills") as stage:
+            for source in ("a.csv", "b.csv"):
+                with section(source):
+                    scratch = bytearray(2_000_000)  # freed before exit
+                    kept.append(bytearray(500_000))
+                    del scratch
+            stage.outputs = {"frame": pd.DataFrame({"x": range(1000)})}
+
+    bills = tracker.sections["bills"]
+    source = tracker.sections["bills/a.csv"]
+    assert (source.stage, source.source) == ("bills", "a.csv")
+    assert source.traced_peak >= 2_000_000
+    assert 500_000 <= source.traced_retained < 2_000_000
+    # The stage's peak and retained memory include its sources
+    assert bills.traced_peak >= source.traced_peak
+    assert bills.traced_retained >= 1_000_000
+    assert tracker.artifacts["bills"]["frame"]["rows"] == 1000
+    assert tracker.process["traced_peak"] >= bills.traced_peak
+
+    path = tracker.write(tmp_path / "memory.json")
+    report = json.loads(path.read_text())
+    assert [s["name"] for s in report["sections"]] == [
+        "bills",
+        "bills/a.csv",
+        "bills/b.csv",
+    ]
+    assert report["artifacts"]["bills"]["frame"]["bytes"] >= 8000
+
+
+def test_estimate_bytes_of_record_lists():
+    records = [
+        BillOfMortalityRecord(
+            parish_id=i,
+            count_type="buried",
+            count=i,
+            year=1665,
+            joinid=f"1665-{i:02d}",
+            bill_type="weekly",
+            missing=False,
+            illegible=False,
+            source="test",
+            unique_identifier="x",
+        )
+        for i in range(5_000)
+    ]
+    # Long lists are extrapolated from a sample, so are close to exact
+    exact = estimate_bytes(records[:2_000]) / 2_000
+    assert abs(estimate_bytes(records) / 5_000 - exact) < exact * 0.05
+    assert estimate_bytes(records) > sys.getsizeof(records)
+
+
+def test_memory_report_path():
+    assert memory_report_path(Path("logs/bom_pipeline.log")) == Path(
+        "logs/bom_pipeline_memory.json"
+    )
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Tests for the hot-path metrics registry."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.models import BillOfMortalityRecord
+from bom.processors.dedup import BILL_DEDUP_RULE, DEDUP_REMOVALS, deduplicate
+from bom.utils.metrics import REGISTRY, MetricsRegistry
+from bom.utils.sections import section
+
+
+def test_samples_are_labelled_with_the_current_section(tmp_path):
+    registry = MetricsRegistry()
+    matches = registry.counter("matches_total", "Matches", ["strategy"])
+    offsets = registry.histogram("offset_days", "Offsets", buckets=(0, 1, 3))
+    seconds = registry.timer("match_seconds", "Match time")
+
+    matches.inc(strategy="end_day")
+    with section("bills"):
+        with section('a "quoted".csv'):
+            matches.inc(strategy="end_day")
+            matches.inc(2, strategy="end_day")
+            offsets.observe(2)
+            with seconds.time():
+                pass
+        matches.inc(strategy="same_month")
+
+    assert matches.value() == 5
+    assert matches.value(source='a "quoted".csv') == 3
+    assert matches.value(stage="bills", strategy="same_month") == 1
+    with pytest.raises(ValueError):
+        matches.inc(nope="x")
+    with pytest.raises(ValueError):
+        registry.timer("matches_total", "Clash")
+
+    text = registry.to_prometheus()
+    assert "# TYPE matches_total counter" in text
+    assert 'matches_total{strategy="end_day"} 1\n' in text
+    assert (
+        'matches_total{stage="bills",source="a \\"quoted\\".csv",strategy="end_day"} 3'
+        in text
+    )
+    assert (
+        'offset_days_bucket{stage="bills",source="a \\"quoted\\".csv",le="1"} 0' in text
+    )
+    assert 'le="3"} 1' in text and 'le="+Inf"} 1' in text
+    assert "# TYPE match_seconds summary" in text
+
+    paths = registry.write(tmp_path / "run_metrics", stages=["bills"])
+    registry.reset()
+    registry.write(tmp_path / "run_metrics", stages=[])
+    assert paths[0].read_text().count("\n") == 3 * 2  # HELP and TYPE only
+    history = [json.loads(line) for line in paths[1].read_text().splitlines()]
+    assert [entry["stages"] for entry in history] == [["bills"], []]
+    timer = history[0]["metrics"]["match_seconds"]["samples"][0]
+    assert timer["count"] == 1 and timer["labels"]["stage"] == "bills"
+    assert history[1]["metrics"]["matches_total"]["samples"] == []
+
+
+def test_dedup_removals_are_counted_per_source_file():
+    REGISTRY.reset()
+
+    def bill(count, source):
+        return BillOfMortalityRecord(
+            parish_id=1,
+            count_type="buried",
+            count=count,
+            year=1665,
+            joinid="1665-01",
+            bill_type="weekly",
+            missing=False,
+            illegible=False,
+            source=source,
+            unique_identifier="bill-1",
+        )
+
+    records = [bill(1, "a.csv"), bill(2, "a.csv"), bill(3, "b.csv")]
+    kept, stats = deduplicate(records, BILL_DEDUP_RULE)
+    assert [r.count for r in kept] == [3]
+    assert DEDUP_REMOVALS.value(rule="bill") == stats.same_source_removed == 2
+    assert DEDUP_REMOVALS.value(source="a.csv") == 1
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Tests for the partitioned Parquet writer."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+pytest.importorskip("pyarrow")
+
+from bom.contracts import TABLE_CONTRACTS
+from bom.writers import read_parquet_table, write_parquet_table
+
+
+def _subtotals() -> pd.DataFrame:
+    df = pd.DataFrame(
+        {
+            "subtotal_category": ["Within the walls", "Westminster", "Westminster"],
+            "count_type": ["buried", "christened", "buried"],
+            "count": [10, None, 7],
+            "year": [1665, 1702, 1665],
+            "joinid": ["1665010316650110", "1702010317020110", "1665011016650117"],
+            "bill_type": ["weekly", "weekly", "general"],
+            "missing": [False, True, False],
+            "illegible": [False, False, False],
+            "source": ["a", "a", "b"],
+            "unique_identifier": ["x", "y", "z"],
+        }
+    )
+    return TABLE_CONTRACTS["subtotals"].conform(df)
+
+
+def test_writes_bill_type_and_decade_partitions(tmp_path):
+    table_dir = write_parquet_table(_subtotals(), tmp_path, "subtotals")
+    partitions = sorted(
+        str(p.parent.relative_to(table_dir)) for p in table_dir.rglob("*.parquet")
+    )
+    assert partitions == [
+        "bill_type=general/decade=1660",
+        "bill_type=weekly/decade=1660",
+        "bill_type=weekly/decade=1700",
+    ]
+
+
+def test_round_trip_keeps_types(tmp_path):
+    table_dir = write_parquet_table(_subtotals(), tmp_path, "subtotals")
+    df = read_parquet_table(table_dir)
+
+    assert len(df) == 3
+    assert df["count"].dtype == "Int64"
+    assert df["missing"].dtype == "boolean"
+    assert isinstance(df["subtotal_category"].dtype, pd.CategoricalDtype)
+    assert df["count"].isna().sum() == 1
+
+
+def test_filters_prune_partitions(tmp_path):
+    table_dir = write_parquet_table(_subtotals(), tmp_path, "subtotals")
+    df = read_parquet_table(
+        table_dir,
+        columns=["year", "count"],
+        filters=[("bill_type", "=", "weekly"), ("year", "<", 1700)],
+        categorical=False,
+        nullable=False,
+    )
+    assert df["year"].tolist() == [1665]
+    assert df["count"].tolist() == [10]
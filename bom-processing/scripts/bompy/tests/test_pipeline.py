@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Tests for the stage DAG runner and its on-disk cache."""
+
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.pipeline import Pipeline, PipelineError, Stage, StageCache
+
+
+def _pipeline(calls, barrier=None):
+    def load(ctx, numbers):
+        calls.append("load")
+        return {"rows": [n * ctx.scale for n in numbers]}
+
+    def total(ctx, rows):
+        calls.append("total")
+        if barrier is not None:
+            barrier.wait(timeout=5)
+        return {"total": sum(rows)}
+
+    def count(ctx, rows):
+        calls.append("count")
+        if barrier is not None:
+            barrier.wait(timeout=5)
+        return {"count": len(rows)}
+
+    def report(ctx, total, count):
+        calls.append("report")
+        return {"report": f"{count} rows, total {total}"}
+
+    return Pipeline(
+        [
+            Stage("report", report, inputs=("total", "count"), outputs=("report",)),
+            Stage("load", load, ("numbers",), ("rows",), params=("scale",)),
+            Stage("total", total, ("rows",), ("total",)),
+            Stage("count", count, ("rows",), ("count",)),
+        ]
+    )
+
+
+def test_order_and_selection():
+    pipeline = _pipeline([])
+    assert pipeline.order == ["load", "total", "count", "report"]
+    assert pipeline.root_inputs == {"numbers"}
+    assert pipeline.select(start="total") == ["total", "report"]
+    assert pipeline.select(only=["count"]) == ["count"]
+    with pytest.raises(PipelineError):
+        pipeline.select(only=["nope"])
+
+
+def test_cached_stages_are_loaded_instead_of_run(tmp_path):
+    ctx = SimpleNamespace(scale=2)
+    cache = StageCache(tmp_path)
+    calls = []
+    run = _pipeline(calls).run(ctx, {"numbers": [1, 2, 3]}, cache=cache)
+    assert run.artifacts["report"] == "3 rows, total 12"
+    assert sorted(calls) == ["count", "load", "report", "total"]
+
+    # Everything is cached, and nothing needs the cached upstream artifacts
+    calls.clear()
+    run = _pipeline(calls).run(ctx, {"numbers": [1, 2, 3]}, cache=cache)
+    assert calls == []
+    assert "rows" not in run.artifacts
+
+    # --only reruns a stage from its cached inputs, without the upstream
+    run = _pipeline(calls).run(ctx, {"numbers": [1, 2, 3]}, cache=cache, only=["total"])
+    assert calls == ["total"]
+    assert run.cached == ["load"]
+
+    # A changed parameter invalidates the stage and everything downstream
+    calls.clear()
+    ctx.scale = 3
+    run = _pipeline(calls).run(ctx, {"numbers": [1, 2, 3]}, cache=cache)
+    assert sorted(calls) == ["count", "load", "report", "total"]
+    assert run.artifacts["report"] == "3 rows, total 18"
+    assert len(list((tmp_path / "load").iterdir())) == 1
+
+
+def test_independent_stages_run_concurrently():
+    # Both branches wait for each other, so this only finishes if they overlap
+    barrier = threading.Barrier(2)
+    calls = []
+    run = _pipeline(calls, barrier).run(SimpleNamespace(scale=1), {"numbers": [4]})
+    assert run.artifacts["report"] == "1 rows, total 4"
+    assert run.ran[-1] == "report"
+
+
+def test_stage_must_return_its_declared_outputs():
+    pipeline = Pipeline([Stage("bad", lambda ctx: {"other": 1}, outputs=("good",))])
+    with pytest.raises(PipelineError, match="bad"):
+        pipeline.run(SimpleNamespace(), {})
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Tests for prefetching loads and pipelined pipeline runs."""
+
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.benchmarks.synthetic import generate_corpus
+from bom.loaders import REGISTRY, CSVLoader
+from bom.pipeline import run_pipeline
+from bom.pipeline.sources import PipelinedDatasets
+from bom.utils.prefetch import prefetch
+
+
+def test_prefetch_keeps_order_and_bounds_loaded_items():
+    loaded = []
+
+    def load(i):
+        loaded.append(i)
+        return i
+
+    results = []
+    for item in prefetch(load, range(20), depth=3):
+        # Loaded but not yet used, counting this one
+        assert len(loaded) - len(results) <= 3
+        results.append(item)
+    assert results == list(range(20))
+
+    # depth=1 loads nothing ahead
+    loaded.clear()
+    iterator = prefetch(load, range(5), depth=1)
+    assert next(iterator) == 0
+    threading.Event().wait(0.05)
+    assert loaded == [0]
+    iterator.close()
+
+
+def test_prefetch_raises_load_errors_and_stops_on_close():
+    def load(i):
+        if i == 2:
+            raise KeyError(i)
+        return i
+
+    seen = []
+    with pytest.raises(KeyError):
+        for item in prefetch(load, range(5)):
+            seen.append(item)
+    assert seen == [0, 1]
+
+    threads = threading.active_count()
+    iterator = prefetch(str, range(100))
+    next(iterator)
+    iterator.close()
+    assert threading.active_count() == threads
+
+    with pytest.raises(ValueError):
+        next(prefetch(str, range(3), depth=0))
+
+
+def test_pipelined_run_writes_the_same_tables(tmp_path):
+    paths = generate_corpus(tmp_path / "corpus", scale=0.005, seed=2)
+    tables = {}
+    for prefetch_depth in (0, 1):
+        run = run_pipeline(
+            paths[0].parent,
+            tmp_path / f"out{prefetch_depth}",
+            workers=2,
+            prefetch=prefetch_depth,
+        )
+        datasets = run.artifacts["datasets"]
+        assert isinstance(datasets, PipelinedDatasets) == bool(prefetch_depth)
+        assert len(datasets) == len(paths)
+        tables[prefetch_depth] = {
+            path.name: path.read_bytes() for path in run.artifacts["output_files"]
+        }
+    assert tables[0] == tables[1]
+    assert len(tables[0]) > 5
+
+
+def _count_loads(monkeypatch) -> Counter:
+    """Count CSVLoader loads per file name from now on."""
+    loads = Counter()
+    original = CSVLoader.load
+
+    def load(self, path, *args, **kwargs):
+        loads[Path(path).name] += 1
+        return original(self, path, *args, **kwargs)
+
+    monkeypatch.setattr(CSVLoader, "load", load)
+    return loads
+
+
+def test_pipelined_run_reads_sources_only_as_stages_use_them(tmp_path, monkeypatch):
+    paths = generate_corpus(tmp_path / "corpus", scale=0.005, seed=2)
+    broken = paths[0].parent / "2025-11-01-QC-weeklybills-parishes.csv"
+    broken.write_text("")
+    eager = run_pipeline(paths[0].parent, tmp_path / "eager")
+
+    loads = _count_loads(monkeypatch)
+    # One stage at a time, so no other stage tries the broken file while the
+    # entities stage finds it fails
+    run = run_pipeline(paths[0].parent, tmp_path / "pipelined", prefetch=1, workers=1)
+    for path in paths:
+        readers = REGISTRY.processors_for(REGISTRY.get_dataset_type(path.name))
+        # Once for the entities, then once per stage of a processor that reads it
+        assert loads[path.name] == 1 + len(readers), path.name
+    # A source that fails is skipped after its first attempt
+    assert loads[broken.name] == 1
+    assert run.artifacts["source_loads"] == eager.artifacts["source_loads"]
+    assert run.artifacts["source_loads"].load_errors == 1
+
+
+def test_pipelined_datasets_route_and_order(tmp_path):
+    paths = generate_corpus(tmp_path, scale=0.005, seed=1)
+    datasets = PipelinedDatasets(
+        tuple((path, REGISTRY.get_dataset_type(path.name)) for path in paths),
+        depth=2,
+    )
+    foodstuffs = datasets.routed("foodstuffs")
+    assert [name for _, name, _ in foodstuffs] == [
+        path.name for path in paths if "foodstuffs" in path.name
+    ]
+    frames = foodstuffs.by_name()
+    assert list(frames) == [name for _, name, _ in foodstuffs]
+    name, df = next(iter(frames.items()))
+    assert frames[name].equals(df)
+
+    ordered = datasets.ordered(lambda name: (not name.endswith("-parishes.csv"), name))
+    assert [path.name for path, _ in ordered.sources][0].endswith("-parishes.csv")
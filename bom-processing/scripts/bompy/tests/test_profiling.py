@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Tests for per-stage and per-source CPU profiling."""
+
+import pstats
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.utils.profiling import Profiler, collapsed_stacks
+from bom.utils.sections import section
+
+
+def _busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def _process_source(n: int) -> int:
+    return _busy(n)
+
+
+def test_sections_nest_and_write_profiles(tmp_path):
+    # Without an active profiler sections are no-ops
+    with section("ignored"):
+        _busy(10)
+
+    with Profiler(tmp_path) as profiler:
+        with section("bills"):
+            _busy(20_000)
+            for source in ("a.csv", "b;c.csv"):
+                with section(source):
+                    _process_source(100_000)
+
+    assert profiler.stages == ["bills"]
+    assert sorted(profiler.sections) == ["bills", "bills/a.csv", "bills/b;c.csv"]
+
+    written = profiler.write()
+    assert tmp_path / "bills.pstats" in written
+    assert (tmp_path / "bills" / "a.csv.pstats").exists()
+
+    # The stage's statistics include its sources
+    functions = {f[2] for f in pstats.Stats(str(tmp_path / "bills.pstats")).stats}
+    assert {"_busy", "_process_source"} <= functions
+
+    lines = (tmp_path / "bills.collapsed").read_text().splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any(
+        line.startswith("a.csv;") and "_process_source" in line for line in lines
+    )
+    assert any(line.startswith("b,c.csv;") for line in lines)
+
+    hot = profiler.hot_functions(limit=5)
+    assert hot and hot[0]["stage"] == "bills"
+    assert hot == sorted(hot, key=lambda e: e["own"], reverse=True)
+
+
+def test_collapsed_stacks_empty():
+    assert collapsed_stacks(None) == []
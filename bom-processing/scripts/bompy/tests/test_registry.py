@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Tests for dataset type detection and routing."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.loaders import DatasetRegistry
+from bom.pipeline.stages import RunContext, load_sources
+
+
+def test_patterns_are_tried_in_order_then_fallbacks():
+    registry = DatasetRegistry()
+    detect = registry.get_dataset_type
+    assert detect("2025-11-01-BLV1-weeklybills-parishes.csv") == "blv1_parishes"
+    assert detect("2024-09-25-BodleianV1-weeklybills-causes.csv") == "bodleian_causes"
+    # bl_parishes comes before the catch-all bl_special
+    assert detect("BL1877.e.7-weeklybills-parishes-minus3foldbill.csv") == (
+        "bl_parishes"
+    )
+    assert detect("BL1877.e.7-weeklybills.csv") == "bl_special"
+    assert detect("2025-12-09-BLV2-weeklybills-causes-DIRTYDATA.csv") == (
+        "causes_unknown"
+    )
+    assert detect("2025-12-10-Guildhall-generalbills-parishes.csv") == (
+        "parishes_unknown"
+    )
+    assert detect("notes.csv") == "unknown"
+
+
+def test_types_map_to_their_processors():
+    registry = DatasetRegistry()
+    assert registry.processors_for("laxton_causes") == ("bills",)
+    assert registry.processors_for("parishes_unknown") == (
+        "bills",
+        "christenings_parish",
+        "christenings",
+    )
+    assert registry.processors_for("laxton_gender") == (
+        "christenings_gender",
+        "christenings",
+    )
+    assert registry.get_processor("Laxton-weeklybills-foodstuffs.csv") == (
+        "foodstuffs",
+    )
+    assert registry.processors_for("unknown") == ()
+
+    registry.register("unknown", "bills")
+    assert registry.get_processor("notes.csv") == ("bills",)
+    assert DatasetRegistry().processors_for("unknown") == ()
+
+
+def test_discover_routes_files_by_type(tmp_path):
+    for name in (
+        "b-QC-weeklybills-parishes.csv",
+        "a-QC-weeklybills-parishes.csv",
+        "c-Laxton-weeklybills-foodstuffs.csv",
+        "notes.csv",
+    ):
+        (tmp_path / name).write_text("year\n1665\n")
+
+    registry = DatasetRegistry()
+    datasets = registry.discover_datasets(tmp_path)
+    assert datasets is registry.datasets
+    assert list(datasets) == ["qc_parishes", "laxton_foodstuffs"]
+    assert [dataset.path.name for dataset in datasets["qc_parishes"]] == [
+        "a-QC-weeklybills-parishes.csv",
+        "b-QC-weeklybills-parishes.csv",
+    ]
+
+    df = pd.DataFrame({"year": [1665]})
+    loaded = [
+        (df, dataset.path.name, dataset.dataset_type)
+        for files in datasets.values()
+        for dataset in files
+    ]
+    assert [name for _, name in registry.select(loaded, "foodstuffs")] == [
+        "c-Laxton-weeklybills-foodstuffs.csv"
+    ]
+    assert len(registry.select(loaded, "christenings_parish")) == 2
+
+
+def test_load_skips_files_no_processor_reads(tmp_path):
+    parishes = tmp_path / "2025-11-01-QC-weeklybills-parishes.csv"
+    notes = tmp_path / "notes.csv"
+    for path in (parishes, notes):
+        path.write_text("Year,Week\n1665,1\n")
+
+    result = load_sources(RunContext(output_dir=tmp_path), [notes, parishes])
+    assert [(name, kind) for _, name, kind in result["datasets"]] == [
+        (parishes.name, "qc_parishes")
+    ]
+    assert result["source_loads"].load_errors == 0
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Tests for processor engines and shadow runs."""
+
+import dataclasses
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.benchmarks import diff_tables, shadow_run
+from bom.benchmarks.shadow import _bill_sources
+from bom.benchmarks.suite import Suite
+from bom.benchmarks.synthetic import generate_corpus
+from bom.loaders import REGISTRY
+from bom.processors import BillsProcessor, engines
+from bom.processors.general_bills import GeneralBillsProcessor
+
+
+@pytest.fixture(scope="module")
+def suite(tmp_path_factory):
+    paths = generate_corpus(tmp_path_factory.mktemp("corpus"), scale=0.005, seed=1)
+    return Suite(sorted(paths))
+
+
+@pytest.fixture
+def register():
+    """Register test engines, removed again after the test."""
+    added = []
+
+    def add(path, name):
+        added.append((path, name))
+        return engines.register(path, name)
+
+    yield add
+    for path, name in added:
+        engines._registry[path].pop(name, None)
+
+
+def test_selection_and_use():
+    assert set(engines.enabled().values()) == {engines.LEGACY}
+    assert engines.parse_selection(["parish=legacy"]) == {"parish": "legacy"}
+    with pytest.raises(engines.EngineError, match="path=engine"):
+        engines.parse_selection(["parish"])
+    with pytest.raises(engines.EngineError, match="Unknown path"):
+        engines.parse_selection(["bogus=legacy"])
+    with pytest.raises(engines.EngineError, match="No 'fast' engine"):
+        engines.parse_selection(["causes=fast"])
+
+
+def test_use_restores_previous_engines(register):
+    register("causes", "other")(engines.implementation("causes"))
+    with engines.use({"causes": "other"}):
+        assert engines.enabled()["causes"] == "other"
+        with pytest.raises(engines.EngineError):
+            with engines.use({"parish": "missing"}):
+                pass
+        assert engines.enabled()["causes"] == "other"
+    assert engines.enabled()["causes"] == engines.LEGACY
+
+
+def test_columnar_christenings_engine_matches_legacy(suite):
+    assert engines.engines("christenings") == [engines.LEGACY, "columnar"]
+    report = shadow_run(suite, "christenings", "columnar")
+    assert report.sources > 0
+    assert report.tables[0].legacy_rows > 0
+    assert report.equivalent, report.format()
+
+
+def test_reordered_engine_is_equivalent(suite, register):
+    legacy = engines.implementation("parish", engines.LEGACY)
+
+    @register("parish", "reversed")
+    def reversed_engine(processor, df, source_name, parish_mapping, week_mapping):
+        bills, subtotals = legacy(
+            processor, df, source_name, parish_mapping, week_mapping
+        )
+        return bills[::-1], subtotals[::-1]
+
+    report = shadow_run(suite, "parish", "reversed")
+    assert report.sources > 0
+    assert report.equivalent, report.format()
+    assert [diff.table for diff in report.tables] == [
+        "all_bills",
+        "all_bills (deduplicated)",
+        "subtotals",
+    ]
+    assert report.format().endswith("EQUIVALENT")
+
+
+def test_changed_and_missing_rows_are_reported_by_key(suite, register):
+    legacy = engines.implementation("causes", engines.LEGACY)
+
+    @register("causes", "broken")
+    def broken(processor, df, source_name, week_mapping):
+        records = legacy(processor, df, source_name, week_mapping)
+        first = dataclasses.replace(records[0], count=(records[0].count or 0) + 1)
+        return [first] + records[2:]
+
+    report = shadow_run(suite, "causes", "broken")
+    assert not report.equivalent
+    causes = report.tables[0]
+    assert causes.changed == report.sources
+    assert causes.missing == report.sources
+    assert causes.extra == 0
+    assert any(s.startswith("changed (") and "count:" in s for s in causes.samples)
+    assert report.format().endswith("DIFFERENT")
+
+
+def test_appending_engine(suite, register):
+    legacy = engines.implementation("christenings_gender", engines.LEGACY)
+
+    @register("christenings_gender", "doubled")
+    def doubled(processor, df, dataset_name):
+        legacy(processor, df, dataset_name)
+        processor.records.extend(processor.records[:1])
+
+    report = shadow_run(suite, "christenings_gender", "doubled")
+    assert report.tables[0].extra == report.sources
+    assert report.tables[0].missing == report.tables[0].changed == 0
+
+
+def test_bill_paths_take_the_sources_the_pipeline_routes(suite):
+    suite.ensure("loader")
+    routed = [name for _, name in REGISTRY.select(suite.state["datasets"], "bills")]
+    causes = [name for _, name in _bill_sources(suite.state, causes=True)]
+    parish = [name for _, name in _bill_sources(suite.state, causes=False)]
+    # General Bills parish files go through their own processor
+    general = [
+        name
+        for name in routed
+        if name not in causes and GeneralBillsProcessor().is_general_bill_dataset(name)
+    ]
+    assert causes and parish and general
+    assert sorted(causes + parish + general) == sorted(routed)
+
+
+def test_diff_tables_ignores_order(suite):
+    suite.ensure("loader", "week_extractor")
+    processor = BillsProcessor()
+    week_mapping = processor.create_week_id_mapping(suite.state["source_weeks"])
+    df, name, _ = next(
+        source for source in suite.state["datasets"] if "causes" in source[1]
+    )
+    records = engines.implementation("causes")(processor, df, name, week_mapping)
+
+    diff = diff_tables("causes_of_death", records, list(reversed(records)))
+    assert diff.equal
+    assert diff.legacy_rows == diff.candidate_rows == len(records)
+    dropped = diff_tables("causes_of_death", records, records[1:])
+    assert dropped.missing == 1 and dropped.samples[0].startswith("missing (")
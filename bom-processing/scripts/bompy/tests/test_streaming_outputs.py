@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Tests for streaming sinks and external deduplication."""
+
+import random
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.models import BillOfMortalityRecord, CausesOfDeathRecord
+from bom.processors.dedup import (
+    BILL_DEDUP_RULE,
+    CAUSE_DEDUP_RULE,
+    ExternalDeduplicator,
+    deduplicate,
+)
+from bom.writers import CSVTableSink, TableSink, iter_chunks, write_csv_table
+
+
+def _bills(n: int = 2000) -> list:
+    rng = random.Random(7)
+    return [
+        BillOfMortalityRecord(
+            parish_id=rng.randint(1, 20),
+            count_type=rng.choice(["buried", "plague"]),
+            count=rng.choice([None, rng.randint(0, 50)]),
+            year=1665,
+            joinid=f"16650{rng.randint(1, 3)}0316650110",
+            bill_type="weekly",
+            missing=False,
+            illegible=False,
+            source=None,
+            unique_identifier=rng.choice(["a", "b", "c"]),
+        )
+        for _ in range(n)
+    ]
+
+
+def _causes(n: int = 2000) -> list:
+    rng = random.Random(11)
+    return [
+        CausesOfDeathRecord(
+            original_name=rng.choice(["Ague", "Fever", "Plague", "Teeth"]),
+            count=rng.choice([None, rng.randint(0, 50)]),
+            year=rng.choice([1665, 1666]),
+            joinid=f"1665010{rng.randint(1, 9)}16650110",
+            source_name=rng.choice(["x", "y"]),
+            descriptive_text=None,
+            definition=None,
+            definition_source=None,
+            bill_type="weekly",
+            name=None,
+        )
+        for _ in range(n)
+    ]
+
+
+def _external(records, rule, tmp_path, chunk_size=300):
+    deduper = ExternalDeduplicator(rule, spill_dir=tmp_path, buckets=8)
+    for chunk in iter_chunks(records, chunk_size):
+        deduper.add(chunk)
+    return list(deduper.finish()), deduper.stats
+
+
+def test_external_dedup_matches_in_memory_for_bills(tmp_path):
+    records = _bills()
+    expected, expected_stats = deduplicate(records, BILL_DEDUP_RULE)
+    actual, stats = _external(records, BILL_DEDUP_RULE, tmp_path)
+
+    assert actual == expected
+    assert stats == expected_stats
+    assert stats.same_source_removed > 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_external_dedup_matches_in_memory_for_causes(tmp_path):
+    records = _causes()
+    expected, expected_stats = deduplicate(records, CAUSE_DEDUP_RULE)
+    actual, stats = _external(records, CAUSE_DEDUP_RULE, tmp_path)
+
+    assert actual == expected
+    assert stats == expected_stats
+
+
+def test_csv_sink_chunks_match_single_write(tmp_path):
+    records = _bills(500)
+    full_dir = tmp_path / "full"
+    full_dir.mkdir()
+    write_csv_table(
+        pd.DataFrame([r.to_dict() for r in records]).astype({"count": "Int64"}),
+        full_dir,
+        "all_bills",
+    )
+
+    sink = CSVTableSink(tmp_path, "all_bills")
+    for chunk in iter_chunks(records, 64):
+        sink.write_records(chunk)
+    paths = sink.close()
+
+    assert paths == [tmp_path / "all_bills.csv"]
+    assert sink.rows_written == 500
+    assert paths[0].read_text() == (full_dir / "all_bills.csv").read_text()
+
+
+def test_sink_missing_a_writer_fails_when_created(tmp_path):
+    class NoWriter(TableSink):
+        @property
+        def path(self):
+            return tmp_path / "all_bills.csv"
+
+    with pytest.raises(TypeError, match="_write"):
+        NoWriter(tmp_path, "all_bills")
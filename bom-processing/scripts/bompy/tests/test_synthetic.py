@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Tests for the synthetic benchmark corpus and the benchmark suite."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.benchmarks import BENCHMARKS, run_scale
+from bom.benchmarks.synthetic import KINDS, PARISHES, corpus_files, generate_corpus
+from bom.loaders import CSVLoader
+
+
+def test_corpus_is_deterministic_and_classified(tmp_path):
+    paths = generate_corpus(tmp_path / "a", scale=0.005, seed=3)
+    again = generate_corpus(tmp_path / "b", scale=0.005, seed=3)
+    assert [p.read_bytes() for p in paths] == [p.read_bytes() for p in again]
+    assert len(paths) == len(KINDS)
+
+    loader = CSVLoader()
+    types = {}
+    for path in paths:
+        df, info = loader.load(path)
+        types[path.name.split("-", 3)[3]] = info.dataset_type
+        assert len(df) > 0
+    assert types["weeklybills-parishes.csv"] != "unknown"
+    assert types["weeklybills-gender.csv"] != "unknown"
+
+    header = paths[0].read_text().splitlines()[0].split(",")
+    assert header.count("is_missing") == header.count("is_illegible") > len(PARISHES)
+
+
+def test_corpus_scales_by_files():
+    one = corpus_files(1)
+    ten = corpus_files(10)
+    assert sum(map(sum, ten.values())) >= 9.9 * sum(map(sum, one.values()))
+    assert len(ten["weekly_parishes"]) > 9 * len(one["weekly_parishes"])
+    assert max(ten["weekly_parishes"]) <= max(one["weekly_parishes"]) + 20
+
+
+def test_every_component_produces_records(tmp_path):
+    results = run_scale(tmp_path, 0.005, seed=0, only=BENCHMARKS, trace=False)
+    assert [r["benchmark"] for r in results] == BENCHMARKS
+    by_name = {r["benchmark"]: r for r in results}
+    for name in ("loader", "parish_extractor", "week_extractor", "bills"):
+        assert by_name[name]["records"] > 0
+        assert by_name[name]["seconds"] > 0
+
+    only = run_scale(tmp_path, 0.005, seed=0, only=["foodstuffs"], trace=True)
+    assert [r["benchmark"] for r in only] == ["foodstuffs"]
+    assert only[0]["records"] == by_name["foodstuffs"]["records"] > 0
+    assert only[0]["traced_peak_mb"] is not None
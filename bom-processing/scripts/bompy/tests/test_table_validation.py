@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Tests for the column-wise table validators."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from bom.models import BillOfMortalityRecord, CausesOfDeathRecord
+from bom.utils.validation import TABLE_RULES, SchemaValidator
+
+
+def _bill(**overrides):
+    values = dict(
+        parish_id=1,
+        count_type="buried",
+        count=3,
+        year=1665,
+        joinid="1665091916650926",
+        bill_type="weekly",
+        missing=False,
+        illegible=False,
+        source="laxton",
+        unique_identifier="Laxton-1665-38",
+    )
+    values.update(overrides)
+    return BillOfMortalityRecord(**values)
+
+
+def _cause(**overrides):
+    values = dict(
+        original_name="Plague",
+        count=7165,
+        year=1665,
+        joinid="1665091916650926",
+        descriptive_text=None,
+        source_name="wellcome",
+        definition=None,
+        definition_source=None,
+        bill_type="weekly",
+        name="plague",
+    )
+    values.update(overrides)
+    return CausesOfDeathRecord(**values)
+
+
+def test_bills_match_per_record_validator():
+    records = [
+        _bill(),
+        _bill(parish_id=None),
+        _bill(parish_id=0),
+        _bill(joinid=None),
+        _bill(count_type=""),
+        _bill(year=1800),
+        _bill(year=1401),
+        _bill(year=0),
+    ]
+
+    result = SchemaValidator.validate_records(records, "bill_of_mortality")
+
+    expected_valid = [
+        i
+        for i, r in enumerate(records)
+        if not SchemaValidator.validate_bill_of_mortality(r)
+    ]
+    expected_errors = sum(
+        len(SchemaValidator.validate_bill_of_mortality(r)) for r in records
+    )
+    assert result.valid_positions == expected_valid
+    assert len(result.violations) == expected_errors
+
+
+def test_causes_match_per_record_validator():
+    records = [
+        _cause(),
+        _cause(year=None),
+        _cause(original_name=""),
+        _cause(joinid=None, year=1399),
+    ]
+
+    result = SchemaValidator.validate_records(records, "causes_of_death")
+
+    expected_valid = [
+        i
+        for i, r in enumerate(records)
+        if not SchemaValidator.validate_causes_of_death(r)
+    ]
+    assert result.valid_positions == expected_valid
+    assert result.rule_counts() == {
+        "original_name_required": 1,
+        "joinid_required": 1,
+        "year_range": 1,
+    }
+
+
+def test_violation_frame_reports_row_rule_and_value():
+    df = pd.DataFrame(
+        {
+            "joinid": ["a", "b", "c"],
+            "year": [1665, 1850, None],
+            "week_number": [90, 91, 1],
+            "start_day": [1, 31, 32],
+            "end_day": [None, 7, 7],
+        },
+        index=[10, 11, 12],
+    )
+
+    result = SchemaValidator.validate_table(df, TABLE_RULES["week"])
+
+    assert result.valid.index.tolist() == [10]
+    violations = result.violations.sort_values(["row", "rule"])
+    assert violations["row"].tolist() == [11, 11, 12]
+    assert violations["rule"].astype(str).tolist() == [
+        "week_number_range",
+        "year_range",
+        "start_day_range",
+    ]
+    assert violations["value"].tolist() == [91, 1850, 32]
+
+
+def test_empty_table_has_no_violations():
+    result = SchemaValidator.validate_records([], "bill_of_mortality")
+
+    assert result.valid.empty
+    assert result.violations.empty
+    assert list(result.violations.columns) == ["row", "rule", "value"]